@@ -0,0 +1,504 @@
+import sys
+from array import array
+from collections import Counter
+from collections.abc import MutableSequence
+from anuncio import Anuncio, comprimir, redimensionar, rendicion
+from error import SubTipoInvalidoException
+
+
+def _a_arreglo(columna):
+    """Copia una columna memoryview a un array del mismo tipo; un array se regresa tal cual."""
+    if not isinstance(columna, memoryview):
+        return columna
+    copia = array(columna.format)
+    copia.frombytes(columna.cast("B"))
+    return copia
+
+
+class AnuncioFila:
+    """
+    Vista liviana de una fila de un AnuncioStore.
+
+    Expone la misma API de propiedades que Anuncio (alto, ancho, sub_tipo,
+    url_archivo, url_clic y duracion en los videos), pero lee y escribe
+    directamente sobre las columnas del almacén.
+    """
+
+    __slots__ = ("_almacen", "_indice")
+
+    def __init__(self, almacen, indice):
+        """
+        Inicializa la vista de una fila.
+
+        Args:
+            almacen (AnuncioStore): Almacén al que pertenece la fila.
+            indice (int): Posición de la fila dentro del almacén.
+        """
+        self._almacen = almacen
+        self._indice = indice
+
+    @property
+    def clase(self):
+        """type: Regresa la clase de Anuncio que representa la fila."""
+        return Anuncio.REGISTRO.clase_de_codigo(self._almacen._tipo[self._indice])
+
+    @property
+    def tipo(self):
+        """str: Regresa el nombre del tipo de anuncio."""
+        return self.clase.__name__
+
+    @property
+    def alto(self):
+        """int: Regresa la altura del anuncio."""
+        return self._almacen._alto[self._indice]
+
+    @alto.setter
+    def alto(self, valor):
+        """Establece la altura del anuncio. Si es menor o igual a 0, se establece en 1."""
+        self._almacen._alto[self._indice] = valor if valor > 0 else 1
+
+    @property
+    def ancho(self):
+        """int: Regresa el ancho del anuncio."""
+        return self._almacen._ancho[self._indice]
+
+    @ancho.setter
+    def ancho(self, valor):
+        """Establece el ancho del anuncio. Si es menor o igual a 0, se establece en 1."""
+        self._almacen._ancho[self._indice] = valor if valor > 0 else 1
+
+    @property
+    def sub_tipo(self):
+        """str: Regresa el subtipo del anuncio."""
+        return Anuncio.REGISTRO.sub_tipo(self._almacen._sub_tipo[self._indice])
+
+    @sub_tipo.setter
+    def sub_tipo(self, valor):
+        """
+        Establece el subtipo del anuncio.
+
+        Raises:
+            SubTipoInvalidoException: Si el subtipo no está permitido para el tipo de anuncio.
+        """
+        almacen = self._almacen
+        codigo = almacen._codigo_sub_tipo(self.clase, valor)
+        almacen._contar(self._indice, -1)
+        almacen._sub_tipo[self._indice] = codigo
+        almacen._contar(self._indice, 1)
+
+    @property
+    def url_archivo(self):
+        """str: Regresa la URL del archivo del anuncio."""
+        return self._almacen._cadenas[self._almacen._url_archivo[self._indice]]
+
+    @url_archivo.setter
+    def url_archivo(self, nueva_url):
+        """Establece la URL del archivo del anuncio."""
+        self._almacen._url_archivo[self._indice] = self._almacen._codigo_cadena(nueva_url)
+
+    @property
+    def url_clic(self):
+        """str: Regresa la URL de destino del clic en el anuncio."""
+        return self._almacen._cadenas[self._almacen._url_clic[self._indice]]
+
+    @url_clic.setter
+    def url_clic(self, nueva_url):
+        """Establece la URL de destino del clic en el anuncio."""
+        self._almacen._url_clic[self._indice] = self._almacen._codigo_cadena(nueva_url)
+
+    @property
+    def duracion(self):
+        """int: Regresa la duración del video."""
+        self._exigir_duracion()
+        return self._almacen._duracion[self._indice]
+
+    @duracion.setter
+    def duracion(self, valor):
+        """Establece la duración del video. Si es menor o igual a 0, se establece en 5."""
+        self._exigir_duracion()
+        self._almacen._duracion[self._indice] = valor if valor > 0 else 5
+
+    def _exigir_duracion(self):
+        """Lanza AttributeError si el tipo de anuncio no tiene duración."""
+        if not hasattr(self.clase, "duracion"):
+            raise AttributeError(f"'{self.tipo}' no tiene el atributo 'duracion'")
+
+    def materializar(self):
+        """
+        Construye un objeto Anuncio independiente con los datos de la fila.
+
+        Returns:
+            Anuncio: Instancia de la subclase correspondiente.
+        """
+        clase = self.clase
+        anuncio = clase(self.sub_tipo, self.url_archivo, self.url_clic)
+        anuncio.alto = self.alto
+        anuncio.ancho = self.ancho
+        if hasattr(clase, "duracion"):
+            anuncio.duracion = self.duracion
+        return anuncio
+
+    def comprimir_anuncio(self, calidad=None, codificador=None, directorio=None):
+        """
+        Comprime el archivo del anuncio sin materializarlo (ver compresion.comprimir_anuncio).
+
+        El codificador solo se usa en las filas de video.
+        """
+        return comprimir(self, calidad, codificador, directorio)
+
+    def rendicion(self, ancho=None, alto=None, directorio=None):
+        """Regresa la ruta de una rendición procesada del creativo (ver redimension.rendicion)."""
+        return rendicion(self, ancho, alto, directorio)
+
+    def redimensionar_anuncio(self, directorio=None, escalador=None):
+        """
+        Genera las rendiciones del anuncio sin materializarlo (ver redimension.redimensionar_anuncio).
+
+        El escalador solo se usa en las filas de video.
+        """
+        return redimensionar(self, directorio, escalador)
+
+    def __eq__(self, otro):
+        """Dos anuncios son iguales si tienen el mismo tipo y los mismos datos."""
+        if not isinstance(otro, AnuncioFila) and not hasattr(otro, "url_clic"):
+            return NotImplemented
+        return AnuncioStore._columnas(otro) == AnuncioStore._columnas(self)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<{self.tipo} fila={self._indice} sub_tipo={self.sub_tipo!r}>"
+
+
+class AnuncioStore(MutableSequence):
+    """
+    Almacén columnar de anuncios para campañas con muchos creativos.
+
+    En lugar de guardar un objeto por anuncio, cada atributo vive en su propia
+    columna: arreglos tipados para alto, ancho y duración, los códigos enteros
+    de Anuncio.REGISTRO para el tipo y el subtipo, y una tabla de cadenas compartida donde
+    cada URL distinta se guarda una sola vez. El acceso por índice o iteración
+    entrega vistas AnuncioFila con la misma API de propiedades que Anuncio.
+    Los conteos por tipo y subtipo se mantienen al día en cada modificación.
+
+    Se puede usar como respaldo de Campana.anuncios:
+
+        campana = Campana("Verano", anuncios=AnuncioStore())
+    """
+
+    def __init__(self, anuncios=None):
+        """
+        Inicializa un almacén vacío o con los anuncios entregados.
+
+        Args:
+            anuncios (iterable, optional): Anuncios iniciales. Por defecto es None.
+        """
+        self._cadenas = [None]
+        self._codigos_cadenas = {None: 0}
+        self._tipo = array("B")
+        self._sub_tipo = array("H")
+        self._alto = array("i")
+        self._ancho = array("i")
+        self._duracion = array("i")
+        self._url_archivo = array("I")
+        self._url_clic = array("I")
+        self._por_tipo = Counter()
+        self._por_sub_tipo = Counter()
+        self._mapeado = False
+        if anuncios is not None:
+            self.extend(anuncios)
+
+    @classmethod
+    def desde_columnas(cls, columnas, cadenas):
+        """
+        Crea un almacén sobre columnas ya codificadas, sin copiarlas.
+
+        Las columnas pueden ser memoryview sobre un archivo mapeado (ver
+        instantanea): las lecturas y los cambios de valores trabajan directo sobre
+        ellas, y el primer cambio estructural (agregar, insertar o quitar
+        anuncios) las copia a arreglos propios. Los conteos por tipo y subtipo, y
+        el índice de la tabla de cadenas, se calculan la primera vez que se
+        necesitan.
+
+        Args:
+            columnas (tuple): Tipo, subtipo, alto, ancho, duración, URL de archivo y URL
+                de clic, en el orden de _arreglos y con los mismos códigos de tipo.
+            cadenas (Sequence): Tabla de cadenas a la que apuntan las columnas de URLs;
+                debe aceptar append para las cadenas nuevas.
+
+        Returns:
+            AnuncioStore: Almacén que comparte las columnas entregadas.
+        """
+        almacen = cls()
+        (almacen._tipo, almacen._sub_tipo, almacen._alto, almacen._ancho, almacen._duracion,
+         almacen._url_archivo, almacen._url_clic) = columnas
+        almacen._cadenas = cadenas
+        almacen._codigos_cadenas = None
+        almacen._por_tipo = almacen._por_sub_tipo = None
+        almacen._mapeado = True
+        return almacen
+
+    def clonar(self):
+        """
+        Regresa un almacén independiente con los mismos anuncios.
+
+        Las columnas se copian como bloques de bytes, sin crear un objeto por
+        anuncio, y la tabla de cadenas como una lista de referencias.
+
+        Returns:
+            AnuncioStore: Copia que se puede modificar sin afectar a este almacén.
+        """
+        clon = AnuncioStore()
+        (clon._tipo, clon._sub_tipo, clon._alto, clon._ancho, clon._duracion,
+         clon._url_archivo, clon._url_clic) = [columna[:] if isinstance(columna, array) else _a_arreglo(columna)
+                                              for columna in self._arreglos()]
+        clon._cadenas = list(self._cadenas)
+        clon._codigos_cadenas = dict(self._indice_cadenas())
+        self._asegurar_conteos()
+        clon._por_tipo = self._por_tipo.copy()
+        clon._por_sub_tipo = self._por_sub_tipo.copy()
+        return clon
+
+    def columnas(self):
+        """
+        Regresa las columnas codificadas y la tabla de cadenas, para exportarlas sin crear objetos.
+
+        Returns:
+            tuple: (columnas en el orden de desde_columnas, tabla de cadenas).
+        """
+        return self._arreglos(), self._cadenas
+
+    def _asegurar_conteos(self):
+        """Calcula los conteos por tipo y subtipo si aún no existen."""
+        if self._por_tipo is None:
+            self._por_tipo = Counter(self._tipo)
+            self._por_sub_tipo = Counter(zip(self._tipo, self._sub_tipo))
+
+    def _escribible(self):
+        """Copia las columnas compartidas a arreglos propios antes de un cambio estructural."""
+        if self._mapeado:
+            self._asegurar_conteos()
+            (self._tipo, self._sub_tipo, self._alto, self._ancho, self._duracion,
+             self._url_archivo, self._url_clic) = map(_a_arreglo, self._arreglos())
+            self._mapeado = False
+
+    @staticmethod
+    def _codigo_sub_tipo(clase, sub_tipo):
+        """
+        Regresa el código del subtipo en Anuncio.REGISTRO.
+
+        Raises:
+            SubTipoInvalidoException: Si el subtipo no está permitido para la clase.
+        """
+        registro = Anuncio.REGISTRO
+        if sub_tipo is None:
+            return 0
+        if not registro.es_valido(clase, sub_tipo):
+            raise SubTipoInvalidoException(
+                f"Subtipo '{sub_tipo}' no válido para {clase.__name__}."
+            )
+        return registro.codigo(sub_tipo)
+
+    def _indice_cadenas(self):
+        """Regresa el diccionario cadena -> código, armándolo desde la tabla si aún no existe."""
+        if self._codigos_cadenas is None:
+            codigos = {}
+            for codigo, cadena in enumerate(self._cadenas):
+                codigos.setdefault(cadena, codigo)
+            self._codigos_cadenas = codigos
+        return self._codigos_cadenas
+
+    def _codigo_cadena(self, cadena):
+        """Regresa el índice de una cadena en la tabla compartida (la interna si es nueva)."""
+        codigo = self._indice_cadenas().get(cadena)
+        if codigo is None:
+            codigo = len(self._cadenas)
+            self._cadenas.append(cadena)
+            self._codigos_cadenas[cadena] = codigo
+        return codigo
+
+    @staticmethod
+    def _columnas(anuncio):
+        """Regresa una tupla con la clase y los datos de un Anuncio o de una vista que expone su clase."""
+        clase = getattr(anuncio, "clase", type(anuncio))
+        duracion = anuncio.duracion if hasattr(clase, "duracion") else 0
+        return (clase, anuncio.sub_tipo, anuncio.alto, anuncio.ancho, duracion,
+                anuncio.url_archivo, anuncio.url_clic)
+
+    def _codificar(self, anuncio):
+        """Convierte un anuncio en la tupla de valores que se guarda en cada columna."""
+        clase, sub_tipo, alto, ancho, duracion, url_archivo, url_clic = self._columnas(anuncio)
+        return (Anuncio.REGISTRO.codigo_clase(clase), self._codigo_sub_tipo(clase, sub_tipo), alto, ancho,
+                duracion, self._codigo_cadena(url_archivo), self._codigo_cadena(url_clic))
+
+    def _arreglos(self):
+        """Regresa las columnas en el mismo orden que _codificar."""
+        return (self._tipo, self._sub_tipo, self._alto, self._ancho,
+                self._duracion, self._url_archivo, self._url_clic)
+
+    def _contar(self, indice, delta):
+        """Suma delta a los conteos del tipo y subtipo de la fila indicada."""
+        self._asegurar_conteos()
+        tipo = self._tipo[indice]
+        self._por_tipo[tipo] += delta
+        self._por_sub_tipo[tipo, self._sub_tipo[indice]] += delta
+
+    def _normalizar_indice(self, indice):
+        """Convierte un índice negativo en positivo y valida el rango."""
+        largo = len(self._tipo)
+        if indice < 0:
+            indice += largo
+        if not 0 <= indice < largo:
+            raise IndexError("índice de anuncio fuera de rango")
+        return indice
+
+    def __len__(self):
+        return len(self._tipo)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [AnuncioFila(self, i) for i in range(*indice.indices(len(self)))]
+        return AnuncioFila(self, self._normalizar_indice(indice))
+
+    def _escribir(self, indice, valores):
+        """Reemplaza en su lugar los valores codificados de una fila existente."""
+        self._contar(indice, -1)
+        for columna, valor in zip(self._arreglos(), valores):
+            columna[indice] = valor
+        self._contar(indice, 1)
+
+    def __setitem__(self, indice, anuncio):
+        if not isinstance(indice, slice):
+            self._escribir(self._normalizar_indice(indice), self._codificar(anuncio))
+            return
+        # Se codifica todo antes de cambiar nada: un anuncio inválido deja el almacén intacto.
+        nuevos = [self._codificar(elemento) for elemento in anuncio]
+        posiciones = range(*indice.indices(len(self)))
+        if indice.step not in (None, 1) and len(nuevos) != len(posiciones):
+            raise ValueError(f"Se intentó asignar {len(nuevos)} anuncios a un slice extendido "
+                             f"de {len(posiciones)}.")
+        if len(nuevos) == len(posiciones):
+            for posicion, valores in zip(posiciones, nuevos):
+                self._escribir(posicion, valores)
+            return
+        self._escribible()
+        for posicion in posiciones:
+            self._contar(posicion, -1)
+        inicio, fin = posiciones.start, max(posiciones.start, posiciones.stop)
+        columnas_nuevas = zip(*nuevos) if nuevos else [()] * len(self._arreglos())
+        for columna, valores in zip(self._arreglos(), columnas_nuevas):
+            columna[inicio:fin] = array(columna.typecode, valores)
+        for valores in nuevos:
+            self._por_tipo[valores[0]] += 1
+            self._por_sub_tipo[valores[0], valores[1]] += 1
+
+    def __delitem__(self, indice):
+        self._escribible()
+        if isinstance(indice, slice):
+            for i in range(*indice.indices(len(self))):
+                self._contar(i, -1)
+        else:
+            indice = self._normalizar_indice(indice)
+            self._contar(indice, -1)
+        for columna in self._arreglos():
+            del columna[indice]
+
+    def insert(self, indice, anuncio):
+        """Inserta un anuncio antes de la posición indicada."""
+        self._escribible()
+        valores = self._codificar(anuncio)
+        for columna, valor in zip(self._arreglos(), valores):
+            columna.insert(indice, valor)
+        self._por_tipo[valores[0]] += 1
+        self._por_sub_tipo[valores[0], valores[1]] += 1
+
+    def append(self, anuncio):
+        """
+        Agrega un anuncio al final del almacén.
+
+        Raises:
+            SubTipoInvalidoException: Si el subtipo del anuncio no está permitido para su tipo.
+        """
+        self._escribible()
+        valores = self._codificar(anuncio)
+        for columna, valor in zip(self._arreglos(), valores):
+            columna.append(valor)
+        self._por_tipo[valores[0]] += 1
+        self._por_sub_tipo[valores[0], valores[1]] += 1
+
+    def agregar_lote(self, lote):
+        """
+        Agrega un lote ya validado escribiendo directo en las columnas, sin crear objetos.
+
+        Args:
+            lote (ingesta.LoteAnuncios): Filas válidas regresadas por ingesta.validar_lote.
+        """
+        self._escribible()
+        registro = Anuncio.REGISTRO
+        tipos = array("B", map(registro.codigo_clase, lote.clases))
+        sub_tipos = array("H", map(registro.codigo, lote.sub_tipos))
+        self._tipo.extend(tipos)
+        self._sub_tipo.extend(sub_tipos)
+        self._por_tipo.update(tipos)
+        self._por_sub_tipo.update(zip(tipos, sub_tipos))
+        self._alto.extend(lote.altos)
+        self._ancho.extend(lote.anchos)
+        self._duracion.extend(lote.duraciones)
+        self._url_archivo.extend(map(self._codigo_cadena, lote.urls_archivo))
+        self._url_clic.extend(map(self._codigo_cadena, lote.urls_clic))
+
+    def extend(self, anuncios):
+        """Agrega varios anuncios al final del almacén."""
+        if anuncios is self:
+            anuncios = list(anuncios)
+        for anuncio in anuncios:
+            self.append(anuncio)
+
+    def __iter__(self):
+        for indice in range(len(self._tipo)):
+            yield AnuncioFila(self, indice)
+
+    def __contains__(self, anuncio):
+        if not isinstance(anuncio, AnuncioFila) and not hasattr(anuncio, "url_clic"):
+            return False
+        return any(fila == anuncio for fila in self)
+
+    def conteo_por_tipo(self):
+        """
+        Regresa los conteos de anuncios por tipo.
+
+        Returns:
+            dict: Nombre del tipo -> cantidad de anuncios.
+        """
+        self._asegurar_conteos()
+        registro = Anuncio.REGISTRO
+        return {registro.clase_de_codigo(tipo).__name__: cantidad
+                for tipo, cantidad in self._por_tipo.items() if cantidad}
+
+    def conteo_por_sub_tipo(self):
+        """
+        Regresa los conteos de anuncios por tipo y subtipo.
+
+        Returns:
+            dict: (nombre del tipo, subtipo) -> cantidad de anuncios.
+        """
+        self._asegurar_conteos()
+        registro = Anuncio.REGISTRO
+        return {(registro.clase_de_codigo(tipo).__name__, registro.sub_tipo(sub_tipo)): cantidad
+                for (tipo, sub_tipo), cantidad in self._por_sub_tipo.items() if cantidad}
+
+    def bytes_usados(self):
+        """
+        Estima la memoria ocupada por las columnas y la tabla de cadenas.
+
+        Returns:
+            int: Cantidad aproximada de bytes.
+        """
+        total = sum(len(columna) * columna.itemsize for columna in self._arreglos())
+        if self._codigos_cadenas is not None:
+            total += sys.getsizeof(self._codigos_cadenas)
+        if not isinstance(self._cadenas, list):
+            return total + self._cadenas.bytes_usados()
+        total += sys.getsizeof(self._cadenas)
+        total += sum(sys.getsizeof(cadena) for cadena in self._cadenas if cadena is not None)
+        return total
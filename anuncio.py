@@ -1,12 +1,194 @@
 from abc import ABC, abstractmethod
+from array import array
 from error import SubTipoInvalidoException
+from observable import Observable
 
-class Anuncio(ABC):
+
+def comprimir(anuncio, calidad=None, codificador=None, directorio=None):
+    """
+    Comprime el archivo de un anuncio con compresion.comprimir_anuncio.
+
+    compresion y redimension se importan al primer uso y no al cargar este
+    módulo: traen subprocess, shutil y el caché de creativos, que la mayoría de
+    los programas que solo crean anuncios no necesitan. None usa los valores por
+    defecto de compresion.
+    """
+    import compresion
+
+    return compresion.comprimir_anuncio(
+        anuncio, compresion.CALIDAD if calidad is None else calidad, codificador,
+        compresion.DIRECTORIO_CACHE if directorio is None else directorio)
+
+
+def redimensionar(anuncio, directorio=None, escalador=None):
+    """Genera las rendiciones de un anuncio con redimension.redimensionar_anuncio (ver comprimir)."""
+    import redimension
+
+    return redimension.redimensionar_anuncio(
+        anuncio, redimension.DIRECTORIO_RENDICIONES if directorio is None else directorio, escalador)
+
+
+def rendicion(anuncio, ancho=None, alto=None, directorio=None):
+    """Regresa la ruta de una rendición con redimension.rendicion (ver comprimir)."""
+    import redimension
+
+    return redimension.rendicion(
+        anuncio, ancho, alto, redimension.DIRECTORIO_RENDICIONES if directorio is None else directorio)
+
+
+def registrar_subclase(base, cls):
+    """
+    Registra los SUB_TIPOS de una subclase en base.SUB_TIPOS y en base.REGISTRO.
+
+    Lo usa el __init_subclass__ de las dos jerarquías de anuncios (esta y
+    anuncio_compacto), cada una con su propio registro.
+
+    Args:
+        base (type): Clase base dueña del registro.
+        cls (type): Subclase recién definida.
+    """
+    base.SUB_TIPOS[cls.__name__] = cls.SUB_TIPOS
+    base.REGISTRO = base.REGISTRO.con_clase(cls, cls.SUB_TIPOS.get(cls.__name__, ()))
+    cls._SUB_TIPOS_VALIDOS = base.REGISTRO.sub_tipos_de(cls)
+
+
+class RegistroSubTipos:
+    """
+    Registro inmutable de tipos de anuncio y sus subtipos permitidos.
+
+    Se construye una sola vez por cada clase registrada: agregar una clase
+    produce un registro nuevo y deja intacto el anterior. Cada subtipo distinto
+    recibe un código entero pequeño (0 se reserva para "sin subtipo"), lo que
+    permite validar en O(1), validar lotes completos y traducir códigos de vuelta
+    a su nombre.
+    """
+
+    __slots__ = ("_clases", "_por_nombre", "_codigos_clase", "_ordenados",
+                 "_validos", "_sub_tipos", "_codigos")
+
+    INVALIDO = 0xFFFF
+
+    def __init__(self):
+        """Inicializa un registro vacío."""
+        self._clases = ()
+        self._por_nombre = {}
+        self._codigos_clase = {}
+        self._ordenados = {}
+        self._validos = {}
+        self._sub_tipos = (None,)
+        self._codigos = {None: 0}
+
+    def con_clase(self, clase, sub_tipos):
+        """
+        Regresa un registro nuevo que además incluye la clase indicada.
+
+        Args:
+            clase (type): Subclase de Anuncio a registrar.
+            sub_tipos (tuple): Subtipos permitidos para la clase, en orden de presentación.
+
+        Returns:
+            RegistroSubTipos: Registro ampliado; el actual no se modifica.
+        """
+        nuevo = RegistroSubTipos()
+        nuevo._clases = self._clases + (clase,)
+        nuevo._por_nombre = {**self._por_nombre, clase.__name__: clase}
+        nuevo._codigos_clase = {**self._codigos_clase, clase: len(self._clases) + 1}
+        nuevo._ordenados = {**self._ordenados, clase: tuple(sub_tipos)}
+        nuevo._validos = {**self._validos, clase: frozenset(sub_tipos)}
+        nuevos = tuple(s for s in dict.fromkeys(sub_tipos) if s not in self._codigos)
+        nuevo._sub_tipos = self._sub_tipos + nuevos
+        nuevo._codigos = {s: i for i, s in enumerate(nuevo._sub_tipos)}
+        return nuevo
+
+    @property
+    def clases(self):
+        """tuple: Regresa las clases registradas en orden de registro."""
+        return self._clases
+
+    @property
+    def sub_tipos(self):
+        """tuple: Regresa todos los subtipos registrados en orden de código (el 0 es None)."""
+        return self._sub_tipos
+
+    def clase_por_nombre(self, nombre):
+        """Regresa la clase registrada con ese nombre, o None si no existe."""
+        return self._por_nombre.get(nombre)
+
+    def codigo_clase(self, clase):
+        """Regresa el código entero (desde 1) de una clase registrada."""
+        return self._codigos_clase[clase]
+
+    def clase_de_codigo(self, codigo):
+        """Regresa la clase correspondiente a un código de clase."""
+        return self._clases[codigo - 1]
+
+    def sub_tipos_de(self, clase):
+        """frozenset: Regresa los subtipos permitidos para la clase."""
+        return self._validos.get(clase, frozenset())
+
+    def sub_tipos_ordenados(self, clase):
+        """tuple: Regresa los subtipos de la clase en el orden en que se declararon."""
+        return self._ordenados.get(clase, ())
+
+    def es_valido(self, clase, sub_tipo):
+        """Indica si el subtipo está permitido para la clase."""
+        return sub_tipo in self._validos.get(clase, ())
+
+    def validar_lote(self, clase, sub_tipos):
+        """
+        Valida muchos subtipos para una misma clase.
+
+        Args:
+            clase (type): Clase de anuncio contra la que se valida.
+            sub_tipos (iterable): Subtipos a validar.
+
+        Returns:
+            list: Un booleano por subtipo, True si es válido.
+        """
+        return list(map(self._validos.get(clase, frozenset()).__contains__, sub_tipos))
+
+    def indices_invalidos(self, clase, sub_tipos):
+        """Regresa las posiciones de los subtipos no permitidos para la clase."""
+        validos = self._validos.get(clase, frozenset())
+        return [i for i, sub_tipo in enumerate(sub_tipos) if sub_tipo not in validos]
+
+    def codigo(self, sub_tipo):
+        """Regresa el código entero de un subtipo registrado (0 para None)."""
+        return self._codigos[sub_tipo]
+
+    def sub_tipo(self, codigo):
+        """Regresa el nombre del subtipo correspondiente a un código."""
+        return self._sub_tipos[codigo]
+
+    def codificar_lote(self, clase, sub_tipos):
+        """
+        Traduce muchos subtipos a sus códigos enteros.
+
+        Args:
+            clase (type): Clase de anuncio contra la que se valida.
+            sub_tipos (iterable): Subtipos a codificar.
+
+        Returns:
+            array: Códigos de tipo 'H'; los subtipos no permitidos quedan como INVALIDO.
+        """
+        codigos = {s: self._codigos[s] for s in self._validos.get(clase, ())}
+        return array("H", [codigos.get(s, self.INVALIDO) for s in sub_tipos])
+
+
+class Anuncio(Observable, ABC):
     """
     Clase base abstracta que representa un anuncio genérico.
+
+    Los cambios de sus atributos se notifican a los suscriptores (ver Observable), lo
+    que permite a las colecciones mantener sus conteos al día y a un Diario
+    registrar cada edición.
     """
 
     SUB_TIPOS = {}
+    TAMANOS = {}
+    CAMPOS_EDITABLES = ("sub_tipo", "url_archivo", "url_clic")
+    REGISTRO = RegistroSubTipos()
+    _SUB_TIPOS_VALIDOS = frozenset()
 
     def __init__(self, sub_tipo=None, url_archivo=None, url_clic=None):
         """
@@ -16,7 +198,14 @@ class Anuncio(ABC):
             sub_tipo (str, optional): Subtipo del anuncio. Por defecto es None.
             url_archivo (str, optional): URL del archivo del anuncio. Por defecto es None.
             url_clic (str, optional): URL de destino del clic en el anuncio. Por defecto es None.
+
+        Raises:
+            SubTipoInvalidoException: Si el subtipo no es None ni está permitido para el tipo de anuncio.
         """
+        if sub_tipo is not None and sub_tipo not in self._SUB_TIPOS_VALIDOS:
+            raise SubTipoInvalidoException(
+                f"Subtipo '{sub_tipo}' no válido para {type(self).__name__}."
+            )
         self._alto = 1
         self._ancho = 1
         self._sub_tipo = sub_tipo
@@ -25,10 +214,16 @@ class Anuncio(ABC):
 
     def __init_subclass__(cls, **kwargs):
         """
-        Registra los SUB_TIPOS de la subclase en el diccionario de la clase Anuncio.
+        Registra los SUB_TIPOS de la subclase en el diccionario de la clase Anuncio
+        y en el registro inmutable de subtipos.
         """
         super().__init_subclass__(**kwargs)
-        Anuncio.SUB_TIPOS[cls.__name__] = cls.SUB_TIPOS
+        registrar_subclase(Anuncio, cls)
+
+    @property
+    def tipo(self):
+        """str: Regresa el nombre del tipo de anuncio (Video, Display, Social...)."""
+        return type(self).__name__
 
     @property
     def alto(self):
@@ -43,7 +238,10 @@ class Anuncio(ABC):
         Args:
             valor (int): Nueva altura del anuncio. Si es menor o igual a 0, se establece en 1.
         """
+        anterior = self._alto
         self._alto = valor if valor > 0 else 1
+        if self._observadores:
+            self._notificar("alto", anterior, self._alto)
 
     @property
     def ancho(self):
@@ -58,7 +256,10 @@ class Anuncio(ABC):
         Args:
             valor (int): Nuevo ancho del anuncio. Si es menor o igual a 0, se establece en 1.
         """
+        anterior = self._ancho
         self._ancho = valor if valor > 0 else 1
+        if self._observadores:
+            self._notificar("ancho", anterior, self._ancho)
 
     @property
     def sub_tipo(self):
@@ -76,8 +277,11 @@ class Anuncio(ABC):
         Raises:
             SubTipoInvalidoException: Si el subtipo no está permitido para el tipo de anuncio.
         """
-        if valor in self.SUB_TIPOS.get(type(self).__name__, []):
+        if valor in self._SUB_TIPOS_VALIDOS:
+            anterior = self._sub_tipo
             self._sub_tipo = valor
+            if self._observadores:
+                self._notificar("sub_tipo", anterior, valor)
         else:
             raise SubTipoInvalidoException(
                 f"Subtipo '{valor}' no válido para {type(self).__name__}."
@@ -91,7 +295,10 @@ class Anuncio(ABC):
     @url_archivo.setter
     def url_archivo(self, nueva_url):
         """Establece la URL del archivo del anuncio."""
+        anterior = self._url_archivo
         self._url_archivo = nueva_url
+        if self._observadores:
+            self._notificar("url_archivo", anterior, nueva_url)
 
     @property
     def url_clic(self):
@@ -101,35 +308,42 @@ class Anuncio(ABC):
     @url_clic.setter
     def url_clic(self, nueva_url):
         """Establece la URL de destino del clic en el anuncio."""
+        anterior = self._url_clic
         self._url_clic = nueva_url
+        if self._observadores:
+            self._notificar("url_clic", anterior, nueva_url)
 
     @staticmethod
     def mostrar_formatos(tipo_anuncio=None):
         """Devuelve un string con los formatos de anuncios y subtipos disponibles."""
         formatos_str = "Subtipos:\n"
+        registro = Anuncio.REGISTRO
         if tipo_anuncio:
-            subtipos = Anuncio.SUB_TIPOS.get(tipo_anuncio)
-            if subtipos:
-                formatos_str += f"De {tipo_anuncio}: "
-                # Itera sobre los valores del diccionario subtipos
-                for i, subtipo in enumerate(subtipos[tipo_anuncio]):
-                    formatos_str += f"'{subtipo}'"
-                    if i < len(subtipos[tipo_anuncio]) - 1:
-                        formatos_str += " y "
-                    else:
-                        formatos_str += "\n"
+            clase = registro.clase_por_nombre(tipo_anuncio)
+            clases = (clase,) if clase else ()
         else:
-            for formato, subtipos in Anuncio.SUB_TIPOS.items():
-                formatos_str += f"De {formato}: "
-                # Itera sobre los valores del diccionario subtipos
-                for i, subtipo in enumerate(subtipos[formato]):
-                    formatos_str += f"'{subtipo}'"
-                    if i < len(subtipos[formato]) - 1:
-                        formatos_str += " y "
-                    else:
-                        formatos_str += "\n"
+            clases = registro.clases
+        for clase in clases:
+            subtipos = registro.sub_tipos_ordenados(clase)
+            if subtipos:
+                formatos_str += f"De {clase.__name__}: "
+                formatos_str += " y ".join(f"'{subtipo}'" for subtipo in subtipos) + "\n"
         return formatos_str
 
+    def rendicion(self, ancho=None, alto=None, directorio=None):
+        """
+        Regresa la ruta de una rendición procesada del creativo, generándola solo si no está en caché.
+
+        Args:
+            ancho (int, optional): Ancho de la rendición. Por defecto, el primer tamaño de su subtipo.
+            alto (int, optional): Alto de la rendición. Por defecto, el primer tamaño de su subtipo.
+            directorio (str, optional): Directorio del caché de creativos. Por defecto, el de su módulo.
+
+        Returns:
+            str: Ruta de la rendición (ver redimension.rendicion).
+        """
+        return rendicion(self, ancho, alto, directorio)
+
     @abstractmethod
     def comprimir_anuncio(self):
         """Comprime el anuncio."""
@@ -147,6 +361,8 @@ class Video(Anuncio):
     """
 
     SUB_TIPOS = {"Video": ("Publicidad", "Tutorial")}
+    TAMANOS = {"Publicidad": ((1920, 1080), (1280, 720)), "Tutorial": ((1280, 720),)}
+    CAMPOS_EDITABLES = Anuncio.CAMPOS_EDITABLES + ("duracion",)
 
     def __init__(self, sub_tipo=None, url_archivo=None, url_clic=None, duracion=5):
         """
@@ -174,40 +390,102 @@ class Video(Anuncio):
         Args:
             valor (int): Nueva duración del video en segundos. Si es menor o igual a 0, se establece en 5.
         """
+        anterior = self._duracion
         self._duracion = valor if valor > 0 else 5
+        if self._observadores:
+            self._notificar("duracion", anterior, self._duracion)
 
-    def comprimir_anuncio(self):
-        """Comprime el anuncio de video (no implementado)."""
-        print("COMPRESIÓN DE VIDEO NO IMPLEMENTADA AÚN")
+    def comprimir_anuncio(self, calidad=None, codificador=None, directorio=None):
+        """
+        Comprime el archivo local del video con un codificador intercambiable.
 
-    def redimensionar_anuncio(self):
-        """Redimensiona el anuncio de video (no implementado)."""
-        print("RECORTE DE VIDEO NO IMPLEMENTADO AÚN")
+        Args:
+            calidad (int, optional): Calidad objetivo de 1 a 100. Por defecto es compresion.CALIDAD.
+            codificador (callable, optional): Ver compresion.comprimir_video. Por defecto usa ffmpeg.
+            directorio (str, optional): Directorio del caché de creativos. Por defecto, el de su módulo.
+
+        Returns:
+            ResultadoCompresion: Tamaños antes y después, o el error ocurrido.
+        """
+        return comprimir(self, calidad, codificador, directorio)
+
+    def redimensionar_anuncio(self, directorio=None, escalador=None):
+        """
+        Genera las rendiciones del video en los tamaños de su subtipo (ver TAMANOS).
+
+        Args:
+            directorio (str, optional): Directorio del caché de creativos. Por defecto, el de su módulo.
+            escalador (callable, optional): Ver redimension.redimensionar_video. Por defecto usa ffmpeg.
+
+        Returns:
+            ResultadoRedimension: Las rendiciones generadas, o el error ocurrido.
+        """
+        return redimensionar(self, directorio, escalador)
 
 
 class Display(Anuncio):
     """Clase que representa un anuncio display."""
 
     SUB_TIPOS = {"Display": ("Banner", "Sidebar")}
+    TAMANOS = {"Banner": ((728, 90), (468, 60)), "Sidebar": ((300, 600), (160, 600))}
 
-    def comprimir_anuncio(self):
-        """Comprime el anuncio display (no implementado)."""
-        print("COMPRESIÓN DE ANUNCIOS DISPLAY NO IMPLEMENTADA AÚN")
+    def comprimir_anuncio(self, calidad=None, directorio=None):
+        """
+        Recomprime la imagen local del anuncio (PNG o JPEG).
 
-    def redimensionar_anuncio(self):
-        """Redimensiona el anuncio display (no implementado)."""
-        print("REDIMENSIONAMIENTO DE ANUNCIOS DISPLAY NO IMPLEMENTADA AÚN")
+        Args:
+            calidad (int, optional): Calidad objetivo de 1 a 100. Por defecto es compresion.CALIDAD.
+            directorio (str, optional): Directorio del caché de creativos. Por defecto, el de su módulo.
+
+        Returns:
+            ResultadoCompresion: Tamaños antes y después, o el error ocurrido.
+        """
+        return comprimir(self, calidad, directorio=directorio)
+
+    def redimensionar_anuncio(self, directorio=None):
+        """
+        Genera las rendiciones de la imagen en los tamaños de su subtipo (ver TAMANOS).
+
+        El alto y ancho del anuncio quedan en el primer tamaño objetivo.
+
+        Args:
+            directorio (str, optional): Directorio del caché de creativos. Por defecto, el de su módulo.
+
+        Returns:
+            ResultadoRedimension: Las rendiciones generadas, o el error ocurrido.
+        """
+        return redimensionar(self, directorio)
 
 
 class Social(Anuncio):
     """Clase que representa un anuncio de redes sociales."""
 
     SUB_TIPOS = {"Social": ("Post", "Story")}
+    TAMANOS = {"Post": ((1080, 1080),), "Story": ((1080, 1920),)}
 
-    def comprimir_anuncio(self):
-        """Comprime el anuncio de redes sociales (no implementado)."""
-        print("COMPRESIÓN DE ANUNCIOS DE REDES SOCIALES NO IMPLEMENTADA AÚN")
+    def comprimir_anuncio(self, calidad=None, directorio=None):
+        """
+        Recomprime la imagen local del anuncio (PNG o JPEG).
 
-    def redimensionar_anuncio(self):
-        """Redimensiona el anuncio de redes sociales (no implementado)."""
-        print("REDIMENSIONAMIENTO DE ANUNCIOS DE REDES SOCIALES NO IMPLEMENTADA AÚN")
\ No newline at end of file
+        Args:
+            calidad (int, optional): Calidad objetivo de 1 a 100. Por defecto es compresion.CALIDAD.
+            directorio (str, optional): Directorio del caché de creativos. Por defecto, el de su módulo.
+
+        Returns:
+            ResultadoCompresion: Tamaños antes y después, o el error ocurrido.
+        """
+        return comprimir(self, calidad, directorio=directorio)
+
+    def redimensionar_anuncio(self, directorio=None):
+        """
+        Genera las rendiciones de la imagen en los tamaños de su subtipo (ver TAMANOS).
+
+        El alto y ancho del anuncio quedan en el primer tamaño objetivo.
+
+        Args:
+            directorio (str, optional): Directorio del caché de creativos. Por defecto, el de su módulo.
+
+        Returns:
+            ResultadoRedimension: Las rendiciones generadas, o el error ocurrido.
+        """
+        return redimensionar(self, directorio)
@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+import anuncio
+from anuncio import RegistroSubTipos
+from error import SubTipoInvalidoException
+
+
+class Anuncio(ABC):
+    """
+    Variante compacta de la clase base Anuncio basada en __slots__.
+
+    Mantiene la API y las reglas de validación de anuncio.Anuncio, pero las
+    instancias no tienen __dict__: cada atributo ocupa una ranura fija. Las URLs
+    no tienen validación en sus setters, así que son ranuras públicas y su
+    lectura no pasa por una property.
+
+    Tiene su propio REGISTRO, llenado con anuncio.registrar_subclase, y comparte
+    con anuncio los métodos de compresión y rendiciones.
+    """
+
+    __slots__ = ("_alto", "_ancho", "_sub_tipo", "url_archivo", "url_clic")
+
+    SUB_TIPOS = {}
+    TAMANOS = {}
+    REGISTRO = RegistroSubTipos()
+    _SUB_TIPOS_VALIDOS = frozenset()
+
+    def __init__(self, sub_tipo=None, url_archivo=None, url_clic=None):
+        """
+        Inicializa una instancia compacta de Anuncio.
+
+        Args:
+            sub_tipo (str, optional): Subtipo del anuncio. Por defecto es None.
+            url_archivo (str, optional): URL del archivo del anuncio. Por defecto es None.
+            url_clic (str, optional): URL de destino del clic en el anuncio. Por defecto es None.
+
+        Raises:
+            SubTipoInvalidoException: Si el subtipo no es None ni está permitido para el tipo de anuncio.
+        """
+        if sub_tipo is not None and sub_tipo not in self._SUB_TIPOS_VALIDOS:
+            raise SubTipoInvalidoException(
+                f"Subtipo '{sub_tipo}' no válido para {type(self).__name__}."
+            )
+        self._alto = 1
+        self._ancho = 1
+        self._sub_tipo = sub_tipo
+        self.url_archivo = url_archivo
+        self.url_clic = url_clic
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Registra los SUB_TIPOS de la subclase en el diccionario de la clase Anuncio
+        y en el registro inmutable de subtipos.
+        """
+        super().__init_subclass__(**kwargs)
+        anuncio.registrar_subclase(Anuncio, cls)
+
+    @property
+    def tipo(self):
+        """str: Regresa el nombre del tipo de anuncio (Video, Display, Social...)."""
+        return type(self).__name__
+
+    @property
+    def alto(self):
+        """int: Regresa la altura del anuncio."""
+        return self._alto
+
+    @alto.setter
+    def alto(self, valor):
+        """Establece la altura del anuncio. Si es menor o igual a 0, se establece en 1."""
+        self._alto = valor if valor > 0 else 1
+
+    @property
+    def ancho(self):
+        """int: Regresa el ancho del anuncio."""
+        return self._ancho
+
+    @ancho.setter
+    def ancho(self, valor):
+        """Establece el ancho del anuncio. Si es menor o igual a 0, se establece en 1."""
+        self._ancho = valor if valor > 0 else 1
+
+    @property
+    def sub_tipo(self):
+        """str: Regresa el subtipo del anuncio."""
+        return self._sub_tipo
+
+    @sub_tipo.setter
+    def sub_tipo(self, valor):
+        """
+        Establece el subtipo del anuncio.
+
+        Raises:
+            SubTipoInvalidoException: Si el subtipo no está permitido para el tipo de anuncio.
+        """
+        if valor in self._SUB_TIPOS_VALIDOS:
+            self._sub_tipo = valor
+        else:
+            raise SubTipoInvalidoException(
+                f"Subtipo '{valor}' no válido para {type(self).__name__}."
+            )
+
+    rendicion = anuncio.Anuncio.rendicion
+
+    @abstractmethod
+    def comprimir_anuncio(self):
+        """Comprime el anuncio."""
+
+    @abstractmethod
+    def redimensionar_anuncio(self):
+        """Redimensiona el anuncio."""
+
+
+class Video(Anuncio):
+    """Variante compacta de un anuncio de video."""
+
+    __slots__ = ("_duracion",)
+
+    SUB_TIPOS = {"Video": ("Publicidad", "Tutorial")}
+    TAMANOS = anuncio.Video.TAMANOS
+
+    def __init__(self, sub_tipo=None, url_archivo=None, url_clic=None, duracion=5):
+        """
+        Inicializa una instancia compacta de Video.
+
+        Args:
+            sub_tipo (str, optional): Subtipo del anuncio de video. Por defecto es None.
+            url_archivo (str, optional): URL del archivo del anuncio. Por defecto es None.
+            url_clic (str, optional): URL de destino del clic en el anuncio. Por defecto es None.
+            duracion (int, optional): Duración del video en segundos. Por defecto es 5.
+        """
+        super().__init__(sub_tipo, url_archivo, url_clic)
+        self._duracion = duracion
+
+    @property
+    def duracion(self):
+        """int: Regresa la duración del video."""
+        return self._duracion
+
+    @duracion.setter
+    def duracion(self, valor):
+        """Establece la duración del video. Si es menor o igual a 0, se establece en 5."""
+        self._duracion = valor if valor > 0 else 5
+
+    comprimir_anuncio = anuncio.Video.comprimir_anuncio
+    redimensionar_anuncio = anuncio.Video.redimensionar_anuncio
+
+
+class Display(Anuncio):
+    """Variante compacta de un anuncio display."""
+
+    __slots__ = ()
+
+    SUB_TIPOS = {"Display": ("Banner", "Sidebar")}
+    TAMANOS = anuncio.Display.TAMANOS
+
+    comprimir_anuncio = anuncio.Display.comprimir_anuncio
+    redimensionar_anuncio = anuncio.Display.redimensionar_anuncio
+
+
+class Social(Anuncio):
+    """Variante compacta de un anuncio de redes sociales."""
+
+    __slots__ = ()
+
+    SUB_TIPOS = {"Social": ("Post", "Story")}
+    TAMANOS = anuncio.Social.TAMANOS
+
+    comprimir_anuncio = anuncio.Social.comprimir_anuncio
+    redimensionar_anuncio = anuncio.Social.redimensionar_anuncio
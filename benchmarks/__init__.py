@@ -0,0 +1 @@
+"""Benchmarks de rendimiento del sistema de gestión de campañas."""
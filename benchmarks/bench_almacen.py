@@ -0,0 +1,48 @@
+"""
+Compara los bytes por anuncio de una lista de objetos Anuncio contra AnuncioStore.
+
+Uso:
+    python -m benchmarks.bench_almacen [cantidad]
+"""
+import sys
+import tracemalloc
+from anuncio import Video, Display, Social
+from almacen import AnuncioStore
+
+
+def generar_anuncios(cantidad, urls_distintas=1000):
+    """Genera anuncios con URLs repetidas, como llegan desde un archivo de carga."""
+    tipos = ((Video, "Publicidad"), (Display, "Banner"), (Social, "Story"))
+    for i in range(cantidad):
+        clase, sub_tipo = tipos[i % 3]
+        # Cada URL es un objeto str nuevo, igual que al leerla desde disco.
+        url_archivo = "".join(("http://cdn.ejemplo.com/", str(i % urls_distintas), ".jpg"))
+        url_clic = "".join(("http://ejemplo.com/landing/", str(i % urls_distintas)))
+        anuncio = clase(sub_tipo, url_archivo, url_clic)
+        anuncio.alto = 90
+        anuncio.ancho = 728
+        yield anuncio
+
+
+def medir(constructor, cantidad):
+    """Regresa los bytes asignados que quedan vivos tras construir la estructura."""
+    tracemalloc.start()
+    estructura = constructor(generar_anuncios(cantidad))
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del estructura
+    return actual
+
+
+def main(cantidad=200_000):
+    """Imprime los bytes por anuncio de cada estructura."""
+    lista = medir(list, cantidad)
+    almacen = medir(AnuncioStore, cantidad)
+    print(f"Anuncios: {cantidad}")
+    print(f"Lista de objetos: {lista / cantidad:8.1f} bytes/anuncio")
+    print(f"AnuncioStore:     {almacen / cantidad:8.1f} bytes/anuncio")
+    print(f"Reducción:        {lista / almacen:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
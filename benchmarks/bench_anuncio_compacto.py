@@ -0,0 +1,85 @@
+"""
+Micro-benchmarks de la jerarquía Anuncio original contra la variante con __slots__.
+
+Mide la tasa de construcción, el rendimiento de getters y setters, y la memoria
+residente (RSS) por millón de anuncios. La RSS se mide en un subproceso nuevo
+por variante para que una no contamine a la otra.
+
+Uso:
+    python -m benchmarks.bench_anuncio_compacto
+"""
+import resource
+import subprocess
+import sys
+import timeit
+
+VARIANTES = {"original": "anuncio", "compacta": "anuncio_compacto"}
+
+
+def importar_video(variante):
+    """Regresa la clase Video del módulo de la variante indicada."""
+    modulo = __import__(VARIANTES[variante])
+    return modulo.Video
+
+
+def medir_operaciones(variante, repeticiones=200_000):
+    """
+    Mide operaciones por segundo de construcción, getters y setters.
+
+    Returns:
+        dict: Nombre de la operación -> operaciones por segundo.
+    """
+    Video = importar_video(variante)
+    video = Video("Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com", 15)
+    casos = {
+        "construccion": lambda: Video("Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com", 15),
+        "get alto": lambda: video.alto,
+        "set alto": lambda: setattr(video, "alto", 90),
+        "get url_clic": lambda: video.url_clic,
+        "set url_clic": lambda: setattr(video, "url_clic", "http://ejemplo.com/b"),
+        "set sub_tipo": lambda: setattr(video, "sub_tipo", "Tutorial"),
+    }
+    resultados = {}
+    for nombre, caso in casos.items():
+        segundos = min(timeit.repeat(caso, number=repeticiones, repeat=3))
+        resultados[nombre] = repeticiones / segundos
+    return resultados
+
+
+def rss_por_millon(variante):
+    """Construye un millón de anuncios y regresa el aumento de RSS máxima en bytes."""
+    Video = importar_video(variante)
+    antes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    anuncios = [Video("Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com", i)
+                for i in range(1_000_000)]
+    despues = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    del anuncios
+    # ru_maxrss está en kilobytes en Linux y en bytes en macOS.
+    return (despues - antes) * (1 if sys.platform == "darwin" else 1024)
+
+
+def main():
+    """Imprime una tabla comparativa de ambas variantes."""
+    operaciones = {variante: medir_operaciones(variante) for variante in VARIANTES}
+    print(f"{'operación':<15}{'original':>15}{'compacta':>15}{'mejora':>9}")
+    for nombre in operaciones["original"]:
+        original = operaciones["original"][nombre]
+        compacta = operaciones["compacta"][nombre]
+        print(f"{nombre:<15}{original:>13,.0f}/s{compacta:>13,.0f}/s{compacta / original:>8.2f}x")
+
+    rss = {}
+    for variante in VARIANTES:
+        salida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_anuncio_compacto", "--rss", variante],
+            capture_output=True, text=True, check=True,
+        )
+        rss[variante] = int(salida.stdout)
+    print(f"{'RSS/millón':<15}{rss['original'] / 2**20:>12.1f}MiB{rss['compacta'] / 2**20:>12.1f}MiB"
+          f"{rss['original'] / rss['compacta']:>8.2f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--rss":
+        print(rss_por_millon(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,55 @@
+"""
+Mide crear variantes de una campaña con Campana.clonar frente a copiar todos sus anuncios.
+
+Uso:
+    python -m benchmarks.bench_clonar [cantidad]
+"""
+import sys
+import time
+import tracemalloc
+from anuncio import Display, Social, Video
+from campana import Campana
+from coleccion import copiar_anuncio
+
+VARIANTES = 20
+EDICIONES = 100
+
+
+def generar_campana(cantidad):
+    """Genera una campaña con `cantidad` anuncios de los tres tipos."""
+    clases = ((Video, "Publicidad"), (Display, "Banner"), (Social, "Story"))
+    return Campana("Campaña", [clases[i % 3][0](clases[i % 3][1], f"http://cdn.com/{i}.jpg")
+                               for i in range(cantidad)])
+
+
+def medir(crear):
+    """Regresa los segundos y los bytes asignados por variante al crear VARIANTES variantes."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    variantes = [crear(i) for i in range(VARIANTES)]
+    transcurrido = time.perf_counter() - inicio
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return transcurrido / len(variantes), memoria / len(variantes), variantes
+
+
+def main(cantidad=100_000):
+    """Crea VARIANTES variantes de una campaña de `cantidad` anuncios y edita EDICIONES anuncios en cada una."""
+    campana = generar_campana(cantidad)
+
+    segundos, memoria, variantes = medir(lambda i: campana.clonar(f"Variante {i}"))
+    print(f"clonar():       {segundos * 1e3:8.2f} ms y {memoria / 1e6:6.2f} MB por variante")
+    inicio = time.perf_counter()
+    for variante in variantes:
+        for i in range(EDICIONES):
+            variante.anuncios[i * 7].url_clic = "http://ejemplo.com/b"
+    print(f"  {EDICIONES} ediciones:  {(time.perf_counter() - inicio) / len(variantes) * 1e3:8.2f} ms por variante")
+    del variantes
+
+    segundos, memoria, _ = medir(lambda i: Campana(f"Variante {i}", list(map(copiar_anuncio, campana.anuncios)),
+                                                   campana.fecha_inicio, campana.fecha_termino))
+    print(f"Copia completa: {segundos * 1e3:8.2f} ms y {memoria / 1e6:6.2f} MB por variante")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
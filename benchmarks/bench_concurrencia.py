@@ -0,0 +1,100 @@
+"""
+Prueba de estrés con N hilos lectores y M escritores sobre los anuncios de una campaña.
+
+Compara la colección con copia en escritura (ColeccionConcurrente) con una
+ColeccionAnuncios protegida por un único candado para lecturas y escrituras.
+
+Uso:
+    python -m benchmarks.bench_concurrencia [cantidad] [lectores] [escritores]
+"""
+import sys
+import threading
+import time
+from anuncio import Display, Social, Video
+from campana import Campana
+
+DURACION = 2.0
+
+
+def generar_anuncios(cantidad):
+    """Genera anuncios de los tres tipos en partes iguales."""
+    clases = ((Video, "Publicidad"), (Display, "Banner"), (Social, "Story"))
+    return [clases[i % 3][0](clases[i % 3][1]) for i in range(cantidad)]
+
+
+def _correr(lectores, escritores, leer, escribir):
+    """Corre los hilos durante DURACION segundos y regresa (lecturas, escrituras, incoherencias)."""
+    detener = threading.Event()
+    totales = {"lecturas": 0, "escrituras": 0, "incoherencias": 0}
+    candado_totales = threading.Lock()
+
+    def lector():
+        lecturas = incoherencias = 0
+        while not detener.is_set():
+            anuncios, por_tipo = leer()
+            incoherencias += sum(por_tipo.values()) != len(anuncios)
+            lecturas += 1
+        with candado_totales:
+            totales["lecturas"] += lecturas
+            totales["incoherencias"] += incoherencias
+
+    def escritor():
+        escrituras = 0
+        while not detener.is_set():
+            escribir(Social("Post"))
+            escrituras += 1
+        with candado_totales:
+            totales["escrituras"] += escrituras
+
+    hilos = [threading.Thread(target=lector) for _ in range(lectores)]
+    hilos += [threading.Thread(target=escritor) for _ in range(escritores)]
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(DURACION)
+    detener.set()
+    for hilo in hilos:
+        hilo.join()
+    return totales["lecturas"], totales["escrituras"], totales["incoherencias"]
+
+
+def _informar(nombre, lecturas, escrituras, incoherencias):
+    print(f"{nombre:28} {lecturas / DURACION:12,.0f} lecturas/s {escrituras / DURACION:10,.0f} escrituras/s"
+          f"  incoherencias: {incoherencias}")
+
+
+def main(cantidad=10_000, lectores=8, escritores=2):
+    """Mide lecturas de reporte y escrituras (agregar y quitar un anuncio) durante DURACION segundos."""
+    print(f"{cantidad:,} anuncios, {lectores} lectores, {escritores} escritores, {DURACION} s")
+
+    campana = Campana("Concurrente", generar_anuncios(cantidad), concurrente=True)
+    coleccion = campana.anuncios
+
+    def leer_concurrente():
+        version = coleccion.instantanea()
+        return version.anuncios, version.por_tipo
+
+    def escribir_concurrente(anuncio):
+        coleccion.append(anuncio)
+        del coleccion[0]
+
+    _informar("Copia en escritura", *_correr(lectores, escritores, leer_concurrente, escribir_concurrente))
+
+    campana = Campana("Candado global", generar_anuncios(cantidad))
+    coleccion_global = campana.anuncios
+    candado = threading.Lock()
+
+    def leer_global():
+        with candado:
+            return list(coleccion_global), coleccion_global.conteo_por_tipo()
+
+    def escribir_global(anuncio):
+        with candado:
+            coleccion_global.append(anuncio)
+            del coleccion_global[0]
+
+    _informar("Candado global", *_correr(lectores, escritores, leer_global, escribir_global))
+
+
+if __name__ == "__main__":
+    argumentos = [int(valor) for valor in sys.argv[1:4]]
+    main(*argumentos)
@@ -0,0 +1,63 @@
+"""
+Mide persistir ediciones sueltas con el diario frente a volver a guardar la campaña completa.
+
+Uso:
+    python -m benchmarks.bench_diario [cantidad]
+"""
+import os
+import sys
+import tempfile
+import time
+import diario
+import instantanea
+from anuncio import Display, Social, Video
+from campana import Campana
+from persistencia import AlmacenSQLite
+
+EDICIONES = 200
+
+
+def generar_campana(cantidad):
+    """Genera una campaña con `cantidad` anuncios de los tres tipos."""
+    clases = ((Video, "Publicidad"), (Display, "Banner"), (Social, "Story"))
+    return Campana("Campaña", [clases[i % 3][0](clases[i % 3][1], f"http://cdn.com/{i}.jpg")
+                               for i in range(cantidad)])
+
+
+def main(cantidad=100_000):
+    """Hace EDICIONES cambios sobre una campaña de `cantidad` anuncios y persiste cada uno."""
+    with tempfile.TemporaryDirectory() as directorio:
+        campana = generar_campana(cantidad)
+        paso = max(1, cantidad // EDICIONES)
+        posiciones = range(0, cantidad, paso)[:EDICIONES]
+
+        ruta_diario = os.path.join(directorio, "campanas.diario")
+        with diario.Diario(ruta_diario) as registro:
+            registro.seguir(campana, 0)
+            inicio = time.perf_counter()
+            for posicion in posiciones:
+                campana.anuncios[posicion].url_clic = f"http://ejemplo.com/{posicion}"
+            en_diario = time.perf_counter() - inicio
+        print(f"Diario:                 {len(posiciones)} ediciones en {en_diario * 1000:8.1f} ms "
+              f"({os.path.getsize(ruta_diario):,} bytes)")
+
+        with AlmacenSQLite(os.path.join(directorio, "campanas.db")) as almacen:
+            almacen.guardar(campana)
+            muestras = posiciones[:10]
+            inicio = time.perf_counter()
+            for posicion in muestras:
+                campana.anuncios[posicion].url_clic = f"http://otro.com/{posicion}"
+                almacen.guardar(campana)
+            completa = (time.perf_counter() - inicio) / len(muestras) * len(posiciones)
+        print(f"Guardar campaña (SQL):  {len(posiciones)} ediciones en {completa * 1000:8.1f} ms (estimado)")
+
+        ruta_instantanea = os.path.join(directorio, "campanas.snap")
+        instantanea.guardar([campana], ruta_instantanea)
+        inicio = time.perf_counter()
+        restauradas = instantanea.cargar(ruta_instantanea)
+        diario.reproducir(diario.leer(ruta_diario), restauradas)
+        print(f"Recuperar (instantánea + diario): {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
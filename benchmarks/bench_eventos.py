@@ -0,0 +1,68 @@
+"""
+Mide la agregación de eventos de impresión y clic leyendo un archivo en un proceso y en varios.
+
+Uso:
+    python -m benchmarks.bench_eventos [cantidad]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import eventos
+from anuncio import Display, Social, Video
+from campana import Campana
+
+CAMPANAS = 100
+ANUNCIOS_POR_CAMPANA = 1000
+MOMENTO = 1_704_067_200
+
+
+def generar_campanas():
+    """Genera CAMPANAS campañas de ANUNCIOS_POR_CAMPANA anuncios de los tres tipos."""
+    clases = ((Video, "Publicidad"), (Display, "Banner"), (Social, "Story"))
+    return [Campana(f"Campaña {c}", [clases[i % 3][0](clases[i % 3][1]) for i in range(ANUNCIOS_POR_CAMPANA)])
+            for c in range(CAMPANAS)]
+
+
+def escribir_eventos(ruta, cantidad):
+    """Escribe `cantidad` eventos de un día, con anuncios repartidos según una ley de Zipf y 2% de clics."""
+    generador = random.Random(0)
+    pesos = [1 / (i + 1) for i in range(CAMPANAS * ANUNCIOS_POR_CAMPANA)]
+    with open(ruta, "wb") as archivo:
+        for inicio in range(0, cantidad, 100_000):
+            parte = min(100_000, cantidad - inicio)
+            anuncios = generador.choices(range(len(pesos)), pesos, k=parte)
+            archivo.write(b"".join(
+                b"%d,%s,Campa\xc3\xb1a %d,%d\n" % (MOMENTO + (inicio + i) * 86400 // cantidad,
+                                                   b"c" if generador.random() < 0.02 else b"i",
+                                                   anuncio % CAMPANAS, anuncio // CAMPANAS)
+                for i, anuncio in enumerate(anuncios)))
+
+
+def main(cantidad=2_000_000):
+    """Agrega `cantidad` eventos de un archivo con uno y con todos los núcleos."""
+    campanas = generar_campanas()
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "eventos.csv")
+        escribir_eventos(ruta, cantidad)
+
+        agregador = eventos.Agregador(campanas)
+        inicio = time.perf_counter()
+        eventos.ingerir(ruta, agregador)
+        print(f"Un proceso:       {cantidad / (time.perf_counter() - inicio):12,.0f} eventos/s")
+
+        procesos = os.cpu_count() or 1
+        paralelo = eventos.Agregador(campanas)
+        inicio = time.perf_counter()
+        eventos.ingerir_paralelo(ruta, paralelo, procesos)
+        print(f"{procesos} procesos:       {cantidad / (time.perf_counter() - inicio):12,.0f} eventos/s")
+
+    impresiones, clics = agregador.totales
+    print(f"Impresiones: {impresiones:,}  Clics: {clics:,}  Sin atribuir: {agregador.sin_atribuir:,}")
+    print(f"Anuncio más visto (estimado): {agregador.conteo('Campaña 0', 0)}")
+    print(f"Por tipo: {agregador.por_tipo()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,64 @@
+"""
+Mide el arranque en frío desde una instantánea binaria frente a reconstruir los anuncios.
+
+Uso:
+    python -m benchmarks.bench_instantanea [cantidad]
+"""
+import os
+import sys
+import tempfile
+import time
+import instantanea
+from almacen import AnuncioStore
+from campana import Campana
+
+POR_CAMPANA = 10_000
+
+
+def generar_campanas(cantidad):
+    """Genera campañas columnares de POR_CAMPANA anuncios cargadas en lote."""
+    tipos = (("Video", "Publicidad"), ("Display", "Banner"), ("Social", "Story"))
+    for numero, desde in enumerate(range(0, cantidad, POR_CAMPANA)):
+        filas = range(desde, min(desde + POR_CAMPANA, cantidad))
+        campana = Campana(f"Campaña {numero}", AnuncioStore())
+        campana.agregar_anuncios_bulk({
+            "tipo": [tipos[i % 3][0] for i in filas],
+            "sub_tipo": [tipos[i % 3][1] for i in filas],
+            "url_archivo": [f"http://cdn.com/{i % 1000}.jpg" for i in filas],
+            "url_clic": ["http://ejemplo.com"] * len(filas),
+            "alto": [90] * len(filas),
+            "ancho": [728] * len(filas),
+        })
+        yield campana
+
+
+def main(cantidad=1_000_000):
+    """Guarda `cantidad` anuncios, mide la carga desde la instantánea y un recorrido."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "campanas.snap")
+        inicio = time.perf_counter()
+        instantanea.guardar(generar_campanas(cantidad), ruta)
+        guardado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        campanas = instantanea.cargar(ruta)
+        # Arma todas las campañas y lee un anuncio de cada una, como un servicio al arrancar.
+        primeros = [campana.anuncios[0].url_archivo for campana in campanas]
+        arranque = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        conteos = sum(campana.conteo_por_tipo()["Video"] for campana in campanas)
+        conteo = time.perf_counter() - inicio
+
+        tamano = os.path.getsize(ruta)
+        del campanas, primeros
+
+    print(f"Anuncios: {cantidad} en {-(-cantidad // POR_CAMPANA)} campañas")
+    print(f"Guardar (con generación):  {guardado:7.2f} s")
+    print(f"Archivo:                   {tamano / cantidad:7.1f} bytes/anuncio")
+    print(f"Arranque en frío:          {arranque:7.3f} s")
+    print(f"Primer conteo por tipo:    {conteo:7.2f} s ({conteos} videos)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
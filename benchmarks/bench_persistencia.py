@@ -0,0 +1,48 @@
+"""
+Mide cuánto tarda guardar y reabrir una campaña grande en SQLite.
+
+Uso:
+    python -m benchmarks.bench_persistencia [cantidad]
+"""
+import os
+import sys
+import tempfile
+import time
+from anuncio import Video, Display, Social
+from campana import Campana
+from persistencia import AlmacenSQLite
+
+
+def main(cantidad=1_000_000):
+    """Guarda una campaña con `cantidad` anuncios, la reabre y la recorre."""
+    tipos = ((Video, "Publicidad"), (Display, "Banner"), (Social, "Story"))
+    campana = Campana("Benchmark")
+    campana.anuncios.extend(
+        tipos[i % 3][0](tipos[i % 3][1], f"http://cdn.com/{i % 1000}.jpg", "http://ejemplo.com")
+        for i in range(cantidad)
+    )
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "bench.db")
+        with AlmacenSQLite(ruta) as almacen:
+            inicio = time.perf_counter()
+            campana_id = almacen.guardar(campana)
+            guardado = time.perf_counter() - inicio
+
+        with AlmacenSQLite(ruta) as almacen:
+            inicio = time.perf_counter()
+            reabierta = almacen.abrir(campana_id)
+            resumen = str(reabierta)
+            apertura = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            recorridos = sum(1 for _ in reabierta.anuncios)
+            recorrido = time.perf_counter() - inicio
+
+    print(f"Anuncios: {cantidad}")
+    print(f"Guardar:             {guardado:7.2f} s")
+    print(f"Abrir y resumir:     {apertura:7.2f} s")
+    print(f"Recorrer {recorridos} anuncios: {recorrido:7.2f} s")
+    print(resumen)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,60 @@
+"""
+Mide la latencia de las decisiones de ritmo con muchas campañas concurrentes.
+
+Uso:
+    python -m benchmarks.bench_ritmo [cantidad]
+"""
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from campana import Campana
+from ritmo import Ritmo
+
+DECISIONES = 1_000_000
+MINUTOS = 120
+
+
+def generar_campanas(cantidad):
+    """Genera `cantidad` campañas de entre 1 y 30 días, repartidas en enero de 2024."""
+    generador = random.Random(0)
+    campanas = []
+    for i in range(cantidad):
+        inicio = date(2024, 1, 1) + timedelta(days=generador.randrange(30))
+        campanas.append(Campana(f"Campaña {i}", fecha_inicio=inicio,
+                                fecha_termino=inicio + timedelta(days=generador.randrange(30))))
+    return campanas
+
+
+def main(cantidad=50_000):
+    """Agrega `cantidad` campañas y toma DECISIONES decisiones repartidas en MINUTOS minutos."""
+    campanas = generar_campanas(cantidad)
+    ahora = datetime(2024, 1, 15).timestamp()
+    ritmo = Ritmo(reloj=lambda: ahora)
+    inicio = time.perf_counter()
+    for campana in campanas:
+        ritmo.agregar(campana, 100_000)
+    print(f"Agregar {cantidad:,} campañas: {time.perf_counter() - inicio:.3f} s "
+          f"({len(ritmo.activas()):,} activas)")
+
+    generador = random.Random(1)
+    elegidas = [campanas[generador.randrange(cantidad)] for _ in range(DECISIONES)]
+    por_minuto = DECISIONES // MINUTOS
+    permitir = ritmo.permitir
+    permitidas = 0
+    inicio = time.perf_counter()
+    for minuto in range(MINUTOS):
+        momento = ahora + 60 * minuto
+        for campana in elegidas[minuto * por_minuto:(minuto + 1) * por_minuto]:
+            permitidas += permitir(campana, 1, momento)
+    transcurrido = time.perf_counter() - inicio
+    print(f"Decisión: {transcurrido / (por_minuto * MINUTOS) * 1e6:.2f} µs en promedio "
+          f"({permitidas:,} permitidas de {por_minuto * MINUTOS:,})")
+
+    inicio = time.perf_counter()
+    terminadas = ritmo.avanzar(datetime(2024, 1, 20).timestamp())
+    print(f"Avanzar cinco días: {(time.perf_counter() - inicio) * 1e3:.1f} ms ({len(terminadas):,} terminadas)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
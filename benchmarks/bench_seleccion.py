@@ -0,0 +1,73 @@
+"""
+Mide elecciones ponderadas de anuncios con tablas de alias frente a recorrer los pesos acumulados.
+
+Uso:
+    python -m benchmarks.bench_seleccion [cantidad]
+"""
+import random
+import sys
+import time
+from itertools import accumulate
+from anuncio import Display, Social, Video
+from campana import Campana
+
+ELECCIONES = 200_000
+RECORRIDOS = 200
+
+
+def generar_campana(cantidad):
+    """Genera una campaña con anuncios de varios tipos y tamaños, y pesos entre 1 y 100."""
+    generador = random.Random(0)
+    tamanos = ((728, 90), (300, 250), (300, 600))
+    anuncios = []
+    for i in range(cantidad):
+        clase, sub_tipo = ((Video, "Publicidad"), (Display, "Banner"), (Social, "Post"))[i % 3]
+        anuncio = clase(sub_tipo, url_clic=f"http://ejemplo.com/{generador.randint(1, 100)}")
+        anuncio.ancho, anuncio.alto = tamanos[i % len(tamanos)]
+        anuncios.append(anuncio)
+    return Campana("Servir", anuncios)
+
+
+def peso(anuncio):
+    return int(anuncio.url_clic.rsplit("/", 1)[1])
+
+
+def main(cantidad=100_000):
+    """Compara ELECCIONES elecciones filtradas por tipo y tamaño sobre `cantidad` anuncios."""
+    campana = generar_campana(cantidad)
+
+    inicio = time.perf_counter()
+    selector = campana.selector(peso, semilla=0)
+    selector.elegir(tipo="Display", ancho=300, alto=250)
+    print(f"Construcción del selector: {time.perf_counter() - inicio:.3f} s")
+
+    elegir = selector.elegir
+    inicio = time.perf_counter()
+    for _ in range(ELECCIONES):
+        elegir("Display", None, 300, 250)
+    alias = ELECCIONES / (time.perf_counter() - inicio)
+    print(f"Tabla de alias:     {alias:12,.0f} elecciones/s")
+
+    inicio = time.perf_counter()
+    selector.elegir_varios(ELECCIONES, tipo="Display", ancho=300, alto=250)
+    print(f"Alias en lote:      {ELECCIONES / (time.perf_counter() - inicio):12,.0f} elecciones/s")
+
+    # Lo que hace un servidor sin selector: filtrar y acumular pesos en cada petición.
+    generador = random.Random(0)
+    inicio = time.perf_counter()
+    for _ in range(RECORRIDOS):
+        candidatos = [a for a in campana.anuncios if a.tipo == "Display" and a.ancho == 300 and a.alto == 250]
+        acumulados = list(accumulate(map(peso, candidatos)))
+        generador.choices(candidatos, cum_weights=acumulados)
+    recorrido = RECORRIDOS / (time.perf_counter() - inicio)
+    print(f"Recorrido por pedido: {recorrido:10,.0f} elecciones/s ({alias / recorrido:,.0f}x más lento)")
+
+    inicio = time.perf_counter()
+    for i in range(1000):
+        campana.anuncios[i].url_clic = f"http://ejemplo.com/{i % 100 + 1}"
+        elegir("Display", None, 300, 250)
+    print(f"Cambio de peso + elección: {(time.perf_counter() - inicio):.3f} s por 1000")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
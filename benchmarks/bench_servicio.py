@@ -0,0 +1,84 @@
+"""
+Prueba de carga del servicio HTTP sobre loopback: latencia p50/p99 y peticiones por segundo.
+
+Uso:
+    python -m benchmarks.bench_servicio [cantidad]
+"""
+import asyncio
+import sys
+import time
+from campana import Campana
+from servicio import Cliente, Servicio
+
+CLIENTES = 16
+CAMPANAS = 4
+POR_LOTE = 50
+
+
+def percentil(latencias, p):
+    """Regresa el percentil p (0-100) de una lista ordenada de latencias."""
+    return latencias[min(len(latencias) - 1, int(len(latencias) * p / 100))]
+
+
+def informar(nombre, latencias, total, peticiones):
+    latencias.sort()
+    print(f"{nombre}: {peticiones} peticiones en {total:.2f} s, {peticiones / total:,.0f} pet/s, "
+          f"p50 {percentil(latencias, 50) * 1000:.2f} ms, p99 {percentil(latencias, 99) * 1000:.2f} ms")
+
+
+async def _cargar(puerto, cantidad, crear_peticion):
+    """Reparte `cantidad` peticiones entre CLIENTES conexiones y mide cada una."""
+    latencias = []
+
+    async def trabajar(numero):
+        cliente = await Cliente.conectar(puerto=puerto)
+        try:
+            for i in range(numero, cantidad, CLIENTES):
+                metodo, ruta, cuerpo = crear_peticion(i)
+                inicio = time.perf_counter()
+                await cliente.pedir(metodo, ruta, cuerpo)
+                latencias.append(time.perf_counter() - inicio)
+        finally:
+            await cliente.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajar(numero) for numero in range(CLIENTES)))
+    return latencias, time.perf_counter() - inicio
+
+
+def _anuncio(i):
+    return {"tipo": "Social", "sub_tipo": "Post", "url_clic": f"http://ejemplo.com/{i}"}
+
+
+async def _medir(cantidad):
+    servicio = Servicio(Campana(f"Campaña {i}") for i in range(CAMPANAS))
+    servidor = await servicio.iniciar(puerto=0)
+    puerto = servidor.sockets[0].getsockname()[1]
+    async with servidor:
+        latencias, total = await _cargar(
+            puerto, cantidad, lambda i: ("POST", f"/campanas/{i % CAMPANAS + 1}/anuncios", _anuncio(i)))
+        informar("POST individual", latencias, total, cantidad)
+
+        lotes = cantidad // POR_LOTE
+        latencias, total = await _cargar(puerto, lotes, lambda i: (
+            "POST", f"/campanas/{i % CAMPANAS + 1}/anuncios", [_anuncio(i)] * POR_LOTE))
+        informar(f"POST en lotes de {POR_LOTE}", latencias, total, lotes)
+        print(f"  equivalente a {lotes * POR_LOTE / total:,.0f} anuncios/s")
+
+        latencias, total = await _cargar(puerto, cantidad, lambda i: ("GET", f"/campanas/{i % CAMPANAS + 1}", None))
+        informar("GET campaña", latencias, total, cantidad)
+
+        inicio = time.perf_counter()
+        cliente = await Cliente.conectar(puerto=puerto)
+        _, filas = await cliente.pedir("GET", "/campanas/1/anuncios")
+        await cliente.cerrar()
+        print(f"GET lista por partes: {len(filas):,} anuncios en {time.perf_counter() - inicio:.2f} s")
+
+
+def main(cantidad=10_000):
+    """Levanta el servicio en un puerto libre y lo carga con `cantidad` peticiones por escenario."""
+    asyncio.run(_medir(cantidad))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,63 @@
+"""
+Compara la validación de URLs de demo.py original contra el módulo validacion.
+
+Genera un millón de URLs con repetición realista: unas pocas páginas de
+destino concentran la mayoría de los anuncios (distribución tipo Zipf).
+
+Uso:
+    python -m benchmarks.bench_validacion [cantidad]
+"""
+import random
+import re
+import sys
+import time
+import validacion
+
+
+def validar_url_original(url):
+    """Copia de la validación original, que compila la expresión en cada llamada."""
+    regex = re.compile(
+        r'^(?:http|ftp)s?://'
+        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'
+        r'localhost|'
+        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
+        r'(?::\d+)?'
+        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    return re.match(regex, url) is not None
+
+
+def generar_urls(cantidad, distintas=50_000, semilla=42):
+    """Genera URLs donde la frecuencia de cada página sigue una ley de potencias."""
+    aleatorio = random.Random(semilla)
+    pesos = [1 / (rango + 1) for rango in range(distintas)]
+    paginas = aleatorio.choices(range(distintas), weights=pesos, k=cantidad)
+    # Cada URL es un objeto str nuevo, como al leerla de un archivo.
+    return ["".join(("https://tienda", str(p % 97), ".com/landing/", str(p), "?utm=ads"))
+            for p in paginas]
+
+
+def cronometrar(funcion, *args):
+    """Regresa los segundos que tarda la llamada."""
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+
+def main(cantidad=1_000_000):
+    """Imprime URLs por segundo de cada estrategia."""
+    urls = generar_urls(cantidad)
+    print(f"URLs: {cantidad} ({len(set(urls))} distintas)")
+    casos = {
+        "original (compila por llamada)": lambda: [validar_url_original(u) for u in urls],
+        "patrón precompilado (sin caché)": lambda: [validacion.PATRON_URL.match(u) is not None for u in urls],
+        "validar_url (caché LRU)": lambda: [validacion.validar_url(u) for u in urls],
+        "validar_urls (lote)": lambda: validacion.validar_urls(urls),
+    }
+    for nombre, caso in casos.items():
+        validacion.validar_url.cache_clear()
+        segundos = cronometrar(caso)
+        print(f"{nombre:<32}{cantidad / segundos:>14,.0f} URLs/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
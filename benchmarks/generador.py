@@ -0,0 +1,106 @@
+"""
+Generador determinista de campañas sintéticas para los benchmarks.
+
+Con la misma semilla produce siempre las mismas campañas, con una mezcla
+realista: tipos y subtipos con frecuencias desparejas, pocas URLs de destino
+que concentran la mayoría de los anuncios (ley de potencias), URLs de
+archivo repetidas entre creativos y campañas sin fecha de inicio o de
+término. Las filas se generan de a bloques, así que la escala de 10 millones
+no necesita tenerlas todas en memoria.
+"""
+import random
+from datetime import date, timedelta
+from almacen import AnuncioStore
+from campana import Campana
+
+ESCALAS = {"1k": 1_000, "100k": 100_000, "10m": 10_000_000}
+
+# (tipo, subtipo, peso): los banners y los videos publicitarios dominan.
+MEZCLA = (
+    ("Display", "Banner", 45),
+    ("Display", "Sidebar", 10),
+    ("Video", "Publicidad", 20),
+    ("Video", "Tutorial", 3),
+    ("Social", "Post", 17),
+    ("Social", "Story", 5),
+)
+TAMANOS = {"Banner": (728, 90), "Sidebar": (300, 600), "Publicidad": (1920, 1080), "Tutorial": (1280, 720),
+           "Post": (1080, 1080), "Story": (1080, 1920)}
+URLS_CLIC = 5_000
+URLS_ARCHIVO = 50_000
+TAMANO_BLOQUE = 100_000
+
+
+def _urls(cantidad, plantilla):
+    """Regresa `cantidad` URLs distintas y sus pesos según una ley de potencias."""
+    return [plantilla.format(i=i, dominio=i % 97) for i in range(cantidad)], [1 / (i + 1) for i in range(cantidad)]
+
+
+def generar_filas(cantidad, semilla=0, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Genera filas de anuncios en el formato de ingesta.COLUMNAS, de a bloques.
+
+    Args:
+        cantidad (int): Cantidad total de filas.
+        semilla (int, optional): Semilla del generador.
+        tamano_bloque (int, optional): Filas por bloque.
+
+    Yields:
+        list: Tuplas (tipo, sub_tipo, url_archivo, url_clic, duracion, alto, ancho).
+    """
+    aleatorio = random.Random(semilla)
+    clics, pesos_clic = _urls(URLS_CLIC, "https://tienda{dominio}.com/landing/{i}?utm=ads")
+    archivos, pesos_archivo = _urls(URLS_ARCHIVO, "https://cdn{dominio}.ejemplo.com/creativos/{i}.jpg")
+    mezcla = [(tipo, sub_tipo) + TAMANOS[sub_tipo] for tipo, sub_tipo, _ in MEZCLA]
+    pesos_mezcla = [peso for _, _, peso in MEZCLA]
+    for inicio in range(0, cantidad, tamano_bloque):
+        parte = min(tamano_bloque, cantidad - inicio)
+        formatos = aleatorio.choices(mezcla, pesos_mezcla, k=parte)
+        urls_clic = aleatorio.choices(clics, pesos_clic, k=parte)
+        urls_archivo = aleatorio.choices(archivos, pesos_archivo, k=parte)
+        duraciones = aleatorio.choices((5, 15, 30, 60), (4, 3, 2, 1), k=parte)
+        yield [(tipo, sub_tipo, url_archivo, url_clic, duracion if tipo == "Video" else None, alto, ancho)
+               for (tipo, sub_tipo, ancho, alto), url_archivo, url_clic, duracion
+               in zip(formatos, urls_archivo, urls_clic, duraciones)]
+
+
+def generar_fechas(cantidad, semilla=0):
+    """
+    Genera fechas de campañas; alrededor de una de cada diez no tiene inicio y una de cada cinco no tiene término.
+
+    Returns:
+        list: Tuplas (fecha_inicio, fecha_termino), cada una date o None.
+    """
+    aleatorio = random.Random(semilla)
+    fechas = []
+    for _ in range(cantidad):
+        inicio = date(2024, 1, 1) + timedelta(days=aleatorio.randrange(365))
+        termino = inicio + timedelta(days=aleatorio.randrange(1, 90))
+        fechas.append((None if aleatorio.random() < 0.1 else inicio, None if aleatorio.random() < 0.2 else termino))
+    return fechas
+
+
+def generar_campanas(cantidad, semilla=0, por_campana=10_000, columnar=None):
+    """
+    Genera campañas con `cantidad` anuncios en total.
+
+    Args:
+        cantidad (int): Cantidad total de anuncios, por ejemplo ESCALAS["100k"].
+        semilla (int, optional): Semilla del generador.
+        por_campana (int, optional): Anuncios por campaña; la última puede tener menos.
+        columnar (bool, optional): Si es True, cada campaña guarda sus anuncios en un
+            AnuncioStore. Por defecto, solo desde un millón de anuncios.
+
+    Returns:
+        list: Campañas con nombre "Campaña <n>".
+    """
+    if columnar is None:
+        columnar = cantidad >= 1_000_000
+    fechas = generar_fechas(-(-cantidad // por_campana), semilla)
+    campanas = []
+    for filas in generar_filas(cantidad, semilla, por_campana):
+        fecha_inicio, fecha_termino = fechas[len(campanas)]
+        campana = Campana(f"Campaña {len(campanas)}", AnuncioStore() if columnar else None, fecha_inicio, fecha_termino)
+        campana.agregar_anuncios_bulk(filas)
+        campanas.append(campana)
+    return campanas
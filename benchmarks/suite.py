@@ -0,0 +1,282 @@
+"""
+Suite de benchmarks con resultados en JSON y comparación entre corridas.
+
+Cada benchmark prepara sus datos con benchmarks.generador (fuera del tiempo
+medido), se corre varias veces y guarda la mejor marca en operaciones por
+segundo. Comparar dos archivos marca como regresión cada benchmark que
+bajó más que el umbral.
+
+Uso:
+    python -m benchmarks.suite correr [--escala 1k|100k|10m] [--salida base.json]
+    python -m benchmarks.suite comparar base.json nuevo.json [--umbral 0.1]
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+from itertools import cycle, islice
+import validacion
+from anuncio import Anuncio
+from error import SubTipoInvalidoException
+from benchmarks.generador import ESCALAS, TAMANO_BLOQUE, generar_campanas, generar_filas
+
+VERSION_FORMATO = 1
+UMBRAL = 0.10
+LLAMADAS_FIJAS = 10_000
+# Las escalas chicas repiten sus datos hasta este mínimo, para que las corridas no duren microsegundos.
+MINIMO_OPERACIONES = 100_000
+
+Comparacion = namedtuple("Comparacion", ["nombre", "base", "nuevo", "cambio", "regresion"])
+Comparacion.__doc__ = """Resultado de un benchmark en dos corridas: operaciones/s, cambio relativo y si es regresión."""
+
+
+def _muestra(cantidad, semilla):
+    """Regresa hasta TAMANO_BLOQUE filas generadas; las escalas mayores las recorren en ciclo."""
+    return next(generar_filas(min(cantidad, TAMANO_BLOQUE), semilla))
+
+
+def _anuncios(filas):
+    """Construye los anuncios de unas filas."""
+    clase = Anuncio.REGISTRO.clase_por_nombre
+    return [clase(tipo)(sub_tipo, url_archivo, url_clic) for tipo, sub_tipo, url_archivo, url_clic, *_ in filas]
+
+
+def preparar_construccion(cantidad, semilla):
+    """Construir anuncios Video, Display y Social con sus URLs, uno por cada anuncio de la escala."""
+    clases = {clase.__name__: clase for clase in Anuncio.REGISTRO.clases}
+    filas = [(clases[tipo], sub_tipo, url_archivo, url_clic)
+             for tipo, sub_tipo, url_archivo, url_clic, *_ in _muestra(cantidad, semilla)]
+
+    operaciones = max(cantidad, MINIMO_OPERACIONES)
+
+    def correr():
+        for fila in islice(cycle(filas), operaciones):
+            fila[0](fila[1], fila[2], fila[3])
+    return operaciones, correr
+
+
+def preparar_setters(cantidad, semilla):
+    """Asignar subtipos válidos, que el setter valida contra el registro, uno por cada anuncio de la escala."""
+    anuncios = _anuncios(_muestra(cantidad, semilla))
+    otros = [next(s for s in Anuncio.REGISTRO.sub_tipos_ordenados(type(a)) if s != a.sub_tipo) for a in anuncios]
+    pares = list(zip(anuncios, otros, [a.sub_tipo for a in anuncios]))
+    vueltas = max(cantidad, MINIMO_OPERACIONES) // 2
+
+    def correr():
+        for anuncio, otro, propio in islice(cycle(pares), vueltas):
+            anuncio.sub_tipo = otro
+            anuncio.sub_tipo = propio
+    return 2 * vueltas, correr
+
+
+def preparar_setter_invalido(cantidad, semilla):
+    """Rechazar subtipos inválidos con SubTipoInvalidoException, uno por cada cien anuncios de la escala."""
+    anuncios = _anuncios(_muestra(cantidad, semilla))
+    operaciones = max(cantidad // 100, LLAMADAS_FIJAS)
+
+    def correr():
+        for anuncio in islice(cycle(anuncios), operaciones):
+            try:
+                anuncio.sub_tipo = "Holograma"
+            except SubTipoInvalidoException:
+                pass
+    return operaciones, correr
+
+
+def preparar_campana_str(cantidad, semilla):
+    """Resumir con str() las campañas generadas; con menos de LLAMADAS_FIJAS se recorren en ciclo."""
+    campanas = generar_campanas(cantidad, semilla)
+    operaciones = max(len(campanas), LLAMADAS_FIJAS)
+
+    def correr():
+        for campana in islice(cycle(campanas), operaciones):
+            str(campana)
+    return operaciones, correr
+
+
+def preparar_mostrar_formatos(cantidad, semilla):
+    """Listar los formatos de todos los tipos y de cada tipo; no depende de la escala."""
+    tipos = [None] + [clase.__name__ for clase in Anuncio.REGISTRO.clases]
+
+    def correr():
+        for tipo in islice(cycle(tipos), LLAMADAS_FIJAS):
+            Anuncio.mostrar_formatos(tipo)
+    return LLAMADAS_FIJAS, correr
+
+
+def preparar_validar_url(cantidad, semilla):
+    """Validar las URLs de clic y de archivo de los anuncios, empezando con el caché vacío."""
+    urls = [url for fila in _muestra(cantidad, semilla) for url in fila[2:4]]
+    # Cada URL es un objeto str nuevo, como al leerla de un archivo.
+    urls = ["".join(url) for url in urls]
+
+    operaciones = max(len(urls) * max(cantidad // TAMANO_BLOQUE, 1), MINIMO_OPERACIONES)
+
+    def correr():
+        validacion.validar_url.cache_clear()
+        for url in islice(cycle(urls), operaciones):
+            validacion.validar_url(url)
+    return operaciones, correr
+
+
+BENCHMARKS = {
+    "anuncio_construccion": preparar_construccion,
+    "anuncio_setters": preparar_setters,
+    "anuncio_setter_invalido": preparar_setter_invalido,
+    "campana_str": preparar_campana_str,
+    "mostrar_formatos": preparar_mostrar_formatos,
+    "validar_url": preparar_validar_url,
+}
+
+
+def correr(escala="1k", semilla=0, repeticiones=3, nombres=None):
+    """
+    Corre los benchmarks y regresa sus resultados.
+
+    Args:
+        escala (str, optional): Una de las claves de generador.ESCALAS.
+        semilla (int, optional): Semilla del generador de datos.
+        repeticiones (int, optional): Corridas por benchmark; se guarda la más rápida.
+        nombres (list, optional): Benchmarks a correr. Por defecto, todos los de BENCHMARKS.
+
+    Returns:
+        dict: Resultado serializable en JSON, con el entorno y, por benchmark, las
+            operaciones, los segundos de cada corrida y las operaciones por segundo.
+
+    Raises:
+        ValueError: Si la escala o algún benchmark no existe.
+    """
+    if escala not in ESCALAS:
+        raise ValueError(f"Escala desconocida: {escala}.")
+    desconocidos = [nombre for nombre in nombres or () if nombre not in BENCHMARKS]
+    if desconocidos:
+        raise ValueError(f"Benchmarks desconocidos: {', '.join(desconocidos)}.")
+    cantidad = ESCALAS[escala]
+    resultados = {}
+    for nombre in nombres or BENCHMARKS:
+        operaciones, funcion = BENCHMARKS[nombre](cantidad, semilla)
+        segundos = []
+        for _ in range(repeticiones):
+            gc.collect()
+            inicio = time.perf_counter()
+            funcion()
+            segundos.append(time.perf_counter() - inicio)
+        resultados[nombre] = {"operaciones": operaciones, "segundos": segundos,
+                              "por_segundo": operaciones / min(segundos)}
+        del funcion
+    return {
+        "formato": VERSION_FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "escala": escala,
+        "semilla": semilla,
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+
+
+def comparar(base, nuevo, umbral=UMBRAL):
+    """
+    Compara dos resultados de correr() benchmark por benchmark.
+
+    Args:
+        base (dict): Resultado de referencia.
+        nuevo (dict): Resultado a evaluar.
+        umbral (float, optional): Caída relativa de operaciones por segundo a partir de la
+            cual hay regresión; 0.1 es un 10 % más lento.
+
+    Returns:
+        list: Una Comparacion por benchmark presente en ambos resultados, en el orden de base.
+
+    Raises:
+        ValueError: Si los resultados son de escalas distintas.
+    """
+    if base["escala"] != nuevo["escala"]:
+        raise ValueError(f"No se pueden comparar escalas distintas ({base['escala']} y {nuevo['escala']}).")
+    comparaciones = []
+    for nombre, anterior in base["resultados"].items():
+        actual = nuevo["resultados"].get(nombre)
+        if actual is None:
+            continue
+        cambio = actual["por_segundo"] / anterior["por_segundo"] - 1
+        comparaciones.append(Comparacion(nombre, anterior["por_segundo"], actual["por_segundo"], cambio,
+                                         cambio < -umbral))
+    return comparaciones
+
+
+def _correr(args):
+    resultado = correr(args.escala, args.semilla, args.repeticiones, args.benchmarks)
+    for nombre, datos in resultado["resultados"].items():
+        print(f"{nombre:<26}{datos['por_segundo']:>16,.0f} op/s", file=sys.stderr)
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+    return 0
+
+
+def _comparar(args):
+    with open(args.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(args.nuevo, encoding="utf-8") as archivo:
+        nuevo = json.load(archivo)
+    comparaciones = comparar(base, nuevo, args.umbral)
+    for c in comparaciones:
+        marca = "  REGRESIÓN" if c.regresion else ""
+        print(f"{c.nombre:<26}{c.base:>16,.0f}{c.nuevo:>16,.0f} op/s{c.cambio:>+9.1%}{marca}")
+    return 1 if any(c.regresion for c in comparaciones) else 0
+
+
+def crear_parser():
+    """
+    Construye el parser de argumentos con los subcomandos correr y comparar.
+
+    Returns:
+        argparse.ArgumentParser: Parser listo para usar.
+    """
+    parser = argparse.ArgumentParser(prog="benchmarks.suite", description="Mide y compara el rendimiento.")
+    subcomandos = parser.add_subparsers(dest="subcomando", required=True)
+
+    sub = subcomandos.add_parser("correr", aliases=["run"], help="corre los benchmarks y escribe JSON")
+    sub.add_argument("--escala", choices=tuple(ESCALAS), default="1k")
+    sub.add_argument("--semilla", type=int, default=0)
+    sub.add_argument("--repeticiones", type=int, default=3)
+    sub.add_argument("--salida", help="archivo JSON; por defecto, la salida estándar")
+    sub.add_argument("benchmarks", nargs="*", help=f"por defecto, todos ({', '.join(BENCHMARKS)})")
+    sub.set_defaults(funcion=_correr)
+
+    sub = subcomandos.add_parser("comparar", aliases=["compare"], help="compara dos resultados JSON")
+    sub.add_argument("base")
+    sub.add_argument("nuevo")
+    sub.add_argument("--umbral", type=float, default=UMBRAL, help="caída que cuenta como regresión (0.1 = 10 %%)")
+    sub.set_defaults(funcion=_comparar)
+    return parser
+
+
+def main(argv=None):
+    """
+    Ejecuta un subcomando.
+
+    Args:
+        argv (list, optional): Argumentos sin el nombre del programa. Por defecto, sys.argv.
+
+    Returns:
+        int: 0, o 1 si comparar encontró alguna regresión.
+    """
+    args = crear_parser().parse_args(argv)
+    try:
+        return args.funcion(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
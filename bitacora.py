@@ -0,0 +1,237 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+# JSON Lines; el error.log de texto de versiones anteriores queda sin tocar.
+RUTA = "errores.jsonl"
+MAX_BYTES = 1024 * 1024
+RESPALDOS = 3
+INTERVALO = 0.5
+
+Registro = namedtuple("Registro", ["momento", "tipo", "mensaje", "campana", "anuncio", "repeticiones"])
+Registro.__doc__ = """Error agrupado: primera vez que ocurrió, excepción, contexto y cuántas veces se repitió."""
+
+_FIN = object()
+
+_bitacora = None
+_candado_bitacora = threading.Lock()
+
+
+class Bitacora:
+    """
+    Bitácora de errores que escribe en segundo plano.
+
+    registrar() solo deja el error en una cola y regresa de inmediato. Un hilo
+    escritor junta lo que llega durante INTERVALO segundos, agrupa los errores
+    idénticos (mismo tipo, mensaje y campaña) en un solo Registro con su cantidad
+    de repeticiones y escribe el lote con una sola llamada, una línea JSON por
+    registro. El archivo se rota por tamaño: errores.jsonl pasa a
+    errores.jsonl.1, este a errores.jsonl.2 y así hasta RESPALDOS.
+    """
+
+    def __init__(self, ruta=RUTA, max_bytes=MAX_BYTES, respaldos=RESPALDOS, intervalo=INTERVALO):
+        """
+        Inicializa la bitácora e inicia el hilo escritor.
+
+        Args:
+            ruta (str, optional): Archivo de la bitácora. Por defecto es RUTA.
+            max_bytes (int, optional): Tamaño a partir del cual se rota el archivo.
+            respaldos (int, optional): Archivos rotados que se conservan; 0 trunca el archivo.
+            intervalo (float, optional): Segundos que el escritor junta errores antes de escribir.
+        """
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self.respaldos = respaldos
+        self.intervalo = intervalo
+        self._cola = queue.SimpleQueue()
+        self._hilo = threading.Thread(target=self._escribir_en_segundo_plano, name="bitacora", daemon=True)
+        self._cerrada = False
+        # Ordena los avisos de vaciar() con el fin que pone cerrar(), para que ninguno quede sin atender.
+        self._candado = threading.Lock()
+        self._hilo.start()
+
+    def registrar(self, error, campana=None, anuncio=None):
+        """
+        Agrega un error a la bitácora sin esperar a que se escriba.
+
+        Args:
+            error (Exception): Excepción a registrar, por ejemplo LargoExcedidoException o
+                SubTipoInvalidoException.
+            campana (str, optional): Nombre de la campaña donde ocurrió.
+            anuncio (int, optional): Posición del anuncio dentro de la campaña o del lote.
+
+        Raises:
+            ValueError: Si la bitácora ya se cerró.
+        """
+        registro = (time.time(), type(error).__name__, str(error), campana, anuncio)
+        # Con el candado, un registro no puede quedar en la cola después del fin que pone cerrar().
+        with self._candado:
+            if self._cerrada:
+                raise ValueError("La bitácora ya se cerró.")
+            self._cola.put(registro)
+
+    def registrar_errores(self, errores, campana=None):
+        """
+        Agrega los errores de una carga masiva (ErrorFila de ingesta o serializacion).
+
+        Args:
+            errores (iterable): ErrorFila con la posición de la fila y la excepción.
+            campana (str, optional): Nombre de la campaña cargada.
+        """
+        for error in errores:
+            self.registrar(error.error, campana, error.fila)
+
+    def vaciar(self):
+        """
+        Espera a que todo lo registrado hasta ahora quede escrito en el archivo.
+
+        Con la bitácora cerrada regresa de inmediato: cerrar() ya escribió todo.
+        """
+        listo = threading.Event()
+        with self._candado:
+            if self._cerrada:
+                return
+            self._cola.put(listo)
+        listo.wait()
+
+    def cerrar(self):
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        with self._candado:
+            if self._cerrada:
+                return
+            self._cerrada = True
+            self._cola.put(_FIN)
+        self._hilo.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+    def _escribir_en_segundo_plano(self):
+        """Bucle del hilo escritor: junta un lote por intervalo, lo agrupa y lo escribe."""
+        archivo = None
+        terminar = False
+        try:
+            while not terminar:
+                pendientes = [self._cola.get()]
+                limite = time.monotonic() + self.intervalo
+                avisos = []
+                while True:
+                    elemento = pendientes[-1]
+                    if elemento is _FIN or isinstance(elemento, threading.Event):
+                        pendientes.pop()
+                        terminar = elemento is _FIN
+                        if not terminar:
+                            avisos.append(elemento)
+                        break
+                    restante = limite - time.monotonic()
+                    try:
+                        pendientes.append(self._cola.get(timeout=restante) if restante > 0
+                                          else self._cola.get_nowait())
+                    except queue.Empty:
+                        break
+                if pendientes:
+                    try:
+                        archivo = self._escribir(archivo, agrupar(pendientes))
+                    except OSError:
+                        # Un disco lleno no debe detener la aplicación: se pierde el lote.
+                        if archivo is not None:
+                            archivo.close()
+                        archivo = None
+                for aviso in avisos:
+                    aviso.set()
+        finally:
+            if archivo is not None:
+                archivo.close()
+
+    def _escribir(self, archivo, registros):
+        """Escribe un lote de registros, rotando antes si el archivo se pasaría del máximo."""
+        texto = "".join(json.dumps(registro._asdict(), ensure_ascii=False) + "\n" for registro in registros)
+        datos = texto.encode("utf-8")
+        if archivo is None:
+            archivo = open(self.ruta, "ab")
+        if archivo.tell() and archivo.tell() + len(datos) > self.max_bytes:
+            archivo.close()
+            self._rotar()
+            archivo = open(self.ruta, "ab")
+        archivo.write(datos)
+        archivo.flush()
+        return archivo
+
+    def _rotar(self):
+        """Desplaza los archivos rotados y deja libre la ruta principal."""
+        if self.respaldos <= 0:
+            os.remove(self.ruta)
+            return
+        for numero in range(self.respaldos - 1, 0, -1):
+            origen = f"{self.ruta}.{numero}"
+            if os.path.exists(origen):
+                os.replace(origen, f"{self.ruta}.{numero + 1}")
+        os.replace(self.ruta, f"{self.ruta}.1")
+
+
+def agrupar(pendientes):
+    """
+    Agrupa errores idénticos en un solo Registro por (tipo, mensaje, campaña).
+
+    Args:
+        pendientes (list): Tuplas (momento, tipo, mensaje, campaña, anuncio) en orden de llegada.
+
+    Returns:
+        list: Registros en el orden de la primera aparición de cada grupo, con el
+            momento y el anuncio de esa primera aparición.
+    """
+    grupos = {}
+    for momento, tipo, mensaje, campana, anuncio in pendientes:
+        clave = (tipo, mensaje, campana)
+        registro = grupos.get(clave)
+        if registro is None:
+            grupos[clave] = [momento, tipo, mensaje, campana, anuncio, 1]
+        else:
+            registro[5] += 1
+    return [Registro(datetime.fromtimestamp(momento).isoformat(timespec="milliseconds"), *resto)
+            for momento, *resto in grupos.values()]
+
+
+def configurar(ruta=RUTA, **opciones):
+    """
+    Crea la bitácora del proceso, cerrando la anterior si existía.
+
+    Args:
+        ruta (str, optional): Archivo de la bitácora.
+        **opciones: max_bytes, respaldos e intervalo (ver Bitacora).
+
+    Returns:
+        Bitacora: La bitácora que usa registrar().
+    """
+    global _bitacora
+    with _candado_bitacora:
+        if _bitacora is not None:
+            _bitacora.cerrar()
+        _bitacora = Bitacora(ruta, **opciones)
+        return _bitacora
+
+
+def registrar(error, campana=None, anuncio=None):
+    """Registra un error en la bitácora del proceso, creándola con los valores por defecto si no existe."""
+    global _bitacora
+    with _candado_bitacora:
+        if _bitacora is None:
+            _bitacora = Bitacora()
+        bitacora = _bitacora
+    bitacora.registrar(error, campana, anuncio)
+
+
+def cerrar():
+    """Escribe lo pendiente y cierra la bitácora del proceso."""
+    global _bitacora
+    with _candado_bitacora:
+        if _bitacora is not None:
+            _bitacora.cerrar()
+            _bitacora = None
@@ -0,0 +1,305 @@
+import hashlib
+import os
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from trabajos import escribir_atomico
+
+DIRECTORIO_CACHE = "rendiciones"
+MAX_BYTES_MEMORIA = 64 * 1024 * 1024
+MAX_BYTES_DISCO = 2 * 1024 * 1024 * 1024
+MAX_HUELLAS = 10_000
+TAMANO_LECTURA = 1024 * 1024
+
+_caches = {}
+_candado_caches = threading.Lock()
+
+
+def huella_archivo(ruta):
+    """
+    Calcula el SHA-256 del contenido de un archivo.
+
+    El resultado se recuerda por (ruta, fecha de modificación, tamaño), así que un
+    creativo usado por muchos anuncios se lee y se calcula una sola vez por proceso.
+    Se recuerdan hasta MAX_HUELLAS archivos; después se olvidan los usados hace más
+    tiempo.
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Returns:
+        str: Hash en hexadecimal.
+
+    Raises:
+        OSError: Si el archivo no se puede leer.
+    """
+    estado = os.stat(ruta)
+    return _huella(ruta, estado.st_mtime_ns, estado.st_size)
+
+
+@lru_cache(maxsize=MAX_HUELLAS)
+def _huella(ruta, modificacion, tamano):
+    """Lee un archivo y calcula su SHA-256; modificacion y tamano solo forman la clave del caché."""
+    suma = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_LECTURA), b""):
+            suma.update(bloque)
+    return suma.hexdigest()
+
+
+def huella_datos(datos):
+    """Calcula el SHA-256 de un contenido en memoria."""
+    return hashlib.sha256(datos).hexdigest()
+
+
+def compartido(directorio=DIRECTORIO_CACHE):
+    """
+    Regresa el CacheCreativos del proceso para un directorio, creándolo la primera vez.
+
+    Los procesos de un pool que usan el mismo directorio comparten el nivel en
+    disco; cada uno tiene su propio nivel en memoria.
+    """
+    directorio = os.path.abspath(directorio)
+    with _candado_caches:
+        cache = _caches.get(directorio)
+        if cache is None:
+            cache = _caches[directorio] = CacheCreativos(directorio)
+        return cache
+
+
+class CacheCreativos:
+    """
+    Caché de creativos procesados, direccionado por contenido.
+
+    Cada entrada se identifica por el hash del archivo de origen más los
+    parámetros de la transformación (por ejemplo {"op": "redimensionar",
+    "ancho": 728, "alto": 90, "formato": "png"}), así que dos anuncios que usan el
+    mismo archivo, aunque tengan otra url_archivo, comparten el resultado.
+
+    Tiene dos niveles: uno en memoria, acotado en bytes y con desalojo LRU, y
+    otro en disco, también acotado en bytes, que desaloja los archivos usados
+    hace más tiempo. Cuenta aciertos, fallos y desalojos de cada nivel.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, max_bytes_memoria=MAX_BYTES_MEMORIA,
+                 max_bytes_disco=MAX_BYTES_DISCO):
+        """
+        Inicializa el caché y carga el índice de lo que ya hay en disco.
+
+        Args:
+            directorio (str, optional): Directorio del nivel en disco.
+            max_bytes_memoria (int, optional): Tamaño máximo del nivel en memoria.
+            max_bytes_disco (int, optional): Tamaño máximo del nivel en disco.
+        """
+        self.directorio = directorio
+        self.max_bytes_memoria = max_bytes_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self._disco = OrderedDict()
+        self._bytes_disco = 0
+        self._contadores = Counter()
+        self._candado = threading.RLock()
+        self._indexar_disco()
+
+    def _indexar_disco(self):
+        """Registra los archivos existentes en disco, del usado hace más tiempo al más reciente."""
+        entradas = []
+        if os.path.isdir(self.directorio):
+            for carpeta in os.scandir(self.directorio):
+                if not carpeta.is_dir():
+                    continue
+                for archivo in os.scandir(carpeta.path):
+                    if archivo.is_file() and not archivo.name.endswith(".tmp"):
+                        estado = archivo.stat()
+                        entradas.append((estado.st_mtime_ns, archivo.path, estado.st_size))
+        for _, ruta, tamano in sorted(entradas):
+            self._disco[ruta] = tamano
+            self._bytes_disco += tamano
+
+    @staticmethod
+    def clave(huella, transformacion):
+        """
+        Calcula la clave de una entrada.
+
+        Args:
+            huella (str): Hash del contenido de origen.
+            transformacion (dict): Parámetros de la transformación.
+
+        Returns:
+            str: Clave en hexadecimal.
+        """
+        parametros = ";".join(f"{nombre}={transformacion[nombre]!r}" for nombre in sorted(transformacion))
+        return hashlib.sha256(f"{huella}|{parametros}".encode()).hexdigest()
+
+    def _ruta(self, huella, transformacion):
+        """Ruta en disco de una entrada."""
+        clave = self.clave(huella, transformacion)
+        formato = transformacion.get("formato")
+        extension = f".{formato}" if formato else ""
+        return os.path.join(self.directorio, clave[:2], clave + extension)
+
+    def ruta(self, huella, transformacion):
+        """
+        Busca una entrada en el nivel en disco.
+
+        Args:
+            huella (str): Hash del contenido de origen.
+            transformacion (dict): Parámetros de la transformación.
+
+        Returns:
+            str | None: Ruta del archivo, o None si no está en caché.
+        """
+        ruta = self._ruta(huella, transformacion)
+        with self._candado:
+            if ruta not in self._disco and not self._adoptar(ruta):
+                self._contadores["fallos_disco"] += 1
+                return None
+            self._disco.move_to_end(ruta)
+            self._contadores["aciertos_disco"] += 1
+        try:
+            os.utime(ruta)
+        except OSError:
+            # Otro proceso la desalojó entre la búsqueda y el uso.
+            with self._candado:
+                self._olvidar_disco(ruta)
+            return None
+        return ruta
+
+    def _adoptar(self, ruta):
+        """Registra un archivo que otro proceso escribió en el directorio compartido."""
+        try:
+            tamano = os.path.getsize(ruta)
+        except OSError:
+            return False
+        self._disco[ruta] = tamano
+        self._bytes_disco += tamano
+        self._desalojar_disco()
+        return ruta in self._disco
+
+    def obtener(self, huella, transformacion):
+        """
+        Busca el contenido de una entrada, primero en memoria y después en disco.
+
+        Un acierto en disco sube la entrada al nivel en memoria.
+
+        Returns:
+            bytes | None: El contenido, o None si no está en caché.
+        """
+        ruta = self._ruta(huella, transformacion)
+        with self._candado:
+            datos = self._memoria.get(ruta)
+            if datos is not None:
+                self._memoria.move_to_end(ruta)
+                self._contadores["aciertos_memoria"] += 1
+                return datos
+            self._contadores["fallos_memoria"] += 1
+        ruta = self.ruta(huella, transformacion)
+        if ruta is None:
+            return None
+        try:
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+        except OSError:
+            return None
+        with self._candado:
+            self._en_memoria(ruta, datos)
+        return datos
+
+    def guardar(self, huella, transformacion, datos):
+        """
+        Guarda el contenido de una entrada en ambos niveles.
+
+        Returns:
+            str: Ruta del archivo en disco.
+        """
+        ruta = self._ruta(huella, transformacion)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        escribir_atomico(ruta, datos)
+        with self._candado:
+            self._en_disco(ruta, len(datos))
+            self._en_memoria(ruta, datos)
+        return ruta
+
+    def guardar_archivo(self, huella, transformacion, origen):
+        """
+        Mueve un archivo ya generado (por ejemplo, la salida de ffmpeg) al nivel en disco.
+
+        Returns:
+            str: Ruta del archivo en disco.
+        """
+        ruta = self._ruta(huella, transformacion)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        os.replace(origen, ruta)
+        with self._candado:
+            self._en_disco(ruta, os.path.getsize(ruta))
+        return ruta
+
+    def obtener_o_crear(self, huella, transformacion, crear):
+        """
+        Regresa el contenido de una entrada, calculándolo con crear() si no está en caché.
+
+        Args:
+            huella (str): Hash del contenido de origen.
+            transformacion (dict): Parámetros de la transformación.
+            crear (callable): Función sin argumentos que regresa los bytes.
+
+        Returns:
+            bytes: El contenido.
+        """
+        datos = self.obtener(huella, transformacion)
+        if datos is None:
+            datos = crear()
+            self.guardar(huella, transformacion, datos)
+        return datos
+
+    def _en_memoria(self, ruta, datos):
+        """Agrega una entrada al nivel en memoria y desaloja las menos usadas."""
+        if len(datos) > self.max_bytes_memoria:
+            return
+        anterior = self._memoria.pop(ruta, None)
+        if anterior is not None:
+            self._bytes_memoria -= len(anterior)
+        self._memoria[ruta] = datos
+        self._bytes_memoria += len(datos)
+        while self._bytes_memoria > self.max_bytes_memoria:
+            _, desalojado = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(desalojado)
+            self._contadores["desalojos_memoria"] += 1
+
+    def _en_disco(self, ruta, tamano):
+        """Registra un archivo del nivel en disco y desaloja los usados hace más tiempo."""
+        self._bytes_disco += tamano - self._disco.pop(ruta, 0)
+        self._disco[ruta] = tamano
+        self._desalojar_disco()
+
+    def _desalojar_disco(self):
+        """Borra archivos del nivel en disco hasta respetar el tamaño máximo."""
+        while self._bytes_disco > self.max_bytes_disco and len(self._disco) > 1:
+            ruta, _ = next(iter(self._disco.items()))
+            self._olvidar_disco(ruta)
+            try:
+                os.unlink(ruta)
+            except OSError:
+                pass
+            self._contadores["desalojos_disco"] += 1
+
+    def _olvidar_disco(self, ruta):
+        """Quita una entrada del índice en disco; el nivel en memoria la conserva."""
+        self._bytes_disco -= self._disco.pop(ruta, 0)
+
+    def estadisticas(self):
+        """
+        Regresa los contadores del caché.
+
+        Returns:
+            dict: Aciertos, fallos y desalojos de cada nivel, más los bytes y
+                entradas ocupados en memoria y en disco.
+        """
+        with self._candado:
+            estadisticas = dict.fromkeys(("aciertos_memoria", "fallos_memoria", "desalojos_memoria",
+                                          "aciertos_disco", "fallos_disco", "desalojos_disco"), 0)
+            estadisticas.update(self._contadores)
+            estadisticas.update(entradas_memoria=len(self._memoria), bytes_memoria=self._bytes_memoria,
+                                entradas_disco=len(self._disco), bytes_disco=self._bytes_disco)
+            return estadisticas
@@ -1,27 +1,39 @@
 from anuncio import Anuncio, Video, Display, Social
+from coleccion import ColeccionAnuncios, ColeccionConcurrente, copiar_anuncio
 from error import LargoExcedidoException
+from observable import Observable
+from ingesta import validar_lote, construir_anuncios
 from datetime import date
 
-class Campana:
+class Campana(Observable):
     """
     Representa una campaña publicitaria con un nombre, lista de anuncios y fechas.
 
+    Los cambios de nombre y de fechas se notifican a los suscriptores (ver
+    Observable), por ejemplo a un IndiceNombres o a un CampanaIndex.
+
     Atributos:
         _nombre (str): Nombre de la campaña (máximo 250 caracteres).
-        _anuncios (list): Lista de objetos Anuncio que pertenecen a la campaña.
+        _anuncios (ColeccionAnuncios | ColeccionConcurrente | AnuncioStore): Anuncios que pertenecen a la campaña,
+            con conteos por tipo y subtipo mantenidos al día.
         _fecha_inicio (date): Fecha de inicio de la campaña.
         _fecha_termino (date): Fecha de término de la campaña.
     """
 
-    def __init__(self, nombre, anuncios=None, fecha_inicio=None, fecha_termino=None):
+    def __init__(self, nombre, anuncios=None, fecha_inicio=None, fecha_termino=None, concurrente=False):
         """
         Inicializa una instancia de la clase Campana.
 
         Args:
             nombre (str): Nombre de la campaña.
-            anuncios (list, optional): Lista de anuncios. Por defecto es None.
+            anuncios (list | AnuncioStore, optional): Anuncios de la campaña. Una lista se
+                envuelve en una ColeccionAnuncios; para campañas con muchos creativos se puede
+                entregar un AnuncioStore columnar. Por defecto es None.
             fecha_inicio (date, optional): Fecha de inicio. Por defecto es None.
             fecha_termino (date, optional): Fecha de término. Por defecto es None.
+            concurrente (bool, optional): Si es True, una lista se envuelve en una
+                ColeccionConcurrente, para leer y escribir los anuncios desde varios hilos.
+                Por defecto es False.
 
         Raises:
             LargoExcedidoException: Si el nombre de la campaña excede los 250 caracteres.
@@ -29,7 +41,9 @@ class Campana:
         if len(nombre) > 250:
             raise LargoExcedidoException("El nombre de la campaña excede los 250 caracteres.")
         self._nombre = nombre
-        self._anuncios = anuncios if anuncios is not None else []
+        if anuncios is None or isinstance(anuncios, (list, tuple)):
+            anuncios = (ColeccionConcurrente if concurrente else ColeccionAnuncios)(anuncios or ())
+        self._anuncios = anuncios
         self._fecha_inicio = fecha_inicio
         self._fecha_termino = fecha_termino
 
@@ -51,13 +65,156 @@ class Campana:
         """
         if len(nuevo_nombre) > 250:
             raise LargoExcedidoException("El nombre de la campaña excede los 250 caracteres.")
+        anterior = self._nombre
         self._nombre = nuevo_nombre
+        if self._observadores:
+            self._notificar("nombre", anterior, nuevo_nombre)
 
     @property
     def anuncios(self):
-        """list: Regresa la lista de anuncios de la campaña."""
+        """ColeccionAnuncios | ColeccionConcurrente | AnuncioStore: Regresa los anuncios de la campaña."""
         return self._anuncios
+
+    def conteo_por_tipo(self):
+        """
+        Regresa la cantidad de anuncios de cada tipo registrado, incluidos los que no tienen anuncios.
+
+        Returns:
+            dict: Nombre del tipo -> cantidad de anuncios.
+        """
+        conteos = dict.fromkeys((clase.__name__ for clase in Anuncio.REGISTRO.clases), 0)
+        if hasattr(self._anuncios, "conteo_por_tipo"):
+            conteos.update(self._anuncios.conteo_por_tipo())
+        else:
+            for anuncio in self._anuncios:
+                conteos[anuncio.tipo] = conteos.get(anuncio.tipo, 0) + 1
+        return conteos
+
+    def conteo_por_sub_tipo(self):
+        """
+        Regresa la cantidad de anuncios de cada par (tipo, subtipo) presente en la campaña.
+
+        Returns:
+            dict: (nombre del tipo, subtipo) -> cantidad de anuncios.
+        """
+        if hasattr(self._anuncios, "conteo_por_sub_tipo"):
+            return self._anuncios.conteo_por_sub_tipo()
+        conteos = {}
+        for anuncio in self._anuncios:
+            clave = (anuncio.tipo, anuncio.sub_tipo)
+            conteos[clave] = conteos.get(clave, 0) + 1
+        return conteos
     
+    def agregar_anuncios_bulk(self, filas):
+        """
+        Agrega muchos anuncios validándolos en lote.
+
+        Las filas inválidas no detienen la carga: se omiten y se informan en la lista
+        de errores, en lugar de lanzar la primera SubTipoInvalidoException.
+
+        Args:
+            filas: Iterable de filas (dict o tupla tipo, sub_tipo, url_archivo, url_clic,
+                duracion, alto, ancho) o un lote de columnas (dict de nombre -> lista de valores).
+
+        Returns:
+            list: Un ErrorFila por cada fila rechazada, con su posición en la entrada.
+        """
+        lote, errores = validar_lote(filas)
+        if hasattr(self._anuncios, "agregar_lote"):
+            self._anuncios.agregar_lote(lote)
+        else:
+            self._anuncios.extend(construir_anuncios(lote))
+        return errores
+
+    def selector(self, peso=None, semilla=None):
+        """
+        Crea un selector para servir los anuncios de la campaña según su peso.
+
+        Args:
+            peso (callable, optional): Recibe un anuncio y regresa su peso. Por defecto,
+                todos pesan 1.
+            semilla (int, optional): Semilla para elecciones reproducibles.
+
+        Returns:
+            Selector: Selector con los anuncios actuales (ver seleccion.Selector). Los
+                anuncios que se agreguen después a la campaña se le agregan con
+                Selector.agregar.
+        """
+        from seleccion import Selector
+        return Selector(self._anuncios, peso, semilla)
+
+    def clonar(self, nombre=None):
+        """
+        Crea una variante de la campaña que comparte los anuncios mientras no se modifican.
+
+        Con una ColeccionAnuncios el costo no depende de los anuncios que no se
+        tocan: el clon copia la lista de referencias y los conteos, y cada anuncio
+        se copia recién cuando se cambia uno de sus atributos en el clon (ver
+        ColeccionClonada). Un AnuncioStore copia sus columnas; otras colecciones
+        copian cada anuncio.
+
+        Args:
+            nombre (str, optional): Nombre de la variante. Por defecto, el de la campaña.
+
+        Returns:
+            Campana: Campaña nueva con las mismas fechas y anuncios; los cambios en una no
+                afectan a la otra.
+
+        Raises:
+            LargoExcedidoException: Si el nombre excede los 250 caracteres.
+        """
+        if hasattr(self._anuncios, "clonar"):
+            anuncios = self._anuncios.clonar()
+        else:
+            anuncios = (ColeccionConcurrente if isinstance(self._anuncios, ColeccionConcurrente)
+                        else ColeccionAnuncios)(map(copiar_anuncio, self._anuncios))
+        return Campana(self._nombre if nombre is None else nombre, anuncios, self._fecha_inicio,
+                       self._fecha_termino)
+
+    def comprimir_anuncios(self, calidad=None, max_procesos=None, codificador_video=None, directorio=None):
+        """
+        Comprime los archivos de todos los anuncios de la campaña en un pool de procesos.
+
+        Args:
+            calidad (int, optional): Calidad objetivo de 1 a 100. Por defecto es compresion.CALIDAD.
+            max_procesos (int, optional): Procesos a usar. Por defecto, uno por núcleo.
+            codificador_video (callable, optional): Ver compresion.comprimir_video.
+            directorio (str, optional): Directorio del caché de creativos.
+
+        Returns:
+            list: Un ResultadoCompresion por anuncio, en el orden de la campaña.
+        """
+        import compresion
+
+        if calidad is None:
+            calidad = compresion.CALIDAD
+        if directorio is None:
+            directorio = compresion.DIRECTORIO_CACHE
+        return compresion.comprimir_lote(self._anuncios, calidad, max_procesos, codificador_video,
+                                         directorio=directorio)
+
+    def redimensionar_anuncios(self, directorio=None, max_procesos=None, escalador_video=None):
+        """
+        Genera las rendiciones de todos los anuncios de la campaña en un pool de procesos.
+
+        Cada archivo de origen se decodifica una sola vez aunque lo usen varios anuncios.
+
+        Args:
+            directorio (str, optional): Directorio del caché de creativos.
+            max_procesos (int, optional): Procesos a usar. Por defecto, uno por núcleo.
+            escalador_video (callable, optional): Ver redimension.redimensionar_video.
+
+        Returns:
+            list: Un ResultadoRedimension por anuncio, en el orden de la campaña.
+        """
+        # Una colección perezosa recuerda los anuncios que entrega al recorrerla, así
+        # que los cambios de alto y ancho se guardan sin cargarla completa.
+        import redimension
+
+        if directorio is None:
+            directorio = redimension.DIRECTORIO_RENDICIONES
+        return redimension.redimensionar_lote(self._anuncios, directorio, max_procesos, escalador_video)
+
     @property
     def fecha_inicio(self):
         """date: Retorna la fecha de inicio de la campaña."""
@@ -66,7 +223,10 @@ class Campana:
     @fecha_inicio.setter
     def fecha_inicio(self, nueva_fecha_inicio):
         """Establece una nueva fecha de inicio para la campaña."""
+        anterior = self._fecha_inicio
         self._fecha_inicio = nueva_fecha_inicio
+        if self._observadores:
+            self._notificar("fecha_inicio", anterior, nueva_fecha_inicio)
 
     @property
     def fecha_termino(self):
@@ -76,7 +236,10 @@ class Campana:
     @fecha_termino.setter
     def fecha_termino(self, nueva_fecha_termino):
         """Establece una nueva fecha de término para la campaña."""
+        anterior = self._fecha_termino
         self._fecha_termino = nueva_fecha_termino
+        if self._observadores:
+            self._notificar("fecha_termino", anterior, nueva_fecha_termino)
 
     def __str__(self):
         """
@@ -92,9 +255,6 @@ class Campana:
             resumen += f"Fecha de término: {self._fecha_termino.strftime('%Y-%m-%d')}\n"
 
         resumen += "Anuncios:\n"
-        conteos = {'Video': 0, 'Display': 0, 'Social': 0}
-        for anuncio in self._anuncios:
-            conteos[type(anuncio).__name__] += 1
-        for tipo, cantidad in conteos.items():
+        for tipo, cantidad in self.conteo_por_tipo().items():
             resumen += f"- {cantidad} {tipo}\n"
         return resumen
\ No newline at end of file
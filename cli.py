@@ -0,0 +1,349 @@
+"""
+Interfaz de línea de comandos para administrar campañas sin menús interactivos.
+
+Uso:
+    python -m cli [--bd campanas.db] <subcomando> ...
+
+Subcomandos:
+    crear              Crea una campaña.
+    importar           Importa campañas y anuncios desde JSON Lines o CSV.
+    agregar-anuncios   Agrega anuncios a una campaña desde JSON Lines o CSV.
+    modificar          Aplica ediciones de campañas y anuncios desde JSON Lines o CSV.
+    reporte            Muestra las campañas con sus conteos por tipo.
+    comprimir          Comprime los archivos de los anuncios de una campaña.
+    redimensionar      Genera las rendiciones de los anuncios de una campaña.
+
+Los archivos de entrada pueden ser "-" para leer desde la entrada estándar. Los
+errores de cada línea se informan en la salida de errores sin detener el resto,
+y el código de salida es 1 si hubo alguno.
+"""
+import argparse
+import json
+import sys
+
+# Los módulos de campañas, SQLite, compresión y redimensionamiento se importan
+# dentro de cada subcomando, así que --help y los errores de argumentos
+# responden sin cargarlos.
+
+class CampanaNoEncontrada(LookupError):
+    """Excepción lanzada cuando un subcomando pide una campaña que no está guardada."""
+
+
+class CampanasGuardadas(dict):
+    """
+    Campañas por nombre que se abren desde la base la primera vez que se piden.
+
+    Sirve como el dict de campañas de serializacion.importar_filas: las campañas
+    ya guardadas se completan en lugar de duplicarse.
+    """
+
+    def __init__(self, almacen):
+        """
+        Inicializa el diccionario vacío.
+
+        Args:
+            almacen (AlmacenSQLite): Base desde donde se abren las campañas.
+        """
+        super().__init__()
+        self._almacen = almacen
+
+    def get(self, nombre, defecto=None):
+        """Regresa la campaña con ese nombre, abriéndola desde la base si hace falta."""
+        if not isinstance(nombre, str):
+            return defecto
+        if nombre not in self:
+            campana = self._almacen.abrir_por_nombre(nombre)
+            if campana is None:
+                return defecto
+            self[nombre] = campana
+        return self[nombre]
+
+    def ocupado(self, nombre, propia):
+        """Indica si otra campaña, abierta o guardada, ya se llama así."""
+        if any(campana is not propia and campana.nombre == nombre for campana in self.values()):
+            return True
+        abiertas = {self._almacen.id_de(campana) for campana in self.values()}
+        return any(campana_id not in abiertas for campana_id in self._almacen.buscar(nombre))
+
+    def guardar(self):
+        """Guarda en la base todas las campañas abiertas o creadas."""
+        for campana in dict.fromkeys(self.values()):
+            self._almacen.guardar(campana)
+
+
+class Errores:
+    """Informa errores por línea en la salida de errores y en la bitácora, y los cuenta."""
+
+    def __init__(self, bitacora=None, campana=None):
+        """
+        Inicializa el contador en cero.
+
+        Args:
+            bitacora (Bitacora, optional): Bitácora donde también se registran.
+            campana (str, optional): Campaña a la que pertenecen las líneas, si es una sola.
+        """
+        self.cantidad = 0
+        self._bitacora = bitacora
+        self._campana = campana
+
+    def __call__(self, error):
+        """Recibe un ErrorFila cuya fila es el número de línea."""
+        self.cantidad += 1
+        campo = f" ({error.campo})" if error.campo else ""
+        print(f"línea {error.fila}{campo}: {type(error.error).__name__}: {error.error}", file=sys.stderr)
+        if self._bitacora is not None:
+            self._bitacora.registrar(error.error, self._campana, error.fila)
+
+
+def _formato(args):
+    """Regresa el formato indicado o el que corresponde a la extensión del archivo."""
+    if args.formato:
+        return args.formato
+    return "csv" if args.archivo.lower().endswith(".csv") else "jsonl"
+
+
+def _leer(args, al_error):
+    """Regresa el generador de filas (línea, dict) del archivo o de la entrada estándar."""
+    from serializacion import LECTORES
+
+    archivo = sys.stdin if args.archivo == "-" else args.archivo
+    return LECTORES[_formato(args)](archivo, al_error)
+
+
+def _abrir(almacen, nombre):
+    """
+    Abre una campaña guardada por nombre.
+
+    Raises:
+        CampanaNoEncontrada: Si no hay una campaña con ese nombre.
+    """
+    campana = almacen.abrir_por_nombre(nombre)
+    if campana is None:
+        raise CampanaNoEncontrada(f"la campaña '{nombre}' no existe.")
+    return campana
+
+
+def _argumento_fecha(texto):
+    """Tipo de argparse para fechas YYYY-MM-DD."""
+    from validacion import convertir_fecha
+
+    try:
+        return convertir_fecha(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def crear(args, almacen, errores):
+    """Crea una campaña, salvo que ya exista una con el mismo nombre."""
+    from campana import Campana
+    from error import LargoExcedidoException
+
+    if almacen.buscar(args.nombre):
+        errores.cantidad += 1
+        print(f"error: ya existe una campaña llamada {args.nombre!r}.", file=sys.stderr)
+        return
+    try:
+        campana = Campana(args.nombre, fecha_inicio=args.inicio, fecha_termino=args.termino)
+    except LargoExcedidoException as e:
+        errores.cantidad += 1
+        print(f"error: {e}", file=sys.stderr)
+        return
+    print(almacen.guardar(campana))
+
+
+def importar(args, almacen, errores):
+    """Importa campañas y anuncios, completando las que ya existen."""
+    from serializacion import importar_filas
+
+    campanas = CampanasGuardadas(almacen)
+    importar_filas(_leer(args, errores), errores, campanas)
+    campanas.guardar()
+    print(f"{len(campanas)} campañas importadas, {errores.cantidad} líneas con errores.")
+
+
+def agregar_anuncios(args, almacen, errores):
+    """Agrega anuncios a una campaña existente; las filas no necesitan la columna campana."""
+    from serializacion import importar_filas
+
+    campanas = CampanasGuardadas(almacen)
+    campanas[args.campana] = campana = _abrir(almacen, args.campana)
+    antes = len(campana.anuncios)
+
+    def filas():
+        for linea, datos in _leer(args, errores):
+            datos["campana"] = args.campana
+            yield linea, datos
+
+    importar_filas(filas(), errores, campanas)
+    campanas.guardar()
+    print(f"{len(campana.anuncios) - antes} anuncios agregados, {errores.cantidad} líneas con errores.")
+
+
+def modificar(args, almacen, errores):
+    """Aplica ediciones línea por línea; una edición inválida no detiene las demás."""
+    from ingesta import ErrorFila, aplicar_edicion
+
+    campanas = CampanasGuardadas(almacen)
+    aplicadas = 0
+    for linea, datos in _leer(args, errores):
+        nombre = datos.get("campana")
+        campana = campanas.get(nombre)
+        if campana is None:
+            errores(ErrorFila(linea, "campana", ValueError(f"La campaña '{nombre}' no existe.")))
+            continue
+        nuevo = datos.get("nombre") if datos.get("anuncio") is None else None
+        if isinstance(nuevo, str) and nuevo != campana.nombre and campanas.ocupado(nuevo, campana):
+            errores(ErrorFila(linea, "nombre", ValueError(f"Ya existe una campaña llamada '{nuevo}'.")))
+            continue
+        fallo = aplicar_edicion(campana, datos)
+        # Las líneas siguientes pueden usar el nombre nuevo aunque aún no esté guardado.
+        campanas[campana.nombre] = campana
+        if fallo is None:
+            aplicadas += 1
+        else:
+            errores(ErrorFila(linea, *fallo))
+    campanas.guardar()
+    print(f"{aplicadas} ediciones aplicadas, {errores.cantidad} líneas con errores.")
+
+
+def reporte(args, almacen, errores):
+    """Muestra cada campaña con sus fechas y conteos por tipo, sin cargar sus anuncios."""
+    if args.campanas:
+        campanas = [_abrir(almacen, nombre) for nombre in args.campanas]
+    else:
+        campanas = almacen.cargar_todas()
+    for campana in campanas:
+        conteos = campana.conteo_por_tipo()
+        fila = {
+            "campana": campana.nombre,
+            "fecha_inicio": campana.fecha_inicio.isoformat() if campana.fecha_inicio else None,
+            "fecha_termino": campana.fecha_termino.isoformat() if campana.fecha_termino else None,
+            "anuncios": sum(conteos.values()),
+            "por_tipo": conteos,
+        }
+        if args.formato == "json":
+            print(json.dumps(fila, ensure_ascii=False))
+        else:
+            tipos = " ".join(f"{tipo}={cantidad}" for tipo, cantidad in conteos.items())
+            print(f"{fila['campana']}\t{fila['fecha_inicio'] or '-'}\t{fila['fecha_termino'] or '-'}\t"
+                  f"{fila['anuncios']}\t{tipos}")
+
+
+def _informar_resultados(resultados, errores):
+    """Informa los anuncios cuyo procesamiento falló."""
+    for posicion, resultado in enumerate(resultados):
+        if resultado.error is not None:
+            errores.cantidad += 1
+            print(f"anuncio {posicion}: {type(resultado.error).__name__}: {resultado.error}",
+                  file=sys.stderr)
+
+
+def comprimir(args, almacen, errores):
+    """Comprime los archivos de los anuncios de una campaña."""
+    import compresion
+
+    campana = _abrir(almacen, args.campana)
+    calidad = compresion.CALIDAD if args.calidad is None else args.calidad
+    directorio = compresion.DIRECTORIO_CACHE if args.directorio is None else args.directorio
+    resultados = campana.comprimir_anuncios(calidad, args.procesos, directorio=directorio)
+    _informar_resultados(resultados, errores)
+    total = compresion.resumen(resultados)
+    print(f"{total['archivos']} archivos comprimidos, {total['ahorrado']} bytes ahorrados, "
+          f"{total['errores']} errores.")
+
+
+def redimensionar(args, almacen, errores):
+    """Genera las rendiciones de los anuncios de una campaña y guarda sus nuevas medidas."""
+    import redimension
+
+    campana = _abrir(almacen, args.campana)
+    directorio = redimension.DIRECTORIO_RENDICIONES if args.directorio is None else args.directorio
+    resultados = campana.redimensionar_anuncios(directorio, args.procesos)
+    _informar_resultados(resultados, errores)
+    almacen.guardar(campana)
+    rendiciones = sum(len(r.rendiciones) for r in resultados if r.error is None)
+    print(f"{rendiciones} rendiciones, {sum(r.desde_cache for r in resultados)} desde caché, "
+          f"{errores.cantidad} errores.")
+
+
+def crear_parser():
+    """
+    Construye el parser de argumentos con todos los subcomandos.
+
+    Returns:
+        argparse.ArgumentParser: Parser listo para usar.
+    """
+    parser = argparse.ArgumentParser(prog="cli", description="Administra campañas publicitarias.")
+    parser.add_argument("--bd", default="campanas.db", help="archivo SQLite (por defecto campanas.db)")
+    parser.add_argument("--bitacora", help="registra también los errores en esta bitácora")
+    subcomandos = parser.add_subparsers(dest="subcomando", required=True)
+
+    sub = subcomandos.add_parser("crear", aliases=["create"], help="crea una campaña")
+    sub.add_argument("nombre")
+    sub.add_argument("--inicio", type=_argumento_fecha, help="fecha de inicio YYYY-MM-DD")
+    sub.add_argument("--termino", type=_argumento_fecha, help="fecha de término YYYY-MM-DD")
+    sub.set_defaults(funcion=crear)
+
+    for nombre, alias, funcion, ayuda in (
+        ("importar", "import", importar, "importa campañas y anuncios"),
+        ("agregar-anuncios", "add-ads", agregar_anuncios, "agrega anuncios a una campaña"),
+        ("modificar", "modify", modificar, "aplica ediciones de campañas y anuncios"),
+    ):
+        sub = subcomandos.add_parser(nombre, aliases=[alias], help=ayuda)
+        if funcion is agregar_anuncios:
+            sub.add_argument("campana")
+        sub.add_argument("archivo", nargs="?", default="-", help='JSON Lines o CSV; "-" es la entrada estándar')
+        sub.add_argument("--formato", choices=("jsonl", "csv"), help="por defecto, según la extensión")
+        sub.set_defaults(funcion=funcion)
+
+    sub = subcomandos.add_parser("reporte", aliases=["report"], help="muestra las campañas")
+    sub.add_argument("campanas", nargs="*", help="por defecto, todas")
+    sub.add_argument("--formato", choices=("texto", "json"), default="texto")
+    sub.set_defaults(funcion=reporte)
+
+    for nombre, alias, funcion, ayuda in (
+        ("comprimir", "compress", comprimir, "comprime los archivos de una campaña"),
+        ("redimensionar", "resize", redimensionar, "genera las rendiciones de una campaña"),
+    ):
+        sub = subcomandos.add_parser(nombre, aliases=[alias], help=ayuda)
+        sub.add_argument("campana")
+        sub.add_argument("--procesos", type=int, help="procesos del pool (por defecto, uno por núcleo)")
+        sub.add_argument("--directorio", help="directorio del caché de creativos")
+        if funcion is comprimir:
+            sub.add_argument("--calidad", type=int, help="calidad de 1 a 100")
+        sub.set_defaults(funcion=funcion)
+    return parser
+
+
+def main(argv=None):
+    """
+    Ejecuta un subcomando.
+
+    Args:
+        argv (list, optional): Argumentos sin el nombre del programa. Por defecto, sys.argv.
+
+    Returns:
+        int: 0 si todo se aplicó, 1 si alguna línea o anuncio tuvo errores.
+    """
+    args = crear_parser().parse_args(argv)
+    from persistencia import AlmacenSQLite
+
+    registro = None
+    if args.bitacora:
+        from bitacora import Bitacora
+        registro = Bitacora(args.bitacora)
+    errores = Errores(registro, getattr(args, "campana", None))
+    try:
+        with AlmacenSQLite(args.bd) as almacen:
+            args.funcion(args, almacen, errores)
+    except CampanaNoEncontrada as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if registro is not None:
+            registro.cerrar()
+    return 1 if errores.cantidad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
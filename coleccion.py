@@ -0,0 +1,681 @@
+import copy
+import threading
+import weakref
+from collections import Counter, namedtuple
+from collections.abc import MutableSequence
+from contextlib import contextmanager
+from itertools import count
+from types import MethodType
+from observable import Observable
+
+Version = namedtuple("Version", ["numero", "anuncios", "por_tipo", "por_sub_tipo"])
+Version.__doc__ = """Estado publicado de una ColeccionConcurrente: número, tupla de anuncios y sus conteos."""
+
+
+class ColeccionAnuncios(MutableSequence):
+    """
+    Lista de anuncios que mantiene conteos por tipo y por subtipo.
+
+    Se comporta como una lista (append, extend, índices, slices, del, in...),
+    pero cada alta, baja o reemplazo actualiza los conteos, y los cambios de
+    sub_tipo de un anuncio contenido llegan por su suscripción (ver Observable).
+    Así los resúmenes cuestan O(cantidad de tipos) en lugar de recorrer todos
+    los anuncios, y cubren cualquier subclase de Anuncio.
+    """
+
+    _clones = ()
+
+    def __init__(self, anuncios=()):
+        """
+        Inicializa la colección.
+
+        Args:
+            anuncios (iterable, optional): Anuncios iniciales. Por defecto está vacía.
+        """
+        self._anuncios = []
+        self._por_tipo = Counter()
+        self._por_sub_tipo = Counter()
+        self.extend(anuncios)
+
+    def _alta(self, anuncio):
+        """Cuenta un anuncio que entra a la colección y, si es observable, se suscribe a sus cambios."""
+        tipo = anuncio.tipo
+        self._por_tipo[tipo] += 1
+        self._por_sub_tipo[tipo, anuncio.sub_tipo] += 1
+        if hasattr(anuncio, "suscribir"):
+            anuncio.suscribir(self._al_cambiar)
+
+    def _baja(self, anuncio):
+        """Descuenta un anuncio que sale de la colección y cancela su suscripción."""
+        tipo = anuncio.tipo
+        self._descontar(self._por_tipo, tipo)
+        self._descontar(self._por_sub_tipo, (tipo, anuncio.sub_tipo))
+        if hasattr(anuncio, "desuscribir"):
+            anuncio.desuscribir(self._al_cambiar)
+
+    @staticmethod
+    def _descontar(conteos, clave):
+        """Resta uno a un conteo y elimina la clave cuando llega a cero."""
+        if conteos[clave] == 1:
+            del conteos[clave]
+        else:
+            conteos[clave] -= 1
+
+    def _al_cambiar(self, anuncio, campo, anterior, nuevo):
+        """Actualiza los conteos cuando cambia el subtipo de un anuncio contenido."""
+        if campo == "sub_tipo":
+            tipo = anuncio.tipo
+            self._descontar(self._por_sub_tipo, (tipo, anterior))
+            self._por_sub_tipo[tipo, nuevo] += 1
+        if self._clones:
+            self._avisar_clones(anuncio, campo, anterior)
+
+    def _avisar_clones(self, anuncio, campo, anterior):
+        """Avisa a los clones vivos que un anuncio que pueden compartir cambió."""
+        for referencia in self._clones:
+            clon = referencia()
+            if clon is not None:
+                clon._preservar(anuncio, campo, anterior)
+
+    def _avisar_bajas(self, anuncios):
+        """Avisa a los clones vivos que salieron anuncios que pueden compartir, de los que ya no se avisarán cambios."""
+        for referencia in self._clones:
+            clon = referencia()
+            if clon is not None:
+                clon._retener(anuncios)
+
+    def clonar(self):
+        """
+        Regresa una copia de la colección que comparte los anuncios hasta que se modifican.
+
+        Returns:
+            ColeccionClonada: Colección con los mismos anuncios; ver ColeccionClonada.
+        """
+        clon = ColeccionClonada(self)
+        # Referencias débiles: un clon descartado deja de recibir avisos.
+        vivos = tuple(referencia for referencia in self._clones if referencia() is not None)
+        self._clones = vivos + (weakref.ref(clon),)
+        return clon
+
+    def __len__(self):
+        return len(self._anuncios)
+
+    def __getitem__(self, indice):
+        return self._anuncios[indice]
+
+    def __setitem__(self, indice, valor):
+        if isinstance(indice, slice):
+            valor = list(valor)
+            eliminados = self._anuncios[indice]
+            for anuncio in eliminados:
+                self._baja(anuncio)
+            self._anuncios[indice] = valor
+            for anuncio in valor:
+                self._alta(anuncio)
+        else:
+            eliminados = (self._anuncios[indice],)
+            self._baja(eliminados[0])
+            self._anuncios[indice] = valor
+            self._alta(valor)
+        if self._clones:
+            self._avisar_bajas(eliminados)
+
+    def __delitem__(self, indice):
+        eliminados = self._anuncios[indice]
+        del self._anuncios[indice]
+        if not isinstance(indice, slice):
+            eliminados = (eliminados,)
+        for anuncio in eliminados:
+            self._baja(anuncio)
+        if self._clones:
+            self._avisar_bajas(eliminados)
+
+    def insert(self, indice, anuncio):
+        """Inserta un anuncio antes de la posición indicada."""
+        self._anuncios.insert(indice, anuncio)
+        self._alta(anuncio)
+
+    def append(self, anuncio):
+        """Agrega un anuncio al final de la colección."""
+        self._anuncios.append(anuncio)
+        self._alta(anuncio)
+
+    def extend(self, anuncios):
+        """Agrega varios anuncios al final de la colección."""
+        anuncios = list(anuncios)
+        self._anuncios.extend(anuncios)
+        for anuncio in anuncios:
+            self._alta(anuncio)
+
+    def reverse(self):
+        """Invierte el orden de los anuncios, sin darlos de baja ni de alta."""
+        self._anuncios.reverse()
+
+    def clear(self):
+        """Elimina todos los anuncios."""
+        del self[:]
+
+    def __iter__(self):
+        return iter(self._anuncios)
+
+    def __contains__(self, anuncio):
+        return anuncio in self._anuncios
+
+    def __eq__(self, otra):
+        if isinstance(otra, ColeccionAnuncios):
+            return self._anuncios == otra._anuncios
+        if isinstance(otra, list):
+            return self._anuncios == otra
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ColeccionAnuncios({self._anuncios!r})"
+
+    def conteo_por_tipo(self):
+        """
+        Regresa los conteos de anuncios por tipo.
+
+        Returns:
+            dict: Nombre del tipo -> cantidad de anuncios.
+        """
+        return dict(self._por_tipo)
+
+    def conteo_por_sub_tipo(self):
+        """
+        Regresa los conteos de anuncios por tipo y subtipo.
+
+        Returns:
+            dict: (nombre del tipo, subtipo) -> cantidad de anuncios.
+        """
+        return dict(self._por_sub_tipo)
+
+
+def copiar_anuncio(anuncio):
+    """Copia un anuncio sin sus suscripciones."""
+    copia = copy.copy(anuncio)
+    copia.__dict__.pop("_observadores", None)
+    return copia
+
+
+class AnuncioCompartido:
+    """
+    Vista de un anuncio que una ColeccionClonada todavía comparte con su origen.
+
+    Las lecturas y los métodos van al anuncio compartido. El primer cambio de un
+    atributo lo copia dentro de la colección clonada y desde ahí la vista
+    trabaja sobre la copia. Suscribirse no copia nada: la vista guarda sus
+    propias funciones y, si el anuncio se copia, se suscribe a la copia para
+    pasarles sus cambios. Igual que AnuncioFila, expone la clase del anuncio en
+    el atributo clase.
+    """
+
+    __slots__ = ("_coleccion", "_anuncio", "_posicion", "_observadores", "__weakref__")
+
+    def __init__(self, coleccion, anuncio, posicion):
+        """
+        Inicializa la vista.
+
+        Args:
+            coleccion (ColeccionClonada): Colección a la que pertenece la vista.
+            anuncio (Anuncio): Anuncio compartido.
+            posicion (int): Posición donde se leyó el anuncio, para copiarlo sin buscarlo.
+                None si el anuncio ya salió de la colección y la vista trabaja sobre una copia suelta.
+        """
+        object.__setattr__(self, "_coleccion", coleccion)
+        object.__setattr__(self, "_anuncio", anuncio)
+        object.__setattr__(self, "_posicion", posicion)
+        object.__setattr__(self, "_observadores", ())
+
+    @property
+    def clase(self):
+        """type: Regresa la clase del anuncio."""
+        return type(self._anuncio)
+
+    def __getattr__(self, nombre):
+        valor = getattr(self._anuncio, nombre)
+        # Los métodos se ligan a la vista para que sus cambios pasen por __setattr__.
+        if isinstance(valor, MethodType) and valor.__self__ is self._anuncio:
+            return MethodType(valor.__func__, self)
+        return valor
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._coleccion._propio(self), nombre, valor)
+
+    def suscribir(self, funcion):
+        """
+        Suscribe una función a los cambios del anuncio hechos en la colección clonada.
+
+        La función recibe la vista como objeto. Los cambios del anuncio en el origen
+        no se notifican, porque la colección clonada conserva el valor anterior.
+        """
+        if not self._observadores:
+            self._coleccion._seguir(self)
+        object.__setattr__(self, "_observadores", self._observadores + (funcion,))
+
+    def desuscribir(self, funcion):
+        """
+        Elimina una suscripción de la función.
+
+        Raises:
+            ValueError: Si la función no estaba suscrita.
+        """
+        observadores = list(self._observadores)
+        observadores.remove(funcion)
+        object.__setattr__(self, "_observadores", tuple(observadores))
+        if not observadores:
+            self._coleccion._dejar(self)
+
+    def _reenviar(self, anuncio, campo, anterior, nuevo):
+        """Pasa un cambio de la copia propia a las funciones suscritas a la vista."""
+        for funcion in self._observadores:
+            funcion(self, campo, anterior, nuevo)
+
+    def __repr__(self):
+        return f"AnuncioCompartido({self._anuncio!r})"
+
+
+class ColeccionClonada(ColeccionAnuncios):
+    """
+    ColeccionAnuncios creada con clonar(), que comparte los anuncios con su origen.
+
+    Crearla copia la lista de referencias y los conteos, sin copiar ni recorrer
+    los anuncios. Los anuncios que todavía se comparten se entregan como vistas
+    AnuncioCompartido; el primer cambio a través de la vista copia ese anuncio
+    en la posición donde se leyó, en O(1), y solo ahí se aplica (si el mismo
+    anuncio aparece dos veces, la otra aparición sigue compartida). Los
+    anuncios que se agregan después son propios de la colección. Los que no
+    son observables, como las vistas AnuncioFila de un almacén, se entregan
+    tal cual: escriben sobre su almacén igual que en el origen.
+
+    Si un anuncio compartido cambia en el origen (o en un clon del que esta se
+    clonó), el origen avisa a sus clones, que antes de seguir compartiéndolo se
+    quedan con una copia con el valor anterior. Del mismo modo, los anuncios que
+    salen del origen se copian en sus clones antes de que dejen de avisarse sus
+    cambios. Cada aviso cuesta una búsqueda en la lista por clon; una baja de
+    varios anuncios a la vez (un slice o clear) hace una sola.
+    """
+
+    def __init__(self, origen):
+        """
+        Inicializa el clon.
+
+        Args:
+            origen (ColeccionAnuncios): Colección que se clona.
+        """
+        self._anuncios = list(origen._anuncios)
+        self._por_tipo = origen._por_tipo.copy()
+        self._por_sub_tipo = origen._por_sub_tipo.copy()
+        # Apariciones propias por id de anuncio; las vistas viven mientras alguien las use.
+        self._propios = Counter()
+        self._vistas = weakref.WeakValueDictionary()
+        # Vistas con suscripciones cuyo anuncio todavía es compartido.
+        self._suscritas = set()
+
+    def _vista(self, anuncio, posicion):
+        """Regresa el anuncio si es propio, o su vista si todavía es compartido."""
+        if id(anuncio) in self._propios or not isinstance(anuncio, Observable):
+            return anuncio
+        vista = self._vistas.get(id(anuncio))
+        if vista is None:
+            vista = self._vistas[id(anuncio)] = AnuncioCompartido(self, anuncio, posicion)
+        else:
+            object.__setattr__(vista, "_posicion", posicion)
+        return vista
+
+    def _reemplazar(self, compartido, copia, posiciones=None):
+        """
+        Cambia un anuncio compartido por su copia propia.
+
+        Args:
+            compartido (Anuncio): Anuncio compartido.
+            copia (Anuncio): Copia que pasa a ser propia.
+            posiciones (iterable, optional): Posiciones a cambiar. Por defecto, todas las
+                apariciones del anuncio, buscándolas en la lista.
+        """
+        anuncios = self._anuncios
+        if posiciones is None:
+            posiciones = [posicion for posicion, anuncio in enumerate(anuncios) if anuncio is compartido]
+        vista = self._vistas.pop(id(compartido), None)
+        if vista is not None:
+            object.__setattr__(vista, "_anuncio", copia)
+            if not posiciones:
+                object.__setattr__(vista, "_posicion", None)
+            if vista._observadores:
+                self._suscritas.discard(vista)
+                copia.suscribir(vista._reenviar)
+        for posicion in posiciones:
+            anuncios[posicion] = copia
+            self._propios[id(copia)] += 1
+            copia.suscribir(self._al_cambiar)
+
+    def _propio(self, vista):
+        """Regresa el anuncio propio de una vista, copiándolo si todavía es compartido."""
+        anuncio = vista._anuncio
+        posicion = vista._posicion
+        if posicion is not None and id(anuncio) not in self._propios:
+            anuncios = self._anuncios
+            vigente = posicion < len(anuncios) and anuncios[posicion] is anuncio
+            self._reemplazar(anuncio, copiar_anuncio(anuncio), (posicion,) if vigente else None)
+        return vista._anuncio
+
+    def _seguir(self, vista):
+        """Empieza a pasarle a una vista los cambios de su anuncio hechos en el clon."""
+        if vista._posicion is None or id(vista._anuncio) in self._propios:
+            vista._anuncio.suscribir(vista._reenviar)
+        else:
+            # Mientras el anuncio sea compartido no hay cambios que pasar; basta con no perder la vista.
+            self._suscritas.add(vista)
+
+    def _dejar(self, vista):
+        """Deja de pasarle cambios a una vista que se quedó sin suscripciones."""
+        if vista in self._suscritas:
+            self._suscritas.discard(vista)
+        else:
+            vista._anuncio.desuscribir(vista._reenviar)
+
+    def _preservar(self, anuncio, campo, anterior):
+        """Se queda con una copia con el valor anterior de un anuncio compartido que cambió en el origen."""
+        if id(anuncio) not in self._propios and anuncio in self._anuncios:
+            copia = copiar_anuncio(anuncio)
+            setattr(copia, campo, anterior)
+            self._reemplazar(anuncio, copia)
+        if self._clones:
+            self._avisar_clones(anuncio, campo, anterior)
+
+    def _retener(self, anuncios):
+        """Se queda con copias de los anuncios compartidos que salieron del origen."""
+        pendientes = {id(anuncio): anuncio for anuncio in anuncios if id(anuncio) not in self._propios}
+        if pendientes:
+            posiciones = {}
+            for posicion, anuncio in enumerate(self._anuncios):
+                if id(anuncio) in pendientes:
+                    posiciones.setdefault(id(anuncio), []).append(posicion)
+            for clave, lugares in posiciones.items():
+                compartido = pendientes[clave]
+                self._reemplazar(compartido, copiar_anuncio(compartido), lugares)
+        if self._clones:
+            self._avisar_bajas(anuncios)
+
+    def _desenvolver(self, anuncio):
+        """Regresa el anuncio detrás de una vista; los anuncios que llegan de afuera pasan a ser propios."""
+        if isinstance(anuncio, AnuncioCompartido):
+            if anuncio._coleccion is self:
+                return anuncio._anuncio
+            anuncio = anuncio._anuncio
+        self._propios[id(anuncio)] += 1
+        return anuncio
+
+    def _alta(self, anuncio):
+        """Cuenta un anuncio que entra al clon y, si es propio, se suscribe a sus cambios."""
+        tipo = anuncio.tipo
+        self._por_tipo[tipo] += 1
+        self._por_sub_tipo[tipo, anuncio.sub_tipo] += 1
+        if id(anuncio) in self._propios and hasattr(anuncio, "suscribir"):
+            anuncio.suscribir(self._al_cambiar)
+
+    def _baja(self, anuncio):
+        """Descuenta un anuncio que sale del clon y, si es propio, cancela su suscripción."""
+        tipo = anuncio.tipo
+        self._descontar(self._por_tipo, tipo)
+        self._descontar(self._por_sub_tipo, (tipo, anuncio.sub_tipo))
+        if id(anuncio) in self._propios:
+            if hasattr(anuncio, "desuscribir"):
+                anuncio.desuscribir(self._al_cambiar)
+            self._descontar(self._propios, id(anuncio))
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            posiciones = range(*indice.indices(len(self._anuncios)))
+            return list(map(self._vista, self._anuncios[indice], posiciones))
+        anuncio = self._anuncios[indice]
+        return self._vista(anuncio, indice if indice >= 0 else indice + len(self._anuncios))
+
+    def __setitem__(self, indice, valor):
+        if isinstance(indice, slice):
+            valor = [self._desenvolver(anuncio) for anuncio in valor]
+        else:
+            valor = self._desenvolver(valor)
+        super().__setitem__(indice, valor)
+
+    def insert(self, indice, anuncio):
+        """Inserta un anuncio antes de la posición indicada."""
+        super().insert(indice, self._desenvolver(anuncio))
+
+    def append(self, anuncio):
+        """Agrega un anuncio al final de la colección."""
+        super().append(self._desenvolver(anuncio))
+
+    def extend(self, anuncios):
+        """Agrega varios anuncios al final de la colección."""
+        super().extend([self._desenvolver(anuncio) for anuncio in anuncios])
+
+    def __iter__(self):
+        return map(self._vista, self._anuncios, count())
+
+    def __contains__(self, anuncio):
+        if isinstance(anuncio, AnuncioCompartido):
+            anuncio = anuncio._anuncio
+        return anuncio in self._anuncios
+
+    def __repr__(self):
+        return f"ColeccionClonada({self._anuncios!r})"
+
+
+def _sobrantes(antes, despues):
+    """Regresa los anuncios de antes que no están en despues, por identidad y contando repeticiones."""
+    pendientes = Counter(map(id, despues))
+    sobrantes = []
+    for anuncio in antes:
+        if pendientes[id(anuncio)]:
+            pendientes[id(anuncio)] -= 1
+        else:
+            sobrantes.append(anuncio)
+    return sobrantes
+
+
+class ColeccionConcurrente(MutableSequence):
+    """
+    Colección de anuncios para usar desde varios hilos, con copia en escritura.
+
+    El estado se publica como una Version inmutable: una tupla con los anuncios y
+    los conteos por tipo y subtipo que le corresponden. Las lecturas (índices,
+    len, recorridos, conteos) toman la versión vigente sin ningún candado, así
+    que un reporte nunca ve una colección a medio modificar ni bloquea a quien
+    escribe. Las escrituras se serializan con un candado, copian la tupla,
+    aplican el cambio y publican la versión siguiente con una sola asignación.
+
+    Cada escritura cuesta O(n) por la copia; para muchos cambios seguidos conviene
+    extend() o un bloque escritura(), que publican una sola versión. Los anuncios
+    en sí son compartidos: la copia protege qué anuncios hay, no sus atributos.
+    """
+
+    def __init__(self, anuncios=()):
+        """
+        Inicializa la colección.
+
+        Args:
+            anuncios (iterable, optional): Anuncios iniciales. Por defecto está vacía.
+        """
+        # Reentrante para que un cambio de subtipo dentro de escritura() no se bloquee.
+        self._candado = threading.RLock()
+        self._version = Version(0, (), {}, {})
+        self.extend(anuncios)
+
+    def instantanea(self):
+        """
+        Regresa la versión vigente, que no cambia aunque la colección se modifique.
+
+        Returns:
+            Version: Número de versión, tupla de anuncios y conteos coherentes entre sí.
+        """
+        return self._version
+
+    @property
+    def version(self):
+        """int: Número de la versión vigente; aumenta con cada escritura publicada."""
+        return self._version.numero
+
+    def _publicar(self, actual, anuncios, agregados, quitados):
+        """Publica la versión siguiente a actual, ajustando conteos y suscripciones."""
+        por_tipo = Counter(actual.por_tipo)
+        por_sub_tipo = Counter(actual.por_sub_tipo)
+        for anuncio in quitados:
+            tipo = anuncio.tipo
+            por_tipo[tipo] -= 1
+            por_sub_tipo[tipo, anuncio.sub_tipo] -= 1
+            if hasattr(anuncio, "desuscribir"):
+                anuncio.desuscribir(self._al_cambiar)
+        for anuncio in agregados:
+            tipo = anuncio.tipo
+            por_tipo[tipo] += 1
+            por_sub_tipo[tipo, anuncio.sub_tipo] += 1
+            if hasattr(anuncio, "suscribir"):
+                anuncio.suscribir(self._al_cambiar)
+        self._version = Version(actual.numero + 1, tuple(anuncios), dict(+por_tipo), dict(+por_sub_tipo))
+
+    @contextmanager
+    def escritura(self):
+        """
+        Modifica la colección como una lista y publica el resultado como una sola versión.
+
+        Yields:
+            list: Copia de los anuncios vigentes; al salir del bloque sin error pasa a ser
+                la versión nueva. Si el bloque lanza una excepción, no se publica nada.
+        """
+        with self._candado:
+            actual = self._version
+            anuncios = list(actual.anuncios)
+            yield anuncios
+            self._publicar(actual, anuncios, _sobrantes(anuncios, actual.anuncios),
+                           _sobrantes(actual.anuncios, anuncios))
+
+    def _al_cambiar(self, anuncio, campo, anterior, nuevo):
+        """Publica conteos nuevos cuando cambia el subtipo de un anuncio contenido."""
+        if campo == "sub_tipo":
+            with self._candado:
+                actual = self._version
+                por_sub_tipo = Counter(actual.por_sub_tipo)
+                por_sub_tipo[anuncio.tipo, anterior] -= 1
+                por_sub_tipo[anuncio.tipo, nuevo] += 1
+                self._version = actual._replace(numero=actual.numero + 1, por_sub_tipo=dict(+por_sub_tipo))
+
+    def __len__(self):
+        return len(self._version.anuncios)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return list(self._version.anuncios[indice])
+        return self._version.anuncios[indice]
+
+    def _cambiar(self, cambio):
+        """Aplica cambio(lista) a una copia y publica; cambio regresa (agregados, quitados)."""
+        with self._candado:
+            actual = self._version
+            anuncios = list(actual.anuncios)
+            agregados, quitados = cambio(anuncios)
+            self._publicar(actual, anuncios, agregados, quitados)
+
+    def __setitem__(self, indice, valor):
+        def reemplazar(anuncios):
+            if isinstance(indice, slice):
+                nuevos = list(valor)
+                quitados = anuncios[indice]
+                anuncios[indice] = nuevos
+                return nuevos, quitados
+            quitado = anuncios[indice]
+            anuncios[indice] = valor
+            return (valor,), (quitado,)
+        self._cambiar(reemplazar)
+
+    def __delitem__(self, indice):
+        def eliminar(anuncios):
+            quitados = anuncios[indice]
+            del anuncios[indice]
+            return (), quitados if isinstance(indice, slice) else (quitados,)
+        self._cambiar(eliminar)
+
+    def insert(self, indice, anuncio):
+        """Inserta un anuncio antes de la posición indicada."""
+        def insertar(anuncios):
+            anuncios.insert(indice, anuncio)
+            return (anuncio,), ()
+        self._cambiar(insertar)
+
+    def append(self, anuncio):
+        """Agrega un anuncio al final de la colección."""
+        with self._candado:
+            actual = self._version
+            self._publicar(actual, actual.anuncios + (anuncio,), (anuncio,), ())
+
+    def extend(self, anuncios):
+        """Agrega varios anuncios al final de la colección, publicando una sola versión."""
+        nuevos = tuple(anuncios)
+        with self._candado:
+            actual = self._version
+            self._publicar(actual, actual.anuncios + nuevos, nuevos, ())
+
+    def pop(self, indice=-1):
+        """Quita y regresa el anuncio de la posición indicada en una sola escritura."""
+        quitados = []
+
+        def sacar(anuncios):
+            quitados.append(anuncios.pop(indice))
+            return (), quitados
+        self._cambiar(sacar)
+        return quitados[0]
+
+    def remove(self, anuncio):
+        """Quita la primera aparición de un anuncio en una sola escritura."""
+        def quitar(anuncios):
+            anuncios.remove(anuncio)
+            return (), (anuncio,)
+        self._cambiar(quitar)
+
+    def reverse(self):
+        """Invierte el orden de los anuncios en una sola escritura."""
+        def invertir(anuncios):
+            anuncios.reverse()
+            return (), ()
+        self._cambiar(invertir)
+
+    def clear(self):
+        """Elimina todos los anuncios."""
+        del self[:]
+
+    def __iter__(self):
+        return iter(self._version.anuncios)
+
+    def __contains__(self, anuncio):
+        return anuncio in self._version.anuncios
+
+    def __eq__(self, otra):
+        if isinstance(otra, (ColeccionConcurrente, ColeccionAnuncios)):
+            return list(self) == list(otra)
+        if isinstance(otra, list):
+            return list(self._version.anuncios) == otra
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ColeccionConcurrente({list(self._version.anuncios)!r})"
+
+    def conteo_por_tipo(self):
+        """
+        Regresa los conteos de anuncios por tipo de la versión vigente.
+
+        Returns:
+            dict: Nombre del tipo -> cantidad de anuncios.
+        """
+        return dict(self._version.por_tipo)
+
+    def conteo_por_sub_tipo(self):
+        """
+        Regresa los conteos de anuncios por tipo y subtipo de la versión vigente.
+
+        Returns:
+            dict: (nombre del tipo, subtipo) -> cantidad de anuncios.
+        """
+        return dict(self._version.por_sub_tipo)
@@ -0,0 +1,288 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+from collections import namedtuple
+from urllib.parse import urlparse
+import cache_creativos
+import imagen
+from cache_creativos import DIRECTORIO_CACHE
+from trabajos import ejecutar_en_pool, escribir_atomico
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow es opcional: sin él se usa la compresión de la biblioteca estándar.
+    Image = None
+
+CALIDAD = 80
+
+
+class ResultadoCompresion(namedtuple("ResultadoCompresion",
+                                     ["ruta", "bytes_antes", "bytes_despues", "error"])):
+    """Resultado de comprimir un archivo: ruta, tamaños y excepción sin lanzar."""
+
+    __slots__ = ()
+
+    @property
+    def ahorrado(self):
+        """int: Bytes ahorrados por la compresión."""
+        return self.bytes_antes - self.bytes_despues
+
+
+def ruta_local(url_archivo):
+    """
+    Traduce la url_archivo de un anuncio a una ruta del sistema de archivos.
+
+    Args:
+        url_archivo (str): Ruta local o URL file://.
+
+    Returns:
+        str: Ruta del archivo.
+
+    Raises:
+        ValueError: Si el anuncio no tiene archivo o la URL no es local.
+    """
+    if not url_archivo:
+        raise ValueError("El anuncio no tiene archivo.")
+    partes = urlparse(url_archivo)
+    if partes.scheme == "file":
+        # urllib.request es pesado de importar y solo hace falta para URLs file://.
+        from urllib.request import url2pathname
+        return url2pathname(partes.path)
+    if partes.scheme and len(partes.scheme) > 1:
+        raise ValueError(f"'{url_archivo}' no es un archivo local.")
+    return url_archivo
+
+
+def _comprimir_con_pillow(datos, tipo, calidad):
+    """Recodifica una imagen con Pillow y regresa los bytes resultantes."""
+    salida = io.BytesIO()
+    with Image.open(io.BytesIO(datos)) as imagen_pil:
+        if tipo == "jpeg":
+            imagen_pil.save(salida, "JPEG", quality=calidad, optimize=True, progressive=True)
+        else:
+            imagen_pil.save(salida, "PNG", optimize=True)
+    return salida.getvalue()
+
+
+def _comprimir_datos(datos, tipo, calidad):
+    """Comprime el contenido de una imagen con el motor disponible."""
+    if Image is not None:
+        return _comprimir_con_pillow(datos, tipo, calidad)
+    if tipo == "png":
+        return imagen.recomprimir_png(datos)
+    return imagen.limpiar_jpeg(datos)
+
+
+def comprimir_imagen(ruta, calidad=CALIDAD, directorio=DIRECTORIO_CACHE):
+    """
+    Comprime una imagen PNG o JPEG en su lugar.
+
+    Con Pillow instalado, los JPEG se recodifican con la calidad indicada y los
+    PNG se optimizan sin pérdida. Sin Pillow se usa la biblioteca estándar: los
+    PNG se recomprimen con zlib y a los JPEG se les quitan los metadatos (la
+    calidad solo se aplica cuando hay un codificador disponible). El archivo se
+    reemplaza solo si el resultado es más pequeño.
+
+    El resultado se guarda en el caché de creativos por el hash del contenido,
+    así que otro archivo con el mismo contenido, o el mismo archivo ya
+    comprimido, no se vuelve a procesar.
+
+    Args:
+        ruta (str): Ruta del archivo.
+        calidad (int, optional): Calidad objetivo de 1 a 100. Por defecto es CALIDAD.
+        directorio (str, optional): Directorio del caché de creativos.
+
+    Returns:
+        ResultadoCompresion: Tamaños antes y después.
+    """
+    try:
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        tipo = imagen.formato(datos)
+        if tipo is None:
+            raise ValueError(f"'{ruta}' no es una imagen PNG o JPEG.")
+        cache = cache_creativos.compartido(directorio)
+        transformacion = {"op": "comprimir", "calidad": calidad, "formato": tipo,
+                          "motor": "pillow" if Image is not None else "stdlib"}
+        comprimido = cache.obtener_o_crear(cache_creativos.huella_datos(datos), transformacion,
+                                           lambda: _comprimir_datos(datos, tipo, calidad))
+        if len(comprimido) < len(datos):
+            escribir_atomico(ruta, comprimido)
+            # El archivo ya comprimido también queda en caché, con su propio hash.
+            cache.guardar(cache_creativos.huella_datos(comprimido), transformacion, comprimido)
+            return ResultadoCompresion(ruta, len(datos), len(comprimido), None)
+        return ResultadoCompresion(ruta, len(datos), len(datos), None)
+    except (OSError, ValueError) as e:
+        return ResultadoCompresion(ruta, 0, 0, e)
+
+
+def codificar_ffmpeg(entrada, salida, calidad=CALIDAD):
+    """
+    Codificador de video por omisión: recodifica con ffmpeg en H.264.
+
+    La calidad de 1 a 100 se traduce a un CRF entre 51 y 18.
+
+    Raises:
+        OSError: Si ffmpeg no está instalado.
+        subprocess.CalledProcessError: Si ffmpeg falla.
+    """
+    ejecutable = shutil.which("ffmpeg")
+    if ejecutable is None:
+        raise OSError("No hay un codificador de video disponible (ffmpeg no está instalado).")
+    crf = round(51 - max(1, min(calidad, 100)) * 0.33)
+    subprocess.run([ejecutable, "-y", "-v", "error", "-i", entrada, "-c:v", "libx264",
+                    "-crf", str(crf), "-preset", "medium", "-c:a", "copy", salida],
+                   check=True, stdin=subprocess.DEVNULL)
+
+
+def comprimir_video(ruta, calidad=CALIDAD, codificador=None, directorio=DIRECTORIO_CACHE):
+    """
+    Comprime un video en su lugar con un codificador intercambiable.
+
+    El codificador recibe (ruta_entrada, ruta_salida, calidad) y debe escribir el
+    resultado en ruta_salida. Para usarlo en comprimir_lote tiene que poder
+    enviarse a otro proceso, es decir, ser una función definida a nivel de módulo.
+    La salida se guarda en el caché de creativos, así que un video con el mismo
+    contenido y los mismos parámetros se codifica una sola vez.
+
+    Args:
+        ruta (str): Ruta del video.
+        calidad (int, optional): Calidad objetivo de 1 a 100. Por defecto es CALIDAD.
+        codificador (callable, optional): Por defecto es codificar_ffmpeg.
+        directorio (str, optional): Directorio del caché de creativos.
+
+    Returns:
+        ResultadoCompresion: Tamaños antes y después.
+    """
+    codificador = codificador or codificar_ffmpeg
+    try:
+        antes = os.path.getsize(ruta)
+        cache = cache_creativos.compartido(directorio)
+        huella = cache_creativos.huella_archivo(ruta)
+        extension = os.path.splitext(ruta)[1]
+        transformacion = {"op": "comprimir", "calidad": calidad, "formato": extension[1:],
+                          "codificador": f"{codificador.__module__}.{codificador.__qualname__}"}
+        comprimido = cache.ruta(huella, transformacion)
+        if comprimido is None:
+            os.makedirs(cache.directorio, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=cache.directorio, suffix=".tmp" + extension)
+            os.close(descriptor)
+            try:
+                codificador(ruta, temporal, calidad)
+                comprimido = cache.guardar_archivo(huella, transformacion, temporal)
+            finally:
+                if os.path.exists(temporal):
+                    os.unlink(temporal)
+        despues = os.path.getsize(comprimido)
+        if despues >= antes:
+            return ResultadoCompresion(ruta, antes, antes, None)
+        descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".", suffix=extension)
+        os.close(descriptor)
+        try:
+            shutil.copyfile(comprimido, temporal)
+            os.replace(temporal, ruta)
+        finally:
+            if os.path.exists(temporal):
+                os.unlink(temporal)
+        return ResultadoCompresion(ruta, antes, despues, None)
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        return ResultadoCompresion(ruta, 0, 0, e)
+
+
+def tarea_de(anuncio, calidad=CALIDAD, codificador_video=None, directorio=DIRECTORIO_CACHE):
+    """
+    Prepara la tarea de compresión de un anuncio.
+
+    Los anuncios con duración (videos) van al codificador de video; el resto se
+    trata como imagen.
+
+    Returns:
+        tuple: (función, argumentos) listos para ejecutarse en otro proceso.
+
+    Raises:
+        ValueError: Si el anuncio no tiene un archivo local.
+    """
+    ruta = ruta_local(anuncio.url_archivo)
+    if hasattr(anuncio, "duracion"):
+        return comprimir_video, (ruta, calidad, codificador_video, directorio)
+    return comprimir_imagen, (ruta, calidad, directorio)
+
+
+def comprimir_anuncio(anuncio, calidad=CALIDAD, codificador_video=None, directorio=DIRECTORIO_CACHE):
+    """
+    Comprime el archivo de un anuncio en el proceso actual.
+
+    Returns:
+        ResultadoCompresion: Tamaños antes y después, o el error ocurrido.
+    """
+    try:
+        funcion, argumentos = tarea_de(anuncio, calidad, codificador_video, directorio)
+    except ValueError as e:
+        return ResultadoCompresion(anuncio.url_archivo, 0, 0, e)
+    return funcion(*argumentos)
+
+
+def comprimir_lote(anuncios, calidad=CALIDAD, max_procesos=None, codificador_video=None,
+                   en_vuelo=None, directorio=DIRECTORIO_CACHE):
+    """
+    Comprime los archivos de muchos anuncios en un pool de procesos.
+
+    Cada archivo se comprime una sola vez aunque lo usen varios anuncios; los
+    anuncios repetidos reciben un resultado sin ahorro, para que la suma de
+    ahorrado no cuente dos veces el mismo archivo. El pool se maneja con
+    trabajos.ejecutar_en_pool.
+
+    Args:
+        anuncios (iterable): Anuncios (o filas de un AnuncioStore) a comprimir.
+        calidad (int, optional): Calidad objetivo de 1 a 100. Por defecto es CALIDAD.
+        max_procesos (int, optional): Procesos del pool. Por defecto, uno por núcleo.
+            Con 1 no se crea un pool.
+        codificador_video (callable, optional): Ver comprimir_video.
+        en_vuelo (int, optional): Tareas pendientes como máximo. Por defecto, el doble
+            de max_procesos.
+        directorio (str, optional): Directorio del caché de creativos.
+
+    Returns:
+        list: Un ResultadoCompresion por anuncio, en el mismo orden.
+    """
+    resultados = []
+    tareas = {}
+    repetidos = []
+    for posicion, anuncio in enumerate(anuncios):
+        resultados.append(None)
+        try:
+            funcion, argumentos = tarea_de(anuncio, calidad, codificador_video, directorio)
+        except ValueError as e:
+            resultados[posicion] = ResultadoCompresion(anuncio.url_archivo, 0, 0, e)
+            continue
+        ruta = argumentos[0]
+        if ruta in tareas:
+            repetidos.append((posicion, tareas[ruta][0]))
+        else:
+            tareas[ruta] = (posicion, funcion, argumentos)
+
+    hechos = ejecutar_en_pool([(funcion, argumentos) for _, funcion, argumentos in tareas.values()],
+                              max_procesos, en_vuelo)
+    for (posicion, _, _), resultado in zip(tareas.values(), hechos):
+        resultados[posicion] = resultado
+
+    for posicion, original in repetidos:
+        resultado = resultados[original]
+        resultados[posicion] = resultado._replace(bytes_antes=resultado.bytes_despues)
+    return resultados
+
+
+def resumen(resultados):
+    """
+    Resume un lote de compresiones.
+
+    Returns:
+        dict: 'archivos', 'errores', 'bytes_antes', 'bytes_despues' y 'ahorrado'.
+    """
+    correctos = [r for r in resultados if r.error is None]
+    antes = sum(r.bytes_antes for r in correctos)
+    despues = sum(r.bytes_despues for r in correctos)
+    return {"archivos": len(correctos), "errores": len(resultados) - len(correctos),
+            "bytes_antes": antes, "bytes_despues": despues, "ahorrado": antes - despues}
@@ -1,27 +1,11 @@
-from campaña import Campana
-from anuncio import Anuncio, Video, Display, Social
+import bitacora
+from campana import Campana
+import tipos_anuncio
+from anuncio import Anuncio
 from error import LargoExcedidoException, SubTipoInvalidoException
+from validacion import validar_fecha, validar_url
+from persistencia import AlmacenSQLite
 from datetime import date
-import re  
-
-def validar_fecha(fecha_str):
-    """Valida que la fecha tenga el formato YYYY-MM-DD."""
-    try:
-        date.fromisoformat(fecha_str)
-        return True
-    except ValueError:
-        return False
-
-def validar_url(url):
-    """Valida que la URL tenga un formato válido usando una expresión regular."""
-    regex = re.compile(
-        r'^(?:http|ftp)s?://'  # http:// o https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # Dominio
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...o dirección IP
-        r'(?::\d+)?'  # puerto opcional
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return re.match(regex, url) is not None
 
 def crear_campana(campanas):
     """Crea una nueva campaña y la agrega a la lista de campañas."""
@@ -54,6 +38,7 @@ def crear_campana(campanas):
         print("¡Campaña creada con éxito!")
     except LargoExcedidoException as e:
         print(f"Error al crear la campaña: {e}")
+        bitacora.registrar(e)
 
 def mostrar_campanas(campanas):
     """Muestra la información de todas las campañas."""
@@ -107,6 +92,7 @@ def modificar_campana(campanas):
                 print("Nombre de la campaña actualizado correctamente.")
             except LargoExcedidoException as e:
                 print(f"Error: {e}")
+                bitacora.registrar(e, campana.nombre)
         elif opcion == 'b':
             campana = agregar_anuncio(campana)
         elif opcion == 'c':
@@ -117,23 +103,46 @@ def modificar_campana(campanas):
             print("Opción inválida. Intenta de nuevo.")
     return campana
 
+# Textos del menú de edición para cada campo editable de un tipo de anuncio.
+ETIQUETAS_CAMPOS = {
+    "sub_tipo": "Cambiar subtipo",
+    "url_archivo": "Cambiar URL del archivo",
+    "url_clic": "Cambiar URL de destino del clic",
+    "duracion": "Cambiar duración",
+    "alto": "Cambiar alto",
+    "ancho": "Cambiar ancho",
+}
+
+def _letra(posicion):
+    """Regresa la letra de menú de una posición (0 -> 'a')."""
+    return chr(ord("a") + posicion)
+
+def _pedir_entero(mensaje):
+    """Pide un número entero hasta que el usuario ingrese uno válido."""
+    while True:
+        try:
+            return int(input(mensaje))
+        except ValueError:
+            print("Valor inválido. Ingresa un número entero.")
+
 def agregar_anuncio(campana):
     """Agrega un nuevo anuncio a la campaña."""
+    # Los tipos se listan sin importar sus módulos; solo se carga el elegido.
+    nombres = tipos_anuncio.nombres()
     print("\n--- Agregar Anuncio ---")
-    print("a. Video")
-    print("b. Display")
-    print("c. Social")
+    for posicion, nombre in enumerate(nombres):
+        print(f"{_letra(posicion)}. {nombre}")
 
+    opciones = {_letra(posicion): nombre for posicion, nombre in enumerate(nombres)}
     while True:
         tipo_anuncio = input("Elige el tipo de anuncio: ").lower()
-        if tipo_anuncio in ("a", "b", "c"):
+        if tipo_anuncio in opciones:
             break
         print("Opción inválida. Intenta de nuevo.")
 
-    # Obtener el nombre de la clase del tipo de anuncio
-    tipo_anuncio_nombre = {"a": "Video", "b": "Display", "c": "Social"}[tipo_anuncio]
+    formato = tipos_anuncio.formato(opciones[tipo_anuncio])
 
-    subtipos_str = Anuncio.mostrar_formatos(tipo_anuncio_nombre)
+    subtipos_str = Anuncio.mostrar_formatos(formato.nombre)
     while True:
         sub_tipo = input(f"Elige el subtipo del anuncio:\n{subtipos_str}Subtipo: ")
         if sub_tipo:
@@ -155,36 +164,19 @@ def agregar_anuncio(campana):
             print("URL inválida. Intenta de nuevo.")
 
     try:
-        if tipo_anuncio == "a":
-            if sub_tipo in Video.SUB_TIPOS["Video"]:
-                while True:
-                    try:
-                        duracion = int(input("Ingresa la duración del video (segundos): "))
-                        break
-                    except ValueError:
-                        print("Duración inválida. Ingresa un número entero.")
-                anuncio = Video(sub_tipo, url_archivo, url_clic, duracion)
-                campana.anuncios.append(anuncio)
-            else:
-                print(f"Error: Subtipo '{sub_tipo}' no es válido para Video.")
-        elif tipo_anuncio == "b":
-            if sub_tipo in Display.SUB_TIPOS["Display"]:
-                anuncio = Display(sub_tipo, url_archivo, url_clic)
-                campana.anuncios.append(anuncio)
-            else:
-                print(f"Error: Subtipo '{sub_tipo}' no es válido para Display.")
+        if sub_tipo not in formato.sub_tipos:
+            raise SubTipoInvalidoException(f"Subtipo '{sub_tipo}' no válido para {formato.nombre}.")
+        if "duracion" in formato.campos:
+            duracion = _pedir_entero("Ingresa la duración del video (segundos): ")
+            anuncio = formato.clase(sub_tipo, url_archivo, url_clic, duracion)
         else:
-            if sub_tipo in Social.SUB_TIPOS["Social"]:
-                anuncio = Social(sub_tipo, url_archivo, url_clic)
-                campana.anuncios.append(anuncio)
-            else:
-                print(f"Error: Subtipo '{sub_tipo}' no es válido para Social.")
-
+            anuncio = formato.clase(sub_tipo, url_archivo, url_clic)
+        anuncio.ancho, anuncio.alto = formato.tamanos[sub_tipo]
+        campana.anuncios.append(anuncio)
         print("¡Anuncio agregado correctamente!")
     except SubTipoInvalidoException as e:
         print(f"Error: {e}")
-    except ValueError:
-        print("Error: Ingresa una duración válida (un número entero).")
+        bitacora.registrar(e, campana.nombre, len(campana.anuncios))
 
     return campana
 
@@ -209,88 +201,68 @@ def modificar_anuncio(campana):
         except ValueError:
             print("Ingresa un número válido.")
 
+    # Las opciones salen de los campos editables que declara el tipo del anuncio.
+    formato = tipos_anuncio.formato(anuncio_a_modificar.tipo)
+    opciones = {_letra(posicion): campo for posicion, campo in enumerate(formato.campos)}
+    salir = _letra(len(opciones))
+
     while True:
-        # Mostrar opciones de modificación según el tipo de anuncio
-        if isinstance(anuncio_a_modificar, Video):
-            print("\n--- Modificar Anuncio de Video ---")
-            print("a. Cambiar subtipo")
-            print("b. Cambiar URL del archivo")
-            print("c. Cambiar URL de destino del clic")
-            print("d. Cambiar duración")
-            print("e. Volver al menú anterior")
-        elif isinstance(anuncio_a_modificar, Display):
-            print("\n--- Modificar Anuncio Display ---")
-            print("a. Cambiar subtipo")
-            print("b. Cambiar URL del archivo")
-            print("c. Cambiar URL de destino del clic")
-            print("d. Volver al menú anterior")
-        elif isinstance(anuncio_a_modificar, Social):
-            print("\n--- Modificar Anuncio Social ---")
-            print("a. Cambiar subtipo")
-            print("b. Cambiar URL del archivo")
-            print("c. Cambiar URL de destino del clic")
-            print("d. Volver al menú anterior")
+        print(f"\n--- Modificar Anuncio {formato.nombre} ---")
+        for letra, campo in opciones.items():
+            print(f"{letra}. {ETIQUETAS_CAMPOS.get(campo, f'Cambiar {campo}')}")
+        print(f"{salir}. Volver al menú anterior")
 
         opcion_modificar = input("Elige una opción: ").lower()
+        if opcion_modificar == salir:
+            break
+        campo = opciones.get(opcion_modificar)
+        if campo is None:
+            print("Opción inválida. Intenta de nuevo.")
+            continue
 
         try:
-            if opcion_modificar == "a":
-                # Obtener el string formateado de subtipos
-                tipo_anuncio = type(anuncio_a_modificar).__name__
-                subtipos_str = Anuncio.mostrar_formatos(tipo_anuncio)
-                nuevo_subtipo = input(
+            if campo == "sub_tipo":
+                subtipos_str = Anuncio.mostrar_formatos(formato.nombre)
+                anuncio_a_modificar.sub_tipo = input(
                     f"Ingresa el nuevo subtipo del anuncio:\n{subtipos_str}Subtipo: "
                 )
-                anuncio_a_modificar.sub_tipo = nuevo_subtipo
-                print("Subtipo del anuncio actualizado correctamente.")
-            elif opcion_modificar == "b":
-                while True:
-                    nueva_url_archivo = input(
-                        "Ingresa la nueva URL del archivo del anuncio: "
-                    )
-                    if validar_url(nueva_url_archivo):
-                        anuncio_a_modificar.url_archivo = nueva_url_archivo
-                        print("URL del archivo del anuncio actualizada correctamente.")
-                        break
-                    else:
-                        print("URL inválida. Intenta de nuevo.")
-            elif opcion_modificar == "c":
-                while True:
-                    nueva_url_clic = input(
-                        "Ingresa la nueva URL de destino del clic: "
-                    )
-                    if validar_url(nueva_url_clic):
-                        anuncio_a_modificar.url_clic = nueva_url_clic
-                        print("URL de destino del clic actualizada correctamente.")
-                        break
-                    else:
-                        print("URL inválida. Intenta de nuevo.")
-            elif opcion_modificar == "d" and isinstance(anuncio_a_modificar, Video):
+            elif campo.startswith("url_"):
                 while True:
-                    try:
-                        nueva_duracion = int(
-                            input("Ingresa la nueva duración del video (segundos): ")
-                        )
-                        anuncio_a_modificar.duracion = nueva_duracion
-                        print("Duración del video actualizada correctamente.")
+                    nueva_url = input(f"Ingresa el nuevo valor de {campo}: ")
+                    if validar_url(nueva_url):
+                        setattr(anuncio_a_modificar, campo, nueva_url)
                         break
-                    except ValueError:
-                        print("Duración inválida. Ingresa un número entero.")
-            elif opcion_modificar in ("d", "e"):  # Salir del bucle de modificación
-                break
+                    print("URL inválida. Intenta de nuevo.")
             else:
-                print("Opción inválida. Intenta de nuevo.")
+                setattr(anuncio_a_modificar, campo, _pedir_entero(f"Ingresa el nuevo valor de {campo}: "))
+            print(f"{ETIQUETAS_CAMPOS.get(campo, campo)}: actualizado correctamente.")
         except SubTipoInvalidoException as e:
             print(f"Error: {e}")
-        except ValueError:
-            print("Error: Ingresa un valor válido.")
+            bitacora.registrar(e, campana.nombre, opcion - 1)
 
     return campana
 
-def main():
-    """Función principal del programa."""
-    campanas = []  # Lista para almacenar las campañas
-
+def main(ruta_bd="campanas.db"):
+    """
+    Función principal del programa.
+
+    Args:
+        ruta_bd (str, optional): Archivo SQLite donde se guardan las campañas entre
+            ejecuciones. Por defecto es "campanas.db".
+    """
+    almacen = AlmacenSQLite(ruta_bd)
+    campanas = almacen.cargar_todas()  # Los anuncios se leen a demanda
+    bitacora.configurar()
+    try:
+        menu_principal(campanas)
+    finally:
+        for campana in campanas:
+            almacen.guardar(campana)
+        almacen.cerrar()
+        bitacora.cerrar()
+
+def menu_principal(campanas):
+    """Muestra el menú principal hasta que el usuario decide salir."""
     while True:
         print("\n--- Sistema Gestión Campañas Publicitarias ---\nMenú Principal")
         print("a. Crear campaña")
@@ -326,9 +298,8 @@ def main():
 
         except (LargoExcedidoException, SubTipoInvalidoException) as e:
             print(f"Error: {e}")
-            # Escribe el mensaje de la excepción en el archivo error.log
-            with open("error.log", "a") as f:
-                f.write(f"{date.today()} - {type(e).__name__}: {e}\n")
+            # La bitácora escribe en errores.jsonl desde su propio hilo, agrupando repetidos
+            bitacora.registrar(e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,307 @@
+import json
+import os
+from collections import namedtuple
+from datetime import date
+from functools import partial
+from trabajos import escribir_atomico
+
+Cambio = namedtuple("Cambio", ["secuencia", "campana", "anuncio", "campo", "anterior", "nuevo"])
+Cambio.__doc__ = """Edición de un campo: número de secuencia, clave de la campaña, posición del anuncio
+(None si el campo es de la campaña), campo y valores anterior y nuevo."""
+
+CAMPOS_FECHA = ("fecha_inicio", "fecha_termino")
+
+
+def _codificar(valor):
+    """Convierte una fecha en texto ISO; los demás valores se regresan tal cual."""
+    return valor.isoformat() if isinstance(valor, date) else valor
+
+
+def _decodificar(campo, valor):
+    """Convierte el texto ISO de un campo de fecha en date."""
+    if campo in CAMPOS_FECHA and isinstance(valor, str):
+        return date.fromisoformat(valor)
+    return valor
+
+
+def _linea(cambio):
+    """Codifica un Cambio como una línea JSON."""
+    datos = cambio._replace(anterior=_codificar(cambio.anterior), nuevo=_codificar(cambio.nuevo))
+    return json.dumps(datos._asdict(), ensure_ascii=False) + "\n"
+
+
+def leer(ruta):
+    """
+    Lee los cambios de un diario, uno a la vez.
+
+    Una última línea incompleta (por ejemplo, de un proceso que terminó mientras
+    escribía) se ignora.
+
+    Args:
+        ruta (str): Archivo del diario.
+
+    Yields:
+        Cambio: Cambios en orden de secuencia, con las fechas como date.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        for texto in archivo:
+            try:
+                datos = json.loads(texto)
+            except ValueError:
+                if texto.endswith("\n"):
+                    raise
+                return
+            campo = datos["campo"]
+            yield Cambio(datos["secuencia"], datos["campana"], datos["anuncio"], campo,
+                         _decodificar(campo, datos["anterior"]), _decodificar(campo, datos["nuevo"]))
+
+
+def reproducir(cambios, campanas, desde=0):
+    """
+    Aplica cambios sobre campañas restauradas, por ejemplo de una instantánea.
+
+    Args:
+        cambios (iterable): Cambios en orden, como los que entrega leer().
+        campanas (dict | Sequence): Campañas indexadas por la misma clave con que se
+            siguieron en el Diario (su posición, si se restauran con instantanea.cargar).
+        desde (int, optional): Secuencia ya incluida en las campañas; los cambios hasta
+            ella se saltan.
+
+    Returns:
+        int: Secuencia del último cambio aplicado, o desde si no se aplicó ninguno.
+    """
+    ultima = desde
+    for cambio in cambios:
+        if cambio.secuencia <= desde:
+            continue
+        objetivo = campanas[cambio.campana]
+        if cambio.anuncio is not None:
+            objetivo = objetivo.anuncios[cambio.anuncio]
+        setattr(objetivo, cambio.campo, cambio.nuevo)
+        ultima = cambio.secuencia
+    return ultima
+
+
+def compactar(cambios):
+    """
+    Junta los cambios de un mismo campo en uno solo, con el primer valor anterior y el último nuevo.
+
+    Los cambios resultantes quedan en el orden de su última secuencia. Un campo
+    que termina con el valor que tenía también se conserva, para que la última
+    secuencia del diario no retroceda.
+
+    Args:
+        cambios (iterable): Cambios en orden de secuencia.
+
+    Returns:
+        list: Cambios compactados.
+    """
+    ultimos = {}
+    for cambio in cambios:
+        clave = (cambio.campana, cambio.anuncio, cambio.campo)
+        previo = ultimos.pop(clave, None)
+        if previo is not None:
+            cambio = cambio._replace(anterior=previo.anterior)
+        ultimos[clave] = cambio
+    return list(ultimos.values())
+
+
+class Diario:
+    """
+    Diario de solo agregado con las ediciones campo por campo de campañas y anuncios.
+
+    El diario se suscribe a las campañas que sigue y a sus anuncios (ver
+    Observable): cada cambio hecho con un setter queda como un Cambio, en
+    memoria y, si hay archivo, como una línea JSON al final de él. Persistir
+    una edición cuesta una línea, en lugar de volver a serializar la campaña.
+
+    Para recuperar, se restaura la última instantánea y se reproducen encima los
+    cambios posteriores (ver reproducir). descartar() quita del archivo los
+    cambios que ya cubre una instantánea y compactar() junta los cambios
+    viejos de un mismo campo.
+
+    deshacer() y rehacer() recorren las ediciones de esta sesión. Deshacer no
+    borra nada del diario: aplica el valor anterior, y eso se registra como un
+    cambio más, así que el archivo siempre refleja el estado real.
+
+    Los anuncios se identifican por su posición en la campaña al momento de
+    seguirla; después de agregar o quitar anuncios hay que volver a llamar a
+    seguir(). Las campañas con un AnuncioStore solo registran los cambios de la
+    campaña, porque sus filas no notifican cambios.
+    """
+
+    def __init__(self, ruta=None):
+        """
+        Inicializa el diario.
+
+        Args:
+            ruta (str, optional): Archivo donde agregar los cambios. Si ya existe, la
+                secuencia continúa desde su último cambio. Por defecto, solo en memoria.
+        """
+        self.ruta = ruta
+        self._archivo = None
+        self._cambios = []
+        self._hechos = []
+        self._deshechos = []
+        self._aplicando = False
+        self._seguidas = {}
+        self._secuencia = 0
+        if ruta is not None and os.path.exists(ruta):
+            for cambio in leer(ruta):
+                self._secuencia = cambio.secuencia
+
+    @property
+    def secuencia(self):
+        """int: Secuencia del último cambio registrado; se guarda junto a una instantánea."""
+        return self._secuencia
+
+    @property
+    def cambios(self):
+        """list: Cambios registrados en esta sesión, en orden."""
+        return list(self._cambios)
+
+    def seguir(self, campana, clave=None):
+        """
+        Empieza a registrar los cambios de una campaña y de sus anuncios actuales.
+
+        Si la campaña ya se seguía, se vuelve a suscribir con las posiciones actuales
+        de sus anuncios.
+
+        Args:
+            campana (Campana): Campaña a seguir.
+            clave (str | int, optional): Clave de la campaña en el diario. Por defecto, su
+                nombre actual.
+
+        Returns:
+            str | int: La clave usada.
+        """
+        if campana in self._seguidas:
+            anterior = self._seguidas[campana][0]
+            self.dejar_de_seguir(campana)
+            clave = anterior if clave is None else clave
+        clave = campana.nombre if clave is None else clave
+        suscripciones = [(campana, partial(self._al_cambiar, clave, None))]
+        for posicion, anuncio in enumerate(campana.anuncios):
+            if hasattr(anuncio, "suscribir"):
+                suscripciones.append((anuncio, partial(self._al_cambiar, clave, posicion)))
+        for objeto, funcion in suscripciones:
+            objeto.suscribir(funcion)
+        self._seguidas[campana] = (clave, suscripciones)
+        return clave
+
+    def dejar_de_seguir(self, campana):
+        """
+        Deja de registrar los cambios de una campaña.
+
+        Raises:
+            KeyError: Si la campaña no se seguía.
+        """
+        _, suscripciones = self._seguidas.pop(campana)
+        for objeto, funcion in suscripciones:
+            objeto.desuscribir(funcion)
+
+    def _al_cambiar(self, clave, posicion, objeto, campo, anterior, nuevo):
+        """Registra un cambio notificado por una campaña o un anuncio seguido."""
+        self._secuencia += 1
+        cambio = Cambio(self._secuencia, clave, posicion, campo, anterior, nuevo)
+        self._cambios.append(cambio)
+        if not self._aplicando:
+            self._hechos.append((cambio, objeto))
+            self._deshechos.clear()
+        if self.ruta is not None:
+            if self._archivo is None:
+                self._archivo = open(self.ruta, "a", encoding="utf-8")
+            self._archivo.write(_linea(cambio))
+            self._archivo.flush()
+
+    def _aplicar(self, objeto, campo, valor):
+        """Cambia un campo sin tocar las pilas de deshacer y rehacer."""
+        self._aplicando = True
+        try:
+            setattr(objeto, campo, valor)
+        finally:
+            self._aplicando = False
+
+    def deshacer(self):
+        """
+        Deshace la última edición de esta sesión.
+
+        Returns:
+            Cambio | None: La edición deshecha, o None si no había nada que deshacer.
+        """
+        if not self._hechos:
+            return None
+        cambio, objeto = self._hechos.pop()
+        self._aplicar(objeto, cambio.campo, cambio.anterior)
+        self._deshechos.append((cambio, objeto))
+        return cambio
+
+    def rehacer(self):
+        """
+        Vuelve a aplicar la última edición deshecha.
+
+        Returns:
+            Cambio | None: La edición rehecha, o None si no había nada que rehacer.
+        """
+        if not self._deshechos:
+            return None
+        cambio, objeto = self._deshechos.pop()
+        self._aplicar(objeto, cambio.campo, cambio.nuevo)
+        self._hechos.append((cambio, objeto))
+        return cambio
+
+    def _reescribir(self, cambios):
+        """Reemplaza el archivo de forma atómica con los cambios dados."""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        escribir_atomico(self.ruta, (_linea(cambio).encode("utf-8") for cambio in cambios))
+
+    def descartar(self, hasta):
+        """
+        Quita del archivo los cambios que ya incluye una instantánea.
+
+        Args:
+            hasta (int): Secuencia guardada con la instantánea.
+
+        Returns:
+            int: Cantidad de cambios que quedan en el archivo.
+        """
+        restantes = [cambio for cambio in leer(self.ruta) if cambio.secuencia > hasta]
+        self._reescribir(restantes)
+        return len(restantes)
+
+    def compactar(self, hasta=None):
+        """
+        Junta en el archivo los cambios viejos de un mismo campo (ver compactar).
+
+        Reproducir el archivo compactado da el mismo resultado que el original.
+        Las pilas de deshacer y rehacer de la sesión no cambian.
+
+        Args:
+            hasta (int, optional): Solo se compactan los cambios con secuencia hasta
+                esta; los posteriores quedan tal cual. Por defecto, todos.
+
+        Returns:
+            int: Cantidad de cambios que quedan en el archivo.
+        """
+        viejos, recientes = [], []
+        for cambio in leer(self.ruta):
+            (viejos if hasta is None or cambio.secuencia <= hasta else recientes).append(cambio)
+        restantes = compactar(viejos) + recientes
+        self._reescribir(restantes)
+        return len(restantes)
+
+    def cerrar(self):
+        """Deja de seguir todas las campañas y cierra el archivo."""
+        for campana in list(self._seguidas):
+            self.dejar_de_seguir(campana)
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
@@ -0,0 +1,470 @@
+"""
+Agregación de impresiones y clics por anuncio, tipo y día, en memoria fija.
+
+Cada evento es una línea de texto:
+
+    momento,evento,campana,anuncio
+
+con el momento en segundos desde la época (UTC), el evento 'i' (impresión)
+o 'c' (clic), el nombre de la campaña (sin comas) y la posición del anuncio
+dentro de ella desde 0. Los campos extra al final de la línea se ignoran.
+"""
+import asyncio
+import os
+import threading
+import zlib
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from trabajos import ejecutar_en_pool
+
+IMPRESION = b"i"
+CLIC = b"c"
+EVENTOS = {IMPRESION: 0, CLIC: 1}
+SEGUNDOS_DIA = 86400
+TAMANO_LECTURA = 1 << 20
+
+_PRIMO = (1 << 61) - 1
+_EPOCA = date(1970, 1, 1)
+
+
+class SketchConteos:
+    """
+    Count-min sketch: cuenta cuántas veces aparece cada clave en memoria fija.
+
+    La estimación nunca es menor que el conteo real y lo supera como mucho en
+    una fracción e / ancho del total con probabilidad 1 - e^-profundidad. Las
+    funciones de hash no dependen del proceso, así que dos sketches con las
+    mismas dimensiones se pueden combinar sumándolos.
+    """
+
+    def __init__(self, ancho=1 << 16, profundidad=4):
+        """
+        Inicializa el sketch en cero.
+
+        Args:
+            ancho (int, optional): Contadores por fila.
+            profundidad (int, optional): Filas, cada una con su función de hash.
+        """
+        self.ancho = ancho
+        self.profundidad = profundidad
+        self._filas = [array("Q", bytes(8 * ancho)) for _ in range(profundidad)]
+        self._semillas = [(2 * fila + 1) * 0x9E3779B97F4A7C15 % _PRIMO for fila in range(profundidad)]
+
+    def _posiciones(self, clave):
+        base = zlib.crc32(clave) + 1
+        return [base * semilla % _PRIMO % self.ancho for semilla in self._semillas]
+
+    def agregar(self, clave, cantidad=1):
+        """
+        Suma una cantidad al conteo de una clave.
+
+        Args:
+            clave (bytes): Clave a contar.
+            cantidad (int, optional): Cantidad a sumar.
+        """
+        for fila, posicion in zip(self._filas, self._posiciones(clave)):
+            fila[posicion] += cantidad
+
+    def estimar(self, clave):
+        """
+        Estima el conteo de una clave.
+
+        Returns:
+            int: Conteo estimado; nunca menor que el real.
+        """
+        return min(fila[posicion] for fila, posicion in zip(self._filas, self._posiciones(clave)))
+
+    def combinar(self, otro):
+        """
+        Suma los conteos de otro sketch con las mismas dimensiones.
+
+        Raises:
+            ValueError: Si las dimensiones no coinciden.
+        """
+        if (otro.ancho, otro.profundidad) != (self.ancho, self.profundidad):
+            raise ValueError("Solo se pueden combinar sketches con las mismas dimensiones.")
+        for fila, otra in zip(self._filas, otro._filas):
+            for posicion, cantidad in enumerate(otra):
+                if cantidad:
+                    fila[posicion] += cantidad
+
+
+class VentanaCircular:
+    """
+    Conteos de impresiones y clics por intervalo de tiempo en un buffer circular.
+
+    Guarda las últimas `ranuras` ranuras de `resolucion` segundos cada una. Un
+    evento más nuevo que la ranura guardada en su posición la reinicia; uno más
+    viejo que toda la ventana se descarta.
+    """
+
+    def __init__(self, ranuras=3600, resolucion=1):
+        """
+        Inicializa la ventana vacía.
+
+        Args:
+            ranuras (int, optional): Cantidad de intervalos que se conservan.
+            resolucion (int, optional): Segundos por intervalo.
+        """
+        self.ranuras = ranuras
+        self.resolucion = resolucion
+        self._numeros = array("q", [-1]) * ranuras
+        self._conteos = (array("Q", bytes(8 * ranuras)), array("Q", bytes(8 * ranuras)))
+
+    def agregar(self, momento, evento, cantidad=1):
+        """
+        Cuenta eventos ocurridos en un momento.
+
+        Args:
+            momento (int): Segundos desde la época.
+            evento (int): 0 para impresiones, 1 para clics.
+            cantidad (int, optional): Cantidad de eventos.
+
+        Returns:
+            bool: False si el momento es anterior a la ventana y se descartó.
+        """
+        numero = momento // self.resolucion
+        posicion = numero % self.ranuras
+        actual = self._numeros[posicion]
+        if numero != actual:
+            if numero < actual:
+                return False
+            self._numeros[posicion] = numero
+            self._conteos[0][posicion] = self._conteos[1][posicion] = 0
+        self._conteos[evento][posicion] += cantidad
+        return True
+
+    def intervalos(self, desde=None, hasta=None):
+        """
+        Regresa los intervalos con eventos entre dos momentos.
+
+        Args:
+            desde (int, optional): Primer segundo incluido. Por defecto, sin límite.
+            hasta (int, optional): Último segundo excluido. Por defecto, sin límite.
+
+        Returns:
+            list: Tuplas (inicio del intervalo en segundos, impresiones, clics) ordenadas.
+        """
+        impresiones, clics = self._conteos
+        resultado = []
+        for posicion, numero in enumerate(self._numeros):
+            inicio = numero * self.resolucion
+            if numero >= 0 and (desde is None or inicio >= desde) and (hasta is None or inicio < hasta):
+                resultado.append((inicio, impresiones[posicion], clics[posicion]))
+        resultado.sort()
+        return resultado
+
+    def combinar(self, otra):
+        """Suma los conteos de otra ventana de las mismas dimensiones, conservando las ranuras más nuevas."""
+        for posicion, numero in enumerate(otra._numeros):
+            if numero < 0 or numero < self._numeros[posicion]:
+                continue
+            if numero > self._numeros[posicion]:
+                self._numeros[posicion] = numero
+                self._conteos[0][posicion] = self._conteos[1][posicion] = 0
+            for evento in (0, 1):
+                self._conteos[evento][posicion] += otra._conteos[evento][posicion]
+
+
+class Agregador:
+    """
+    Agrega eventos de impresión y clic por anuncio, por tipo y por tiempo.
+
+    - Por anuncio: un count-min sketch por evento, con memoria fija sin importar
+      cuántos anuncios reciban eventos.
+    - Por tipo de anuncio: conteos exactos.
+    - Por segundo (última hora) y por día (último año y algo más): buffers circulares.
+
+    Los eventos se atribuyen a los anuncios de las campañas dadas al crear el
+    agregador. Los que nombran una campaña o posición desconocida se cuentan en
+    sin_atribuir y solo suman en las ventanas de tiempo; las líneas mal formadas
+    se cuentan en invalidos.
+
+    procesar() primero cuenta las líneas repetidas de un bloque con Counter y
+    después aplica cada clave distinta, así que el costo por evento es casi
+    solo el de separar la línea. Las consultas se pueden hacer desde otros
+    hilos mientras se ingiere: cada bloque se aplica completo bajo un candado.
+    """
+
+    def __init__(self, campanas=(), ancho_sketch=1 << 16, profundidad_sketch=4):
+        """
+        Inicializa el agregador.
+
+        Args:
+            campanas (iterable): Campañas a las que se atribuyen los eventos.
+            ancho_sketch (int, optional): Ancho de los count-min sketch por anuncio.
+            profundidad_sketch (int, optional): Filas de los count-min sketch por anuncio.
+        """
+        self._tipos = {campana.nombre.encode("utf-8"): tuple(anuncio.tipo for anuncio in campana.anuncios)
+                       for campana in campanas}
+        self._por_anuncio = (SketchConteos(ancho_sketch, profundidad_sketch),
+                             SketchConteos(ancho_sketch, profundidad_sketch))
+        self._por_tipo = {}
+        self._por_segundo = VentanaCircular(3600, 1)
+        self._por_dia = VentanaCircular(400, SEGUNDOS_DIA)
+        self.totales = [0, 0]
+        self.sin_atribuir = 0
+        self.invalidos = 0
+        self._candado = threading.Lock()
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado["_candado"]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._candado = threading.Lock()
+
+    def procesar(self, lineas):
+        """
+        Agrega un bloque de eventos.
+
+        Args:
+            lineas (list): Líneas en bytes, con o sin salto de línea final.
+
+        Returns:
+            int: Cantidad de líneas procesadas, válidas o no.
+        """
+        partes = [linea.split(b",") for linea in lineas]
+        invalidos = 0
+        try:
+            momentos, eventos, campanas, anuncios, *_ = zip(*partes)
+        except ValueError:
+            validas = [parte for parte in partes if len(parte) >= 4]
+            invalidos = len(partes) - len(validas)
+            if not validas:
+                with self._candado:
+                    self.invalidos += invalidos
+                return len(lineas)
+            momentos, eventos, campanas, anuncios, *_ = zip(*validas)
+        por_anuncio = Counter(zip(campanas, anuncios, eventos))
+        por_momento = Counter(zip(momentos, eventos))
+
+        with self._candado:
+            sketches = self._por_anuncio
+            for (campana, anuncio, evento), cantidad in por_anuncio.items():
+                indice = EVENTOS.get(evento)
+                if indice is None:
+                    continue
+                tipos = self._tipos.get(campana)
+                try:
+                    posicion = int(anuncio)
+                    tipo = tipos[posicion] if tipos is not None and posicion >= 0 else None
+                except (ValueError, IndexError):
+                    tipo = None
+                if tipo is None:
+                    self.sin_atribuir += cantidad
+                    continue
+                sketches[indice].agregar(b"%s\x00%d" % (campana, posicion), cantidad)
+                conteos = self._por_tipo.get(tipo)
+                if conteos is None:
+                    conteos = self._por_tipo[tipo] = [0, 0]
+                conteos[indice] += cantidad
+
+            for (momento, evento), cantidad in por_momento.items():
+                indice = EVENTOS.get(evento)
+                try:
+                    segundo = int(momento)
+                except ValueError:
+                    indice = None
+                if indice is None:
+                    invalidos += cantidad
+                    continue
+                self.totales[indice] += cantidad
+                self._por_segundo.agregar(segundo, indice, cantidad)
+                self._por_dia.agregar(segundo, indice, cantidad)
+            self.invalidos += invalidos
+        return len(lineas)
+
+    def conteo(self, campana, posicion):
+        """
+        Estima las impresiones y clics de un anuncio (nunca por debajo del real).
+
+        Args:
+            campana (str): Nombre de la campaña.
+            posicion (int): Posición del anuncio en la campaña, desde 0.
+
+        Returns:
+            tuple: (impresiones, clics).
+        """
+        clave = b"%s\x00%d" % (campana.encode("utf-8"), posicion)
+        with self._candado:
+            return tuple(sketch.estimar(clave) for sketch in self._por_anuncio)
+
+    def por_tipo(self):
+        """
+        Regresa las impresiones y clics por tipo de anuncio.
+
+        Returns:
+            dict: Nombre del tipo -> (impresiones, clics).
+        """
+        with self._candado:
+            return {tipo: tuple(conteos) for tipo, conteos in self._por_tipo.items()}
+
+    def por_dia(self):
+        """
+        Regresa las impresiones y clics de cada día con eventos, en UTC.
+
+        Returns:
+            dict: date -> (impresiones, clics), en orden de fecha.
+        """
+        with self._candado:
+            intervalos = self._por_dia.intervalos()
+        return {_EPOCA + timedelta(seconds=inicio): (impresiones, clics) for inicio, impresiones, clics in intervalos}
+
+    def ultimos(self, segundos, ahora):
+        """
+        Suma las impresiones y clics de los últimos segundos (como mucho una hora).
+
+        Args:
+            segundos (int): Largo del período.
+            ahora (int): Momento de referencia, en segundos desde la época.
+
+        Returns:
+            tuple: (impresiones, clics).
+        """
+        with self._candado:
+            intervalos = self._por_segundo.intervalos(ahora - segundos + 1, ahora + 1)
+        return sum(fila[1] for fila in intervalos), sum(fila[2] for fila in intervalos)
+
+    def combinar(self, otro):
+        """Suma los conteos de otro agregador, por ejemplo el de otro proceso."""
+        with self._candado:
+            for propio, ajeno in zip(self._por_anuncio, otro._por_anuncio):
+                propio.combinar(ajeno)
+            for tipo, conteos in otro._por_tipo.items():
+                propios = self._por_tipo.setdefault(tipo, [0, 0])
+                propios[0] += conteos[0]
+                propios[1] += conteos[1]
+            self._por_segundo.combinar(otro._por_segundo)
+            self._por_dia.combinar(otro._por_dia)
+            self.totales = [a + b for a, b in zip(self.totales, otro.totales)]
+            self.sin_atribuir += otro.sin_atribuir
+            self.invalidos += otro.invalidos
+
+
+def _bloques_de_lineas(archivo, limite=None):
+    """
+    Lee un archivo binario por bloques de líneas completas.
+
+    Args:
+        archivo (archivo binario): Archivo abierto, en la posición donde empezar.
+        limite (int, optional): Bytes a leer; la línea que cruza el límite se lee completa.
+
+    Yields:
+        list: Líneas sin el salto de línea.
+    """
+    resto = b""
+    leidos = 0
+    while limite is None or leidos < limite:
+        datos = archivo.read(TAMANO_LECTURA if limite is None else min(TAMANO_LECTURA, limite - leidos))
+        if not datos:
+            break
+        leidos += len(datos)
+        datos = resto + datos
+        corte = datos.rfind(b"\n") + 1
+        resto = datos[corte:]
+        if corte:
+            yield datos[:corte].splitlines()
+    if resto and limite is not None:
+        resto += archivo.readline()
+    if resto.rstrip(b"\n"):
+        yield [resto.rstrip(b"\n")]
+
+
+def ingerir(archivo, agregador):
+    """
+    Agrega todos los eventos de un archivo, por bloques de TAMANO_LECTURA bytes.
+
+    Args:
+        archivo (str | archivo binario): Ruta o archivo abierto en modo binario.
+        agregador (Agregador): Agregador que recibe los eventos.
+
+    Returns:
+        int: Cantidad de líneas procesadas.
+    """
+    if isinstance(archivo, (str, os.PathLike)):
+        with open(archivo, "rb") as abierto:
+            return ingerir(abierto, agregador)
+    return sum(agregador.procesar(lineas) for lineas in _bloques_de_lineas(archivo))
+
+
+def _agregar_rango(ruta, desde, hasta, tipos, ancho_sketch, profundidad_sketch):
+    """Agrega las líneas que empiezan entre desde y hasta en un Agregador nuevo (se corre en otro proceso)."""
+    agregador = Agregador(ancho_sketch=ancho_sketch, profundidad_sketch=profundidad_sketch)
+    agregador._tipos = tipos
+    with open(ruta, "rb") as archivo:
+        if desde:
+            # La línea que cruza desde es del rango anterior: se salta hasta el próximo salto.
+            archivo.seek(desde - 1)
+            archivo.readline()
+        inicio = archivo.tell()
+        if inicio < hasta:
+            for lineas in _bloques_de_lineas(archivo, hasta - inicio):
+                agregador.procesar(lineas)
+    return agregador
+
+
+def ingerir_paralelo(ruta, agregador, max_procesos=None):
+    """
+    Agrega los eventos de un archivo repartiéndolo entre varios procesos.
+
+    El archivo se corta en rangos de bytes alineados a líneas; cada proceso los
+    agrega en un Agregador propio, con los mismos anuncios y dimensiones, y al
+    final se combinan en el agregador dado.
+
+    Args:
+        ruta (str): Ruta del archivo de eventos.
+        agregador (Agregador): Agregador que recibe la suma; puede tener eventos previos.
+        max_procesos (int, optional): Procesos a usar. Por defecto, uno por núcleo.
+
+    Returns:
+        int: Cantidad de líneas procesadas.
+    """
+    procesos = max_procesos or os.cpu_count() or 1
+    tamano = os.path.getsize(ruta)
+    cortes = sorted({tamano * i // procesos for i in range(procesos + 1)})
+    sketch = agregador._por_anuncio[0]
+    tareas = [(_agregar_rango, (ruta, desde, hasta, agregador._tipos, sketch.ancho, sketch.profundidad))
+              for desde, hasta in zip(cortes, cortes[1:])]
+    antes = sum(agregador.totales) + agregador.invalidos
+    for parcial in ejecutar_en_pool(tareas, procesos):
+        agregador.combinar(parcial)
+    return sum(agregador.totales) + agregador.invalidos - antes
+
+
+async def servir(agregador, host="127.0.0.1", puerto=9090):
+    """
+    Recibe eventos por TCP: cada conexión envía líneas de eventos hasta cerrarse.
+
+    Los eventos se agregan a medida que llegan, de a bloques, así que el
+    agregador se puede consultar mientras tanto.
+
+    Args:
+        agregador (Agregador): Agregador que recibe los eventos.
+        host (str, optional): Dirección donde escuchar. Por defecto, solo la local.
+        puerto (int, optional): Puerto; 0 elige uno libre.
+
+    Returns:
+        asyncio.Server: El servidor; su puerto real está en sockets[0].getsockname().
+    """
+    async def atender(lector, escritor):
+        try:
+            resto = b""
+            while True:
+                datos = await lector.read(TAMANO_LECTURA)
+                if not datos:
+                    break
+                datos = resto + datos
+                corte = datos.rfind(b"\n") + 1
+                resto = datos[corte:]
+                if corte:
+                    agregador.procesar(datos[:corte].splitlines())
+            if resto:
+                agregador.procesar([resto])
+        finally:
+            escritor.close()
+
+    return await asyncio.start_server(atender, host, puerto)
@@ -0,0 +1,297 @@
+import struct
+import zlib
+from collections import namedtuple
+
+FIRMA_PNG = b"\x89PNG\r\n\x1a\n"
+FIRMA_JPEG = b"\xff\xd8"
+
+# Chunks auxiliares de PNG que afectan cómo se ve la imagen; el resto (tEXt,
+# zTXt, iTXt, tIME, eXIf...) son metadatos y se pueden descartar.
+CHUNKS_VISUALES = frozenset((b"PLTE", b"tRNS", b"cHRM", b"gAMA", b"iCCP", b"sBIT",
+                             b"sRGB", b"pHYs", b"acTL", b"fcTL", b"fdAT"))
+
+CANALES_PNG = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+Imagen = namedtuple("Imagen", ["ancho", "alto", "canales", "pixeles"])
+Imagen.__doc__ = """Imagen decodificada de 8 bits por canal: tamaño, canales (1-4) y píxeles por filas."""
+
+
+def formato(datos):
+    """
+    Detecta el formato de una imagen por su firma.
+
+    Args:
+        datos (bytes): Contenido del archivo, o al menos sus primeros bytes.
+
+    Returns:
+        str | None: "png", "jpeg" o None si no se reconoce.
+    """
+    if datos.startswith(FIRMA_PNG):
+        return "png"
+    if datos.startswith(FIRMA_JPEG):
+        return "jpeg"
+    return None
+
+
+def leer_chunks_png(datos):
+    """
+    Separa un PNG en sus chunks.
+
+    Args:
+        datos (bytes): Contenido completo del archivo PNG.
+
+    Returns:
+        list: Tuplas (tipo, contenido) en orden, terminando en IEND.
+
+    Raises:
+        ValueError: Si el archivo no es un PNG o está truncado.
+    """
+    if not datos.startswith(FIRMA_PNG):
+        raise ValueError("El archivo no es un PNG.")
+    chunks = []
+    posicion = len(FIRMA_PNG)
+    vista = memoryview(datos)
+    while posicion + 8 <= len(datos):
+        largo, tipo = struct.unpack_from(">I4s", datos, posicion)
+        inicio = posicion + 8
+        fin = inicio + largo
+        if fin + 4 > len(datos):
+            raise ValueError(f"Chunk {tipo!r} truncado.")
+        chunks.append((tipo, vista[inicio:fin]))
+        posicion = fin + 4
+        if tipo == b"IEND":
+            return chunks
+    raise ValueError("El PNG no tiene chunk IEND.")
+
+
+def escribir_chunk_png(tipo, contenido):
+    """Serializa un chunk PNG con su largo y su CRC."""
+    return b"".join((struct.pack(">I", len(contenido)), tipo, contenido,
+                     struct.pack(">I", zlib.crc32(contenido, zlib.crc32(tipo)))))
+
+
+def recomprimir_png(datos, nivel=9):
+    """
+    Recomprime los datos de imagen de un PNG sin pérdida y descarta sus metadatos.
+
+    Los chunks IDAT se unen, se descomprimen y se vuelven a comprimir con zlib
+    en un único IDAT. Los píxeles no cambian.
+
+    Args:
+        datos (bytes): Contenido del PNG.
+        nivel (int, optional): Nivel de compresión de zlib (0-9). Por defecto es 9.
+
+    Returns:
+        bytes: El PNG recomprimido.
+
+    Raises:
+        ValueError: Si el archivo no es un PNG válido.
+    """
+    chunks = leer_chunks_png(datos)
+    idat = b"".join(contenido for tipo, contenido in chunks if tipo == b"IDAT")
+    try:
+        crudo = zlib.decompress(idat)
+    except zlib.error as e:
+        raise ValueError(f"Datos de imagen PNG dañados: {e}") from None
+    compresor = zlib.compressobj(nivel, zlib.DEFLATED, 15, 9)
+    nuevo_idat = compresor.compress(crudo) + compresor.flush()
+
+    partes = [FIRMA_PNG]
+    idat_escrito = False
+    for tipo, contenido in chunks:
+        if tipo == b"IDAT":
+            if not idat_escrito:
+                partes.append(escribir_chunk_png(b"IDAT", nuevo_idat))
+                idat_escrito = True
+        elif tipo in (b"IHDR", b"IEND") or tipo in CHUNKS_VISUALES:
+            partes.append(escribir_chunk_png(tipo, bytes(contenido)))
+    return b"".join(partes)
+
+
+def limpiar_jpeg(datos):
+    """
+    Quita los metadatos de un JPEG sin recodificarlo.
+
+    Se descartan los comentarios y los segmentos APP1-APP15 (EXIF, XMP,
+    miniaturas...), salvo el perfil de color ICC (APP2) y el segmento Adobe
+    (APP14), que cambian cómo se ve la imagen. Los datos comprimidos se copian
+    tal cual.
+
+    Args:
+        datos (bytes): Contenido del JPEG.
+
+    Returns:
+        bytes: El JPEG sin metadatos.
+
+    Raises:
+        ValueError: Si el archivo no es un JPEG válido.
+    """
+    if not datos.startswith(FIRMA_JPEG):
+        raise ValueError("El archivo no es un JPEG.")
+    partes = [FIRMA_JPEG]
+    posicion = 2
+    while posicion + 4 <= len(datos):
+        if datos[posicion] != 0xFF:
+            raise ValueError("Marcador JPEG no válido.")
+        marcador = datos[posicion + 1]
+        if marcador == 0xFF:
+            posicion += 1
+            continue
+        largo = struct.unpack_from(">H", datos, posicion + 2)[0]
+        fin = posicion + 2 + largo
+        if marcador == 0xDA:
+            # Inicio de los datos comprimidos: el resto del archivo se copia entero.
+            partes.append(datos[posicion:])
+            return b"".join(partes)
+        segmento = datos[posicion:fin]
+        descartar = marcador == 0xFE or (
+            0xE1 <= marcador <= 0xEF
+            and not (marcador == 0xE2 and segmento[4:16] == b"ICC_PROFILE\x00")
+            and marcador != 0xEE
+        )
+        if not descartar:
+            partes.append(segmento)
+        posicion = fin
+    raise ValueError("El JPEG no tiene datos de imagen.")
+
+
+def _paeth(a, b, c):
+    """Predictor Paeth del formato PNG."""
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _desfiltrar(crudo, largo_fila, alto, bpp):
+    """Deshace los filtros por fila de un PNG y regresa los píxeles sin filtro."""
+    salida = bytearray(largo_fila * alto)
+    previa = bytes(largo_fila)
+    posicion = 0
+    for y in range(alto):
+        filtro = crudo[posicion]
+        fila = bytearray(crudo[posicion + 1:posicion + 1 + largo_fila])
+        posicion += 1 + largo_fila
+        if filtro == 1:
+            for i in range(bpp, largo_fila):
+                fila[i] = (fila[i] + fila[i - bpp]) & 0xFF
+        elif filtro == 2:
+            fila = bytearray((a + b) & 0xFF for a, b in zip(fila, previa))
+        elif filtro == 3:
+            for i in range(largo_fila):
+                izquierda = fila[i - bpp] if i >= bpp else 0
+                fila[i] = (fila[i] + ((izquierda + previa[i]) >> 1)) & 0xFF
+        elif filtro == 4:
+            for i in range(largo_fila):
+                if i >= bpp:
+                    fila[i] = (fila[i] + _paeth(fila[i - bpp], previa[i], previa[i - bpp])) & 0xFF
+                else:
+                    fila[i] = (fila[i] + previa[i]) & 0xFF
+        elif filtro != 0:
+            raise ValueError(f"Filtro PNG {filtro} no válido.")
+        salida[y * largo_fila:(y + 1) * largo_fila] = fila
+        previa = fila
+    return salida
+
+
+def decodificar_png(datos):
+    """
+    Decodifica un PNG de 8 bits por canal sin entrelazado.
+
+    Las imágenes con paleta se expanden a RGB, o a RGBA si la paleta tiene
+    transparencia.
+
+    Args:
+        datos (bytes): Contenido del PNG.
+
+    Returns:
+        Imagen: La imagen decodificada.
+
+    Raises:
+        ValueError: Si el PNG no es válido o usa una variante no soportada.
+    """
+    chunks = leer_chunks_png(datos)
+    if chunks[0][0] != b"IHDR":
+        raise ValueError("El PNG no comienza con IHDR.")
+    ancho, alto, profundidad, color, _, _, entrelazado = struct.unpack(">IIBBBBB", chunks[0][1])
+    if profundidad != 8 or entrelazado or color not in CANALES_PNG:
+        raise ValueError("Solo se decodifican PNG de 8 bits por canal sin entrelazado.")
+    canales = CANALES_PNG[color]
+    try:
+        crudo = zlib.decompress(b"".join(c for tipo, c in chunks if tipo == b"IDAT"))
+    except zlib.error as e:
+        raise ValueError(f"Datos de imagen PNG dañados: {e}") from None
+    if len(crudo) < (ancho * canales + 1) * alto:
+        raise ValueError("Datos de imagen PNG incompletos.")
+    pixeles = _desfiltrar(crudo, ancho * canales, alto, canales)
+
+    if color == 3:
+        auxiliares = {tipo: bytes(c) for tipo, c in chunks if tipo in (b"PLTE", b"tRNS")}
+        paleta = auxiliares.get(b"PLTE", b"")
+        alfas = auxiliares.get(b"tRNS")
+        colores = [paleta[i:i + 3] for i in range(0, len(paleta), 3)]
+        if alfas is not None:
+            colores = [rgb + bytes((alfas[i] if i < len(alfas) else 255,))
+                       for i, rgb in enumerate(colores)]
+        canales = 4 if alfas is not None else 3
+        colores += [bytes(canales)] * (256 - len(colores))
+        pixeles = b"".join(map(colores.__getitem__, pixeles))
+    return Imagen(ancho, alto, canales, bytes(pixeles))
+
+
+def codificar_png(imagen, nivel=6):
+    """
+    Codifica una imagen como PNG sin filtros.
+
+    Args:
+        imagen (Imagen): Imagen a codificar.
+        nivel (int, optional): Nivel de compresión de zlib. Por defecto es 6.
+
+    Returns:
+        bytes: El archivo PNG.
+    """
+    color = {1: 0, 2: 4, 3: 2, 4: 6}[imagen.canales]
+    largo = imagen.ancho * imagen.canales
+    pixeles = imagen.pixeles
+    crudo = b"".join(b"\x00" + pixeles[y * largo:(y + 1) * largo] for y in range(imagen.alto))
+    ihdr = struct.pack(">IIBBBBB", imagen.ancho, imagen.alto, 8, color, 0, 0, 0)
+    return b"".join((FIRMA_PNG, escribir_chunk_png(b"IHDR", ihdr),
+                     escribir_chunk_png(b"IDAT", zlib.compress(crudo, nivel)),
+                     escribir_chunk_png(b"IEND", b"")))
+
+
+def redimensionar(imagen, ancho, alto):
+    """
+    Escala una imagen para cubrir ancho x alto y recorta el centro.
+
+    Usa vecino más cercano: cada fila de destino se arma con una sola pasada en C
+    sobre una tabla de índices precalculada, y las filas de origen repetidas se
+    reutilizan.
+
+    Args:
+        imagen (Imagen): Imagen de origen.
+        ancho (int): Ancho de destino.
+        alto (int): Alto de destino.
+
+    Returns:
+        Imagen: La imagen redimensionada.
+    """
+    escala = max(ancho / imagen.ancho, alto / imagen.alto)
+    x0 = (imagen.ancho - ancho / escala) / 2
+    y0 = (imagen.alto - alto / escala) / 2
+    canales = imagen.canales
+    columnas = [min(int(x0 + (x + 0.5) / escala), imagen.ancho - 1) for x in range(ancho)]
+    indices = [columna * canales + k for columna in columnas for k in range(canales)]
+    largo = imagen.ancho * canales
+    pixeles = imagen.pixeles
+    filas = []
+    anterior, fila_anterior = -1, b""
+    for y in range(alto):
+        origen = min(int(y0 + (y + 0.5) / escala), imagen.alto - 1)
+        if origen != anterior:
+            fila = pixeles[origen * largo:(origen + 1) * largo]
+            fila_anterior = bytes(map(fila.__getitem__, indices))
+            anterior = origen
+        filas.append(fila_anterior)
+    return Imagen(ancho, alto, canales, b"".join(filas))
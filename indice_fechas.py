@@ -0,0 +1,258 @@
+import random
+from datetime import date, timedelta
+from itertools import count
+from lista_ordenada import ListaOrdenada
+
+SIN_INICIO = 0
+SIN_TERMINO = date.max.toordinal() + 1
+
+
+def _inicio(fecha):
+    """Convierte una fecha de inicio en ordinal; None es el comienzo de los tiempos."""
+    return fecha.toordinal() if fecha is not None else SIN_INICIO
+
+
+def _termino(fecha):
+    """Convierte una fecha de término en ordinal; None es una campaña sin fin."""
+    return fecha.toordinal() if fecha is not None else SIN_TERMINO
+
+
+class _Nodo:
+    """Nodo del treap de intervalos, ordenado por (inicio, uid) y aumentado con el término máximo."""
+
+    __slots__ = ("clave", "fin", "max_fin", "prioridad", "izq", "der", "campana")
+
+    def __init__(self, clave, fin, campana):
+        self.clave = clave
+        self.fin = fin
+        self.max_fin = fin
+        self.prioridad = random.random()
+        self.izq = None
+        self.der = None
+        self.campana = campana
+
+    def actualizar(self):
+        """Recalcula el término máximo del subárbol."""
+        maximo = self.fin
+        if self.izq is not None and self.izq.max_fin > maximo:
+            maximo = self.izq.max_fin
+        if self.der is not None and self.der.max_fin > maximo:
+            maximo = self.der.max_fin
+        self.max_fin = maximo
+
+
+def _dividir(nodo, clave):
+    """Divide el treap en (claves < clave, claves >= clave)."""
+    if nodo is None:
+        return None, None
+    if nodo.clave < clave:
+        izq, der = _dividir(nodo.der, clave)
+        nodo.der = izq
+        nodo.actualizar()
+        return nodo, der
+    izq, der = _dividir(nodo.izq, clave)
+    nodo.izq = der
+    nodo.actualizar()
+    return izq, nodo
+
+
+def _unir(a, b):
+    """Une dos treaps donde todas las claves de a son menores que las de b."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prioridad > b.prioridad:
+        a.der = _unir(a.der, b)
+        a.actualizar()
+        return a
+    b.izq = _unir(a, b.izq)
+    b.actualizar()
+    return b
+
+
+class CampanaIndex:
+    """
+    Índice de intervalos sobre las fechas de inicio y término de las campañas.
+
+    Las campañas se guardan en un treap ordenado por fecha de inicio, donde cada
+    nodo conoce el término máximo de su subárbol; las consultas descartan ramas
+    completas que terminan antes del rango buscado, con costo O(log n + k) en los
+    casos habituales. Una lista ordenada por bloques según la fecha de término
+    responde "terminan dentro de N días" con una búsqueda binaria más el recorrido
+    de los resultados.
+
+    Las fechas en None se consideran abiertas. El índice se suscribe a cada
+    campaña, así que los cambios en fecha_inicio y fecha_termino lo actualizan
+    automáticamente.
+    """
+
+    def __init__(self, campanas=()):
+        """
+        Inicializa el índice.
+
+        Args:
+            campanas (iterable, optional): Campañas iniciales; se cargan en O(n log n).
+        """
+        self._uids = count()
+        self._nodos = {}
+        nodos = [self._crear_nodo(campana) for campana in dict.fromkeys(campanas)]
+        nodos.sort(key=lambda nodo: nodo.clave)
+        self._fines = ListaOrdenada((nodo.fin, nodo.clave[1], nodo.campana) for nodo in nodos)
+        self._raiz = self._construir(nodos)
+
+    def _crear_nodo(self, campana):
+        """Crea el nodo de una campaña, lo registra y se suscribe a sus cambios."""
+        nodo = _Nodo((_inicio(campana.fecha_inicio), next(self._uids)),
+                     _termino(campana.fecha_termino), campana)
+        self._nodos[campana] = nodo
+        campana.suscribir(self._al_cambiar)
+        return nodo
+
+    @staticmethod
+    def _construir(nodos):
+        """Construye un treap en O(n) a partir de nodos ordenados por clave."""
+        pila = []
+        for nodo in nodos:
+            ultimo = None
+            while pila and pila[-1].prioridad < nodo.prioridad:
+                ultimo = pila.pop()
+            nodo.izq = ultimo
+            if pila:
+                pila[-1].der = nodo
+            pila.append(nodo)
+        raiz = pila[0] if pila else None
+        # Recalcula los máximos en post-orden sin recursión.
+        pendientes = [(raiz, False)] if raiz is not None else []
+        while pendientes:
+            nodo, visitado = pendientes.pop()
+            if visitado:
+                nodo.actualizar()
+                continue
+            pendientes.append((nodo, True))
+            for hijo in (nodo.izq, nodo.der):
+                if hijo is not None:
+                    pendientes.append((hijo, False))
+        return raiz
+
+    def _insertar_nodo(self, nodo):
+        """Inserta un nodo en el treap."""
+        izq, der = _dividir(self._raiz, nodo.clave)
+        self._raiz = _unir(_unir(izq, nodo), der)
+
+    def _quitar_nodo(self, nodo):
+        """Quita un nodo del treap."""
+        inicio, uid = nodo.clave
+        izq, resto = _dividir(self._raiz, nodo.clave)
+        _, der = _dividir(resto, (inicio, uid + 1))
+        self._raiz = _unir(izq, der)
+        nodo.izq = nodo.der = None
+        nodo.max_fin = nodo.fin
+
+    def agregar(self, campana):
+        """Agrega una campaña al índice (si ya estaba, no hace nada)."""
+        if campana not in self._nodos:
+            nodo = self._crear_nodo(campana)
+            self._fines.agregar((nodo.fin, nodo.clave[1], campana))
+            self._insertar_nodo(nodo)
+
+    def eliminar(self, campana):
+        """
+        Elimina una campaña del índice.
+
+        Raises:
+            KeyError: Si la campaña no está en el índice.
+        """
+        nodo = self._nodos.pop(campana)
+        self._quitar_nodo(nodo)
+        self._fines.quitar((nodo.fin, nodo.clave[1]))
+        campana.desuscribir(self._al_cambiar)
+
+    def _al_cambiar(self, campana, campo, anterior, nuevo):
+        """Reubica la campaña cuando cambia alguna de sus fechas."""
+        if campo not in ("fecha_inicio", "fecha_termino"):
+            return
+        nodo = self._nodos[campana]
+        uid = nodo.clave[1]
+        self._fines.quitar((nodo.fin, uid))
+        if campo == "fecha_termino":
+            # La clave no cambia: basta con recalcular los máximos del camino.
+            camino = []
+            actual = self._raiz
+            while actual is not nodo:
+                camino.append(actual)
+                actual = actual.izq if nodo.clave < actual.clave else actual.der
+            nodo.fin = _termino(campana.fecha_termino)
+            nodo.actualizar()
+            for ancestro in reversed(camino):
+                ancestro.actualizar()
+        else:
+            self._quitar_nodo(nodo)
+            nodo.clave = (_inicio(campana.fecha_inicio), uid)
+            self._insertar_nodo(nodo)
+        self._fines.agregar((nodo.fin, uid, campana))
+
+    def __len__(self):
+        return len(self._nodos)
+
+    def __contains__(self, campana):
+        return campana in self._nodos
+
+    def _intervalos(self, desde, hasta):
+        """Recorre en orden de inicio las campañas con inicio <= hasta y término >= desde."""
+        resultado = []
+        pila = []
+        nodo = self._raiz
+        while True:
+            while nodo is not None and nodo.max_fin >= desde:
+                pila.append(nodo)
+                nodo = nodo.izq
+            if not pila:
+                return resultado
+            nodo = pila.pop()
+            if nodo.clave[0] > hasta:
+                return resultado
+            if nodo.fin >= desde:
+                resultado.append(nodo.campana)
+            nodo = nodo.der
+
+    def activas_en(self, fecha):
+        """
+        Regresa las campañas activas en una fecha, ordenadas por fecha de inicio.
+
+        Args:
+            fecha (date): Fecha consultada.
+
+        Returns:
+            list: Campañas cuyo intervalo [inicio, término] contiene la fecha.
+        """
+        ordinal = fecha.toordinal()
+        return self._intervalos(ordinal, ordinal)
+
+    def superpuestas(self, desde=None, hasta=None):
+        """
+        Regresa las campañas cuyo intervalo se superpone con [desde, hasta].
+
+        Args:
+            desde (date, optional): Inicio del rango; None lo deja abierto.
+            hasta (date, optional): Término del rango; None lo deja abierto.
+
+        Returns:
+            list: Campañas ordenadas por fecha de inicio.
+        """
+        return self._intervalos(_inicio(desde), _termino(hasta))
+
+    def terminan_dentro_de(self, dias, desde=None):
+        """
+        Regresa las campañas que terminan dentro de los próximos días.
+
+        Args:
+            dias (int): Cantidad de días hacia adelante, incluido el último.
+            desde (date, optional): Fecha de referencia. Por defecto es hoy.
+
+        Returns:
+            list: Campañas con término entre desde y desde + dias, ordenadas por término.
+        """
+        desde = desde if desde is not None else date.today()
+        hasta = (desde + timedelta(days=dias)).toordinal()
+        return [campana for _, _, campana in self._fines.rango((desde.toordinal(),), (hasta, float("inf")))]
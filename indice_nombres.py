@@ -0,0 +1,140 @@
+from itertools import count, islice
+from lista_ordenada import ListaOrdenada
+
+
+class IndiceNombres:
+    """
+    Índice de campañas por nombre: búsqueda exacta y por prefijo.
+
+    La búsqueda exacta usa un diccionario (O(1)) y distingue mayúsculas. La
+    búsqueda por prefijo, pensada para autocompletar, recorre una lista ordenada
+    por el nombre normalizado con casefold, así que no distingue mayúsculas y
+    cuesta O(log n + k) para k resultados.
+
+    El índice se suscribe a cada campaña: al cambiar su nombre con el setter se
+    reubica solo. Un nombre de más de 250 caracteres lanza LargoExcedidoException
+    antes de notificar, por lo que el índice nunca ve un nombre inválido.
+    """
+
+    def __init__(self, campanas=()):
+        """
+        Inicializa el índice.
+
+        Args:
+            campanas (iterable, optional): Campañas iniciales.
+        """
+        self._uids = count()
+        self._claves = {}
+        self._exactos = {}
+        entradas = [self._registrar(campana) for campana in dict.fromkeys(campanas)]
+        self._ordenados = ListaOrdenada(entradas)
+
+    def _registrar(self, campana):
+        """Registra una campaña en el índice exacto, se suscribe y regresa su entrada ordenada."""
+        uid = next(self._uids)
+        nombre = campana.nombre
+        self._claves[campana] = uid
+        self._exactos.setdefault(nombre, {})[campana] = None
+        campana.suscribir(self._al_cambiar)
+        return (nombre.casefold(), uid, campana)
+
+    def _quitar_exacto(self, campana, nombre):
+        """Quita una campaña del índice exacto."""
+        mismas = self._exactos[nombre]
+        del mismas[campana]
+        if not mismas:
+            del self._exactos[nombre]
+
+    def agregar(self, campana):
+        """Agrega una campaña al índice (si ya estaba, no hace nada)."""
+        if campana not in self._claves:
+            self._ordenados.agregar(self._registrar(campana))
+
+    def eliminar(self, campana):
+        """
+        Elimina una campaña del índice.
+
+        Raises:
+            KeyError: Si la campaña no está en el índice.
+        """
+        uid = self._claves.pop(campana)
+        self._quitar_exacto(campana, campana.nombre)
+        self._ordenados.quitar((campana.nombre.casefold(), uid))
+        campana.desuscribir(self._al_cambiar)
+
+    def _al_cambiar(self, campana, campo, anterior, nuevo):
+        """Reubica la campaña cuando cambia su nombre."""
+        if campo != "nombre":
+            return
+        uid = self._claves[campana]
+        self._quitar_exacto(campana, anterior)
+        self._exactos.setdefault(nuevo, {})[campana] = None
+        self._ordenados.quitar((anterior.casefold(), uid))
+        self._ordenados.agregar((nuevo.casefold(), uid, campana))
+
+    def __len__(self):
+        return len(self._claves)
+
+    def __contains__(self, campana):
+        return campana in self._claves
+
+    def buscar(self, nombre):
+        """
+        Busca una campaña por su nombre exacto.
+
+        Args:
+            nombre (str): Nombre de la campaña.
+
+        Returns:
+            Campana | None: La primera campaña indexada con ese nombre, o None.
+        """
+        mismas = self._exactos.get(nombre)
+        return next(iter(mismas)) if mismas else None
+
+    def buscar_todas(self, nombre):
+        """
+        Busca todas las campañas con un nombre exacto.
+
+        Returns:
+            list: Campañas con ese nombre, en orden de indexación.
+        """
+        return list(self._exactos.get(nombre, ()))
+
+    def _con_prefijo(self, prefijo):
+        """Recorre en orden las campañas cuyo nombre normalizado comienza con el prefijo."""
+        prefijo = prefijo.casefold()
+        for clave, _, campana in self._ordenados.desde((prefijo,)):
+            if not clave.startswith(prefijo):
+                return
+            yield campana
+
+    def con_prefijo(self, prefijo, limite=None):
+        """
+        Regresa las campañas cuyo nombre comienza con un prefijo, sin distinguir mayúsculas.
+
+        Args:
+            prefijo (str): Prefijo buscado; "" regresa todas las campañas.
+            limite (int, optional): Cantidad máxima de resultados. Por defecto no hay límite.
+
+        Returns:
+            list: Campañas ordenadas por nombre.
+        """
+        return list(islice(self._con_prefijo(prefijo), limite))
+
+    def autocompletar(self, prefijo, limite=10):
+        """
+        Sugiere nombres de campañas que comienzan con un prefijo.
+
+        Args:
+            prefijo (str): Texto escrito hasta ahora.
+            limite (int, optional): Cantidad máxima de sugerencias. Por defecto es 10.
+
+        Returns:
+            list: Nombres sin repetir, ordenados sin distinguir mayúsculas.
+        """
+        nombres = {}
+        for campana in self._con_prefijo(prefijo):
+            if len(nombres) == limite:
+                break
+            nombres[campana.nombre] = None
+        return list(nombres)
@@ -0,0 +1,323 @@
+from collections import namedtuple
+import tipos_anuncio
+from anuncio import Anuncio
+from error import LargoExcedidoException, SubTipoInvalidoException
+from validacion import convertir_fecha, validar_url
+
+COLUMNAS = ("tipo", "sub_tipo", "url_archivo", "url_clic", "duracion", "alto", "ancho")
+CAMPOS_CAMPANA = ("nombre", "fecha_inicio", "fecha_termino")
+CAMPOS_ANUNCIO = ("sub_tipo", "url_archivo", "url_clic", "duracion", "alto", "ancho")
+
+ErrorFila = namedtuple("ErrorFila", ["fila", "campo", "error"])
+ErrorFila.__doc__ = """Error de validación de una fila: posición, campo y excepción sin lanzar."""
+
+LoteAnuncios = namedtuple("LoteAnuncios", ["filas", "clases", "sub_tipos", "urls_archivo",
+                                           "urls_clic", "duraciones", "altos", "anchos"])
+LoteAnuncios.__doc__ = """Columnas de las filas que pasaron la validación, con su posición original."""
+
+
+def a_columnas(filas):
+    """
+    Normaliza la entrada de una carga masiva a un diccionario de columnas.
+
+    Args:
+        filas: Un lote de columnas (dict de nombre -> secuencia) o un iterable de filas,
+            donde cada fila es un dict o una tupla en el orden de COLUMNAS.
+
+    Returns:
+        dict: Nombre de columna -> lista de valores, con todas las columnas de COLUMNAS.
+
+    Raises:
+        ValueError: Si las columnas de un lote no tienen el mismo largo.
+    """
+    if isinstance(filas, dict):
+        largo = max((len(valores) for valores in filas.values()), default=0)
+        columnas = {}
+        for nombre in COLUMNAS:
+            valores = filas.get(nombre)
+            if valores is None:
+                valores = [None] * largo
+            elif len(valores) != largo:
+                raise ValueError(f"La columna '{nombre}' no tiene {largo} valores.")
+            columnas[nombre] = list(valores)
+        return columnas
+
+    columnas = {nombre: [] for nombre in COLUMNAS}
+    agregar = [columnas[nombre].append for nombre in COLUMNAS]
+    for fila in filas:
+        if isinstance(fila, dict):
+            fila = [fila.get(nombre) for nombre in COLUMNAS]
+        else:
+            fila = tuple(fila) + (None,) * (len(COLUMNAS) - len(fila))
+        for agregar_valor, valor in zip(agregar, fila):
+            agregar_valor(valor)
+    return columnas
+
+
+def _entero(valor, defecto):
+    """
+    Convierte un valor de medida a entero; None y los valores no positivos usan el defecto.
+
+    Raises:
+        ValueError: Si el valor no es un número entero.
+    """
+    if valor is None:
+        return defecto
+    if not isinstance(valor, int):
+        try:
+            valor = int(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{valor}' no es un número entero.") from None
+    return valor if valor > 0 else defecto
+
+
+def _urls_validas(urls):
+    """Valida una columna de URLs; los valores None se consideran válidos."""
+    return [url is None or (isinstance(url, str) and validar_url(url)) for url in urls]
+
+
+def _buscar(buscar, claves, defecto):
+    """Aplica buscar (un get o __contains__) a cada clave; las que no se pueden hashear dan defecto."""
+    try:
+        return list(map(buscar, claves))
+    except TypeError:
+        resultados = []
+        for clave in claves:
+            try:
+                resultados.append(buscar(clave))
+            except TypeError:
+                resultados.append(defecto)
+        return resultados
+
+
+def validar_lote(filas):
+    """
+    Valida un lote de anuncios sin construir objetos ni lanzar excepciones.
+
+    Los tipos se resuelven con un solo diccionario, los pares (clase, subtipo) se
+    comprueban contra un conjunto precalculado desde Anuncio.REGISTRO, las URLs
+    pasan por el validador con caché de validacion y solo se crean objetos de
+    excepción para las filas que fallan. Las URLs en None se aceptan, igual que
+    en el constructor de Anuncio.
+
+    Args:
+        filas: Filas o lote de columnas aceptados por a_columnas.
+
+    Returns:
+        tuple: (LoteAnuncios con las filas válidas, lista de ErrorFila).
+    """
+    columnas = a_columnas(filas)
+    tipos = columnas["tipo"]
+    # Los tipos declarados que aún no se usan se importan antes de armar las tablas.
+    tipos_anuncio.cargar({tipo for tipo in tipos if isinstance(tipo, str)}
+                         .difference(clase.__name__ for clase in Anuncio.REGISTRO.clases))
+    registro = Anuncio.REGISTRO
+    por_tipo = {clase.__name__: clase for clase in registro.clases}
+    por_tipo.update({clase: clase for clase in registro.clases})
+    pares_validos = {(clase, sub_tipo) for clase in registro.clases
+                     for sub_tipo in registro.sub_tipos_de(clase)}
+
+    sub_tipos = columnas["sub_tipo"]
+    clases = _buscar(por_tipo.get, tipos, None)
+    pares_ok = _buscar(pares_validos.__contains__, list(zip(clases, sub_tipos)), False)
+    urls_archivo = columnas["url_archivo"]
+    urls_clic = columnas["url_clic"]
+    archivo_ok = _urls_validas(urls_archivo)
+    clic_ok = _urls_validas(urls_clic)
+
+    errores = []
+    validas = []
+    duraciones = []
+    altos = []
+    anchos = []
+    medidas = zip(columnas["duracion"], columnas["alto"], columnas["ancho"])
+    for fila, (clase, ok, (duracion, alto, ancho)) in enumerate(zip(clases, pares_ok, medidas)):
+        if clase is None:
+            errores.append(ErrorFila(fila, "tipo", ValueError(
+                f"Tipo de anuncio '{tipos[fila]}' no válido.")))
+            continue
+        if not ok:
+            errores.append(ErrorFila(fila, "sub_tipo", SubTipoInvalidoException(
+                f"Subtipo '{sub_tipos[fila]}' no válido para {clase.__name__}.")))
+            continue
+        if not archivo_ok[fila]:
+            errores.append(ErrorFila(fila, "url_archivo", ValueError(
+                f"URL '{urls_archivo[fila]}' no válida.")))
+            continue
+        if not clic_ok[fila]:
+            errores.append(ErrorFila(fila, "url_clic", ValueError(
+                f"URL '{urls_clic[fila]}' no válida.")))
+            continue
+        campo = "duracion"
+        try:
+            duracion = _entero(duracion, 5) if hasattr(clase, "duracion") else 0
+            campo = "alto"
+            alto = _entero(alto, 1)
+            campo = "ancho"
+            ancho = _entero(ancho, 1)
+        except ValueError as e:
+            nombre = "Duración" if campo == "duracion" else campo.capitalize()
+            errores.append(ErrorFila(fila, campo, ValueError(f"{nombre} {e}")))
+            continue
+        validas.append(fila)
+        duraciones.append(duracion)
+        altos.append(alto)
+        anchos.append(ancho)
+
+    lote = LoteAnuncios(
+        validas,
+        [clases[i] for i in validas],
+        [sub_tipos[i] for i in validas],
+        [urls_archivo[i] for i in validas],
+        [urls_clic[i] for i in validas],
+        duraciones,
+        altos,
+        anchos,
+    )
+    return lote, errores
+
+
+def construir_anuncios(lote):
+    """
+    Construye los objetos Anuncio de un lote ya validado.
+
+    Args:
+        lote (LoteAnuncios): Filas válidas regresadas por validar_lote.
+
+    Returns:
+        list: Un objeto Anuncio por fila.
+    """
+    anuncios = []
+    agregar = anuncios.append
+    for clase, sub_tipo, url_archivo, url_clic, duracion, alto, ancho in zip(
+        lote.clases, lote.sub_tipos, lote.urls_archivo, lote.urls_clic, lote.duraciones,
+        lote.altos, lote.anchos
+    ):
+        if duracion:
+            anuncio = clase(sub_tipo, url_archivo, url_clic, duracion)
+        else:
+            anuncio = clase(sub_tipo, url_archivo, url_clic)
+        if alto != 1 or ancho != 1:
+            anuncio.alto = alto
+            anuncio.ancho = ancho
+        agregar(anuncio)
+    return anuncios
+
+
+def cargar_anuncios(filas):
+    """
+    Valida y construye un lote de anuncios en una sola pasada.
+
+    Args:
+        filas: Filas o lote de columnas aceptados por a_columnas.
+
+    Returns:
+        tuple: (lista de anuncios válidos, lista de ErrorFila).
+    """
+    lote, errores = validar_lote(filas)
+    return construir_anuncios(lote), errores
+
+
+def cargar_campanas(filas, campanas=None):
+    """
+    Carga masiva de campañas y anuncios desde filas con una columna 'campana'.
+
+    Cada fila es un dict con el nombre de la campaña en 'campana' y los campos del
+    anuncio. Las campañas se crean la primera vez que aparece su nombre. Las filas
+    que no son dict o no traen un nombre de texto se informan como errores.
+
+    Args:
+        filas (iterable): Filas a cargar.
+        campanas (dict, optional): Campañas existentes por nombre, que se completan
+            en lugar de crearse. Por defecto es None.
+
+    Returns:
+        tuple: (dict de nombre -> Campana, lista de ErrorFila con la posición original).
+    """
+    from campana import Campana
+
+    campanas = {} if campanas is None else campanas
+    errores = []
+    por_campana = {}
+    for fila, datos in enumerate(filas):
+        if not isinstance(datos, dict):
+            errores.append(ErrorFila(fila, None, TypeError(
+                f"La fila debe ser un dict, no {type(datos).__name__}.")))
+            continue
+        nombre = datos.get("campana")
+        if not isinstance(nombre, str):
+            errores.append(ErrorFila(fila, "campana", ValueError(
+                "La fila no indica el nombre de la campaña.") if nombre is None else TypeError(
+                f"El nombre de la campaña debe ser texto, no {type(nombre).__name__}.")))
+            continue
+        if nombre not in campanas:
+            try:
+                campanas[nombre] = Campana(nombre)
+            except LargoExcedidoException as e:
+                errores.append(ErrorFila(fila, "campana", e))
+                continue
+        posiciones, grupo = por_campana.setdefault(nombre, ([], []))
+        posiciones.append(fila)
+        grupo.append(datos)
+
+    for nombre, (posiciones, grupo) in por_campana.items():
+        for error in campanas[nombre].agregar_anuncios_bulk(grupo):
+            errores.append(error._replace(fila=posiciones[error.fila]))
+    errores.sort(key=lambda error: error.fila)
+    return campanas, errores
+
+
+def aplicar_edicion(campana, datos):
+    """
+    Aplica una edición a una campaña o, si trae 'anuncio', a uno de sus anuncios.
+
+    Los campos se aplican en orden con los setters de Campana y Anuncio, que hacen
+    la validación; el primero inválido detiene la edición y los anteriores quedan
+    aplicados. Las URLs se validan igual que en la carga masiva.
+
+    Args:
+        campana (Campana): Campaña a editar.
+        datos (dict): La posición del 'anuncio' desde 0 (opcional) y los campos a
+            cambiar de CAMPOS_CAMPANA o, si hay anuncio, de CAMPOS_ANUNCIO.
+
+    Returns:
+        tuple | None: (campo, excepción) si algún campo no es válido, o None.
+    """
+    if datos.get("anuncio") is None:
+        for campo in CAMPOS_CAMPANA:
+            valor = datos.get(campo)
+            if valor is None:
+                continue
+            try:
+                if campo != "nombre":
+                    valor = convertir_fecha(valor)
+                elif not isinstance(valor, str):
+                    raise TypeError(f"El nombre debe ser texto, no {type(valor).__name__}.")
+                setattr(campana, campo, valor)
+            except (LargoExcedidoException, ValueError, TypeError) as e:
+                return campo, e
+        return None
+
+    try:
+        posicion = int(datos["anuncio"])
+        if posicion < 0:
+            raise IndexError(posicion)
+        anuncio = campana.anuncios[posicion]
+    except (ValueError, TypeError, IndexError):
+        return "anuncio", ValueError(f"La campaña no tiene un anuncio en la posición {datos['anuncio']}.")
+    for campo in CAMPOS_ANUNCIO:
+        valor = datos.get(campo)
+        if valor is None:
+            continue
+        if not hasattr(anuncio, campo):
+            return campo, ValueError(f"Un anuncio {anuncio.tipo} no tiene {campo}.")
+        try:
+            if campo.startswith("url_"):
+                if not validar_url(valor):
+                    raise ValueError(f"URL '{valor}' no válida.")
+            elif campo != "sub_tipo":
+                valor = int(valor)
+            setattr(anuncio, campo, valor)
+        except (SubTipoInvalidoException, ValueError, TypeError) as e:
+            return campo, e
+    return None
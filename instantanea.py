@@ -0,0 +1,301 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import date
+import tipos_anuncio
+from almacen import AnuncioStore
+from anuncio import Anuncio
+from campana import Campana
+from trabajos import escribir_atomico
+
+MAGIA = b"CAMPSNAP"
+VERSION = 1
+ALINEACION = 8
+
+# Secciones del archivo, en el orden en que se escriben, con el código de array de sus valores.
+SECCIONES = (
+    ("cadenas_inicio", "Q"),
+    ("cadenas_datos", "B"),
+    ("campana_nombre", "I"),
+    ("campana_inicio", "i"),
+    ("campana_termino", "i"),
+    ("campana_desde", "Q"),
+    ("tipo", "B"),
+    ("sub_tipo", "H"),
+    ("alto", "i"),
+    ("ancho", "i"),
+    ("duracion", "i"),
+    ("url_archivo", "I"),
+    ("url_clic", "I"),
+)
+COLUMNAS_ANUNCIO = tuple(nombre for nombre, _ in SECCIONES[6:])
+
+# Magia, versión, orden de bytes (0 little, 1 big) y largo de los metadatos JSON.
+_CABECERA = struct.Struct("<8sHBxI")
+# Posición y largo en bytes de una sección.
+_SECCION = struct.Struct("<QQ")
+
+
+class CadenasMapeadas(Sequence):
+    """
+    Tabla de cadenas de una instantánea, leída desde el archivo mapeado.
+
+    Cada cadena se decodifica al pedirla. El código 0 es None, igual que en la
+    tabla de AnuncioStore. Las cadenas nuevas que agregan los almacenes al
+    modificarse se guardan en memoria a continuación de las del archivo.
+    """
+
+    def __init__(self, inicios, datos):
+        """
+        Inicializa la tabla.
+
+        Args:
+            inicios (memoryview): Posición de inicio de cada cadena en datos, más una
+                posición final.
+            datos (memoryview): Cadenas concatenadas en UTF-8.
+        """
+        self._inicios = inicios
+        self._datos = datos
+        self._base = len(inicios) - 1
+        self._nuevas = []
+
+    def __len__(self):
+        return self._base + len(self._nuevas)
+
+    def __getitem__(self, codigo):
+        if codigo < 0:
+            codigo += len(self)
+        if codigo >= self._base:
+            return self._nuevas[codigo - self._base]
+        if codigo == 0:
+            return None
+        return str(self._datos[self._inicios[codigo]:self._inicios[codigo + 1]], "utf-8")
+
+    def append(self, cadena):
+        """Agrega una cadena nueva al final de la tabla."""
+        self._nuevas.append(cadena)
+
+    def bytes_usados(self):
+        """
+        Estima la memoria ocupada por la tabla, incluida la parte mapeada.
+
+        Returns:
+            int: Cantidad aproximada de bytes.
+        """
+        total = self._inicios.nbytes + self._datos.nbytes + sys.getsizeof(self._nuevas)
+        return total + sum(sys.getsizeof(cadena) for cadena in self._nuevas if cadena is not None)
+
+
+def _ordinal(fecha):
+    """Convierte una fecha en su ordinal; None es 0."""
+    return fecha.toordinal() if fecha is not None else 0
+
+
+def _fecha(ordinal):
+    """Convierte un ordinal en fecha; 0 es None."""
+    return date.fromordinal(ordinal) if ordinal else None
+
+
+def _alinear(posicion):
+    """Redondea una posición hacia arriba al múltiplo de ALINEACION."""
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+def guardar(campanas, ruta):
+    """
+    Guarda campañas y anuncios en una instantánea binaria.
+
+    Cada atributo se escribe como una columna de ancho fijo (dimensiones,
+    duración, códigos de tipo y subtipo, fechas como ordinales) y los nombres y
+    URLs van en una sola tabla de cadenas. Las campañas respaldadas por un
+    AnuncioStore se copian columna por columna; las demás se codifican una vez
+    en un AnuncioStore temporal. El archivo se reemplaza de forma atómica.
+
+    Args:
+        campanas (iterable): Campañas a guardar.
+        ruta (str): Ruta del archivo.
+
+    Returns:
+        int: Cantidad de anuncios guardados.
+    """
+    codigos = {None: 0}
+    inicios = array("Q", [0, 0])
+    datos = bytearray()
+
+    def codigo_cadena(cadena):
+        codigo = codigos.get(cadena)
+        if codigo is None:
+            codigo = codigos[cadena] = len(inicios) - 1
+            datos.extend(cadena.encode("utf-8"))
+            inicios.append(len(datos))
+        return codigo
+
+    nombres, fechas_inicio, fechas_termino = array("I"), array("i"), array("i")
+    desde = array("Q", [0])
+    partes = []
+    for campana in campanas:
+        anuncios = campana.anuncios
+        if not isinstance(anuncios, AnuncioStore):
+            anuncios = AnuncioStore(anuncios)
+        columnas, cadenas = anuncios.columnas()
+        traducidos = {}
+
+        def traducir(codigo):
+            nuevo = traducidos.get(codigo)
+            if nuevo is None:
+                nuevo = traducidos[codigo] = codigo_cadena(cadenas[codigo])
+            return nuevo
+
+        # Las URLs pasan de la tabla de cada almacén a la tabla única del archivo.
+        columnas = columnas[:5] + (array("I", map(traducir, columnas[5])),
+                                   array("I", map(traducir, columnas[6])))
+        partes.append(columnas)
+        nombres.append(codigo_cadena(campana.nombre))
+        fechas_inicio.append(_ordinal(campana.fecha_inicio))
+        fechas_termino.append(_ordinal(campana.fecha_termino))
+        desde.append(desde[-1] + len(columnas[0]))
+
+    registro = Anuncio.REGISTRO
+    metadatos = json.dumps({
+        "clases": [clase.__name__ for clase in registro.clases],
+        "sub_tipos": list(registro.sub_tipos),
+    }).encode("utf-8")
+    secciones = [[inicios], [datos], [nombres], [fechas_inicio], [fechas_termino], [desde]]
+    secciones += [[columnas[i] for columnas in partes] for i in range(len(COLUMNAS_ANUNCIO))]
+
+    tabla = []
+    posicion = _alinear(_CABECERA.size + _SECCION.size * len(SECCIONES) + len(metadatos))
+    for bloques in secciones:
+        tamano = sum(len(bloque) * memoryview(bloque).itemsize for bloque in bloques)
+        tabla.append((posicion, tamano))
+        posicion = _alinear(posicion + tamano)
+
+    def bloques():
+        cabecera = _CABECERA.pack(MAGIA, VERSION, sys.byteorder == "big", len(metadatos))
+        escrito = len(cabecera)
+        yield cabecera
+        for seccion in tabla:
+            yield _SECCION.pack(*seccion)
+            escrito += _SECCION.size
+        yield metadatos
+        escrito += len(metadatos)
+        for (posicion, tamano), partes_seccion in zip(tabla, secciones):
+            yield bytes(posicion - escrito)
+            yield from partes_seccion
+            escrito = posicion + tamano
+
+    escribir_atomico(ruta, bloques())
+    return desde[-1]
+
+
+def _traducir(columna, tabla, codigo):
+    """Traduce los códigos de una columna; si la tabla es la identidad, la regresa sin copiar."""
+    if all(nuevo == viejo for viejo, nuevo in enumerate(tabla)):
+        return columna
+    return memoryview(array(codigo, map(tabla.__getitem__, columna)))
+
+
+class Instantanea(Sequence):
+    """
+    Campañas de una instantánea binaria, leídas desde el archivo mapeado en memoria.
+
+    Abrir una instantánea solo lee la cabecera: las columnas son memoryview
+    sobre el archivo y cada Campana se arma la primera vez que se pide, con un
+    AnuncioStore que lee sus anuncios directo del mapeo, sin construir objetos.
+    El mapeo es copia en escritura: los cambios de valores de un anuncio quedan
+    en la memoria del proceso y nunca en el archivo, y el primer cambio
+    estructural de una campaña copia sus columnas a arreglos propios.
+
+    El archivo queda mapeado mientras exista alguna campaña o anuncio que lo use.
+    """
+
+    def __init__(self, ruta):
+        """
+        Abre una instantánea.
+
+        Args:
+            ruta (str): Ruta del archivo escrito por guardar.
+
+        Raises:
+            ValueError: Si el archivo no es una instantánea, es de otra versión o de
+                una máquina con otro orden de bytes, o usa tipos de anuncio no registrados.
+        """
+        with open(ruta, "rb") as archivo:
+            try:
+                mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_COPY)
+            except ValueError:
+                raise ValueError(f"'{ruta}' no es una instantánea de campañas.") from None
+        vista = memoryview(mapa)
+        if len(vista) < _CABECERA.size or vista[:len(MAGIA)] != MAGIA:
+            raise ValueError(f"'{ruta}' no es una instantánea de campañas.")
+        _, version, orden, largo = _CABECERA.unpack_from(vista)
+        if version != VERSION:
+            raise ValueError(f"Versión de instantánea {version} no soportada.")
+        if orden != (sys.byteorder == "big"):
+            raise ValueError("La instantánea se escribió en una máquina con otro orden de bytes.")
+
+        secciones = {}
+        for i, (nombre, codigo) in enumerate(SECCIONES):
+            posicion, tamano = _SECCION.unpack_from(vista, _CABECERA.size + i * _SECCION.size)
+            secciones[nombre] = vista[posicion:posicion + tamano].cast(codigo)
+        inicio = _CABECERA.size + _SECCION.size * len(SECCIONES)
+        metadatos = json.loads(bytes(vista[inicio:inicio + largo]))
+
+        tipos_anuncio.cargar(metadatos["clases"])
+        registro = Anuncio.REGISTRO
+        clases = [registro.clase_por_nombre(nombre) for nombre in metadatos["clases"]]
+        if None in clases:
+            raise ValueError("La instantánea usa tipos de anuncio no registrados.")
+        try:
+            sub_tipos = [registro.codigo(sub_tipo) for sub_tipo in metadatos["sub_tipos"]]
+        except KeyError as e:
+            raise ValueError(f"La instantánea usa el subtipo no registrado {e}.") from None
+        secciones["tipo"] = _traducir(secciones["tipo"], [0] + list(map(registro.codigo_clase, clases)), "B")
+        secciones["sub_tipo"] = _traducir(secciones["sub_tipo"], sub_tipos, "H")
+
+        self._cadenas = CadenasMapeadas(secciones["cadenas_inicio"], secciones["cadenas_datos"])
+        self._nombres = secciones["campana_nombre"]
+        self._inicios = secciones["campana_inicio"]
+        self._terminos = secciones["campana_termino"]
+        self._desde = secciones["campana_desde"]
+        self._columnas = tuple(secciones[nombre] for nombre in COLUMNAS_ANUNCIO)
+        self._campanas = [None] * len(self._nombres)
+
+    def __len__(self):
+        return len(self._campanas)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        campana = self._campanas[indice]
+        if campana is None:
+            desde, hasta = self._desde[indice], self._desde[indice + 1]
+            columnas = tuple(columna[desde:hasta] for columna in self._columnas)
+            campana = Campana(self._cadenas[self._nombres[indice]],
+                              AnuncioStore.desde_columnas(columnas, self._cadenas),
+                              _fecha(self._inicios[indice]), _fecha(self._terminos[indice]))
+            self._campanas[indice] = campana
+        return campana
+
+    @property
+    def cantidad_anuncios(self):
+        """int: Total de anuncios guardados en la instantánea."""
+        return self._desde[-1]
+
+
+def cargar(ruta):
+    """
+    Abre una instantánea sin leer su contenido (ver Instantanea).
+
+    Args:
+        ruta (str): Ruta del archivo escrito por guardar.
+
+    Returns:
+        Instantanea: Secuencia de campañas respaldadas por el archivo.
+    """
+    return Instantanea(ruta)
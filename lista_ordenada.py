@@ -0,0 +1,84 @@
+from bisect import bisect_left, insort
+
+
+class ListaOrdenada:
+    """
+    Lista ordenada por bloques: inserciones y eliminaciones en O(log n + B).
+
+    Una lista plana de Python mueve en memoria todos los elementos posteriores en
+    cada insort; repartir los elementos en bloques de a lo más 2 * B acota ese
+    movimiento al bloque afectado. Los elementos deben ser comparables entre sí y
+    distintos, por ejemplo tuplas (clave, uid, valor) con uid único.
+    """
+
+    B = 512
+
+    def __init__(self, elementos=()):
+        """
+        Inicializa la lista.
+
+        Args:
+            elementos (iterable, optional): Elementos iniciales en cualquier orden.
+        """
+        ordenados = sorted(elementos)
+        self._bloques = [ordenados[i:i + self.B] for i in range(0, len(ordenados), self.B)]
+        self._maximos = [bloque[-1] for bloque in self._bloques]
+        self._largo = len(ordenados)
+
+    def __len__(self):
+        return self._largo
+
+    def __iter__(self):
+        for bloque in self._bloques:
+            yield from bloque
+
+    def agregar(self, elemento):
+        """Inserta un elemento manteniendo el orden."""
+        self._largo += 1
+        if not self._bloques:
+            self._bloques.append([elemento])
+            self._maximos.append(elemento)
+            return
+        i = min(bisect_left(self._maximos, elemento), len(self._bloques) - 1)
+        bloque = self._bloques[i]
+        insort(bloque, elemento)
+        self._maximos[i] = bloque[-1]
+        if len(bloque) > 2 * self.B:
+            self._bloques[i:i + 1] = [bloque[:self.B], bloque[self.B:]]
+            self._maximos[i:i + 1] = [bloque[self.B - 1], bloque[-1]]
+
+    def quitar(self, clave):
+        """
+        Quita el primer elemento mayor o igual que la clave.
+
+        La clave suele ser un prefijo de la tupla guardada, como (clave, uid).
+
+        Raises:
+            IndexError: Si no hay ningún elemento mayor o igual que la clave.
+        """
+        i = bisect_left(self._maximos, clave)
+        bloque = self._bloques[i]
+        del bloque[bisect_left(bloque, clave)]
+        self._largo -= 1
+        if bloque:
+            self._maximos[i] = bloque[-1]
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+
+    def desde(self, clave):
+        """Recorre en orden los elementos mayores o iguales que la clave."""
+        i = bisect_left(self._maximos, clave)
+        if i == len(self._bloques):
+            return
+        posicion = bisect_left(self._bloques[i], clave)
+        for bloque in self._bloques[i:]:
+            yield from bloque[posicion:] if posicion else bloque
+            posicion = 0
+
+    def rango(self, desde, hasta):
+        """Recorre en orden los elementos e con desde <= e <= hasta."""
+        for elemento in self.desde(desde):
+            if elemento > hasta:
+                return
+            yield elemento
@@ -0,0 +1,35 @@
+class Observable:
+    """
+    Mezcla que permite suscribir funciones a los cambios de atributos de un objeto.
+
+    Las funciones suscritas reciben (objeto, campo, valor_anterior, valor_nuevo)
+    después de cada cambio. Mientras no haya suscriptores, el costo para los
+    setters es una sola comprobación de una tupla vacía.
+    """
+
+    _observadores = ()
+
+    def suscribir(self, funcion):
+        """
+        Suscribe una función a los cambios del objeto.
+
+        Una misma función puede suscribirse varias veces y será llamada una vez por
+        cada suscripción.
+        """
+        self._observadores = self._observadores + (funcion,)
+
+    def desuscribir(self, funcion):
+        """
+        Elimina una suscripción de la función.
+
+        Raises:
+            ValueError: Si la función no estaba suscrita.
+        """
+        observadores = list(self._observadores)
+        observadores.remove(funcion)
+        self._observadores = tuple(observadores)
+
+    def _notificar(self, campo, anterior, nuevo):
+        """Llama a cada función suscrita con el cambio ocurrido."""
+        for funcion in self._observadores:
+            funcion(self, campo, anterior, nuevo)
@@ -0,0 +1,410 @@
+import operator
+import sqlite3
+import weakref
+from collections.abc import MutableSequence
+from datetime import date
+from functools import partial
+import tipos_anuncio
+from campana import Campana
+from coleccion import ColeccionAnuncios
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS campanas (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    fecha_inicio TEXT,
+    fecha_termino TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_campanas_nombre ON campanas (nombre);
+CREATE INDEX IF NOT EXISTS idx_campanas_fechas ON campanas (fecha_inicio, fecha_termino);
+
+CREATE TABLE IF NOT EXISTS anuncios (
+    campana_id INTEGER NOT NULL REFERENCES campanas (id) ON DELETE CASCADE,
+    posicion INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    sub_tipo TEXT,
+    url_archivo TEXT,
+    url_clic TEXT,
+    alto INTEGER NOT NULL,
+    ancho INTEGER NOT NULL,
+    duracion INTEGER,
+    PRIMARY KEY (campana_id, posicion)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_anuncios_tipo ON anuncios (tipo, sub_tipo);
+"""
+
+COLUMNAS_ANUNCIO = "tipo, sub_tipo, url_archivo, url_clic, alto, ancho, duracion"
+
+TAMANO_LOTE = 10_000
+
+
+def _fecha_a_texto(fecha):
+    """Convierte una fecha en texto ISO (o None)."""
+    return fecha.isoformat() if fecha is not None else None
+
+
+def _texto_a_fecha(texto):
+    """Convierte un texto ISO en fecha (o None)."""
+    return date.fromisoformat(texto) if texto is not None else None
+
+
+def construir_anuncio(tipo, sub_tipo, url_archivo, url_clic, alto, ancho, duracion):
+    """
+    Reconstruye un Anuncio desde una fila guardada.
+
+    Raises:
+        ValueError: Si el tipo no está registrado ni declarado en tipos_anuncio.
+    """
+    clase = tipos_anuncio.clase(tipo)
+    if clase is None:
+        raise ValueError(f"Tipo de anuncio '{tipo}' no registrado.")
+    if duracion is not None:
+        anuncio = clase(sub_tipo, url_archivo, url_clic, duracion)
+    else:
+        anuncio = clase(sub_tipo, url_archivo, url_clic)
+    anuncio.alto = alto
+    anuncio.ancho = ancho
+    return anuncio
+
+
+class AnunciosPerezosos(MutableSequence):
+    """
+    Anuncios de una campaña guardada que se leen desde SQLite a demanda.
+
+    Iterar, contar, resumir por tipo y leer un anuncio por su posición se
+    resuelven con consultas, sin crear la lista completa. La primera operación
+    que necesita un slice o cambia qué anuncios hay carga todos los anuncios en
+    una ColeccionAnuncios y desde ahí se comporta como ella.
+
+    Los anuncios entregados al recorrerla o por posición siguen ligados a su
+    posición: mientras alguno siga en uso, leerlo otra vez o cargarla entrega
+    ese mismo objeto, y los que se modifican se recuerdan hasta que
+    AlmacenSQLite.guardar actualiza sus filas.
+    """
+
+    def __init__(self, almacen, campana_id):
+        """
+        Inicializa la colección perezosa.
+
+        Args:
+            almacen (AlmacenSQLite): Almacén desde donde se leen los anuncios.
+            campana_id (int): Identificador de la campaña en la base.
+        """
+        self._almacen = almacen
+        self._campana_id = campana_id
+        self._lista = None
+        self._leidos = weakref.WeakValueDictionary()
+        self._editados = {}
+        # Subtipo guardado en la base de cada anuncio editado cuyo subtipo cambió.
+        self._sub_tipos_guardados = {}
+
+    @property
+    def materializada(self):
+        """bool: Indica si los anuncios ya se cargaron en memoria."""
+        return self._lista is not None
+
+    def _materializar(self):
+        """Carga todos los anuncios en memoria, si aún no se ha hecho."""
+        if self._lista is None:
+            self._lista = ColeccionAnuncios(self._recorrer())
+            self._leidos = self._editados = self._sub_tipos_guardados = None
+        return self._lista
+
+    def _ligar(self, posicion, anuncio):
+        """Recuerda un anuncio leído de la base y se suscribe a sus cambios."""
+        anuncio.suscribir(partial(self._al_editar, posicion))
+        self._leidos[posicion] = anuncio
+        return anuncio
+
+    def _recorrer(self):
+        """Recorre los anuncios de la base, entregando los ya leídos que siguen en uso."""
+        leidos = self._leidos
+        for posicion, anuncio in enumerate(self._almacen.iterar_anuncios(self._campana_id)):
+            vigente = leidos.get(posicion)
+            yield self._ligar(posicion, anuncio) if vigente is None else vigente
+
+    def _al_editar(self, posicion, anuncio, campo, anterior, nuevo):
+        """Recuerda un anuncio entregado al recorrer que cambió, para que guardar lo escriba."""
+        if self._editados is not None:
+            self._editados[posicion] = anuncio
+            if campo == "sub_tipo":
+                self._sub_tipos_guardados.setdefault(posicion, anterior)
+
+    def _olvidar_editados(self):
+        """Descarta los cambios pendientes, una vez que guardar los escribió."""
+        self._editados = {}
+        self._sub_tipos_guardados = {}
+
+    def __len__(self):
+        if self._lista is not None:
+            return len(self._lista)
+        return self._almacen.contar_anuncios(self._campana_id)
+
+    def __iter__(self):
+        if self._lista is not None:
+            return iter(self._lista)
+        return self._recorrer()
+
+    def __getitem__(self, indice):
+        if self._lista is not None or isinstance(indice, slice):
+            return self._materializar()[indice]
+        posicion = operator.index(indice)
+        if posicion < 0:
+            posicion += len(self)
+        anuncio = self._leidos.get(posicion)
+        if anuncio is None:
+            anuncio = self._almacen.leer_anuncio(self._campana_id, posicion) if posicion >= 0 else None
+            if anuncio is None:
+                raise IndexError("Índice de anuncio fuera de rango.")
+            self._ligar(posicion, anuncio)
+        return anuncio
+
+    def __setitem__(self, indice, anuncio):
+        self._materializar()[indice] = anuncio
+
+    def __delitem__(self, indice):
+        del self._materializar()[indice]
+
+    def insert(self, indice, anuncio):
+        """Inserta un anuncio antes de la posición indicada."""
+        self._materializar().insert(indice, anuncio)
+
+    def conteo_por_tipo(self):
+        """
+        Cuenta los anuncios de cada tipo.
+
+        Returns:
+            dict: Nombre del tipo -> cantidad de anuncios.
+        """
+        if self._lista is not None:
+            return self._lista.conteo_por_tipo()
+        return self._almacen.contar_por_tipo(self._campana_id)
+
+    def conteo_por_sub_tipo(self):
+        """
+        Cuenta los anuncios de cada par (tipo, subtipo).
+
+        Los subtipos cambiados que aún no se guardan se cuentan con su valor nuevo.
+
+        Returns:
+            dict: (nombre del tipo, subtipo) -> cantidad de anuncios.
+        """
+        if self._lista is not None:
+            return self._lista.conteo_por_sub_tipo()
+        conteos = self._almacen.contar_por_sub_tipo(self._campana_id)
+        for posicion, guardado in self._sub_tipos_guardados.items():
+            anuncio = self._editados[posicion]
+            conteos[anuncio.tipo, guardado] -= 1
+            conteos[anuncio.tipo, anuncio.sub_tipo] = conteos.get((anuncio.tipo, anuncio.sub_tipo), 0) + 1
+        return {par: cantidad for par, cantidad in conteos.items() if cantidad}
+
+
+class AlmacenSQLite:
+    """
+    Persistencia de campañas y anuncios en una base SQLite.
+
+    Las campañas se guardan con índices por nombre y por rango de fechas, y los
+    anuncios con un índice por tipo y subtipo. Las escrituras usan executemany
+    con generadores, de modo que una campaña grande se guarda sin crear una lista
+    intermedia de filas. Al abrir una campaña sus anuncios se leen de forma
+    perezosa mediante AnunciosPerezosos.
+    """
+
+    def __init__(self, ruta=":memory:"):
+        """
+        Abre (o crea) la base de datos.
+
+        Args:
+            ruta (str, optional): Ruta del archivo SQLite. Por defecto es una base en memoria.
+        """
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.execute("PRAGMA foreign_keys = ON")
+        self._conexion.execute("PRAGMA journal_mode = WAL")
+        self._conexion.execute("PRAGMA synchronous = NORMAL")
+        self._conexion.executescript(ESQUEMA)
+        self._ids = weakref.WeakKeyDictionary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        """Cierra la conexión con la base."""
+        self._conexion.close()
+
+    def id_de(self, campana):
+        """Regresa el identificador de una campaña guardada o abierta, o None."""
+        return self._ids.get(campana)
+
+    def guardar(self, campana):
+        """
+        Guarda una campaña nueva o actualiza una ya guardada.
+
+        Los anuncios solo se reescriben si fueron cargados o modificados en memoria;
+        de una campaña abierta sin cargar solo se actualizan las filas de los
+        anuncios que cambiaron después de recorrerla.
+
+        Args:
+            campana (Campana): Campaña a guardar.
+
+        Returns:
+            int: Identificador de la campaña en la base.
+        """
+        datos = (campana.nombre, _fecha_a_texto(campana.fecha_inicio),
+                 _fecha_a_texto(campana.fecha_termino))
+        anuncios = campana.anuncios
+        with self._conexion:
+            campana_id = self._ids.get(campana)
+            if campana_id is None:
+                cursor = self._conexion.execute(
+                    "INSERT INTO campanas (nombre, fecha_inicio, fecha_termino) VALUES (?, ?, ?)",
+                    datos,
+                )
+                campana_id = cursor.lastrowid
+                self._ids[campana] = campana_id
+            else:
+                self._conexion.execute(
+                    "UPDATE campanas SET nombre = ?, fecha_inicio = ?, fecha_termino = ? WHERE id = ?",
+                    datos + (campana_id,),
+                )
+                if (isinstance(anuncios, AnunciosPerezosos) and anuncios._almacen is self
+                        and anuncios._campana_id == campana_id and not anuncios.materializada):
+                    editados = anuncios._editados
+                    self._conexion.executemany(
+                        "UPDATE anuncios SET tipo = ?, sub_tipo = ?, url_archivo = ?, url_clic = ?, "
+                        "alto = ?, ancho = ?, duracion = ? WHERE campana_id = ? AND posicion = ?",
+                        (
+                            (anuncio.tipo, anuncio.sub_tipo, anuncio.url_archivo, anuncio.url_clic,
+                             anuncio.alto, anuncio.ancho, getattr(anuncio, "duracion", None), campana_id, posicion)
+                            for posicion, anuncio in editados.items()
+                        ),
+                    )
+                    anuncios._olvidar_editados()
+                    return campana_id
+                self._conexion.execute("DELETE FROM anuncios WHERE campana_id = ?", (campana_id,))
+            self._conexion.executemany(
+                f"INSERT INTO anuncios (campana_id, posicion, {COLUMNAS_ANUNCIO}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (campana_id, posicion, anuncio.tipo, anuncio.sub_tipo, anuncio.url_archivo,
+                     anuncio.url_clic, anuncio.alto, anuncio.ancho, getattr(anuncio, "duracion", None))
+                    for posicion, anuncio in enumerate(anuncios)
+                ),
+            )
+        return campana_id
+
+    def abrir(self, campana_id):
+        """
+        Abre una campaña guardada sin cargar todavía sus anuncios.
+
+        Args:
+            campana_id (int): Identificador de la campaña.
+
+        Returns:
+            Campana: La campaña, con anuncios perezosos.
+
+        Raises:
+            KeyError: Si no existe una campaña con ese identificador.
+        """
+        fila = self._conexion.execute(
+            "SELECT nombre, fecha_inicio, fecha_termino FROM campanas WHERE id = ?", (campana_id,)
+        ).fetchone()
+        if fila is None:
+            raise KeyError(campana_id)
+        nombre, fecha_inicio, fecha_termino = fila
+        campana = Campana(nombre, anuncios=AnunciosPerezosos(self, campana_id),
+                          fecha_inicio=_texto_a_fecha(fecha_inicio),
+                          fecha_termino=_texto_a_fecha(fecha_termino))
+        self._ids[campana] = campana_id
+        return campana
+
+    def buscar(self, nombre):
+        """Regresa los identificadores de las campañas con ese nombre exacto."""
+        cursor = self._conexion.execute("SELECT id FROM campanas WHERE nombre = ? ORDER BY id", (nombre,))
+        return [campana_id for (campana_id,) in cursor]
+
+    def abrir_por_nombre(self, nombre):
+        """Abre la primera campaña guardada con ese nombre, o regresa None."""
+        ids = self.buscar(nombre)
+        return self.abrir(ids[0]) if ids else None
+
+    def listar(self):
+        """Regresa una lista de tuplas (id, nombre) de todas las campañas guardadas."""
+        return self._conexion.execute("SELECT id, nombre FROM campanas ORDER BY id").fetchall()
+
+    def cargar_todas(self):
+        """Abre todas las campañas guardadas, con sus anuncios perezosos."""
+        return [self.abrir(campana_id) for campana_id, _ in self.listar()]
+
+    def activas_en(self, fecha):
+        """
+        Regresa los identificadores de las campañas activas en una fecha.
+
+        Una fecha de inicio o término en None se considera abierta.
+        """
+        texto = fecha.isoformat()
+        cursor = self._conexion.execute(
+            "SELECT id FROM campanas WHERE (fecha_inicio IS NULL OR fecha_inicio <= ?) "
+            "AND (fecha_termino IS NULL OR fecha_termino >= ?) ORDER BY id",
+            (texto, texto),
+        )
+        return [campana_id for (campana_id,) in cursor]
+
+    def eliminar(self, campana):
+        """Elimina una campaña guardada y sus anuncios."""
+        campana_id = self._ids.pop(campana, None)
+        if campana_id is not None:
+            with self._conexion:
+                self._conexion.execute("DELETE FROM campanas WHERE id = ?", (campana_id,))
+
+    def contar_anuncios(self, campana_id):
+        """Regresa la cantidad de anuncios guardados de una campaña."""
+        return self._conexion.execute(
+            "SELECT COUNT(*) FROM anuncios WHERE campana_id = ?", (campana_id,)
+        ).fetchone()[0]
+
+    def contar_por_tipo(self, campana_id):
+        """Regresa un dict de tipo -> cantidad de anuncios de una campaña."""
+        return dict(self._conexion.execute(
+            "SELECT tipo, COUNT(*) FROM anuncios WHERE campana_id = ? GROUP BY tipo", (campana_id,)
+        ))
+
+    def contar_por_sub_tipo(self, campana_id):
+        """Regresa un dict de (tipo, subtipo) -> cantidad de anuncios de una campaña."""
+        cursor = self._conexion.execute(
+            "SELECT tipo, sub_tipo, COUNT(*) FROM anuncios WHERE campana_id = ? GROUP BY tipo, sub_tipo",
+            (campana_id,),
+        )
+        return {(tipo, sub_tipo): cantidad for tipo, sub_tipo, cantidad in cursor}
+
+    def leer_anuncio(self, campana_id, posicion):
+        """Regresa el anuncio guardado en una posición de una campaña, o None si no existe."""
+        fila = self._conexion.execute(
+            f"SELECT {COLUMNAS_ANUNCIO} FROM anuncios WHERE campana_id = ? AND posicion = ?",
+            (campana_id, posicion),
+        ).fetchone()
+        return construir_anuncio(*fila) if fila is not None else None
+
+    def iterar_anuncios(self, campana_id, tamano_lote=TAMANO_LOTE):
+        """
+        Recorre los anuncios de una campaña leyendo la base por lotes.
+
+        Args:
+            campana_id (int): Identificador de la campaña.
+            tamano_lote (int, optional): Filas leídas por cada viaje a la base.
+
+        Yields:
+            Anuncio: Los anuncios en el orden en que se guardaron.
+        """
+        cursor = self._conexion.execute(
+            f"SELECT {COLUMNAS_ANUNCIO} FROM anuncios WHERE campana_id = ? ORDER BY posicion",
+            (campana_id,),
+        )
+        while True:
+            filas = cursor.fetchmany(tamano_lote)
+            if not filas:
+                break
+            for fila in filas:
+                yield construir_anuncio(*fila)
@@ -0,0 +1,327 @@
+import io
+import os
+import shutil
+import subprocess
+from collections import namedtuple
+import cache_creativos
+import imagen
+from compresion import ruta_local
+from trabajos import ejecutar_en_pool
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow es opcional: sin él solo se redimensionan PNG con la biblioteca estándar.
+    Image = ImageOps = None
+
+DIRECTORIO_RENDICIONES = cache_creativos.DIRECTORIO_CACHE
+
+
+class ResultadoRedimension(namedtuple("ResultadoRedimension",
+                                      ["ruta", "rendiciones", "desde_cache", "error"])):
+    """
+    Resultado de redimensionar un archivo.
+
+    rendiciones es una tupla de (ancho, alto, ruta) por cada tamaño objetivo y
+    desde_cache indica si todas ya existían y no hubo que decodificar el origen.
+    """
+
+    __slots__ = ()
+
+
+def tamanos_de(anuncio):
+    """
+    Regresa los tamaños objetivo (ancho, alto) de un anuncio.
+
+    Se toman del diccionario TAMANOS de su clase según el subtipo. Si el subtipo
+    no tiene tamaños, se usa el alto y ancho del anuncio cuando están definidos.
+
+    Args:
+        anuncio: Anuncio o fila de un AnuncioStore.
+
+    Returns:
+        tuple: Pares (ancho, alto); vacía si no hay ningún tamaño objetivo.
+    """
+    clase = getattr(anuncio, "clase", type(anuncio))
+    tamanos = getattr(clase, "TAMANOS", {}).get(anuncio.sub_tipo)
+    if tamanos:
+        return tuple(tamanos)
+    if anuncio.ancho > 1 and anuncio.alto > 1:
+        return ((anuncio.ancho, anuncio.alto),)
+    return ()
+
+
+def transformacion(ancho, alto, formato, filtro):
+    """Parámetros de una rendición dentro del caché de creativos."""
+    return {"op": "redimensionar", "ancho": ancho, "alto": alto, "formato": formato, "filtro": filtro}
+
+
+def _buscar_rendiciones(cache, huella, tamanos, formato, filtro):
+    """Busca en el caché las rendiciones de un origen; las que faltan quedan con ruta None."""
+    return [(ancho, alto, cache.ruta(huella, transformacion(ancho, alto, formato, filtro)))
+            for ancho, alto in tamanos]
+
+
+def redimensionar_imagen(ruta, tamanos, directorio=DIRECTORIO_RENDICIONES):
+    """
+    Genera las rendiciones de una imagen decodificándola una sola vez.
+
+    Cada rendición cubre el tamaño objetivo y se recorta al centro. Con Pillow se
+    usa el filtro Lanczos y se conserva el formato de origen; sin Pillow solo se
+    aceptan PNG, que se escalan por vecino más cercano. Las rendiciones se buscan
+    y se guardan en el caché de creativos por el hash del contenido, así que un
+    origen ya procesado no se vuelve a decodificar.
+
+    Args:
+        ruta (str): Ruta de la imagen de origen.
+        tamanos (iterable): Pares (ancho, alto).
+        directorio (str, optional): Directorio del caché de creativos.
+
+    Returns:
+        ResultadoRedimension: Las rendiciones, o el error ocurrido.
+    """
+    try:
+        cache = cache_creativos.compartido(directorio)
+        huella = cache_creativos.huella_archivo(ruta)
+        with open(ruta, "rb") as archivo:
+            cabecera = archivo.read(8)
+        tipo = imagen.formato(cabecera)
+        if tipo is None:
+            raise ValueError(f"'{ruta}' no es una imagen PNG o JPEG.")
+        if Image is None and tipo != "png":
+            raise ValueError(f"Redimensionar '{ruta}' requiere Pillow.")
+        formato = "jpg" if tipo == "jpeg" else "png"
+        filtro = "lanczos" if Image is not None else "cercano"
+        rendiciones = _buscar_rendiciones(cache, huella, tamanos, formato, filtro)
+        if all(destino is not None for _, _, destino in rendiciones):
+            return ResultadoRedimension(ruta, tuple(rendiciones), True, None)
+
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        if Image is not None:
+            origen = Image.open(io.BytesIO(datos))
+            origen.load()
+
+            def escalar(ancho, alto):
+                salida = io.BytesIO()
+                ImageOps.fit(origen, (ancho, alto), Image.LANCZOS).save(salida, origen.format)
+                return salida.getvalue()
+        else:
+            origen = imagen.decodificar_png(datos)
+
+            def escalar(ancho, alto):
+                return imagen.codificar_png(imagen.redimensionar(origen, ancho, alto))
+
+        for i, (ancho, alto, destino) in enumerate(rendiciones):
+            if destino is None:
+                destino = cache.guardar(huella, transformacion(ancho, alto, formato, filtro),
+                                        escalar(ancho, alto))
+                rendiciones[i] = (ancho, alto, destino)
+        return ResultadoRedimension(ruta, tuple(rendiciones), False, None)
+    except (OSError, ValueError) as e:
+        return ResultadoRedimension(ruta, (), False, e)
+
+
+def escalar_ffmpeg(entrada, salidas):
+    """
+    Escalador de video por omisión: genera todas las salidas con una sola ejecución de ffmpeg.
+
+    El video se decodifica una vez y el filtro split reparte los cuadros a cada
+    tamaño, que se escala para cubrir el objetivo y se recorta al centro.
+
+    Args:
+        entrada (str): Ruta del video de origen.
+        salidas (list): Tuplas (ancho, alto, ruta_salida).
+
+    Raises:
+        OSError: Si ffmpeg no está instalado.
+        subprocess.CalledProcessError: Si ffmpeg falla.
+    """
+    ejecutable = shutil.which("ffmpeg")
+    if ejecutable is None:
+        raise OSError("No hay un escalador de video disponible (ffmpeg no está instalado).")
+    ramas = "".join(f"[s{i}]" for i in range(len(salidas)))
+    filtros = [f"[0:v]split={len(salidas)}{ramas}"]
+    comando = [ejecutable, "-y", "-v", "error", "-i", entrada]
+    for i, (ancho, alto, _) in enumerate(salidas):
+        filtros.append(f"[s{i}]scale={ancho}:{alto}:force_original_aspect_ratio=increase,"
+                       f"crop={ancho}:{alto}[o{i}]")
+    comando += ["-filter_complex", ";".join(filtros)]
+    for i, (_, _, destino) in enumerate(salidas):
+        comando += ["-map", f"[o{i}]", "-map", "0:a?", "-c:a", "copy", destino]
+    subprocess.run(comando, check=True, stdin=subprocess.DEVNULL)
+
+
+def redimensionar_video(ruta, tamanos, directorio=DIRECTORIO_RENDICIONES, escalador=None):
+    """
+    Genera las rendiciones de un video con un escalador intercambiable.
+
+    El escalador recibe (ruta_entrada, [(ancho, alto, ruta_salida), ...]) y debe
+    escribir todas las salidas; para usarlo en redimensionar_lote tiene que ser
+    una función definida a nivel de módulo.
+
+    Args:
+        ruta (str): Ruta del video de origen.
+        tamanos (iterable): Pares (ancho, alto).
+        directorio (str, optional): Directorio del caché de creativos.
+        escalador (callable, optional): Por defecto es escalar_ffmpeg.
+
+    Returns:
+        ResultadoRedimension: Las rendiciones, o el error ocurrido.
+    """
+    escalador = escalador or escalar_ffmpeg
+    try:
+        cache = cache_creativos.compartido(directorio)
+        huella = cache_creativos.huella_archivo(ruta)
+        extension = os.path.splitext(ruta)[1] or ".mp4"
+        formato = extension[1:]
+        rendiciones = _buscar_rendiciones(cache, huella, tamanos, formato, "ffmpeg")
+        faltantes = [(i, ancho, alto) for i, (ancho, alto, destino) in enumerate(rendiciones)
+                     if destino is None]
+        if not faltantes:
+            return ResultadoRedimension(ruta, tuple(rendiciones), True, None)
+        prefijo = os.path.join(cache.directorio, f"{huella}.{os.getpid()}")
+        temporales = [(ancho, alto, f"{prefijo}_{ancho}x{alto}.tmp{extension}")
+                      for _, ancho, alto in faltantes]
+        os.makedirs(cache.directorio, exist_ok=True)
+        try:
+            escalador(ruta, temporales)
+            for (i, ancho, alto), (_, _, temporal) in zip(faltantes, temporales):
+                destino = cache.guardar_archivo(huella, transformacion(ancho, alto, formato, "ffmpeg"),
+                                                temporal)
+                rendiciones[i] = (ancho, alto, destino)
+        finally:
+            for _, _, temporal in temporales:
+                if os.path.exists(temporal):
+                    os.unlink(temporal)
+        return ResultadoRedimension(ruta, tuple(rendiciones), False, None)
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        return ResultadoRedimension(ruta, (), False, e)
+
+
+def tarea_de(anuncio, tamanos, directorio=DIRECTORIO_RENDICIONES, escalador_video=None):
+    """
+    Prepara la tarea de redimensionamiento de un archivo.
+
+    Returns:
+        tuple: (función, argumentos) listos para ejecutarse en otro proceso.
+
+    Raises:
+        ValueError: Si el anuncio no tiene un archivo local.
+    """
+    ruta = ruta_local(anuncio.url_archivo)
+    if hasattr(anuncio, "duracion"):
+        return redimensionar_video, (ruta, tamanos, directorio, escalador_video)
+    return redimensionar_imagen, (ruta, tamanos, directorio)
+
+
+def _aplicar(anuncio, tamanos, resultado):
+    """Filtra las rendiciones de un anuncio y ajusta su alto y ancho al primer tamaño."""
+    if resultado.error is not None:
+        return resultado
+    propias = tuple(r for r in resultado.rendiciones if (r[0], r[1]) in tamanos)
+    anuncio.ancho, anuncio.alto = tamanos[0]
+    return resultado._replace(rendiciones=propias)
+
+
+def _sin_tamanos(anuncio):
+    """Resultado de un anuncio cuyo subtipo no tiene tamaños objetivo."""
+    return ResultadoRedimension(anuncio.url_archivo, (), False, ValueError(
+        f"El subtipo '{anuncio.sub_tipo}' no tiene tamaños objetivo."))
+
+
+def redimensionar_anuncio(anuncio, directorio=DIRECTORIO_RENDICIONES, escalador_video=None):
+    """
+    Genera las rendiciones de un anuncio en el proceso actual.
+
+    Si todo sale bien, el alto y ancho del anuncio quedan en el primer tamaño objetivo.
+
+    Returns:
+        ResultadoRedimension: Las rendiciones, o el error ocurrido.
+    """
+    tamanos = tamanos_de(anuncio)
+    if not tamanos:
+        return _sin_tamanos(anuncio)
+    try:
+        funcion, argumentos = tarea_de(anuncio, tamanos, directorio, escalador_video)
+    except ValueError as e:
+        return ResultadoRedimension(anuncio.url_archivo, (), False, e)
+    return _aplicar(anuncio, tamanos, funcion(*argumentos))
+
+
+def redimensionar_lote(anuncios, directorio=DIRECTORIO_RENDICIONES, max_procesos=None,
+                       escalador_video=None, en_vuelo=None):
+    """
+    Genera las rendiciones de muchos anuncios en un pool de procesos.
+
+    Los anuncios se agrupan por archivo de origen: cada archivo se decodifica una
+    sola vez y se escala a la unión de los tamaños de todos los anuncios que lo
+    usan. Cada anuncio recibe solo las rendiciones de sus propios tamaños.
+
+    Args:
+        anuncios (iterable): Anuncios (o filas de un AnuncioStore).
+        directorio (str, optional): Directorio del caché de creativos.
+        max_procesos (int, optional): Procesos del pool. Por defecto, uno por núcleo.
+        escalador_video (callable, optional): Ver redimensionar_video.
+        en_vuelo (int, optional): Tareas pendientes como máximo (ver trabajos.ejecutar_en_pool).
+
+    Returns:
+        list: Un ResultadoRedimension por anuncio, en el mismo orden.
+    """
+    anuncios = list(anuncios)
+    resultados = [None] * len(anuncios)
+    por_ruta = {}
+    for posicion, anuncio in enumerate(anuncios):
+        tamanos = tamanos_de(anuncio)
+        if not tamanos:
+            resultados[posicion] = _sin_tamanos(anuncio)
+            continue
+        try:
+            funcion, argumentos = tarea_de(anuncio, tamanos, directorio, escalador_video)
+        except ValueError as e:
+            resultados[posicion] = ResultadoRedimension(anuncio.url_archivo, (), False, e)
+            continue
+        grupo = por_ruta.setdefault(argumentos[0], (funcion, argumentos, {}, []))
+        grupo[2].update(dict.fromkeys(tamanos))
+        grupo[3].append((posicion, tamanos))
+
+    tareas = [(funcion, (argumentos[0], tuple(tamanos)) + argumentos[2:])
+              for funcion, argumentos, tamanos, _ in por_ruta.values()]
+    hechos = ejecutar_en_pool(tareas, max_procesos, en_vuelo)
+    for (_, _, _, miembros), resultado in zip(por_ruta.values(), hechos):
+        for posicion, tamanos in miembros:
+            resultados[posicion] = _aplicar(anuncios[posicion], tamanos, resultado)
+    return resultados
+
+
+def rendicion(anuncio, ancho=None, alto=None, directorio=DIRECTORIO_RENDICIONES, escalador_video=None):
+    """
+    Resuelve la ruta de una rendición del creativo de un anuncio a través del caché de creativos.
+
+    Si la rendición ya existe no se decodifica nada: basta con el hash del archivo
+    de origen, que se recuerda mientras el archivo no cambie.
+
+    Args:
+        anuncio: Anuncio o fila de un AnuncioStore.
+        ancho (int, optional): Ancho de la rendición. Por defecto, el del primer tamaño objetivo.
+        alto (int, optional): Alto de la rendición. Por defecto, el del primer tamaño objetivo.
+        directorio (str, optional): Directorio del caché de creativos.
+        escalador_video (callable, optional): Ver redimensionar_video.
+
+    Returns:
+        str: Ruta de la rendición.
+
+    Raises:
+        ValueError: Si el anuncio no tiene archivo local ni tamaño objetivo, o el
+            archivo no se puede procesar.
+        OSError: Si el archivo de origen no se puede leer.
+    """
+    if ancho is None or alto is None:
+        tamanos = tamanos_de(anuncio)
+        if not tamanos:
+            raise _sin_tamanos(anuncio).error
+        ancho, alto = tamanos[0]
+    funcion, argumentos = tarea_de(anuncio, ((ancho, alto),), directorio, escalador_video)
+    resultado = funcion(*argumentos)
+    if resultado.error is not None:
+        raise resultado.error
+    return resultado.rendiciones[0][2]
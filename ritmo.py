@@ -0,0 +1,236 @@
+"""
+Reparto del presupuesto de las campañas entre su fecha de inicio y de término.
+"""
+import heapq
+import time
+from datetime import datetime
+from itertools import count
+
+INICIO = "inicio"
+TERMINO = "termino"
+
+
+def _minuto(fecha):
+    """Convierte una fecha en el minuto (desde la época) en que empieza, en hora local."""
+    return int(datetime.combine(fecha, datetime.min.time()).timestamp()) // 60
+
+
+class _Estado:
+    """Presupuesto y cuota del minuto en curso de una campaña."""
+
+    __slots__ = ("presupuesto", "gastado", "inicio", "fin", "minuto", "disponible", "version")
+
+    def __init__(self, presupuesto):
+        self.presupuesto = presupuesto
+        self.gastado = 0
+        self.inicio = 0
+        self.fin = 0
+        self.minuto = None
+        self.disponible = 0
+        self.version = 0
+
+
+class Ritmo:
+    """
+    Reparte el presupuesto de cada campaña en partes iguales por minuto.
+
+    La cuota de un minuto es lo que queda del presupuesto dividido por los
+    minutos que faltan hasta el final del día de fecha_termino. Lo que no se
+    gasta en un minuto pasa al siguiente en que la campaña pide decisiones,
+    así que un presupuesto de menos de una impresión por minuto igual se
+    entrega, y los minutos sin pedidos se reparten entre los que faltan. La
+    cuota se calcula cuando la campaña recibe su primera decisión del minuto,
+    así que no hay que recorrer las campañas cuando cambia el minuto y
+    permitir() cuesta O(1).
+
+    Los inicios y términos de las campañas se guardan en una cola de
+    prioridad; al cambiar el minuto solo se sacan los que vencieron, para
+    mantener el conjunto de campañas activas (en su período y con
+    presupuesto) sin revisar las demás. El ritmo se suscribe a las campañas
+    (ver Observable), así que un cambio de fechas se refleja solo.
+
+    Una campaña sin fecha de inicio empieza al agregarla; una sin fecha de
+    término no se puede repartir. No es seguro usarlo desde varios hilos sin
+    un candado externo.
+    """
+
+    def __init__(self, reloj=time.time):
+        """
+        Inicializa el ritmo sin campañas.
+
+        Args:
+            reloj (callable, optional): Regresa la hora actual en segundos desde la época.
+                Se usa cuando no se entrega `ahora`.
+        """
+        self._reloj = reloj
+        self._estados = {}
+        self._activas = set()
+        self._eventos = []
+        self._secuencia = count()
+        self._minuto_actual = -1
+
+    def __len__(self):
+        return len(self._estados)
+
+    def __contains__(self, campana):
+        return campana in self._estados
+
+    def agregar(self, campana, presupuesto, ahora=None):
+        """
+        Agrega una campaña con su presupuesto, o cambia el presupuesto si ya estaba.
+
+        Args:
+            campana (Campana): Campaña con fecha de término.
+            presupuesto (float): Total a gastar en el período, en la misma unidad que los costos.
+            ahora (float, optional): Segundos desde la época. Por defecto, la hora del reloj.
+
+        Raises:
+            ValueError: Si el presupuesto es negativo o la campaña no tiene fecha de término.
+        """
+        if presupuesto < 0:
+            raise ValueError(f"El presupuesto no puede ser negativo ({presupuesto}).")
+        if campana.fecha_termino is None:
+            raise ValueError(f"La campaña {campana.nombre!r} no tiene fecha de término.")
+        estado = self._estados.get(campana)
+        if estado is None:
+            estado = self._estados[campana] = _Estado(presupuesto)
+            campana.suscribir(self._al_cambiar)
+        else:
+            estado.presupuesto = presupuesto
+        self._programar(campana, estado, self._reloj() if ahora is None else ahora)
+
+    def quitar(self, campana):
+        """
+        Quita una campaña.
+
+        Raises:
+            KeyError: Si la campaña no estaba.
+        """
+        del self._estados[campana]
+        self._activas.discard(campana)
+        campana.desuscribir(self._al_cambiar)
+
+    def _programar(self, campana, estado, ahora):
+        """Calcula el período de una campaña y encola su inicio y término."""
+        minuto = int(ahora) // 60
+        fecha_inicio = campana.fecha_inicio
+        estado.inicio = _minuto(fecha_inicio) if fecha_inicio is not None else minuto
+        estado.fin = _minuto(campana.fecha_termino) + 24 * 60
+        estado.minuto = None
+        estado.disponible = 0
+        estado.version += 1
+        for momento, evento in ((estado.inicio, INICIO), (estado.fin, TERMINO)):
+            if momento > minuto:
+                heapq.heappush(self._eventos, (momento, next(self._secuencia), evento, campana, estado.version))
+        if estado.inicio <= minuto < estado.fin and estado.gastado < estado.presupuesto:
+            self._activas.add(campana)
+        else:
+            self._activas.discard(campana)
+
+    def _al_cambiar(self, campana, campo, anterior, nuevo):
+        """Vuelve a programar una campaña cuando cambian sus fechas."""
+        if campo in ("fecha_inicio", "fecha_termino") and campana in self._estados:
+            if campana.fecha_termino is None:
+                # Sin término no hay cómo repartir: deja de entregar hasta que vuelva a tener uno.
+                self._activas.discard(campana)
+                estado = self._estados[campana]
+                estado.version += 1
+                estado.inicio = estado.fin = estado.minuto = 0
+                estado.disponible = 0
+                return
+            self._programar(campana, self._estados[campana], self._reloj())
+
+    def avanzar(self, ahora=None):
+        """
+        Procesa los inicios y términos vencidos hasta ahora.
+
+        permitir() lo llama solo cuando cambia el minuto, así que solo hace falta
+        llamarlo para actualizar activas() sin pedir decisiones.
+
+        Args:
+            ahora (float, optional): Segundos desde la época. Por defecto, la hora del reloj.
+
+        Returns:
+            list: Campañas cuyo período terminó en este avance.
+        """
+        minuto = int(self._reloj() if ahora is None else ahora) // 60
+        self._minuto_actual = max(self._minuto_actual, minuto)
+        terminadas = []
+        eventos = self._eventos
+        while eventos and eventos[0][0] <= minuto:
+            _, _, evento, campana, version = heapq.heappop(eventos)
+            estado = self._estados.get(campana)
+            if estado is None or estado.version != version:
+                continue
+            if evento == INICIO:
+                if estado.gastado < estado.presupuesto and minuto < estado.fin:
+                    self._activas.add(campana)
+            else:
+                self._activas.discard(campana)
+                terminadas.append(campana)
+        return terminadas
+
+    def _renovar(self, estado, minuto):
+        """Calcula la cuota de una campaña para un minuto nuevo."""
+        estado.minuto = minuto
+        if estado.inicio <= minuto < estado.fin:
+            restante = estado.presupuesto - estado.gastado
+            arrastre = estado.disponible
+            estado.disponible = min(restante, arrastre + (restante - arrastre) / (estado.fin - minuto))
+        else:
+            estado.disponible = 0
+
+    def permitir(self, campana, costo=1, ahora=None):
+        """
+        Decide si la campaña puede entregar ahora, y si puede, descuenta el costo.
+
+        Args:
+            campana (Campana): Campaña agregada al ritmo.
+            costo (float, optional): Costo de la entrega. Por defecto, 1 (una impresión).
+            ahora (float, optional): Segundos desde la época. Por defecto, la hora del reloj.
+
+        Returns:
+            bool: True si la cuota del minuto alcanza para el costo.
+
+        Raises:
+            KeyError: Si la campaña no está en el ritmo.
+        """
+        estado = self._estados[campana]
+        minuto = int(self._reloj() if ahora is None else ahora) // 60
+        if minuto != estado.minuto:
+            if minuto > self._minuto_actual:
+                self.avanzar(minuto * 60)
+            self._renovar(estado, minuto)
+        if estado.disponible < costo:
+            return False
+        estado.disponible -= costo
+        estado.gastado += costo
+        if estado.gastado >= estado.presupuesto:
+            self._activas.discard(campana)
+        return True
+
+    def activas(self):
+        """
+        Regresa las campañas en su período que todavía tienen presupuesto.
+
+        Returns:
+            set: Una copia del conjunto de campañas activas.
+        """
+        return set(self._activas)
+
+    def gastado(self, campana):
+        """float: Regresa lo gastado por una campaña."""
+        return self._estados[campana].gastado
+
+    def restante(self, campana):
+        """float: Regresa lo que le queda de presupuesto a una campaña."""
+        estado = self._estados[campana]
+        return estado.presupuesto - estado.gastado
+
+    def cerrar(self):
+        """Cancela las suscripciones a las campañas."""
+        for campana in self._estados:
+            campana.desuscribir(self._al_cambiar)
+        self._estados.clear()
+        self._activas.clear()
+        self._eventos.clear()
@@ -0,0 +1,298 @@
+import random
+from almacen import AnuncioFila
+
+TAMANO_BLOQUE = 1024
+
+
+def tabla_alias(pesos):
+    """
+    Construye la tabla de alias de Vose para elegir índices según sus pesos.
+
+    Args:
+        pesos (list): Pesos positivos.
+
+    Returns:
+        tuple: (probabilidades, alias), dos listas del largo de pesos. Para elegir se
+            toma un índice i al azar y se queda con él con probabilidad
+            probabilidades[i]; si no, se usa alias[i].
+    """
+    cantidad = len(pesos)
+    total = sum(pesos)
+    escalados = [peso * cantidad / total for peso in pesos]
+    probabilidades = [1.0] * cantidad
+    alias = list(range(cantidad))
+    chicos = [i for i, peso in enumerate(escalados) if peso < 1]
+    grandes = [i for i, peso in enumerate(escalados) if peso >= 1]
+    while chicos and grandes:
+        chico = chicos.pop()
+        grande = grandes[-1]
+        probabilidades[chico] = escalados[chico]
+        alias[chico] = grande
+        escalados[grande] -= 1 - escalados[chico]
+        if escalados[grande] < 1:
+            chicos.append(grandes.pop())
+    # Lo que queda tiene peso 1 salvo errores de redondeo.
+    return probabilidades, alias
+
+
+class _Bloque:
+    """Hasta TAMANO_BLOQUE anuncios con el mismo tipo, subtipo y tamaño, con su tabla de alias."""
+
+    __slots__ = ("anuncios", "pesos", "posiciones", "total", "probabilidades", "alias")
+
+    def __init__(self):
+        self.anuncios = []
+        self.pesos = []
+        self.posiciones = {}
+        self.total = 0.0
+        self.probabilidades = None
+        self.alias = None
+
+    def agregar(self, anuncio, llave, peso):
+        self.posiciones[llave] = len(self.anuncios)
+        self.anuncios.append(anuncio)
+        self.pesos.append(peso)
+        self.total += peso
+        self.probabilidades = None
+
+    def quitar(self, llave):
+        """Quita un anuncio moviendo el último a su lugar."""
+        posicion = self.posiciones.pop(llave)
+        self.total -= self.pesos[posicion]
+        ultimo = self.anuncios.pop()
+        peso = self.pesos.pop()
+        if posicion < len(self.anuncios):
+            self.anuncios[posicion] = ultimo
+            self.pesos[posicion] = peso
+            self.posiciones[_llave(ultimo)] = posicion
+        self.probabilidades = None
+
+    def elegir(self, aleatorio):
+        if self.probabilidades is None:
+            self.probabilidades, self.alias = tabla_alias(self.pesos)
+        valor = aleatorio() * len(self.anuncios)
+        indice = int(valor)
+        return self.anuncios[indice if valor - indice < self.probabilidades[indice] else self.alias[indice]]
+
+
+def _llave(anuncio):
+    """Regresa cómo se identifica un anuncio: las vistas de fila, que no son hashables, por su fila."""
+    if isinstance(anuncio, AnuncioFila):
+        return id(anuncio._almacen), anuncio._indice
+    return anuncio
+
+
+def _clave(anuncio):
+    """Regresa el grupo de un anuncio: (tipo, subtipo, ancho, alto)."""
+    return anuncio.tipo, anuncio.sub_tipo, anuncio.ancho, anuncio.alto
+
+
+class Selector:
+    """
+    Elige anuncios al azar según su peso en O(1) por elección, con el método de alias.
+
+    Los anuncios se reparten en grupos por tipo, subtipo, ancho y alto, y cada
+    grupo en bloques de hasta TAMANO_BLOQUE anuncios con su propia tabla de
+    alias. Una elección con filtros usa una segunda tabla, sobre los bloques de
+    los grupos que cumplen los filtros, que se arma la primera vez que se pide
+    esa combinación. Así, elegir cuesta dos sorteos sin importar cuántos
+    anuncios haya.
+
+    Los cambios son incrementales: agregar, quitar o cambiar el peso de un
+    anuncio solo marca su bloque, cuya tabla se reconstruye la próxima vez que
+    se sortee en él, y descarta las tablas de filtros, que son del tamaño de la
+    cantidad de bloques. El selector se suscribe a los anuncios (ver
+    Observable), así que un cambio de subtipo, alto o ancho los mueve de grupo
+    solo. Las filas de un AnuncioStore no notifican cambios: después de
+    modificarlas hay que llamar a actualizar() con una vista de la misma fila.
+
+    Cada anuncio aparece una sola vez aunque esté repetido en la campaña. Los
+    anuncios con peso 0 no se eligen nunca.
+    """
+
+    def __init__(self, anuncios=(), peso=None, semilla=None):
+        """
+        Inicializa el selector.
+
+        Args:
+            anuncios (iterable, optional): Anuncios iniciales, por ejemplo campana.anuncios.
+            peso (callable, optional): Recibe un anuncio y regresa su peso. Se vuelve a
+                calcular cuando el anuncio cambia. Por defecto, todos pesan 1.
+            semilla (int, optional): Semilla del generador, para elecciones reproducibles.
+        """
+        self._peso = peso
+        self._pesos_fijos = {}
+        self._grupos = {}
+        self._claves = {}
+        self._filtros = {}
+        self._aleatorio = random.Random(semilla).random
+        for anuncio in anuncios:
+            self.agregar(anuncio)
+
+    def __len__(self):
+        return len(self._claves)
+
+    def __contains__(self, anuncio):
+        return _llave(anuncio) in self._claves
+
+    def _calcular_peso(self, anuncio, llave, peso=None):
+        if peso is None:
+            peso = self._pesos_fijos.get(llave)
+        if peso is None:
+            peso = 1 if self._peso is None else self._peso(anuncio)
+        if peso < 0:
+            raise ValueError(f"El peso de un anuncio no puede ser negativo ({peso}).")
+        return peso
+
+    def _ubicar(self, anuncio, llave, peso):
+        """Pone un anuncio en el último bloque de su grupo según sus campos actuales."""
+        if peso > 0:
+            clave = _clave(anuncio)
+            bloques = self._grupos.setdefault(clave, [])
+            if not bloques or len(bloques[-1].anuncios) >= TAMANO_BLOQUE:
+                bloques.append(_Bloque())
+            bloques[-1].agregar(anuncio, llave, peso)
+            self._claves[llave] = (anuncio, clave, bloques[-1])
+        else:
+            self._claves[llave] = (anuncio, None, None)
+        self._filtros.clear()
+
+    def _desubicar(self, llave):
+        """Saca un anuncio de su bloque, eliminando el bloque o el grupo si quedan vacíos, y lo regresa."""
+        anuncio, clave, bloque = self._claves.pop(llave)
+        if bloque is not None:
+            bloque.quitar(llave)
+            if not bloque.anuncios:
+                bloques = self._grupos[clave]
+                bloques.remove(bloque)
+                if not bloques:
+                    del self._grupos[clave]
+        self._filtros.clear()
+        return anuncio
+
+    def agregar(self, anuncio, peso=None):
+        """
+        Agrega un anuncio, o actualiza su peso si ya estaba.
+
+        Args:
+            anuncio (Anuncio | AnuncioFila): Anuncio a agregar.
+            peso (float, optional): Peso fijo del anuncio. Por defecto se usa la función de
+                peso del selector.
+
+        Raises:
+            ValueError: Si el peso es negativo.
+        """
+        llave = _llave(anuncio)
+        calculado = self._calcular_peso(anuncio, llave, peso)
+        if peso is not None:
+            self._pesos_fijos[llave] = peso
+        if llave in self._claves:
+            self._desubicar(llave)
+        elif hasattr(anuncio, "suscribir"):
+            anuncio.suscribir(self._al_cambiar)
+        self._ubicar(anuncio, llave, calculado)
+
+    def quitar(self, anuncio):
+        """
+        Quita un anuncio.
+
+        Raises:
+            KeyError: Si el anuncio no está en el selector.
+        """
+        llave = _llave(anuncio)
+        anuncio = self._desubicar(llave)
+        self._pesos_fijos.pop(llave, None)
+        if hasattr(anuncio, "desuscribir"):
+            anuncio.desuscribir(self._al_cambiar)
+
+    def actualizar(self, anuncio):
+        """
+        Vuelve a calcular el grupo y el peso de un anuncio que cambió.
+
+        Si la función de peso falla, el anuncio se queda donde estaba.
+
+        Raises:
+            KeyError: Si el anuncio no está en el selector.
+        """
+        llave = _llave(anuncio)
+        if llave not in self._claves:
+            raise KeyError(anuncio)
+        peso = self._calcular_peso(anuncio, llave)
+        self._desubicar(llave)
+        self._ubicar(anuncio, llave, peso)
+
+    def _al_cambiar(self, anuncio, campo, anterior, nuevo):
+        """Reubica un anuncio cuando cambia un campo que define su grupo o, con función de peso, cualquiera."""
+        if self._peso is not None or campo in ("sub_tipo", "alto", "ancho"):
+            self.actualizar(anuncio)
+
+    def _tabla_filtro(self, filtro):
+        """Regresa la tabla de alias sobre los bloques que cumplen un filtro (tipo, sub_tipo, ancho, alto)."""
+        tabla = self._filtros.get(filtro)
+        if tabla is None:
+            bloques = [bloque for clave, grupo in self._grupos.items()
+                       if all(valor is None or valor == parte for valor, parte in zip(filtro, clave))
+                       for bloque in grupo]
+            if len(bloques) <= 1:
+                tabla = (bloques, None, None)
+            else:
+                tabla = (bloques,) + tabla_alias([bloque.total for bloque in bloques])
+            self._filtros[filtro] = tabla
+        return tabla
+
+    def elegir(self, tipo=None, sub_tipo=None, ancho=None, alto=None):
+        """
+        Elige un anuncio al azar, proporcional a su peso, entre los que cumplen los filtros.
+
+        Args:
+            tipo (str, optional): Nombre del tipo, por ejemplo "Display".
+            sub_tipo (str, optional): Subtipo.
+            ancho (int, optional): Ancho exacto del espacio a llenar.
+            alto (int, optional): Alto exacto del espacio a llenar.
+
+        Returns:
+            Anuncio | None: El anuncio elegido, o None si ninguno cumple los filtros.
+        """
+        filtro = (tipo, sub_tipo, ancho, alto)
+        tabla = self._filtros.get(filtro)
+        if tabla is None:
+            tabla = self._tabla_filtro(filtro)
+        bloques, probabilidades, alias = tabla
+        if probabilidades is None:
+            return bloques[0].elegir(self._aleatorio) if bloques else None
+        valor = self._aleatorio() * len(bloques)
+        indice = int(valor)
+        bloque = bloques[indice if valor - indice < probabilidades[indice] else alias[indice]]
+        return bloque.elegir(self._aleatorio)
+
+    def elegir_varios(self, cantidad, tipo=None, sub_tipo=None, ancho=None, alto=None):
+        """
+        Elige varios anuncios, con reposición, entre los que cumplen los filtros (ver elegir).
+
+        Returns:
+            list: cantidad anuncios, o una lista vacía si ninguno cumple los filtros.
+        """
+        bloques, probabilidades, alias = self._tabla_filtro((tipo, sub_tipo, ancho, alto))
+        if not bloques:
+            return []
+        aleatorio = self._aleatorio
+        if probabilidades is None:
+            elegir = bloques[0].elegir
+            return [elegir(aleatorio) for _ in range(cantidad)]
+        total = len(bloques)
+        elegidos = []
+        for _ in range(cantidad):
+            valor = aleatorio() * total
+            indice = int(valor)
+            elegidos.append(bloques[indice if valor - indice < probabilidades[indice] else alias[indice]]
+                            .elegir(aleatorio))
+        return elegidos
+
+    def cerrar(self):
+        """Cancela las suscripciones a los anuncios."""
+        for anuncio, _, _ in self._claves.values():
+            if hasattr(anuncio, "desuscribir"):
+                anuncio.desuscribir(self._al_cambiar)
+        self._claves.clear()
+        self._grupos.clear()
+        self._filtros.clear()
@@ -0,0 +1,344 @@
+import csv
+import json
+import os
+from datetime import date
+from itertools import islice
+from error import LargoExcedidoException
+from ingesta import COLUMNAS, ErrorFila
+from validacion import convertir_fecha
+
+CAMPOS = ("campana", "fecha_inicio", "fecha_termino") + COLUMNAS
+TAMANO_LOTE = 10_000
+
+
+def _abrir(archivo, modo):
+    """Abre una ruta en texto UTF-8; un objeto archivo ya abierto se usa tal cual."""
+    if isinstance(archivo, (str, os.PathLike)):
+        return open(archivo, modo, encoding="utf-8", newline="")
+    return None
+
+
+def leer_jsonl(archivo, al_error=None):
+    """
+    Lee filas de un archivo JSON Lines, una a la vez.
+
+    Cada línea no vacía debe ser un objeto JSON con los campos de CAMPOS. Las
+    líneas que no se pueden decodificar se informan y se saltan.
+
+    Args:
+        archivo (str | archivo de texto): Ruta o archivo abierto.
+        al_error (callable, optional): Recibe un ErrorFila por línea inválida. Si es
+            None, el error se lanza.
+
+    Yields:
+        tuple: (número de línea desde 1, dict con los campos de la fila).
+    """
+    propio = _abrir(archivo, "r")
+    try:
+        for linea, texto in enumerate(propio or archivo, 1):
+            if not texto.strip():
+                continue
+            try:
+                datos = json.loads(texto)
+                if not isinstance(datos, dict):
+                    raise ValueError("La línea no es un objeto JSON.")
+            except ValueError as e:
+                _informar(ErrorFila(linea, None, e), al_error)
+                continue
+            yield linea, datos
+    finally:
+        if propio is not None:
+            propio.close()
+
+
+def leer_csv(archivo, al_error=None):
+    """
+    Lee filas de un archivo CSV con encabezado, una a la vez.
+
+    Las celdas vacías se leen como None, igual que un campo ausente en JSON Lines.
+    Los registros que el módulo csv no puede leer (csv.Error) y los que tienen
+    más campos que el encabezado se informan y se saltan.
+
+    Args:
+        archivo (str | archivo de texto): Ruta o archivo abierto.
+        al_error (callable, optional): Recibe un ErrorFila por registro inválido. Si es
+            None, el error se lanza.
+
+    Yields:
+        tuple: (número de línea del registro, dict con los campos de la fila).
+    """
+    propio = _abrir(archivo, "r")
+    try:
+        lector = csv.DictReader(propio or archivo)
+        try:
+            lector.fieldnames
+        except csv.Error as e:
+            _informar(ErrorFila(1, None, e), al_error)
+            return
+        while True:
+            linea = lector.line_num + 1
+            try:
+                datos = next(lector)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                _informar(ErrorFila(linea, None, e), al_error)
+                continue
+            if None in datos:
+                _informar(ErrorFila(linea, None, ValueError(
+                    f"El registro tiene {len(datos) - 1 + len(datos[None])} campos y el encabezado "
+                    f"{len(lector.fieldnames)}.")), al_error)
+                continue
+            yield lector.line_num, {campo: valor or None for campo, valor in datos.items()}
+    finally:
+        if propio is not None:
+            propio.close()
+
+
+LECTORES = {"jsonl": leer_jsonl, "csv": leer_csv}
+
+
+def _informar(error, al_error):
+    """Entrega un error al callback o lo lanza con el número de línea al inicio de su mensaje."""
+    if al_error is None:
+        excepcion = error.error
+        if excepcion.args and isinstance(excepcion.args[0], str):
+            campo = f", campo {error.campo}" if error.campo else ""
+            excepcion.args = (f"Línea {error.fila}{campo}: {excepcion.args[0]}",) + excepcion.args[1:]
+        raise excepcion
+    al_error(error)
+
+
+def _fecha(valor):
+    """Convierte un texto ISO en fecha; None y las fechas se regresan tal cual."""
+    if valor is None or isinstance(valor, date):
+        return valor
+    return convertir_fecha(valor)
+
+
+def importar(archivo, formato="jsonl", al_error=None, campanas=None, tamano_lote=TAMANO_LOTE):
+    """
+    Importa campañas y anuncios desde JSON Lines o CSV, leyendo el archivo por partes.
+
+    Cada fila trae el nombre de la campaña en 'campana' y los campos de un anuncio;
+    una fila sin 'tipo' solo declara la campaña. Las fechas de la campaña pueden
+    venir en cualquier fila y la última gana. Los anuncios se validan en lotes de
+    tamano_lote filas con ingesta.validar_lote, así que la lectura y la validación
+    usan memoria acotada por tamano_lote. Los anuncios importados, en cambio, quedan
+    todos en las campañas que se regresan: para archivos grandes conviene pasar en
+    campanas campañas con un AnuncioStore, que los guarda en columnas.
+
+    Los errores se informan por línea como ErrorFila(linea, campo, error): un
+    subtipo inválido llega como SubTipoInvalidoException y un nombre de campaña
+    demasiado largo como LargoExcedidoException.
+
+    Args:
+        archivo (str | archivo de texto): Ruta o archivo abierto.
+        formato (str, optional): "jsonl" o "csv". Por defecto es "jsonl".
+        al_error (callable, optional): Recibe cada ErrorFila en orden de línea. Si es
+            None, el primer error se lanza.
+        campanas (dict, optional): Campañas existentes por nombre, que se completan en
+            lugar de crearse. Una campaña creada con un AnuncioStore recibe los
+            anuncios directo en sus columnas.
+        tamano_lote (int, optional): Filas de anuncios por lote de validación.
+
+    Returns:
+        dict: Nombre -> Campana, con las campañas del archivo y las existentes.
+
+    Raises:
+        ValueError: Si el formato no es "jsonl" ni "csv".
+    """
+    lector = LECTORES.get(formato)
+    if lector is None:
+        raise ValueError(f"Formato '{formato}' no soportado.")
+    return importar_filas(lector(archivo, al_error), al_error, campanas, tamano_lote)
+
+
+def importar_filas(registros, al_error=None, campanas=None, tamano_lote=TAMANO_LOTE):
+    """
+    Importa campañas y anuncios desde filas ya leídas (ver importar).
+
+    Args:
+        registros (iterable): Tuplas (número de línea, dict con los campos de CAMPOS),
+            como las que entregan leer_jsonl y leer_csv.
+        al_error (callable, optional): Recibe cada ErrorFila en orden de línea. Si es
+            None, el primer error se lanza.
+        campanas (dict, optional): Campañas existentes por nombre. Se consultan con get(),
+            así que puede ser un dict que las busque en otro lado la primera vez.
+        tamano_lote (int, optional): Filas de anuncios por lote de validación.
+
+    Returns:
+        dict: Nombre -> Campana, con las campañas importadas y las existentes.
+    """
+    from campana import Campana
+
+    campanas = {} if campanas is None else campanas
+    registros = iter(registros)
+    while True:
+        bloque = list(islice(registros, tamano_lote))
+        if not bloque:
+            return campanas
+        errores = []
+        por_campana = {}
+        for linea, datos in bloque:
+            nombre = datos.get("campana")
+            if not isinstance(nombre, str):
+                errores.append(ErrorFila(linea, "campana", ValueError(
+                    "La fila no indica el nombre de la campaña.") if nombre is None else TypeError(
+                    f"El nombre de la campaña debe ser texto, no {type(nombre).__name__}.")))
+                continue
+            try:
+                campana = campanas.get(nombre)
+                if campana is None:
+                    campanas[nombre] = campana = Campana(nombre)
+                campo = "fecha_inicio"
+                if datos.get(campo) is not None:
+                    campana.fecha_inicio = _fecha(datos[campo])
+                campo = "fecha_termino"
+                if datos.get(campo) is not None:
+                    campana.fecha_termino = _fecha(datos[campo])
+            except LargoExcedidoException as e:
+                errores.append(ErrorFila(linea, "campana", e))
+                continue
+            except ValueError as e:
+                errores.append(ErrorFila(linea, campo, e))
+                continue
+            if datos.get("tipo") is not None:
+                lineas, grupo = por_campana.setdefault(nombre, ([], []))
+                lineas.append(linea)
+                grupo.append(datos)
+
+        for nombre, (lineas, grupo) in por_campana.items():
+            for error in campanas[nombre].agregar_anuncios_bulk(grupo):
+                errores.append(error._replace(fila=lineas[error.fila]))
+        errores.sort(key=lambda error: error.fila)
+        for error in errores:
+            _informar(error, al_error)
+
+
+def datos_anuncio(anuncio):
+    """
+    Regresa los campos de un Anuncio o AnuncioFila con los nombres de COLUMNAS.
+
+    Returns:
+        dict: tipo, sub_tipo, url_archivo, url_clic, duracion (None si no es video), alto y ancho.
+    """
+    return {
+        "tipo": anuncio.tipo,
+        "sub_tipo": anuncio.sub_tipo,
+        "url_archivo": anuncio.url_archivo,
+        "url_clic": anuncio.url_clic,
+        "duracion": getattr(anuncio, "duracion", None),
+        "alto": anuncio.alto,
+        "ancho": anuncio.ancho,
+    }
+
+
+def filas(campanas):
+    """
+    Recorre campañas y anuncios como filas planas, sin armar listas intermedias.
+
+    Cada anuncio da una fila con los datos de su campaña; una campaña sin anuncios
+    da una sola fila sin 'tipo'. Los anuncios se recorren con el iterador de la
+    colección, así que un AnuncioStore entrega vistas de fila y una colección
+    perezosa de persistencia se lee por lotes sin materializarse.
+
+    Args:
+        campanas (Campana | iterable): Una campaña o varias.
+
+    Yields:
+        dict: Campo de CAMPOS -> valor, con las fechas en texto ISO.
+    """
+    if hasattr(campanas, "anuncios"):
+        campanas = (campanas,)
+    for campana in campanas:
+        base = {
+            "campana": campana.nombre,
+            "fecha_inicio": campana.fecha_inicio.isoformat() if campana.fecha_inicio else None,
+            "fecha_termino": campana.fecha_termino.isoformat() if campana.fecha_termino else None,
+        }
+        vacia = True
+        for anuncio in campana.anuncios:
+            vacia = False
+            fila = base.copy()
+            fila.update(datos_anuncio(anuncio))
+            yield fila
+        if vacia:
+            yield base
+
+
+def escribir_jsonl(campanas, archivo):
+    """
+    Escribe campañas y anuncios en JSON Lines, una fila por línea.
+
+    Los campos en None se omiten.
+
+    Args:
+        campanas (Campana | iterable): Una campaña o varias.
+        archivo (str | archivo de texto): Ruta o archivo abierto.
+
+    Returns:
+        int: Cantidad de líneas escritas.
+    """
+    propio = _abrir(archivo, "w")
+    escribir = (propio or archivo).write
+    codificar = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    cantidad = 0
+    try:
+        for fila in filas(campanas):
+            escribir(codificar({campo: valor for campo, valor in fila.items() if valor is not None}))
+            escribir("\n")
+            cantidad += 1
+    finally:
+        if propio is not None:
+            propio.close()
+    return cantidad
+
+
+def escribir_csv(campanas, archivo):
+    """
+    Escribe campañas y anuncios en CSV con encabezado, con las columnas de CAMPOS.
+
+    Args:
+        campanas (Campana | iterable): Una campaña o varias.
+        archivo (str | archivo de texto): Ruta o archivo abierto.
+
+    Returns:
+        int: Cantidad de filas escritas, sin contar el encabezado.
+    """
+    propio = _abrir(archivo, "w")
+    escritor = csv.DictWriter(propio or archivo, CAMPOS)
+    cantidad = 0
+    try:
+        escritor.writeheader()
+        for fila in filas(campanas):
+            escritor.writerow(fila)
+            cantidad += 1
+    finally:
+        if propio is not None:
+            propio.close()
+    return cantidad
+
+
+ESCRITORES = {"jsonl": escribir_jsonl, "csv": escribir_csv}
+
+
+def exportar(campanas, archivo, formato="jsonl"):
+    """
+    Exporta campañas y anuncios en JSON Lines o CSV.
+
+    Args:
+        campanas (Campana | iterable): Una campaña o varias.
+        archivo (str | archivo de texto): Ruta o archivo abierto.
+        formato (str, optional): "jsonl" o "csv". Por defecto es "jsonl".
+
+    Returns:
+        int: Cantidad de filas escritas.
+
+    Raises:
+        ValueError: Si el formato no es "jsonl" ni "csv".
+    """
+    escritor = ESCRITORES.get(formato)
+    if escritor is None:
+        raise ValueError(f"Formato '{formato}' no soportado.")
+    return escritor(campanas, archivo)
@@ -0,0 +1,520 @@
+"""
+Servicio HTTP local para campañas y anuncios, hecho sobre asyncio.
+
+Uso:
+    python -m servicio [--puerto 8080] [--bd campanas.db]
+
+Rutas (cuerpos y respuestas en JSON):
+    GET    /campanas                      Lista las campañas.
+    POST   /campanas                      Crea una campaña ({"nombre", "fecha_inicio", "fecha_termino"}).
+    GET    /campanas/{id}                 Datos y conteos por tipo de una campaña.
+    PATCH  /campanas/{id}                 Cambia nombre o fechas.
+    GET    /campanas/{id}/anuncios        Anuncios en JSON Lines, enviados por partes.
+    POST   /campanas/{id}/anuncios        Agrega un anuncio o una lista de anuncios.
+    GET    /campanas/{id}/anuncios/{i}    Un anuncio.
+    PATCH  /campanas/{id}/anuncios/{i}    Cambia campos de un anuncio.
+    POST   /lote                          Ejecuta una lista de peticiones en un solo viaje.
+"""
+import argparse
+import asyncio
+import json
+import re
+from collections import namedtuple
+from campana import Campana
+from error import LargoExcedidoException
+from ingesta import aplicar_edicion
+from serializacion import datos_anuncio
+
+MAX_CUERPO = 64 * 1024 * 1024
+TAMANO_PARTE = 1000
+
+RAZONES = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+Respuesta = namedtuple("Respuesta", ["estado", "cuerpo"])
+Respuesta.__doc__ = """Estado HTTP y cuerpo: un valor JSON o un generador asíncrono de objetos (JSON Lines)."""
+
+
+class ErrorHttp(Exception):
+    """Excepción que se responde al cliente con su estado HTTP."""
+
+    def __init__(self, estado, mensaje, campo=None):
+        """
+        Args:
+            estado (int): Código de estado HTTP.
+            mensaje (str): Descripción del error.
+            campo (str, optional): Campo inválido, en los errores de validación.
+        """
+        super().__init__(mensaje)
+        self.estado = estado
+        self.campo = campo
+
+    def cuerpo(self):
+        """Regresa el cuerpo JSON del error."""
+        return {"error": str(self), "campo": self.campo}
+
+
+def _error_de_validacion(campo, error):
+    """Convierte el (campo, excepción) de aplicar_edicion en un ErrorHttp 422."""
+    return ErrorHttp(422, f"{type(error).__name__}: {error}", campo)
+
+
+def _resumen(campana_id, campana):
+    """Datos de una campaña para las respuestas."""
+    return {
+        "id": campana_id,
+        "nombre": campana.nombre,
+        "fecha_inicio": campana.fecha_inicio.isoformat() if campana.fecha_inicio else None,
+        "fecha_termino": campana.fecha_termino.isoformat() if campana.fecha_termino else None,
+        "anuncios": len(campana.anuncios),
+    }
+
+
+class Servicio:
+    """
+    Servicio HTTP/1.1 con conexiones persistentes que atiende las rutas del módulo.
+
+    Todo corre en el hilo del bucle de eventos. Cada campaña tiene su propio
+    asyncio.Lock: las operaciones sobre sus anuncios lo toman, y un envío por
+    partes de una lista grande lo toma solo para copiar la lista de anuncios,
+    así que un cliente lento no detiene las escrituras a esa campaña. POST
+    /lote ejecuta muchas peticiones en un solo viaje, y POST de una lista de
+    anuncios los valida y agrega en lote.
+
+    Con un almacén, cada escritura guarda su campaña antes de responder.
+    """
+
+    def __init__(self, campanas=(), almacen=None):
+        """
+        Inicializa el servicio.
+
+        Args:
+            campanas (iterable, optional): Campañas iniciales; sus identificadores son
+                su posición, desde 1.
+            almacen (AlmacenSQLite, optional): Base donde se guarda cada campaña que cambia.
+        """
+        self._almacen = almacen
+        self._campanas = {}
+        self._candados = {}
+        for campana in campanas:
+            self._agregar(campana)
+        self._rutas = [
+            ("GET", re.compile(r"/campanas"), self._listar),
+            ("POST", re.compile(r"/campanas"), self._crear),
+            ("GET", re.compile(r"/campanas/(\d+)"), self._obtener),
+            ("PATCH", re.compile(r"/campanas/(\d+)"), self._actualizar),
+            ("GET", re.compile(r"/campanas/(\d+)/anuncios"), self._listar_anuncios),
+            ("POST", re.compile(r"/campanas/(\d+)/anuncios"), self._agregar_anuncios),
+            ("GET", re.compile(r"/campanas/(\d+)/anuncios/(\d+)"), self._obtener_anuncio),
+            ("PATCH", re.compile(r"/campanas/(\d+)/anuncios/(\d+)"), self._actualizar_anuncio),
+            ("POST", re.compile(r"/lote"), self._lote),
+        ]
+
+    @property
+    def campanas(self):
+        """dict: Identificador -> Campana."""
+        return self._campanas
+
+    def _agregar(self, campana):
+        """Registra una campaña y regresa su identificador."""
+        campana_id = len(self._campanas) + 1
+        self._campanas[campana_id] = campana
+        self._candados[campana_id] = asyncio.Lock()
+        return campana_id
+
+    def _campana(self, campana_id):
+        """
+        Regresa la campaña y su candado.
+
+        Raises:
+            ErrorHttp: 404 si no existe.
+        """
+        campana = self._campanas.get(int(campana_id))
+        if campana is None:
+            raise ErrorHttp(404, f"La campaña {campana_id} no existe.")
+        return campana, self._candados[int(campana_id)]
+
+    def _guardar(self, campana):
+        """Guarda una campaña en el almacén, si hay uno."""
+        if self._almacen is not None:
+            self._almacen.guardar(campana)
+
+    def _revisar_nombre(self, nombre, propia=None):
+        """
+        Revisa que ninguna otra campaña se llame así.
+
+        Raises:
+            ErrorHttp: 409 si el nombre ya está en uso.
+        """
+        if any(campana is not propia and campana.nombre == nombre for campana in self._campanas.values()):
+            raise ErrorHttp(409, f"Ya existe una campaña llamada '{nombre}'.", "nombre")
+
+    async def despachar(self, metodo, ruta, cuerpo=None):
+        """
+        Atiende una petición ya leída.
+
+        Args:
+            metodo (str): Método HTTP.
+            ruta (str): Ruta sin query string.
+            cuerpo (object, optional): Cuerpo JSON ya decodificado.
+
+        Returns:
+            Respuesta: Estado y cuerpo de la respuesta. Una excepción inesperada se
+                responde con 500 en lugar de cortar la conexión.
+        """
+        permitido = False
+        for metodo_ruta, patron, atender in self._rutas:
+            coincidencia = patron.fullmatch(ruta.rstrip("/") or "/")
+            if coincidencia is None:
+                continue
+            permitido = True
+            if metodo_ruta == metodo:
+                try:
+                    return await atender(cuerpo, *coincidencia.groups())
+                except ErrorHttp as e:
+                    return Respuesta(e.estado, e.cuerpo())
+                except Exception as e:
+                    return Respuesta(500, {"error": f"{type(e).__name__}: {e}"})
+        if permitido:
+            return Respuesta(405, {"error": f"Método {metodo} no permitido en {ruta}."})
+        return Respuesta(404, {"error": f"La ruta {ruta} no existe."})
+
+    async def _listar(self, cuerpo):
+        return Respuesta(200, [_resumen(i, campana) for i, campana in self._campanas.items()])
+
+    async def _crear(self, cuerpo):
+        if not isinstance(cuerpo, dict) or not isinstance(cuerpo.get("nombre"), str):
+            raise ErrorHttp(422, "Falta el nombre de la campaña.", "nombre")
+        self._revisar_nombre(cuerpo["nombre"])
+        try:
+            campana = Campana(cuerpo["nombre"])
+        except LargoExcedidoException as e:
+            raise _error_de_validacion("nombre", e) from None
+        fallo = aplicar_edicion(campana, {campo: cuerpo.get(campo) for campo in ("fecha_inicio", "fecha_termino")})
+        if fallo is not None:
+            raise _error_de_validacion(*fallo)
+        self._guardar(campana)
+        campana_id = self._agregar(campana)
+        return Respuesta(201, _resumen(campana_id, campana))
+
+    async def _obtener(self, cuerpo, campana_id):
+        campana, candado = self._campana(campana_id)
+        async with candado:
+            datos = _resumen(int(campana_id), campana)
+            datos["por_tipo"] = campana.conteo_por_tipo()
+        return Respuesta(200, datos)
+
+    async def _actualizar(self, cuerpo, campana_id):
+        campana, candado = self._campana(campana_id)
+        if not isinstance(cuerpo, dict):
+            raise ErrorHttp(400, "El cuerpo debe ser un objeto JSON.")
+        if isinstance(cuerpo.get("nombre"), str):
+            self._revisar_nombre(cuerpo["nombre"], campana)
+        async with candado:
+            fallo = aplicar_edicion(campana, dict(cuerpo, anuncio=None))
+            self._guardar(campana)
+            if fallo is not None:
+                raise _error_de_validacion(*fallo)
+            return Respuesta(200, _resumen(int(campana_id), campana))
+
+    async def _listar_anuncios(self, cuerpo, campana_id):
+        campana, candado = self._campana(campana_id)
+
+        async def anuncios():
+            # Se envían los anuncios que había al pedir la lista; el candado no se
+            # mantiene mientras se espera al cliente.
+            async with candado:
+                copia = list(campana.anuncios)
+            for inicio in range(0, len(copia), TAMANO_PARTE):
+                yield [datos_anuncio(anuncio) for anuncio in copia[inicio:inicio + TAMANO_PARTE]]
+
+        return Respuesta(200, anuncios())
+
+    async def _agregar_anuncios(self, cuerpo, campana_id):
+        campana, candado = self._campana(campana_id)
+        filas = cuerpo if isinstance(cuerpo, list) else [cuerpo]
+        if not all(isinstance(fila, dict) for fila in filas):
+            raise ErrorHttp(400, "Cada anuncio debe ser un objeto JSON.")
+        async with candado:
+            antes = len(campana.anuncios)
+            errores = campana.agregar_anuncios_bulk(filas)
+            agregados = len(campana.anuncios) - antes
+            if agregados:
+                self._guardar(campana)
+        if errores and not agregados:
+            primero = errores[0]
+            raise _error_de_validacion(primero.campo, primero.error)
+        return Respuesta(201, {
+            "agregados": agregados,
+            "errores": [{"fila": e.fila, "campo": e.campo, "error": f"{type(e.error).__name__}: {e.error}"}
+                        for e in errores],
+        })
+
+    def _anuncio(self, campana, posicion):
+        """
+        Regresa un anuncio por posición.
+
+        Raises:
+            ErrorHttp: 404 si la posición no existe.
+        """
+        posicion = int(posicion)
+        if posicion >= len(campana.anuncios):
+            raise ErrorHttp(404, f"La campaña no tiene un anuncio en la posición {posicion}.")
+        return campana.anuncios[posicion]
+
+    async def _obtener_anuncio(self, cuerpo, campana_id, posicion):
+        campana, candado = self._campana(campana_id)
+        async with candado:
+            return Respuesta(200, datos_anuncio(self._anuncio(campana, posicion)))
+
+    async def _actualizar_anuncio(self, cuerpo, campana_id, posicion):
+        campana, candado = self._campana(campana_id)
+        if not isinstance(cuerpo, dict):
+            raise ErrorHttp(400, "El cuerpo debe ser un objeto JSON.")
+        async with candado:
+            anuncio = self._anuncio(campana, posicion)
+            fallo = aplicar_edicion(campana, dict(cuerpo, anuncio=int(posicion)))
+            self._guardar(campana)
+            if fallo is not None:
+                raise _error_de_validacion(*fallo)
+            return Respuesta(200, datos_anuncio(anuncio))
+
+    async def _lote(self, cuerpo):
+        if not isinstance(cuerpo, list):
+            raise ErrorHttp(400, "El cuerpo debe ser una lista de peticiones.")
+        respuestas = []
+        for peticion in cuerpo:
+            if not isinstance(peticion, dict) or peticion.get("ruta", "/lote").rstrip("/") == "/lote":
+                respuestas.append({"estado": 400, "cuerpo": {"error": "Petición de lote no válida."}})
+                continue
+            respuesta = await self.despachar(peticion.get("metodo", "GET").upper(), peticion["ruta"],
+                                             peticion.get("cuerpo"))
+            cuerpo_respuesta = respuesta.cuerpo
+            if hasattr(cuerpo_respuesta, "__aiter__"):
+                cuerpo_respuesta = [fila async for parte in cuerpo_respuesta for fila in parte]
+            respuestas.append({"estado": respuesta.estado, "cuerpo": cuerpo_respuesta})
+        return Respuesta(200, respuestas)
+
+    async def atender(self, lector, escritor):
+        """Atiende las peticiones de una conexión hasta que el cliente la cierra."""
+        try:
+            while True:
+                try:
+                    peticion = await _leer_peticion(lector)
+                except ErrorHttp as e:
+                    # Sin una petición bien formada no se sabe dónde empieza la siguiente.
+                    await _escribir_respuesta(escritor, Respuesta(e.estado, e.cuerpo()))
+                    break
+                if peticion is None:
+                    break
+                metodo, ruta, cabeceras, datos = peticion
+                if datos is _DEMASIADO_GRANDE:
+                    respuesta = Respuesta(413, {"error": "El cuerpo es demasiado grande."})
+                else:
+                    try:
+                        cuerpo = json.loads(datos) if datos else None
+                    except ValueError:
+                        respuesta = Respuesta(400, {"error": "El cuerpo no es JSON válido."})
+                    else:
+                        respuesta = await self.despachar(metodo, ruta.split("?", 1)[0], cuerpo)
+                await _escribir_respuesta(escritor, respuesta)
+                if cabeceras.get("connection", "").lower() == "close" or datos is _DEMASIADO_GRANDE:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception:
+            # Una respuesta por partes que falló a la mitad ya envió su estado; al
+            # cerrar sin la parte final el cliente ve que quedó incompleta.
+            pass
+        finally:
+            escritor.close()
+
+    async def iniciar(self, host="127.0.0.1", puerto=8080):
+        """
+        Empieza a aceptar conexiones.
+
+        Args:
+            host (str, optional): Dirección donde escuchar. Por defecto, solo la local.
+            puerto (int, optional): Puerto; 0 elige uno libre.
+
+        Returns:
+            asyncio.Server: El servidor; su puerto real está en sockets[0].getsockname().
+        """
+        return await asyncio.start_server(self.atender, host, puerto)
+
+
+_DEMASIADO_GRANDE = object()
+
+
+async def _leer_linea(lector):
+    """
+    Lee una línea de la petición.
+
+    Raises:
+        ErrorHttp: 400 si la línea supera el límite del lector.
+    """
+    try:
+        return await lector.readline()
+    except ValueError:
+        # StreamReader.readline convierte LimitOverrunError en ValueError.
+        raise ErrorHttp(400, "La línea de petición o una cabecera es demasiado larga.") from None
+
+
+async def _leer_peticion(lector):
+    """
+    Lee una petición HTTP/1.1.
+
+    Returns:
+        tuple | None: (método, ruta, cabeceras en minúsculas, cuerpo en bytes), o None si
+            el cliente cerró la conexión.
+
+    Raises:
+        ErrorHttp: 400 si la línea de petición o Content-Length no son válidos, o si
+            una línea supera el límite del lector.
+    """
+    linea = await _leer_linea(lector)
+    if not linea.strip():
+        return None
+    partes = linea.decode("latin-1").split(" ", 2)
+    if len(partes) != 3:
+        raise ErrorHttp(400, "La línea de petición no es válida.")
+    metodo, ruta, _ = partes
+    cabeceras = {}
+    while True:
+        linea = await _leer_linea(lector)
+        if linea in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        cabeceras[nombre.strip().lower()] = valor.strip()
+    largo = cabeceras.get("content-length", "0")
+    if not largo.isdecimal():
+        raise ErrorHttp(400, f"Content-Length no válido: {largo!r}.")
+    largo = int(largo)
+    if largo > MAX_CUERPO:
+        return metodo, ruta, cabeceras, _DEMASIADO_GRANDE
+    datos = await lector.readexactly(largo) if largo else b""
+    return metodo, ruta, cabeceras, datos
+
+
+async def _siguiente(partes):
+    """Regresa la siguiente parte de un iterador asíncrono, o None al terminar."""
+    try:
+        return await partes.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _escribir_respuesta(escritor, respuesta):
+    """Escribe una respuesta JSON, o JSON Lines por partes si el cuerpo es un generador."""
+    estado, cuerpo = respuesta
+    inicio = f"HTTP/1.1 {estado} {RAZONES.get(estado, '')}\r\n"
+    if hasattr(cuerpo, "__aiter__"):
+        partes = cuerpo.__aiter__()
+        try:
+            parte = await _siguiente(partes)
+        except Exception as e:
+            # Todavía no se envió nada, así que el error se puede responder.
+            await _escribir_respuesta(escritor, Respuesta(500, {"error": f"{type(e).__name__}: {e}"}))
+            return
+        escritor.write((inicio + "Content-Type: application/x-ndjson; charset=utf-8\r\n"
+                        "Transfer-Encoding: chunked\r\n\r\n").encode("latin-1"))
+        while parte is not None:
+            datos = "".join(json.dumps(fila, ensure_ascii=False) + "\n" for fila in parte).encode("utf-8")
+            escritor.write(b"%x\r\n%s\r\n" % (len(datos), datos))
+            # Respeta el ritmo del cliente en vez de acumular la lista completa en el buffer.
+            await escritor.drain()
+            parte = await _siguiente(partes)
+        escritor.write(b"0\r\n\r\n")
+    else:
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        escritor.write((inicio + "Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(datos)}\r\n\r\n").encode("latin-1") + datos)
+    await escritor.drain()
+
+
+class Cliente:
+    """
+    Cliente HTTP mínimo sobre una conexión persistente, para pruebas y mediciones.
+
+    Las respuestas JSON Lines se regresan como una lista de objetos.
+    """
+
+    def __init__(self, lector, escritor):
+        self._lector = lector
+        self._escritor = escritor
+
+    @classmethod
+    async def conectar(cls, host="127.0.0.1", puerto=8080):
+        """Abre una conexión con el servicio."""
+        return cls(*await asyncio.open_connection(host, puerto))
+
+    async def pedir(self, metodo, ruta, cuerpo=None):
+        """
+        Envía una petición y espera la respuesta.
+
+        Returns:
+            tuple: (estado, cuerpo decodificado).
+        """
+        datos = b"" if cuerpo is None else json.dumps(cuerpo).encode("utf-8")
+        self._escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\n"
+                             f"Content-Length: {len(datos)}\r\n\r\n".encode("latin-1") + datos)
+        await self._escritor.drain()
+        estado = int((await self._lector.readline()).split()[1])
+        cabeceras = {}
+        while True:
+            linea = await self._lector.readline()
+            if linea in (b"\r\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        if cabeceras.get("transfer-encoding") == "chunked":
+            filas = []
+            while True:
+                largo = int(await self._lector.readline(), 16)
+                parte = await self._lector.readexactly(largo + 2)
+                if not largo:
+                    return estado, filas
+                filas.extend(json.loads(linea) for linea in parte[:-2].splitlines())
+        return estado, json.loads(await self._lector.readexactly(int(cabeceras["content-length"])))
+
+    async def cerrar(self):
+        """Cierra la conexión."""
+        self._escritor.close()
+        await self._escritor.wait_closed()
+
+
+async def _servir(servicio, host, puerto):
+    servidor = await servicio.iniciar(host, puerto)
+    print(f"Escuchando en http://{host}:{servidor.sockets[0].getsockname()[1]}")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(argv=None):
+    """Inicia el servicio, cargando y guardando las campañas de una base SQLite si se indica."""
+    parser = argparse.ArgumentParser(prog="servicio", description="Servicio HTTP de campañas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--bd", help="base SQLite desde donde cargar y donde guardar las campañas")
+    args = parser.parse_args(argv)
+
+    almacen = None
+    campanas = ()
+    if args.bd:
+        from persistencia import AlmacenSQLite
+        almacen = AlmacenSQLite(args.bd)
+        campanas = almacen.cargar_todas()
+    # Cada escritura se guarda al responderla, así que terminar el proceso de
+    # cualquier forma no pierde cambios confirmados.
+    servicio = Servicio(campanas, almacen)
+    try:
+        asyncio.run(_servir(servicio, args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if almacen is not None:
+            almacen.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import unittest
+from almacen import AnuncioStore, AnuncioFila
+from anuncio import Video, Display, Social
+from campana import Campana
+from error import SubTipoInvalidoException
+
+
+class TestAnuncioStore(unittest.TestCase):
+    """Pruebas unitarias para el almacén columnar de anuncios."""
+
+    def setUp(self):
+        self.video = Video("Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com", duracion=15)
+        self.display = Display("Banner", "http://cdn.com/b.jpg", "http://ejemplo.com")
+        self.almacen = AnuncioStore([self.video, self.display])
+
+    def test_filas_conservan_propiedades(self):
+        """Prueba que las vistas expongan los mismos datos que los objetos originales."""
+        fila = self.almacen[0]
+        self.assertIsInstance(fila, AnuncioFila)
+        self.assertEqual(fila.tipo, "Video")
+        self.assertEqual(fila.sub_tipo, "Publicidad")
+        self.assertEqual(fila.url_archivo, "http://cdn.com/v.mp4")
+        self.assertEqual(fila.duracion, 15)
+        self.assertEqual(self.almacen[-1].url_clic, "http://ejemplo.com")
+
+    def test_urls_internadas(self):
+        """Prueba que una URL repetida se guarde una sola vez en la tabla de cadenas."""
+        self.assertEqual(self.almacen._url_clic[0], self.almacen._url_clic[1])
+        self.assertEqual(self.almacen._cadenas.count("http://ejemplo.com"), 1)
+
+    def test_setters_validan_como_anuncio(self):
+        """Prueba que las vistas apliquen las mismas reglas que los setters de Anuncio."""
+        fila = self.almacen[1]
+        fila.alto = 0
+        fila.ancho = 300
+        self.assertEqual(fila.alto, 1)
+        self.assertEqual(fila.ancho, 300)
+        fila.sub_tipo = "Sidebar"
+        self.assertEqual(fila.sub_tipo, "Sidebar")
+        with self.assertRaises(SubTipoInvalidoException):
+            fila.sub_tipo = "Story"
+        with self.assertRaises(AttributeError):
+            fila.duracion
+
+    def test_pertenencia_y_eliminacion(self):
+        """Prueba que se puedan buscar y eliminar anuncios."""
+        self.assertIn(self.video, self.almacen)
+        del self.almacen[0]
+        self.assertEqual(len(self.almacen), 1)
+        self.assertNotIn(self.video, self.almacen)
+        self.assertEqual(self.almacen[0].materializar().sub_tipo, "Banner")
+
+    def test_respaldo_de_campana(self):
+        """Prueba que Campana funcione con un AnuncioStore como colección de anuncios."""
+        campana = Campana("Campaña columnar", anuncios=AnuncioStore())
+        campana.anuncios.extend([self.video, Social("Story"), Social("Post")])
+        self.assertIn("- 1 Video\n- 0 Display\n- 2 Social\n", str(campana))
+
+    def test_asignar_slices(self):
+        """Prueba que asignar a un slice se comporte como en una lista y mantenga los conteos."""
+        self.almacen[1:] = [Social("Post"), Social("Story"), self.display]
+        self.assertEqual([fila.sub_tipo for fila in self.almacen], ["Publicidad", "Post", "Story", "Banner"])
+        self.almacen[::2] = [Display("Sidebar"), Video("Tutorial")]
+        self.almacen[1:3] = []
+        self.assertEqual([(fila.tipo, fila.sub_tipo) for fila in self.almacen],
+                         [("Display", "Sidebar"), ("Display", "Banner")])
+        self.assertEqual(self.almacen.conteo_por_tipo(), {"Display": 2})
+        with self.assertRaises(ValueError):
+            self.almacen[::2] = []
+        with self.assertRaises(SubTipoInvalidoException):
+            self.almacen[:1] = [Social("Post"), Social("Banner")]
+        self.assertEqual(len(self.almacen), 2)
+
+    def test_desde_columnas_reutiliza_cadenas(self):
+        """Prueba que un almacén creado desde columnas no repita las cadenas que ya tiene su tabla."""
+        columnas, cadenas = self.almacen.columnas()
+        copia = AnuncioStore.desde_columnas(tuple(columna[:] for columna in columnas), list(cadenas))
+        copia.append(Social("Post", None, "http://ejemplo.com"))
+        self.assertEqual(copia._cadenas, cadenas)
+        self.assertEqual(copia[2].url_clic, "http://ejemplo.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -66,18 +66,18 @@ class TestVideo(unittest.TestCase):
         self.assertEqual(video.duracion, 5)
 
     def test_comprimir_video(self):
-        """Prueba el método comprimir_anuncio."""
+        """Prueba que comprimir_anuncio informa el error de un video sin archivo."""
         video = Video()
-        with self.assertLogs() as cm:
-            video.comprimir_anuncio()
-        self.assertIn("COMPRESIÓN DE VIDEO NO IMPLEMENTADA AÚN", cm.output[0])
+        resultado = video.comprimir_anuncio()
+        self.assertIsInstance(resultado.error, ValueError)
+        self.assertEqual(resultado.ahorrado, 0)
 
     def test_redimensionar_video(self):
-        """Prueba el método redimensionar_anuncio."""
+        """Prueba que redimensionar_anuncio informa el error de un anuncio sin archivo."""
         video = Video()
-        with self.assertLogs() as cm:
-            video.redimensionar_anuncio()
-        self.assertIn("RECORTE DE VIDEO NO IMPLEMENTADO AÚN", cm.output[0])
+        resultado = video.redimensionar_anuncio()
+        self.assertIsInstance(resultado.error, ValueError)
+        self.assertEqual(resultado.rendiciones, ())
 
 
 class TestDisplay(unittest.TestCase):
@@ -89,18 +89,18 @@ class TestDisplay(unittest.TestCase):
         self.assertIsInstance(display, Display)
 
     def test_comprimir_display(self):
-        """Prueba el método comprimir_anuncio."""
+        """Prueba que comprimir_anuncio informa el error de un display sin archivo."""
         display = Display()
-        with self.assertLogs() as cm:
-            display.comprimir_anuncio()
-        self.assertIn("COMPRESIÓN DE ANUNCIOS DISPLAY NO IMPLEMENTADA AÚN", cm.output[0])
+        resultado = display.comprimir_anuncio()
+        self.assertIsInstance(resultado.error, ValueError)
+        self.assertEqual(resultado.ahorrado, 0)
 
     def test_redimensionar_display(self):
-        """Prueba el método redimensionar_anuncio."""
+        """Prueba que redimensionar_anuncio informa el error de un anuncio sin archivo."""
         display = Display()
-        with self.assertLogs() as cm:
-            display.redimensionar_anuncio()
-        self.assertIn("REDIMENSIONAMIENTO DE ANUNCIOS DISPLAY NO IMPLEMENTADA AÚN", cm.output[0])
+        resultado = display.redimensionar_anuncio()
+        self.assertIsInstance(resultado.error, ValueError)
+        self.assertEqual(resultado.rendiciones, ())
 
 
 class TestSocial(unittest.TestCase):
@@ -112,18 +112,73 @@ class TestSocial(unittest.TestCase):
         self.assertIsInstance(social, Social)
 
     def test_comprimir_social(self):
-        """Prueba el método comprimir_anuncio."""
+        """Prueba que comprimir_anuncio informa el error de un anuncio social sin archivo."""
         social = Social()
-        with self.assertLogs() as cm:
-            social.comprimir_anuncio()
-        self.assertIn("COMPRESIÓN DE ANUNCIOS DE REDES SOCIALES NO IMPLEMENTADA AÚN", cm.output[0])
+        resultado = social.comprimir_anuncio()
+        self.assertIsInstance(resultado.error, ValueError)
+        self.assertEqual(resultado.ahorrado, 0)
 
     def test_redimensionar_social(self):
-        """Prueba el método redimensionar_anuncio."""
+        """Prueba que redimensionar_anuncio informa el error de un anuncio sin archivo."""
         social = Social()
-        with self.assertLogs() as cm:
-            social.redimensionar_anuncio()
-        self.assertIn("REDIMENSIONAMIENTO DE ANUNCIOS DE REDES SOCIALES NO IMPLEMENTADA AÚN", cm.output[0])
+        resultado = social.redimensionar_anuncio()
+        self.assertIsInstance(resultado.error, ValueError)
+        self.assertEqual(resultado.rendiciones, ())
+
+
+class TestRegistroSubTipos(unittest.TestCase):
+    """Pruebas unitarias para el registro inmutable de subtipos."""
+
+    def test_registro_por_clase(self):
+        """Prueba que cada subclase quede registrada con sus subtipos."""
+        registro = Anuncio.REGISTRO
+        self.assertEqual(registro.clases[:3], (Video, Display, Social))
+        self.assertEqual(registro.sub_tipos_de(Display), frozenset({"Banner", "Sidebar"}))
+        self.assertIs(registro.clase_por_nombre("Social"), Social)
+
+    def test_codigos_y_busqueda_inversa(self):
+        """Prueba que los códigos de subtipo se puedan traducir de vuelta."""
+        registro = Anuncio.REGISTRO
+        self.assertEqual(registro.codigo(None), 0)
+        for sub_tipo in ("Publicidad", "Tutorial", "Banner", "Sidebar", "Post", "Story"):
+            self.assertEqual(registro.sub_tipo(registro.codigo(sub_tipo)), sub_tipo)
+
+    def test_validacion_en_lote(self):
+        """Prueba la validación y codificación de muchos subtipos a la vez."""
+        registro = Anuncio.REGISTRO
+        sub_tipos = ["Banner", "Story", "Sidebar", None]
+        self.assertEqual(registro.validar_lote(Display, sub_tipos), [True, False, True, False])
+        self.assertEqual(registro.indices_invalidos(Display, sub_tipos), [1, 3])
+        codigos = registro.codificar_lote(Display, sub_tipos)
+        self.assertEqual(codigos[1], registro.INVALIDO)
+        self.assertEqual(registro.sub_tipo(codigos[2]), "Sidebar")
+
+    def test_registro_inmutable(self):
+        """Prueba que registrar una clase nueva no modifique el registro anterior."""
+        anterior, sub_tipos = Anuncio.REGISTRO, dict(Anuncio.SUB_TIPOS)
+        # Podcast no debe quedar registrado para las demás pruebas.
+        self.addCleanup(setattr, Anuncio, "REGISTRO", anterior)
+        self.addCleanup(Anuncio.SUB_TIPOS.update, sub_tipos)
+        self.addCleanup(Anuncio.SUB_TIPOS.clear)
+
+        class Podcast(Anuncio):
+            SUB_TIPOS = {"Podcast": ("Mencion",)}
+
+            def comprimir_anuncio(self):
+                pass
+
+            def redimensionar_anuncio(self):
+                pass
+
+        self.assertIsNone(anterior.clase_por_nombre("Podcast"))
+        self.assertTrue(Anuncio.REGISTRO.es_valido(Podcast, "Mencion"))
+        self.assertIn("De Podcast: 'Mencion'", Anuncio.mostrar_formatos("Podcast"))
+
+    def test_mostrar_formatos(self):
+        """Prueba el texto de formatos para un tipo específico."""
+        self.assertEqual(
+            Anuncio.mostrar_formatos("Video"), "Subtipos:\nDe Video: 'Publicidad' y 'Tutorial'\n"
+        )
 
 
 if __name__ == "__main__":
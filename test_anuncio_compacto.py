@@ -0,0 +1,55 @@
+import unittest
+import anuncio_compacto
+from anuncio_compacto import Anuncio, Video, Display, Social
+from error import SubTipoInvalidoException
+
+
+class TestAnuncioCompacto(unittest.TestCase):
+    """Pruebas unitarias para la variante compacta de Anuncio."""
+
+    def test_sin_dict_por_instancia(self):
+        """Prueba que las instancias no tengan __dict__."""
+        for clase in (Video, Display, Social):
+            anuncio = clase()
+            self.assertFalse(hasattr(anuncio, "__dict__"))
+            with self.assertRaises(AttributeError):
+                anuncio.atributo_inexistente = 1
+
+    def test_sigue_siendo_abstracta(self):
+        """Prueba que la clase base mantenga el contrato de ABC."""
+        with self.assertRaises(TypeError):
+            Anuncio()
+
+    def test_registro_sub_tipos(self):
+        """Prueba que __init_subclass__ registre los subtipos de cada subclase."""
+        self.assertEqual(anuncio_compacto.Anuncio.SUB_TIPOS["Display"], {"Display": ("Banner", "Sidebar")})
+        self.assertIn("Video", Anuncio.SUB_TIPOS)
+        self.assertIn("Social", Anuncio.SUB_TIPOS)
+
+    def test_mismas_reglas_de_validacion(self):
+        """Prueba el ajuste de alto/ancho a 1, la duración por defecto y los subtipos."""
+        video = Video("Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com")
+        self.assertEqual(video.duracion, 5)
+        video.alto = 0
+        video.ancho = -3
+        video.duracion = -1
+        self.assertEqual((video.alto, video.ancho, video.duracion), (1, 1, 5))
+        video.sub_tipo = "Tutorial"
+        self.assertEqual(video.sub_tipo, "Tutorial")
+        with self.assertRaises(SubTipoInvalidoException):
+            video.sub_tipo = "Banner"
+        with self.assertRaises(SubTipoInvalidoException):
+            Video("Banner")
+
+    def test_urls(self):
+        """Prueba que se puedan establecer y obtener las URLs."""
+        social = Social("Post")
+        social.url_archivo = "http://www.ejemplo.com/archivo.jpg"
+        social.url_clic = "http://www.ejemplo.com/destino"
+        self.assertEqual(social.url_archivo, "http://www.ejemplo.com/archivo.jpg")
+        self.assertEqual(social.url_clic, "http://www.ejemplo.com/destino")
+        self.assertEqual(social.tipo, "Social")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from benchmarks import generador, suite
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_generador_determinista(self):
+        """Prueba que la misma semilla genere las mismas campañas, con URLs repetidas y fechas abiertas."""
+        primeras = generador.generar_campanas(3_000, semilla=7, por_campana=100)
+        segundas = generador.generar_campanas(3_000, semilla=7, por_campana=100)
+        self.assertEqual([str(c) for c in primeras], [str(c) for c in segundas])
+        self.assertEqual(sum(len(c.anuncios) for c in primeras), 3_000)
+        urls = [anuncio.url_clic for campana in primeras for anuncio in campana.anuncios]
+        self.assertLess(len(set(urls)), len(urls) // 2)
+        self.assertTrue(any(c.fecha_termino is None for c in primeras))
+        conteos = {}
+        for campana in primeras:
+            for clave, cantidad in campana.conteo_por_sub_tipo().items():
+                conteos[clave] = conteos.get(clave, 0) + cantidad
+        self.assertGreater(conteos["Display", "Banner"], 5 * conteos["Video", "Tutorial"])
+        self.assertNotEqual(next(generador.generar_filas(50, semilla=1)), next(generador.generar_filas(50, semilla=2)))
+
+    def test_correr_y_comparar(self):
+        """Prueba que los resultados se puedan comparar y que una caída mayor al umbral sea regresión."""
+        base = suite.correr("1k", repeticiones=1, nombres=["mostrar_formatos", "anuncio_setters"])
+        self.assertEqual(list(base["resultados"]), ["mostrar_formatos", "anuncio_setters"])
+        nuevo = {**base, "resultados": {
+            "mostrar_formatos": {"por_segundo": base["resultados"]["mostrar_formatos"]["por_segundo"] * 0.95},
+            "anuncio_setters": {"por_segundo": base["resultados"]["anuncio_setters"]["por_segundo"] * 0.5},
+        }}
+        comparaciones = suite.comparar(base, nuevo, umbral=0.1)
+        self.assertEqual([c.regresion for c in comparaciones], [False, True])
+        self.assertAlmostEqual(comparaciones[1].cambio, -0.5)
+        with self.assertRaises(ValueError):
+            suite.comparar(base, {**nuevo, "escala": "100k"})
+        with self.assertRaises(ValueError):
+            suite.correr("1k", nombres=["inexistente"])
+
+
+if __name__ == "__main__":
+    unittest.main()
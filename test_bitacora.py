@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import bitacora
+from bitacora import Bitacora
+from error import LargoExcedidoException, SubTipoInvalidoException
+from ingesta import cargar_anuncios
+
+
+class TestBitacora(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "error.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def leer(self, ruta=None):
+        with open(ruta or self.ruta, encoding="utf-8") as archivo:
+            return [json.loads(linea) for linea in archivo]
+
+    def test_registros_estructurados_y_agrupados(self):
+        """Prueba que los errores repetidos se escriben como un solo registro con su cantidad."""
+        with Bitacora(self.ruta, intervalo=10) as registro:
+            for indice in range(1000):
+                registro.registrar(SubTipoInvalidoException("Subtipo no permitido"), "Verano", indice)
+            registro.registrar(LargoExcedidoException(), "Verano")
+            registro.registrar(SubTipoInvalidoException("Subtipo no permitido"), "Invierno", 3)
+        lineas = self.leer()
+        self.assertEqual([(l["tipo"], l["campana"], l["anuncio"], l["repeticiones"]) for l in lineas], [
+            ("SubTipoInvalidoException", "Verano", 0, 1000),
+            ("LargoExcedidoException", "Verano", None, 1),
+            ("SubTipoInvalidoException", "Invierno", 3, 1),
+        ])
+        self.assertEqual(lineas[0]["mensaje"], "Subtipo no permitido")
+        self.assertIn("T", lineas[0]["momento"])
+
+    def test_vaciar_escribe_sin_esperar_el_intervalo(self):
+        """Prueba que vaciar() deja escrito lo registrado aunque el intervalo sea largo."""
+        registro = Bitacora(self.ruta, intervalo=60)
+        try:
+            registro.registrar(LargoExcedidoException(), "A")
+            registro.vaciar()
+            self.assertEqual(len(self.leer()), 1)
+        finally:
+            registro.cerrar()
+        with self.assertRaises(ValueError):
+            registro.registrar(LargoExcedidoException())
+        hilo = threading.Thread(target=registro.vaciar, daemon=True)
+        hilo.start()
+        hilo.join(5)
+        self.assertFalse(hilo.is_alive())
+
+    def test_rotacion_por_tamano(self):
+        """Prueba que el archivo se rota al pasar el tamaño máximo y se conservan los respaldos."""
+        with Bitacora(self.ruta, max_bytes=300, respaldos=2, intervalo=0) as registro:
+            for numero in range(12):
+                registro.registrar(LargoExcedidoException(f"Error {numero}"), "Campaña")
+                registro.vaciar()
+        self.assertTrue(os.path.exists(self.ruta + ".2"))
+        self.assertFalse(os.path.exists(self.ruta + ".3"))
+        self.assertLessEqual(os.path.getsize(self.ruta), 300)
+        self.assertEqual(self.leer()[-1]["mensaje"], "Error 11")
+
+    def test_errores_de_carga_masiva(self):
+        """Prueba el registro de los ErrorFila de una carga masiva con su posición."""
+        _, errores = cargar_anuncios([("Video", "Banner"), ("Video", "Publicidad"), ("Display", "Post")])
+        with Bitacora(self.ruta) as registro:
+            registro.registrar_errores(errores, "Carga")
+        self.assertEqual([(l["anuncio"], l["tipo"]) for l in self.leer()],
+                         [(0, "SubTipoInvalidoException"), (2, "SubTipoInvalidoException")])
+
+    def test_bitacora_del_proceso(self):
+        """Prueba configurar, registrar y cerrar la bitácora compartida del módulo."""
+        bitacora.configurar(self.ruta)
+        bitacora.registrar(LargoExcedidoException(), "A", 1)
+        bitacora.cerrar()
+        self.assertEqual(self.leer()[0]["anuncio"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
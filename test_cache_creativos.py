@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import cache_creativos
+import imagen
+import redimension
+from anuncio import Display, Social
+from cache_creativos import CacheCreativos
+from test_redimension import png_rgb
+
+
+class TestCacheCreativos(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.raiz = os.path.join(self.directorio, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def test_guardar_y_obtener(self):
+        """Prueba que una entrada se encuentra por hash y transformación."""
+        cache = CacheCreativos(self.raiz)
+        transformacion = {"op": "comprimir", "calidad": 80, "formato": "png"}
+        self.assertIsNone(cache.obtener("abc", transformacion))
+        ruta = cache.guardar("abc", transformacion, b"datos")
+        self.assertTrue(ruta.endswith(".png"))
+        self.assertEqual(cache.obtener("abc", transformacion), b"datos")
+        self.assertIsNone(cache.obtener("abc", dict(transformacion, calidad=60)))
+        estadisticas = cache.estadisticas()
+        self.assertEqual(estadisticas["aciertos_memoria"], 1)
+        self.assertEqual(estadisticas["fallos_disco"], 2)
+
+    def test_desalojo_en_memoria(self):
+        """Prueba el desalojo LRU del nivel en memoria y que el disco sigue respondiendo."""
+        cache = CacheCreativos(self.raiz, max_bytes_memoria=10)
+        cache.guardar("a", {"op": "x"}, b"12345")
+        cache.guardar("b", {"op": "x"}, b"12345")
+        cache.obtener("a", {"op": "x"})
+        cache.guardar("c", {"op": "x"}, b"12345")
+        estadisticas = cache.estadisticas()
+        self.assertEqual(estadisticas["desalojos_memoria"], 1)
+        self.assertEqual(estadisticas["bytes_memoria"], 10)
+        aciertos_memoria = estadisticas["aciertos_memoria"]
+        self.assertEqual(cache.obtener("b", {"op": "x"}), b"12345")
+        self.assertEqual(cache.estadisticas()["aciertos_memoria"], aciertos_memoria)
+        self.assertEqual(cache.estadisticas()["aciertos_disco"], 1)
+
+    def test_desalojo_en_disco(self):
+        """Prueba que el nivel en disco borra los archivos usados hace más tiempo."""
+        cache = CacheCreativos(self.raiz, max_bytes_disco=25)
+        rutas = [cache.guardar(huella, {"op": "x"}, b"0123456789") for huella in "abc"]
+        self.assertFalse(os.path.exists(rutas[0]))
+        self.assertTrue(all(os.path.exists(ruta) for ruta in rutas[1:]))
+        estadisticas = cache.estadisticas()
+        self.assertEqual(estadisticas["desalojos_disco"], 1)
+        self.assertEqual(estadisticas["bytes_disco"], 20)
+
+    def test_indexa_disco_existente(self):
+        """Prueba que un caché nuevo encuentra lo que otro dejó en el mismo directorio."""
+        CacheCreativos(self.raiz).guardar("a", {"op": "x"}, b"datos")
+        cache = CacheCreativos(self.raiz)
+        self.assertEqual(cache.estadisticas()["entradas_disco"], 1)
+        self.assertEqual(cache.obtener("a", {"op": "x"}), b"datos")
+
+    def test_obtener_o_crear(self):
+        """Prueba que la función de creación se llama una sola vez."""
+        cache = CacheCreativos(self.raiz)
+        crear = mock.Mock(return_value=b"resultado")
+        for _ in range(3):
+            self.assertEqual(cache.obtener_o_crear("a", {"op": "x"}, crear), b"resultado")
+        crear.assert_called_once()
+
+    def test_huella_archivo_se_recuerda(self):
+        """Prueba que el hash se recalcula solo cuando el archivo cambia."""
+        ruta = os.path.join(self.directorio, "a.bin")
+        with open(ruta, "wb") as archivo:
+            archivo.write(b"uno")
+        huella = cache_creativos.huella_archivo(ruta)
+        self.assertEqual(huella, cache_creativos.huella_datos(b"uno"))
+        with open(ruta, "wb") as archivo:
+            archivo.write(b"otro contenido")
+        self.assertEqual(cache_creativos.huella_archivo(ruta), cache_creativos.huella_datos(b"otro contenido"))
+        self.assertEqual(cache_creativos._huella.cache_info().maxsize, cache_creativos.MAX_HUELLAS)
+
+    @unittest.skipIf(redimension.Image is not None, "Con Pillow la decodificación no pasa por imagen.")
+    def test_rendicion_compartida_entre_anuncios(self):
+        """Prueba que dos archivos con el mismo contenido comparten la rendición procesada."""
+        datos = png_rgb(30, 30)[0]
+        rutas = []
+        for nombre in ("a.png", "b.png"):
+            rutas.append(os.path.join(self.directorio, nombre))
+            with open(rutas[-1], "wb") as archivo:
+                archivo.write(datos)
+        primera = Display("Banner", rutas[0]).rendicion(directorio=self.raiz)
+        with mock.patch("imagen.decodificar_png", wraps=imagen.decodificar_png) as decodificar:
+            segunda = Display("Sidebar", rutas[1]).rendicion(728, 90, directorio=self.raiz)
+            otra = Social("Post", rutas[1]).rendicion(directorio=self.raiz)
+        self.assertEqual(primera, segunda)
+        self.assertEqual(decodificar.call_count, 1)
+        with open(otra, "rb") as archivo:
+            self.assertEqual(imagen.decodificar_png(archivo.read())[:2], (1080, 1080))
+
+
+if __name__ == "__main__":
+    unittest.main()
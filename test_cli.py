@@ -0,0 +1,124 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+import cli
+from persistencia import AlmacenSQLite
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.bd = os.path.join(self.directorio, "campanas.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def ejecutar(self, *argumentos, entrada=""):
+        """Ejecuta la CLI y regresa (código, salida, errores)."""
+        salida, errores = io.StringIO(), io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(entrada)), redirect_stdout(salida), redirect_stderr(errores):
+            codigo = cli.main(["--bd", self.bd, *argumentos])
+        return codigo, salida.getvalue(), errores.getvalue()
+
+    def campana(self, nombre):
+        with AlmacenSQLite(self.bd) as almacen:
+            campana = almacen.abrir_por_nombre(nombre)
+            return campana, [(a.tipo, a.sub_tipo, getattr(a, "duracion", None)) for a in campana.anuncios]
+
+    def test_crear_e_importar(self):
+        """Prueba crear una campaña e importar anuncios que la completan sin duplicarla."""
+        self.assertEqual(self.ejecutar("create", "Verano", "--inicio", "2024-01-01")[0], 0)
+        codigo, _, errores = self.ejecutar("crear", "Verano")
+        self.assertEqual(codigo, 1)
+        self.assertIn("ya existe una campaña llamada 'Verano'", errores)
+        entrada = ('{"campana": "Verano", "tipo": "Video", "sub_tipo": "Tutorial", "duracion": 30}\n'
+                   '{"campana": "Otoño", "tipo": "Social", "sub_tipo": "Post"}\n'
+                   '{"campana": "Verano", "tipo": "Video", "sub_tipo": "Banner"}\n')
+        codigo, salida, errores = self.ejecutar("importar", entrada=entrada)
+        self.assertEqual(codigo, 1)
+        self.assertIn("línea 3 (sub_tipo): SubTipoInvalidoException", errores)
+        with AlmacenSQLite(self.bd) as almacen:
+            self.assertEqual([nombre for _, nombre in almacen.listar()], ["Verano", "Otoño"])
+        campana, anuncios = self.campana("Verano")
+        self.assertEqual(campana.fecha_inicio.isoformat(), "2024-01-01")
+        self.assertEqual(anuncios, [("Video", "Tutorial", 30)])
+
+    def test_agregar_anuncios_csv(self):
+        """Prueba agregar anuncios desde un CSV a una campaña existente."""
+        self.ejecutar("crear", "Verano")
+        ruta = os.path.join(self.directorio, "anuncios.csv")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write("tipo,sub_tipo,url_archivo\nDisplay,Banner,http://cdn.com/a.png\nSocial,Story,\n")
+        codigo, salida, _ = self.ejecutar("add-ads", "Verano", ruta)
+        self.assertEqual(codigo, 0)
+        self.assertIn("2 anuncios agregados", salida)
+        self.assertEqual(self.campana("Verano")[1], [("Display", "Banner", None), ("Social", "Story", None)])
+        self.assertNotEqual(self.ejecutar("agregar-anuncios", "No existe", ruta)[0], 0)
+
+    def test_modificar_en_lote(self):
+        """Prueba ediciones de campañas y anuncios con errores por línea."""
+        self.ejecutar("importar", entrada='{"campana": "A", "tipo": "Video", "sub_tipo": "Tutorial"}\n'
+                                          '{"campana": "A", "tipo": "Display", "sub_tipo": "Banner"}\n')
+        entrada = "\n".join((
+            '{"campana": "A", "nombre": "B", "fecha_termino": "2024-12-31"}',
+            '{"campana": "B", "anuncio": 0, "sub_tipo": "Publicidad", "duracion": 45}',
+            '{"campana": "B", "anuncio": 1, "duracion": 10}',
+            '{"campana": "B", "anuncio": 1, "sub_tipo": "Story"}',
+            '{"campana": "B", "anuncio": 1, "url_clic": "no es url"}',
+            '{"campana": "B", "nombre": "%s"}' % ("x" * 251),
+        ))
+        codigo, salida, errores = self.ejecutar("modify", entrada=entrada)
+        self.assertEqual(codigo, 1)
+        self.assertIn("2 ediciones aplicadas", salida)
+        lineas = errores.splitlines()
+        self.assertEqual([linea.split(":")[0] for linea in lineas],
+                         ["línea 3 (duracion)", "línea 4 (sub_tipo)", "línea 5 (url_clic)", "línea 6 (nombre)"])
+        self.assertIn("LargoExcedidoException", lineas[3])
+        campana, anuncios = self.campana("B")
+        self.assertEqual(campana.fecha_termino.isoformat(), "2024-12-31")
+        self.assertEqual(anuncios, [("Video", "Publicidad", 45), ("Display", "Banner", None)])
+
+    def test_modificar_sin_duplicar_nombres(self):
+        """Prueba que un cambio de nombre no tome el de otra campaña y que editar un anuncio no cargue la campaña."""
+        self.ejecutar("importar", entrada='{"campana": "A", "tipo": "Video", "sub_tipo": "Tutorial"}\n'
+                                          '{"campana": "B", "tipo": "Social", "sub_tipo": "Post"}\n')
+        entrada = "\n".join((
+            '{"campana": "A", "nombre": "B"}',
+            '{"campana": "A", "nombre": "C"}',
+            '{"campana": "B", "nombre": "C"}',
+            '{"campana": ["A"], "nombre": "D"}',
+            '{"campana": "B", "anuncio": 0, "sub_tipo": "Story"}',
+        ))
+        with mock.patch("persistencia.AnunciosPerezosos._materializar") as materializar:
+            codigo, salida, errores = self.ejecutar("modificar", entrada=entrada)
+        materializar.assert_not_called()
+        self.assertEqual(codigo, 1)
+        self.assertIn("2 ediciones aplicadas", salida)
+        self.assertEqual([linea.split(":")[0] for linea in errores.splitlines()],
+                         ["línea 1 (nombre)", "línea 3 (nombre)", "línea 4 (campana)"])
+        with AlmacenSQLite(self.bd) as almacen:
+            self.assertEqual([nombre for _, nombre in almacen.listar()], ["C", "B"])
+        self.assertEqual(self.campana("B")[1], [("Social", "Story", None)])
+
+    def test_reporte(self):
+        """Prueba el reporte en texto y en JSON."""
+        self.ejecutar("importar", entrada='{"campana": "A", "tipo": "Social", "sub_tipo": "Post"}\n')
+        codigo, salida, _ = self.ejecutar("report")
+        self.assertEqual((codigo, salida.split("\t")[:4]), (0, ["A", "-", "-", "1"]))
+        salida = self.ejecutar("reporte", "A", "--formato", "json")[1]
+        self.assertIn('"Social": 1', salida)
+
+    def test_fecha_invalida(self):
+        """Prueba que los argumentos inválidos terminan con código 2."""
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as contexto:
+            cli.main(["--bd", self.bd, "crear", "A", "--inicio", "2024-13-01"])
+        self.assertEqual(contexto.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date
+import instantanea
+from anuncio import Anuncio, Video, Display, Social
+from almacen import AnuncioStore
+from campana import Campana
+from diario import Diario
+from coleccion import AnuncioCompartido, ColeccionAnuncios, ColeccionClonada, ColeccionConcurrente
+
+
+class TestColeccionAnuncios(unittest.TestCase):
+    """Pruebas unitarias para la colección de anuncios con conteos incrementales."""
+
+    def test_conteos_al_agregar_y_eliminar(self):
+        """Prueba que los conteos sigan las altas, bajas y reemplazos."""
+        coleccion = ColeccionAnuncios([Video("Publicidad"), Display("Banner")])
+        coleccion.append(Display("Sidebar"))
+        coleccion.extend([Social("Post"), Social("Post")])
+        self.assertEqual(coleccion.conteo_por_tipo(), {"Video": 1, "Display": 2, "Social": 2})
+        del coleccion[0]
+        coleccion[0] = Social("Story")
+        del coleccion[-2:]
+        self.assertEqual(coleccion.conteo_por_tipo(), {"Display": 1, "Social": 1})
+        self.assertEqual(coleccion.conteo_por_sub_tipo(), {("Display", "Sidebar"): 1, ("Social", "Story"): 1})
+
+    def test_cambio_de_sub_tipo(self):
+        """Prueba que cambiar el subtipo de un anuncio contenido actualice los conteos."""
+        display = Display("Banner")
+        coleccion = ColeccionAnuncios([display])
+        display.sub_tipo = "Sidebar"
+        self.assertEqual(coleccion.conteo_por_sub_tipo(), {("Display", "Sidebar"): 1})
+        coleccion.remove(display)
+        display.sub_tipo = "Banner"
+        self.assertEqual(coleccion.conteo_por_sub_tipo(), {})
+
+    def test_resumen_incluye_subclases_registradas(self):
+        """Prueba que Campana.__str__ cuente cualquier subclase registrada."""
+        # Audio se registra solo durante esta prueba.
+        self.addCleanup(setattr, Anuncio, "REGISTRO", Anuncio.REGISTRO)
+        self.addCleanup(Anuncio.SUB_TIPOS.update, dict(Anuncio.SUB_TIPOS))
+        self.addCleanup(Anuncio.SUB_TIPOS.clear)
+
+        class Audio(Anuncio):
+            SUB_TIPOS = {"Audio": ("Cuña",)}
+
+            def comprimir_anuncio(self):
+                pass
+
+            def redimensionar_anuncio(self):
+                pass
+
+        campana = Campana("Radio", anuncios=[Audio("Cuña"), Video("Tutorial")])
+        resumen = str(campana)
+        self.assertIn("- 1 Audio\n", resumen)
+        self.assertIn("- 1 Video\n- 0 Display\n- 0 Social\n", resumen)
+
+    def test_almacen_columnar_mantiene_conteos(self):
+        """Prueba que AnuncioStore mantenga los mismos conteos incrementales."""
+        campana = Campana("Columnar", anuncios=AnuncioStore([Display("Banner"), Social("Post")]))
+        campana.anuncios[0].sub_tipo = "Sidebar"
+        del campana.anuncios[1]
+        campana.agregar_anuncios_bulk([("Video", "Tutorial")])
+        self.assertEqual(campana.conteo_por_sub_tipo(), {("Display", "Sidebar"): 1, ("Video", "Tutorial"): 1})
+
+    def test_filas_de_un_almacen(self):
+        """Prueba que una colección acepte vistas AnuncioFila, que no son observables."""
+        almacen = AnuncioStore([Display("Banner")])
+        coleccion = ColeccionAnuncios([Video("Tutorial")])
+        coleccion.append(almacen[0])
+        self.assertEqual(coleccion.conteo_por_sub_tipo(), {("Video", "Tutorial"): 1, ("Display", "Banner"): 1})
+        coleccion.pop()
+        self.assertEqual(coleccion.conteo_por_tipo(), {"Video": 1})
+
+        clon = coleccion.clonar()
+        clon.append(almacen[0])
+        del clon[1:]
+        self.assertEqual(clon.conteo_por_tipo(), {"Video": 1})
+
+        concurrente = ColeccionConcurrente([almacen[0]])
+        concurrente.pop()
+        self.assertEqual(concurrente.conteo_por_tipo(), {})
+
+
+class TestColeccionConcurrente(unittest.TestCase):
+    """Pruebas unitarias para la colección con copia en escritura."""
+
+    def test_instantanea_no_cambia(self):
+        """Prueba que una versión tomada antes de escribir conserve sus anuncios y conteos."""
+        coleccion = ColeccionConcurrente([Video("Publicidad"), Display("Banner")])
+        antes = coleccion.instantanea()
+        coleccion.append(Social("Post"))
+        del coleccion[0]
+        self.assertEqual(len(antes.anuncios), 2)
+        self.assertEqual(antes.por_tipo, {"Video": 1, "Display": 1})
+        self.assertEqual(coleccion.conteo_por_tipo(), {"Display": 1, "Social": 1})
+        self.assertEqual(coleccion.version, antes.numero + 2)
+
+    def test_escritura_en_bloque(self):
+        """Prueba que un bloque publique una sola versión y que un error no publique nada."""
+        display = Display("Banner")
+        coleccion = ColeccionConcurrente([display, Social("Post")])
+        version = coleccion.version
+        with coleccion.escritura() as anuncios:
+            anuncios.reverse()
+            anuncios.append(Video("Tutorial"))
+        self.assertEqual(coleccion.version, version + 1)
+        self.assertIs(coleccion[1], display)
+        with self.assertRaises(RuntimeError), coleccion.escritura() as anuncios:
+            anuncios.clear()
+            raise RuntimeError
+        self.assertEqual(len(coleccion), 3)
+        display.sub_tipo = "Sidebar"
+        coleccion.remove(display)
+        self.assertEqual(coleccion.conteo_por_sub_tipo(), {("Social", "Post"): 1, ("Video", "Tutorial"): 1})
+
+    def test_lectores_y_escritores(self):
+        """Prueba que los lectores siempre vean conteos coherentes con los anuncios."""
+        campana = Campana("Concurrente", concurrente=True)
+        incoherentes = []
+
+        def escribir():
+            for _ in range(200):
+                campana.anuncios.append(Social("Post"))
+                campana.agregar_anuncios_bulk([("Video", "Tutorial"), ("Display", "Banner")])
+                del campana.anuncios[0]
+
+        def leer():
+            for _ in range(500):
+                version = campana.anuncios.instantanea()
+                if sum(version.por_tipo.values()) != len(version.anuncios):
+                    incoherentes.append(version.numero)
+
+        hilos = [threading.Thread(target=escribir) for _ in range(3)] + [threading.Thread(target=leer) for _ in range(3)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(incoherentes, [])
+        self.assertEqual(len(campana.anuncios), 3 * 200 * 2)
+        self.assertEqual(sum(campana.conteo_por_tipo().values()), 3 * 200 * 2)
+
+
+class TestColeccionClonada(unittest.TestCase):
+    """Pruebas unitarias para los clones que comparten anuncios con su origen."""
+
+    def test_copia_al_modificar_el_clon(self):
+        """Prueba que un anuncio se copie recién al cambiarlo en el clon, sin tocar el original."""
+        video, display = Video("Publicidad", url_clic="a"), Display("Banner")
+        original = Campana("Verano", [video, display, video], date(2024, 1, 1))
+        variante = original.clonar("Verano B")
+        self.assertIsInstance(variante.anuncios, ColeccionClonada)
+        self.assertEqual((variante.nombre, variante.fecha_inicio), ("Verano B", date(2024, 1, 1)))
+
+        vista = variante.anuncios[0]
+        self.assertIsInstance(vista, AnuncioCompartido)
+        self.assertEqual((vista.tipo, vista.clase, vista.url_clic, vista.duracion), ("Video", Video, "a", 5))
+        vista.url_clic = "b"
+        vista.sub_tipo = "Tutorial"
+        self.assertEqual((video.url_clic, video.sub_tipo), ("a", "Publicidad"))
+        self.assertIsInstance(variante.anuncios[0], Video)
+        self.assertEqual((variante.anuncios[2].url_clic, variante.anuncios[2].sub_tipo), ("a", "Publicidad"))
+        self.assertIsInstance(variante.anuncios[1], AnuncioCompartido)
+        self.assertEqual(variante.conteo_por_sub_tipo(),
+                         {("Video", "Tutorial"): 1, ("Video", "Publicidad"): 1, ("Display", "Banner"): 1})
+        self.assertEqual(original.conteo_por_sub_tipo(), {("Video", "Publicidad"): 2, ("Display", "Banner"): 1})
+
+        variante.anuncios.reverse()
+        variante.anuncios.append(Social("Post"))
+        del variante.anuncios[0]
+        self.assertEqual([anuncio.tipo for anuncio in variante.anuncios], ["Display", "Video", "Social"])
+        self.assertEqual(len(original.anuncios), 3)
+
+    def test_cambios_del_original_no_llegan_al_clon(self):
+        """Prueba que un clon (y un clon de un clon) conserve el valor que tenía al clonarse."""
+        display = Display("Banner")
+        original = ColeccionAnuncios([display])
+        clon = original.clonar()
+        nieto = clon.clonar()
+        vista = clon[0]
+        display.sub_tipo = "Sidebar"
+        display.ancho = 300
+        self.assertEqual((vista.sub_tipo, vista.ancho), ("Banner", 1))
+        self.assertEqual((nieto[0].sub_tipo, nieto[0].ancho), ("Banner", 1))
+        self.assertEqual(clon.conteo_por_sub_tipo(), {("Display", "Banner"): 1})
+        clon[0].url_clic = "clon"
+        self.assertIsNone(nieto[0].url_clic)
+        self.assertIsNone(display.url_clic)
+
+    def test_anuncios_quitados_del_original(self):
+        """Prueba que los cambios a un anuncio después de quitarlo del original no lleguen a sus clones."""
+        video, display = Video("Publicidad", url_clic="a"), Display("Banner")
+        original = ColeccionAnuncios([video, display, video])
+        clon = original.clonar()
+        nieto = clon.clonar()
+        quitado = original.pop()
+        quitado.url_clic = "otra"
+        original.clear()
+        display.sub_tipo = "Sidebar"
+        self.assertEqual([a.url_clic for a in clon], ["a", None, "a"])
+        self.assertEqual([a.url_clic for a in nieto], ["a", None, "a"])
+        self.assertEqual(clon.conteo_por_sub_tipo(), {("Video", "Publicidad"): 2, ("Display", "Banner"): 1})
+        self.assertEqual(nieto[1].sub_tipo, "Banner")
+        clon[0].url_clic = "clon"
+        self.assertEqual((nieto[0].url_clic, quitado.url_clic), ("a", "otra"))
+
+    def test_no_retiene_vistas_ni_anuncios_quitados(self):
+        """Prueba que el clon no guarde vistas sin usar ni los anuncios propios que ya quitó."""
+        original = ColeccionAnuncios(Display("Banner") for _ in range(100))
+        clon = original.clonar()
+        self.assertEqual(sum(1 for _ in clon), 100)
+        self.assertEqual(len(clon._vistas), 0)
+        for anuncio in clon[:50]:
+            anuncio.ancho = 300
+        clon.append(Social("Post"))
+        self.assertEqual(len(clon._propios), 51)
+        del clon[:]
+        self.assertEqual((len(clon._propios), len(clon._vistas)), (0, 0))
+
+        otro = original.clonar()
+        vista = otro[0]
+        del otro[0]
+        vista.ancho = 300
+        vista.alto = 250
+        self.assertEqual((vista.ancho, vista.alto, original[0].ancho), (300, 250, 1))
+
+    def test_suscribirse_no_copia(self):
+        """Prueba que seguir un clon no copie sus anuncios y que los cambios lleguen con la vista."""
+        video, display = Video("Publicidad"), Display("Banner")
+        original = Campana("Verano", [video, display])
+        variante = original.clonar("Verano B")
+        registro = Diario()
+        registro.seguir(variante)
+        selector = variante.selector()
+        self.assertEqual(len(variante.anuncios._propios), 0)
+        display.ancho = 300
+        self.assertEqual(len(registro.cambios), 0)
+
+        vista = variante.anuncios[1]
+        vista.alto = 600
+        self.assertEqual([(c.anuncio, c.campo, c.nuevo) for c in registro.cambios], [(1, "alto", 600)])
+        self.assertEqual(selector.elegir(alto=600).tipo, "Display")
+        self.assertEqual((display.ancho, display.alto, vista.ancho), (300, 1, 1))
+        registro.deshacer()
+        self.assertEqual(vista.alto, 1)
+        registro.cerrar()
+        selector.cerrar()
+        variante.anuncios[0].duracion = 30
+        self.assertEqual(len(registro.cambios), 2)
+        self.assertEqual(len(variante.anuncios._suscritas), 0)
+
+    def test_almacen_columnar(self):
+        """Prueba que clonar un AnuncioStore dé un almacén independiente."""
+        original = Campana("Columnar", AnuncioStore([Video("Publicidad", url_clic="a"), Display("Banner")]))
+        variante = original.clonar()
+        variante.anuncios[0].url_clic = "b"
+        variante.anuncios.append(Social("Post"))
+        self.assertEqual(original.anuncios[0].url_clic, "a")
+        self.assertEqual(len(original.anuncios), 2)
+        self.assertEqual(variante.conteo_por_tipo()["Social"], 1)
+
+    def test_almacen_e_instantanea_de_un_clon(self):
+        """Prueba que un clon con anuncios compartidos se pueda pasar a un AnuncioStore y a una instantánea."""
+        original = Campana("Verano", [Video("Publicidad", url_clic="a"), Display("Banner")])
+        variante = original.clonar("Verano B")
+        variante.anuncios[1].ancho = 300
+        almacen = AnuncioStore(variante.anuncios)
+        self.assertEqual([(a.clase, a.url_clic, a.ancho) for a in almacen], [(Video, "a", 1), (Display, None, 300)])
+
+        directorio = tempfile.mkdtemp()
+        try:
+            ruta = os.path.join(directorio, "campanas.snap")
+            self.assertEqual(instantanea.guardar([original, variante], ruta), 4)
+            clon = instantanea.cargar(ruta)[1]
+            self.assertEqual((clon.nombre, [a.tipo for a in clon.anuncios]), ("Verano B", ["Video", "Display"]))
+            self.assertEqual((clon.anuncios[0].url_clic, clon.anuncios[1].ancho), ("a", 300))
+        finally:
+            shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    unittest.main()
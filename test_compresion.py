@@ -0,0 +1,138 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import zlib
+import compresion
+import imagen
+from anuncio import Display, Social, Video
+from campana import Campana
+
+
+def crear_png(ancho=64, alto=64, nivel=0):
+    """Crea un PNG RGB en escala de grises con un chunk de texto y compresión débil."""
+    filas = b"".join(b"\x00" + bytes((x * 4) % 256 for x in range(ancho)) * 3 for _ in range(alto))
+    ihdr = struct.pack(">IIBBBBB", ancho, alto, 8, 2, 0, 0, 0)
+    return b"".join((
+        imagen.FIRMA_PNG,
+        imagen.escribir_chunk_png(b"IHDR", ihdr),
+        imagen.escribir_chunk_png(b"tEXt", b"Comment\x00" + b"x" * 500),
+        imagen.escribir_chunk_png(b"IDAT", zlib.compress(filas, nivel)),
+        imagen.escribir_chunk_png(b"IEND", b""),
+    ))
+
+
+def crear_jpeg():
+    """Crea un JPEG mínimo con EXIF, un comentario y un perfil ICC."""
+    def segmento(marcador, contenido):
+        return b"\xff" + bytes((marcador,)) + struct.pack(">H", len(contenido) + 2) + contenido
+    return b"".join((
+        imagen.FIRMA_JPEG,
+        segmento(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"),
+        segmento(0xE1, b"Exif\x00\x00" + b"e" * 300),
+        segmento(0xE2, b"ICC_PROFILE\x00\x01\x01" + b"i" * 20),
+        segmento(0xFE, b"comentario"),
+        segmento(0xDA, b"\x01\x01\x00\x00\x3f\x00"),
+        b"\x12\x34\x56\xff\xd9",
+    ))
+
+
+def codificador_mitad(entrada, salida, calidad):
+    """Codificador de prueba que escribe la primera mitad del archivo."""
+    with open(entrada, "rb") as archivo:
+        datos = archivo.read()
+    with open(salida, "wb") as archivo:
+        archivo.write(datos[:len(datos) // 2])
+
+
+class TestCompresion(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.cache = os.path.join(self.directorio, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def escribir(self, nombre, datos):
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, "wb") as archivo:
+            archivo.write(datos)
+        return ruta
+
+    def test_recomprimir_png_conserva_pixeles(self):
+        """Prueba que la recompresión PNG no cambia los píxeles y quita los metadatos."""
+        original = crear_png()
+        comprimido = imagen.recomprimir_png(original)
+        self.assertLess(len(comprimido), len(original))
+        tipos = [tipo for tipo, _ in imagen.leer_chunks_png(comprimido)]
+        self.assertEqual(tipos, [b"IHDR", b"IDAT", b"IEND"])
+
+        def pixeles(datos):
+            return zlib.decompress(b"".join(c for t, c in imagen.leer_chunks_png(datos) if t == b"IDAT"))
+        self.assertEqual(pixeles(comprimido), pixeles(original))
+
+    def test_limpiar_jpeg(self):
+        """Prueba que se quitan EXIF y comentarios pero se conserva el perfil ICC."""
+        limpio = imagen.limpiar_jpeg(crear_jpeg())
+        self.assertNotIn(b"Exif", limpio)
+        self.assertNotIn(b"comentario", limpio)
+        self.assertIn(b"ICC_PROFILE", limpio)
+        self.assertTrue(limpio.endswith(b"\x12\x34\x56\xff\xd9"))
+
+    @unittest.skipIf(compresion.Image is not None, "Con Pillow los PNG se recodifican de otra forma.")
+    def test_comprimir_display(self):
+        """Prueba que un anuncio display recomprime su archivo e informa el ahorro."""
+        ruta = self.escribir("banner.png", crear_png())
+        antes = os.path.getsize(ruta)
+        resultado = Display("Banner", "file://" + ruta).comprimir_anuncio(directorio=self.cache)
+        self.assertIsNone(resultado.error)
+        self.assertEqual(resultado.bytes_antes, antes)
+        self.assertEqual(os.path.getsize(ruta), resultado.bytes_despues)
+        self.assertGreater(resultado.ahorrado, 0)
+
+    def test_comprimir_sin_archivo_local(self):
+        """Prueba que los anuncios sin archivo local informan un error sin lanzarlo."""
+        self.assertIsInstance(Social("Post").comprimir_anuncio().error, ValueError)
+        resultado = Social("Post", "https://cdn.com/a.png").comprimir_anuncio()
+        self.assertIsInstance(resultado.error, ValueError)
+
+    def test_comprimir_archivo_desconocido(self):
+        """Prueba que un archivo que no es imagen no se modifica."""
+        ruta = self.escribir("datos.txt", b"hola")
+        resultado = Display("Banner", ruta).comprimir_anuncio(directorio=self.cache)
+        self.assertIsInstance(resultado.error, ValueError)
+        with open(ruta, "rb") as archivo:
+            self.assertEqual(archivo.read(), b"hola")
+
+    def test_comprimir_video_con_codificador(self):
+        """Prueba el codificador de video intercambiable."""
+        ruta = self.escribir("spot.mp4", b"v" * 1000)
+        resultado = Video("Publicidad", ruta).comprimir_anuncio(codificador=codificador_mitad,
+                                                              directorio=self.cache)
+        self.assertEqual((resultado.bytes_antes, resultado.bytes_despues), (1000, 500))
+        self.assertEqual(os.path.getsize(ruta), 500)
+
+    def test_comprimir_campana(self):
+        """Prueba la compresión de una campaña completa en un pool de procesos."""
+        rutas = [self.escribir(f"img{i}.png", crear_png(32 + i)) for i in range(4)]
+        video = self.escribir("spot.mp4", b"v" * 1000)
+        anuncios = [Display("Banner", ruta) for ruta in rutas]
+        anuncios += [Social("Post", rutas[0]), Video("Tutorial", video), Display("Banner")]
+        campana = Campana("Compresión", anuncios)
+
+        resultados = campana.comprimir_anuncios(max_procesos=2, codificador_video=codificador_mitad,
+                                                directorio=self.cache)
+        self.assertEqual(len(resultados), len(anuncios))
+        self.assertEqual([r.ruta for r in resultados[:5]], rutas + [rutas[0]])
+        self.assertEqual(resultados[4].ahorrado, 0)
+        self.assertEqual(resultados[5].ahorrado, 500)
+        self.assertIsInstance(resultados[6].error, ValueError)
+        total = compresion.resumen(resultados)
+        self.assertEqual(total["errores"], 1)
+        self.assertEqual(total["ahorrado"], sum(r.ahorrado for r in resultados if r.error is None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+import diario
+import instantanea
+from anuncio import Display, Video
+from campana import Campana
+from diario import Diario
+
+
+class TestDiario(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "campanas.diario")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def test_registra_cambios_de_campos(self):
+        """Prueba que se registren los cambios de campaña y de anuncio con su posición."""
+        campana = Campana("Verano", [Video("Publicidad"), Display("Banner")])
+        with Diario() as registro:
+            registro.seguir(campana)
+            campana.fecha_inicio = date(2024, 1, 1)
+            campana.anuncios[0].duracion = 30
+            campana.anuncios[1].url_clic = "http://ejemplo.com"
+            cambios = registro.cambios
+        self.assertEqual([(c.secuencia, c.campana, c.anuncio, c.campo) for c in cambios], [
+            (1, "Verano", None, "fecha_inicio"), (2, "Verano", 0, "duracion"), (3, "Verano", 1, "url_clic")])
+        self.assertEqual((cambios[1].anterior, cambios[1].nuevo), (5, 30))
+        campana.nombre = "Otoño"
+        self.assertEqual(len(registro.cambios), 3)
+
+    def test_deshacer_y_rehacer(self):
+        """Prueba deshacer y rehacer, y que una edición nueva descarte lo deshecho."""
+        campana = Campana("Verano", [Display("Banner")])
+        registro = Diario()
+        registro.seguir(campana)
+        campana.nombre = "Otoño"
+        campana.anuncios[0].sub_tipo = "Sidebar"
+        self.assertEqual(registro.deshacer().campo, "sub_tipo")
+        self.assertEqual(registro.deshacer().campo, "nombre")
+        self.assertIsNone(registro.deshacer())
+        self.assertEqual((campana.nombre, campana.anuncios[0].sub_tipo), ("Verano", "Banner"))
+        registro.rehacer()
+        self.assertEqual(campana.nombre, "Otoño")
+        campana.anuncios[0].alto = 90
+        self.assertIsNone(registro.rehacer())
+        self.assertEqual(campana.anuncios.conteo_por_sub_tipo(), {("Display", "Banner"): 1})
+        # Deshacer y rehacer también quedan en el diario.
+        self.assertEqual(len(registro.cambios), 6)
+
+    def test_recuperar_desde_instantanea(self):
+        """Prueba reproducir el diario sobre una instantánea y compactarlo."""
+        campanas = [Campana("Verano", [Video("Publicidad"), Display("Banner")]), Campana("Otoño")]
+        ruta_instantanea = os.path.join(self.directorio, "campanas.snap")
+        with Diario(self.ruta) as registro:
+            for posicion, campana in enumerate(campanas):
+                registro.seguir(campana, posicion)
+            campanas[0].anuncios[0].duracion = 10
+            instantanea.guardar(campanas, ruta_instantanea)
+            guardada = registro.secuencia
+            campanas[0].anuncios[0].duracion = 20
+            campanas[0].anuncios[0].duracion = 30
+            campanas[0].anuncios[1].sub_tipo = "Sidebar"
+            campanas[1].fecha_termino = date(2024, 6, 30)
+            campanas[1].nombre = "Invierno"
+            campanas[1].nombre = "Otoño"
+
+        self.assertEqual(Diario(self.ruta).descartar(guardada), 6)
+        self.assertEqual(Diario(self.ruta).compactar(), 4)
+        restauradas = instantanea.cargar(ruta_instantanea)
+        self.assertEqual(diario.reproducir(diario.leer(self.ruta), restauradas, guardada), 7)
+        self.assertEqual(restauradas[0].anuncios[0].duracion, 30)
+        self.assertEqual(restauradas[0].anuncios[1].sub_tipo, "Sidebar")
+        self.assertEqual((restauradas[1].nombre, restauradas[1].fecha_termino), ("Otoño", date(2024, 6, 30)))
+        self.assertEqual(Diario(self.ruta).secuencia, 7)
+
+    def test_linea_incompleta(self):
+        """Prueba que una última línea a medio escribir se ignore."""
+        campana = Campana("Verano")
+        with Diario(self.ruta) as registro:
+            registro.seguir(campana)
+            campana.nombre = "Otoño"
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write('{"secuencia": 2, "camp')
+        self.assertEqual([cambio.nuevo for cambio in diario.leer(self.ruta)], ["Otoño"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import date
+from anuncio import Display, Video
+from campana import Campana
+from eventos import Agregador, SketchConteos, ingerir, ingerir_paralelo, servir
+
+# 2024-01-01 00:00:00 UTC
+MOMENTO = 1_704_067_200
+
+
+def campanas():
+    return [Campana("Verano", [Display("Banner"), Video("Publicidad")]), Campana("Otoño", [Display("Sidebar")])]
+
+
+def lineas_de_prueba():
+    lineas = []
+    for i in range(300):
+        lineas.append(f"{MOMENTO + i},i,Verano,{i % 2}")
+        if i % 10 == 0:
+            lineas.append(f"{MOMENTO + i},c,Verano,0")
+    lineas += [f"{MOMENTO + 86400},i,Otoño,0", f"{MOMENTO},i,Invierno,0", f"{MOMENTO},i,Verano,7",
+               "basura", f"{MOMENTO},x,Verano,0"]
+    return lineas
+
+
+class TestEventos(unittest.TestCase):
+
+    def comprobar(self, agregador):
+        self.assertEqual(agregador.conteo("Verano", 0), (150, 30))
+        self.assertEqual(agregador.conteo("Verano", 1), (150, 0))
+        self.assertEqual(agregador.conteo("Otoño", 0), (1, 0))
+        self.assertEqual(agregador.por_tipo(), {"Display": (151, 30), "Video": (150, 0)})
+        self.assertEqual(agregador.por_dia(), {date(2024, 1, 1): (302, 30), date(2024, 1, 2): (1, 0)})
+        self.assertEqual((agregador.sin_atribuir, agregador.invalidos), (2, 2))
+
+    def test_agregacion(self):
+        """Prueba los conteos por anuncio, tipo, día y ventana, y los eventos sin atribuir o inválidos."""
+        agregador = Agregador(campanas())
+        agregador.procesar([linea.encode("utf-8") for linea in lineas_de_prueba()])
+        self.comprobar(agregador)
+        self.assertEqual(agregador.ultimos(10, MOMENTO + 299), (10, 1))
+        # El evento del día siguiente ocupó la ranura del primer segundo, que ya salió de la ventana.
+        self.assertEqual(agregador.ultimos(300, MOMENTO + 299), (299, 29))
+        self.assertEqual(agregador.ultimos(3600, MOMENTO + 86400), (1, 0))
+
+    def test_archivo_en_paralelo(self):
+        """Prueba que repartir un archivo entre procesos dé lo mismo que leerlo de corrido."""
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "eventos.csv")
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                archivo.write("\n".join(lineas_de_prueba()) + "\n")
+            secuencial = Agregador(campanas())
+            self.assertEqual(ingerir(ruta, secuencial), 335)
+            self.comprobar(secuencial)
+            paralelo = Agregador(campanas())
+            self.assertEqual(ingerir_paralelo(ruta, paralelo, max_procesos=3), 335)
+            self.comprobar(paralelo)
+
+    def test_sketch(self):
+        """Prueba que el sketch nunca subestime y que combinar sume los conteos."""
+        uno, otro = SketchConteos(64, 3), SketchConteos(64, 3)
+        for i in range(500):
+            uno.agregar(b"%d" % i, i % 7 + 1)
+        otro.agregar(b"3", 10)
+        uno.combinar(otro)
+        self.assertTrue(all(uno.estimar(b"%d" % i) >= i % 7 + 1 for i in range(500)))
+        self.assertGreaterEqual(uno.estimar(b"3"), 14)
+        with self.assertRaises(ValueError):
+            uno.combinar(SketchConteos(32, 3))
+
+    def test_socket(self):
+        """Prueba recibir eventos por TCP y consultarlos mientras la conexión sigue abierta."""
+        async def probar():
+            agregador = Agregador(campanas())
+            servidor = await servir(agregador, puerto=0)
+            puerto = servidor.sockets[0].getsockname()[1]
+            _, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+            escritor.write(f"{MOMENTO},i,Verano,0\n{MOMENTO},c,Ver".encode("utf-8"))
+            await escritor.drain()
+            while agregador.totales[0] < 1:
+                await asyncio.sleep(0.01)
+            self.assertEqual(agregador.conteo("Verano", 0), (1, 0))
+            escritor.write(b"ano,0\n")
+            escritor.close()
+            await escritor.wait_closed()
+            while agregador.totales[1] < 1:
+                await asyncio.sleep(0.01)
+            servidor.close()
+            await servidor.wait_closed()
+            return agregador.conteo("Verano", 0)
+
+        self.assertEqual(asyncio.run(probar()), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
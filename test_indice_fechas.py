@@ -0,0 +1,74 @@
+import random
+import unittest
+from datetime import date, timedelta
+from campana import Campana
+from indice_fechas import CampanaIndex
+
+
+class TestCampanaIndex(unittest.TestCase):
+    """Pruebas unitarias para el índice de fechas de campañas."""
+
+    def setUp(self):
+        self.verano = Campana("Verano", fecha_inicio=date(2024, 1, 1), fecha_termino=date(2024, 3, 1))
+        self.otono = Campana("Otoño", fecha_inicio=date(2024, 3, 1), fecha_termino=date(2024, 6, 1))
+        self.siempre = Campana("Siempre")
+        self.desde_abril = Campana("Desde abril", fecha_inicio=date(2024, 4, 1))
+        self.indice = CampanaIndex([self.verano, self.otono, self.siempre, self.desde_abril])
+
+    def test_activas_en(self):
+        """Prueba las campañas activas en una fecha, incluidas las abiertas."""
+        self.assertEqual(self.indice.activas_en(date(2024, 3, 1)), [self.siempre, self.verano, self.otono])
+        self.assertEqual(self.indice.activas_en(date(2024, 7, 1)), [self.siempre, self.desde_abril])
+
+    def test_superpuestas(self):
+        """Prueba la consulta de campañas superpuestas con un rango."""
+        self.assertEqual(self.indice.superpuestas(date(2024, 3, 15), date(2024, 3, 31)), [self.siempre, self.otono])
+        self.assertEqual(len(self.indice.superpuestas()), 4)
+
+    def test_terminan_dentro_de(self):
+        """Prueba las campañas que terminan dentro de N días."""
+        self.assertEqual(self.indice.terminan_dentro_de(10, desde=date(2024, 2, 25)), [self.verano])
+        self.assertEqual(self.indice.terminan_dentro_de(120, desde=date(2024, 2, 25)), [self.verano, self.otono])
+
+    def test_actualiza_con_setters(self):
+        """Prueba que cambiar las fechas de una campaña actualice el índice."""
+        self.verano.fecha_termino = date(2024, 8, 1)
+        self.assertIn(self.verano, self.indice.activas_en(date(2024, 7, 1)))
+        self.verano.fecha_inicio = None
+        self.assertIn(self.verano, self.indice.activas_en(date(2000, 1, 1)))
+        self.indice.eliminar(self.verano)
+        self.verano.fecha_termino = None
+        self.assertNotIn(self.verano, self.indice.activas_en(date(2024, 7, 1)))
+
+    def test_coincide_con_busqueda_lineal(self):
+        """Prueba el índice contra un recorrido lineal con datos aleatorios."""
+        aleatorio = random.Random(7)
+        base = date(2024, 1, 1)
+        campanas = []
+        for i in range(3000):
+            inicio = base + timedelta(days=aleatorio.randint(0, 365)) if aleatorio.random() > 0.1 else None
+            termino = base + timedelta(days=aleatorio.randint(0, 365)) if aleatorio.random() > 0.1 else None
+            campanas.append(Campana(f"c{i}", fecha_inicio=inicio, fecha_termino=termino))
+        indice = CampanaIndex(campanas[:1500])
+        for campana in campanas[1500:]:
+            indice.agregar(campana)
+        for campana in campanas[::7]:
+            campana.fecha_termino = base + timedelta(days=aleatorio.randint(0, 365))
+        for campana in campanas[::11]:
+            campana.fecha_inicio = base + timedelta(days=aleatorio.randint(0, 365))
+        for campana in campanas[::13]:
+            indice.eliminar(campana)
+        campanas = [c for c in campanas if c in indice]
+        for dia in range(0, 365, 13):
+            fecha = base + timedelta(days=dia)
+            esperado = {c for c in campanas
+                        if (c.fecha_inicio is None or c.fecha_inicio <= fecha)
+                        and (c.fecha_termino is None or c.fecha_termino >= fecha)}
+            self.assertEqual(set(indice.activas_en(fecha)), esperado)
+            terminan = {c for c in campanas if c.fecha_termino is not None
+                        and fecha <= c.fecha_termino <= fecha + timedelta(days=10)}
+            self.assertEqual(set(indice.terminan_dentro_de(10, desde=fecha)), terminan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+from campana import Campana
+from error import LargoExcedidoException
+from indice_nombres import IndiceNombres
+
+
+class TestIndiceNombres(unittest.TestCase):
+
+    def setUp(self):
+        self.verano = Campana("Verano 2024")
+        self.vuelta = Campana("vuelta a clases")
+        self.invierno = Campana("Invierno")
+        self.indice = IndiceNombres([self.verano, self.vuelta, self.invierno])
+
+    def test_buscar(self):
+        """Prueba la búsqueda exacta por nombre."""
+        self.assertIs(self.indice.buscar("Invierno"), self.invierno)
+        self.assertIsNone(self.indice.buscar("invierno"))
+        self.assertIsNone(self.indice.buscar("Otoño"))
+
+    def test_nombres_repetidos(self):
+        """Prueba que varias campañas pueden compartir nombre."""
+        otra = Campana("Invierno")
+        self.indice.agregar(otra)
+        self.assertEqual(self.indice.buscar_todas("Invierno"), [self.invierno, otra])
+        self.indice.eliminar(self.invierno)
+        self.assertIs(self.indice.buscar("Invierno"), otra)
+
+    def test_con_prefijo(self):
+        """Prueba la búsqueda por prefijo sin distinguir mayúsculas."""
+        self.assertEqual(self.indice.con_prefijo("V"), [self.verano, self.vuelta])
+        self.assertEqual(self.indice.con_prefijo("VU"), [self.vuelta])
+        self.assertEqual(self.indice.con_prefijo("v", limite=1), [self.verano])
+        self.assertEqual(self.indice.con_prefijo("x"), [])
+        self.assertEqual(len(self.indice.con_prefijo("")), 3)
+
+    def test_autocompletar(self):
+        """Prueba que las sugerencias no repiten nombres."""
+        self.indice.agregar(Campana("Verano 2024"))
+        self.assertEqual(self.indice.autocompletar("ve"), ["Verano 2024"])
+        self.assertEqual(self.indice.autocompletar("v", limite=2), ["Verano 2024", "vuelta a clases"])
+
+    def test_actualiza_con_setter(self):
+        """Prueba que renombrar una campaña actualiza el índice."""
+        self.verano.nombre = "Otoño"
+        self.assertIsNone(self.indice.buscar("Verano 2024"))
+        self.assertIs(self.indice.buscar("Otoño"), self.verano)
+        self.assertEqual(self.indice.con_prefijo("v"), [self.vuelta])
+
+    def test_nombre_largo_no_altera_indice(self):
+        """Prueba que un nombre demasiado largo se rechaza sin tocar el índice."""
+        with self.assertRaises(LargoExcedidoException):
+            self.verano.nombre = "x" * 251
+        self.assertIs(self.indice.buscar("Verano 2024"), self.verano)
+        self.assertEqual(self.indice.con_prefijo("x"), [])
+
+    def test_eliminar(self):
+        """Prueba que una campaña eliminada deja de seguirse."""
+        self.indice.eliminar(self.vuelta)
+        self.vuelta.nombre = "Verano"
+        self.assertNotIn(self.vuelta, self.indice)
+        self.assertEqual(self.indice.con_prefijo("v"), [self.verano])
+        with self.assertRaises(KeyError):
+            self.indice.eliminar(self.vuelta)
+
+    def test_coincide_con_busqueda_lineal(self):
+        """Prueba el índice contra un recorrido lineal con datos aleatorios."""
+        aleatorio = random.Random(3)
+        letras = "abcAB"
+        campanas = [Campana("".join(aleatorio.choices(letras, k=6))) for _ in range(3000)]
+        indice = IndiceNombres(campanas[:1500])
+        for campana in campanas[1500:]:
+            indice.agregar(campana)
+        for campana in campanas[::5]:
+            campana.nombre = "".join(aleatorio.choices(letras, k=6))
+        for prefijo in ("", "a", "Ab", "bca", "cc", "zz"):
+            esperado = {c for c in campanas if c.nombre.casefold().startswith(prefijo.casefold())}
+            self.assertEqual(set(indice.con_prefijo(prefijo)), esperado)
+        nombre = campanas[42].nombre
+        self.assertEqual(set(indice.buscar_todas(nombre)),
+                         {c for c in campanas if c.nombre == nombre})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from almacen import AnuncioStore
+from anuncio import Video, Display
+from campana import Campana
+from error import LargoExcedidoException, SubTipoInvalidoException
+from ingesta import cargar_anuncios, cargar_campanas
+
+
+class TestIngesta(unittest.TestCase):
+    """Pruebas unitarias para la carga masiva de anuncios."""
+
+    def test_errores_por_fila(self):
+        """Prueba que las filas inválidas se informen sin detener la carga."""
+        filas = [
+            ("Video", "Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com", 30),
+            ("Video", "Banner", "http://cdn.com/v.mp4", "http://ejemplo.com"),
+            ("Radio", "Mencion"),
+            {"tipo": "Display", "sub_tipo": "Sidebar", "url_clic": "http://ejemplo.com"},
+            ("Video", "Tutorial", None, None, "diez"),
+            ("Display", ["Banner"]),
+            (["Display"], "Banner"),
+        ]
+        anuncios, errores = cargar_anuncios(filas)
+        self.assertEqual([type(a) for a in anuncios], [Video, Display])
+        self.assertEqual(anuncios[0].duracion, 30)
+        self.assertEqual([(e.fila, e.campo) for e in errores],
+                         [(1, "sub_tipo"), (2, "tipo"), (4, "duracion"), (5, "sub_tipo"), (6, "tipo")])
+        self.assertIsInstance(errores[0].error, SubTipoInvalidoException)
+
+    def test_lote_de_columnas(self):
+        """Prueba la carga desde un lote de columnas y la duración por defecto."""
+        columnas = {
+            "tipo": ["Video", "Social", "Social"],
+            "sub_tipo": ["Tutorial", "Story", "Historia"],
+            "duracion": [0, None, None],
+        }
+        anuncios, errores = cargar_anuncios(columnas)
+        self.assertEqual(len(anuncios), 2)
+        self.assertEqual(anuncios[0].duracion, 5)
+        self.assertEqual(errores[0].fila, 2)
+
+    def test_campana_agregar_anuncios_bulk(self):
+        """Prueba la carga masiva sobre campañas con lista y con AnuncioStore."""
+        filas = [("Display", "Banner", "http://cdn.com/b.jpg", "http://ejemplo.com")] * 3
+        filas.append(("Display", "Post"))
+        for anuncios in (None, AnuncioStore()):
+            campana = Campana("Carga", anuncios=anuncios)
+            errores = campana.agregar_anuncios_bulk(filas)
+            self.assertEqual(len(campana.anuncios), 3)
+            self.assertEqual(campana.anuncios[2].url_clic, "http://ejemplo.com")
+            self.assertEqual([e.fila for e in errores], [3])
+
+    def test_cargar_campanas(self):
+        """Prueba la carga de varias campañas con errores en la posición original."""
+        filas = [
+            {"campana": "A", "tipo": "Video", "sub_tipo": "Publicidad"},
+            {"campana": "x" * 251, "tipo": "Video", "sub_tipo": "Publicidad"},
+            {"campana": "B", "tipo": "Social", "sub_tipo": "Banner"},
+            {"campana": "A", "tipo": "Social", "sub_tipo": "Post"},
+            ("A", "Video", "Tutorial"),
+            {"campana": ["A"], "tipo": "Video", "sub_tipo": "Tutorial"},
+            {"tipo": "Video", "sub_tipo": "Tutorial"},
+        ]
+        campanas, errores = cargar_campanas(filas)
+        self.assertEqual(sorted(campanas), ["A", "B"])
+        self.assertEqual(len(campanas["A"].anuncios), 2)
+        self.assertEqual([(e.fila, e.campo) for e in errores],
+                         [(1, "campana"), (2, "sub_tipo"), (4, None), (5, "campana"), (6, "campana")])
+        self.assertIsInstance(errores[0].error, LargoExcedidoException)
+        self.assertEqual([type(e.error) for e in errores[2:]], [TypeError, TypeError, ValueError])
+
+    def test_alto_y_ancho(self):
+        """Prueba que el alto y ancho se cargan en objetos y en columnas."""
+        filas = [
+            {"tipo": "Display", "sub_tipo": "Banner", "alto": "90", "ancho": 728},
+            {"tipo": "Display", "sub_tipo": "Banner", "alto": 0},
+            {"tipo": "Display", "sub_tipo": "Banner", "ancho": "ancho"},
+        ]
+        for anuncios in (None, AnuncioStore()):
+            campana = Campana("Medidas", anuncios=anuncios)
+            errores = campana.agregar_anuncios_bulk(filas)
+            medidas = [(a.alto, a.ancho) for a in campana.anuncios]
+            self.assertEqual(medidas, [(90, 728), (1, 1)])
+            self.assertEqual([(e.fila, e.campo) for e in errores], [(2, "ancho")])
+
+
+if __name__ == "__main__":
+    unittest.main()
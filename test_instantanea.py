@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+import instantanea
+from almacen import AnuncioStore
+from anuncio import Anuncio, Display, Social, Video
+from campana import Campana
+
+
+def datos(anuncio):
+    """Regresa los datos comparables de un Anuncio o AnuncioFila."""
+    return (anuncio.tipo, anuncio.sub_tipo, anuncio.url_archivo, anuncio.url_clic,
+            anuncio.alto, anuncio.ancho, getattr(anuncio, "duracion", None))
+
+
+class TestInstantanea(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "campanas.snap")
+        display = Display("Sidebar", "http://cdn.com/s.png", "http://ejemplo.com")
+        display.alto, display.ancho = 600, 300
+        self.campanas = [
+            Campana("Invierno ñandú", [Video("Tutorial", "http://cdn.com/v.mp4", None, 12), display],
+                    date(2024, 6, 1), date(2024, 8, 31)),
+            Campana("Sin anuncios"),
+            Campana("Columnar", AnuncioStore([Social("Post", "http://cdn.com/s.png"), Display("Banner")])),
+        ]
+        self.assertEqual(instantanea.guardar(self.campanas, self.ruta), 4)
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def test_ida_y_vuelta(self):
+        """Prueba que campañas, fechas y anuncios se leen igual que se guardaron."""
+        cargadas = instantanea.cargar(self.ruta)
+        self.assertEqual(len(cargadas), 3)
+        self.assertEqual(cargadas.cantidad_anuncios, 4)
+        for original, cargada in zip(self.campanas, cargadas):
+            self.assertEqual((cargada.nombre, cargada.fecha_inicio, cargada.fecha_termino),
+                             (original.nombre, original.fecha_inicio, original.fecha_termino))
+            self.assertEqual([datos(a) for a in cargada.anuncios], [datos(a) for a in original.anuncios])
+            self.assertEqual(cargada.conteo_por_sub_tipo(), original.conteo_por_sub_tipo())
+        self.assertIs(cargadas[-1], cargadas[2])
+
+    def test_cambios_no_llegan_al_archivo(self):
+        """Prueba la copia en escritura de valores y de cambios estructurales."""
+        campana = instantanea.cargar(self.ruta)[0]
+        campana.anuncios[0].duracion = 40
+        campana.anuncios[1].sub_tipo = "Banner"
+        campana.anuncios.append(Social("Story", "http://cdn.com/nuevo.png"))
+        del campana.anuncios[0]
+        self.assertEqual([a.sub_tipo for a in campana.anuncios], ["Banner", "Story"])
+        self.assertEqual(campana.anuncios[1].url_archivo, "http://cdn.com/nuevo.png")
+        self.assertEqual(campana.conteo_por_sub_tipo(), {("Display", "Banner"): 1, ("Social", "Story"): 1})
+
+        otra = instantanea.cargar(self.ruta)[0]
+        self.assertEqual(otra.anuncios[0].duracion, 12)
+        self.assertEqual(otra.anuncios[1].sub_tipo, "Sidebar")
+        self.assertEqual(len(otra.anuncios), 2)
+
+    def test_codigos_de_otro_registro(self):
+        """Prueba que los códigos de tipo se traducen si el registro cambió de orden."""
+        original = Anuncio.REGISTRO
+        invertido = type(original)()
+        for clase in reversed(original.clases):
+            invertido = invertido.con_clase(clase, original.sub_tipos_ordenados(clase))
+        Anuncio.REGISTRO = invertido
+        try:
+            cargada = instantanea.cargar(self.ruta)[0]
+            self.assertEqual([datos(a) for a in cargada.anuncios],
+                             [datos(a) for a in self.campanas[0].anuncios])
+        finally:
+            Anuncio.REGISTRO = original
+
+    def test_archivo_invalido(self):
+        """Prueba que un archivo que no es instantánea lanza ValueError."""
+        for contenido in (b"", b"no es una instantanea"):
+            with open(self.ruta, "wb") as archivo:
+                archivo.write(contenido)
+            with self.assertRaises(ValueError):
+                instantanea.cargar(self.ruta)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from anuncio import Video, Display, Social
+from campana import Campana
+from persistencia import AlmacenSQLite, AnunciosPerezosos
+
+
+class TestAlmacenSQLite(unittest.TestCase):
+    """Pruebas unitarias para la persistencia de campañas en SQLite."""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "campanas.db")
+        self.campana = Campana("Verano", fecha_inicio=date(2024, 1, 1))
+        video = Video("Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com", 20)
+        video.alto = 720
+        self.campana.anuncios.extend([video, Display("Banner"), Social("Story")])
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_guardar_y_reabrir(self):
+        """Prueba que una campaña guardada se recupere con sus anuncios."""
+        with AlmacenSQLite(self.ruta) as almacen:
+            campana_id = almacen.guardar(self.campana)
+        with AlmacenSQLite(self.ruta) as almacen:
+            campana = almacen.abrir(campana_id)
+            self.assertEqual(campana.nombre, "Verano")
+            self.assertEqual(campana.fecha_inicio, date(2024, 1, 1))
+            self.assertIsNone(campana.fecha_termino)
+            anuncios = list(campana.anuncios)
+            self.assertEqual([a.tipo for a in anuncios], ["Video", "Display", "Social"])
+            self.assertEqual((anuncios[0].duracion, anuncios[0].alto), (20, 720))
+
+    def test_anuncios_perezosos(self):
+        """Prueba que abrir una campaña no cargue sus anuncios hasta necesitarlos."""
+        with AlmacenSQLite(self.ruta) as almacen:
+            campana = almacen.abrir(almacen.guardar(self.campana))
+            self.assertIsInstance(campana.anuncios, AnunciosPerezosos)
+            self.assertEqual(len(campana.anuncios), 3)
+            self.assertIn("- 1 Video\n- 1 Display\n- 1 Social\n", str(campana))
+            self.assertFalse(campana.anuncios.materializada)
+            campana.anuncios[1].sub_tipo = "Sidebar"
+            self.assertIs(campana.anuncios[-2], campana.anuncios[1])
+            with self.assertRaises(IndexError):
+                campana.anuncios[3]
+            self.assertFalse(campana.anuncios.materializada)
+            almacen.guardar(campana)
+            self.assertEqual(almacen.abrir(almacen.id_de(campana)).anuncios[1].sub_tipo, "Sidebar")
+            campana.anuncios.append(campana.anuncios[0])
+            self.assertTrue(campana.anuncios.materializada)
+
+    def test_conteos_con_cambios_sin_guardar(self):
+        """Prueba que los conteos de una campaña sin cargar incluyan los subtipos cambiados y no guardados."""
+        with AlmacenSQLite(self.ruta) as almacen:
+            campana = almacen.abrir(almacen.guardar(self.campana))
+            display, social = campana.anuncios[1], campana.anuncios[2]
+            display.sub_tipo = "Sidebar"
+            social.sub_tipo = "Post"
+            social.sub_tipo = "Story"
+            esperados = {("Video", "Publicidad"): 1, ("Display", "Sidebar"): 1, ("Social", "Story"): 1}
+            self.assertEqual(campana.conteo_por_sub_tipo(), esperados)
+            almacen.guardar(campana)
+            self.assertEqual(campana.conteo_por_sub_tipo(), esperados)
+            self.assertFalse(campana.anuncios.materializada)
+
+    def test_guardar_cambios_hechos_al_recorrer(self):
+        """Prueba que guardar escriba los anuncios modificados al recorrer una campaña sin cargarla."""
+        with AlmacenSQLite(self.ruta) as almacen:
+            campana = almacen.abrir(almacen.guardar(self.campana))
+            for anuncio in campana.anuncios:
+                if anuncio.tipo == "Display":
+                    anuncio.url_clic = "http://otra.com"
+            guardado = next(iter(campana.anuncios))
+            guardado.alto = 480
+            self.assertIs(next(iter(campana.anuncios)), guardado)
+            almacen.guardar(campana)
+            self.assertFalse(campana.anuncios.materializada)
+            reabierta = almacen.abrir_por_nombre("Verano")
+            self.assertEqual([(a.alto, a.url_clic) for a in reabierta.anuncios][:2],
+                             [(480, self.campana.anuncios[0].url_clic), (1, "http://otra.com")])
+            guardado.duracion = 45
+            self.assertEqual(campana.anuncios[0].duracion, 45)
+
+    def test_actualizar_campana(self):
+        """Prueba que guardar de nuevo actualice la campaña en lugar de duplicarla."""
+        with AlmacenSQLite(self.ruta) as almacen:
+            campana = almacen.abrir(almacen.guardar(self.campana))
+            campana.nombre = "Invierno"
+            del campana.anuncios[0]
+            almacen.guardar(campana)
+            self.assertEqual(len(almacen.listar()), 1)
+            reabierta = almacen.abrir_por_nombre("Invierno")
+            self.assertEqual([a.tipo for a in reabierta.anuncios], ["Display", "Social"])
+
+    def test_activas_en(self):
+        """Prueba la consulta por rango de fechas con fechas abiertas."""
+        with AlmacenSQLite() as almacen:
+            vigente = almacen.guardar(self.campana)
+            almacen.guardar(Campana("Pasada", fecha_inicio=date(2023, 1, 1), fecha_termino=date(2023, 2, 1)))
+            self.assertEqual(almacen.activas_en(date(2024, 6, 1)), [vigente])
+
+
+if __name__ == "__main__":
+    unittest.main()
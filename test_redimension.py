@@ -0,0 +1,155 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+import imagen
+import redimension
+from anuncio import Display, Social, Video
+from campana import Campana
+
+
+def filtrar(filas, bpp, filtro):
+    """Aplica un filtro PNG a filas de píxeles sin filtro (inverso de imagen._desfiltrar)."""
+    salida = []
+    previa = bytes(len(filas[0]))
+    for fila in filas:
+        filtrada = bytearray()
+        for i, x in enumerate(fila):
+            a = fila[i - bpp] if i >= bpp else 0
+            b = previa[i]
+            c = previa[i - bpp] if i >= bpp else 0
+            prediccion = (0, a, b, (a + b) >> 1, imagen._paeth(a, b, c))[filtro]
+            filtrada.append((x - prediccion) & 0xFF)
+        salida.append(bytes((filtro,)) + bytes(filtrada))
+        previa = fila
+    return b"".join(salida)
+
+
+def png_rgb(ancho, alto, color=lambda x, y: (x * 7 % 256, y * 13 % 256, (x + y) % 256), filtro=0):
+    """Crea un PNG RGB de prueba con el filtro indicado en todas las filas."""
+    filas = [bytes(canal for x in range(ancho) for canal in color(x, y)) for y in range(alto)]
+    ihdr = struct.pack(">IIBBBBB", ancho, alto, 8, 2, 0, 0, 0)
+    return b"".join((imagen.FIRMA_PNG, imagen.escribir_chunk_png(b"IHDR", ihdr),
+                     imagen.escribir_chunk_png(b"IDAT", zlib.compress(filtrar(filas, 3, filtro))),
+                     imagen.escribir_chunk_png(b"IEND", b""))), b"".join(filas)
+
+
+def escalador_copia(entrada, salidas):
+    """Escalador de video de prueba que copia el origen en cada salida."""
+    for _, _, destino in salidas:
+        shutil.copyfile(entrada, destino)
+
+
+class TestImagen(unittest.TestCase):
+
+    def test_decodificar_filtros(self):
+        """Prueba la decodificación con cada uno de los filtros PNG."""
+        for filtro in range(5):
+            datos, pixeles = png_rgb(13, 7, filtro=filtro)
+            decodificada = imagen.decodificar_png(datos)
+            self.assertEqual((decodificada.ancho, decodificada.alto, decodificada.canales), (13, 7, 3))
+            self.assertEqual(decodificada.pixeles, pixeles, f"filtro {filtro}")
+
+    def test_decodificar_paleta(self):
+        """Prueba que una imagen con paleta y transparencia se expande a RGBA."""
+        ihdr = struct.pack(">IIBBBBB", 2, 1, 8, 3, 0, 0, 0)
+        datos = b"".join((imagen.FIRMA_PNG, imagen.escribir_chunk_png(b"IHDR", ihdr),
+                          imagen.escribir_chunk_png(b"PLTE", b"\xff\x00\x00\x00\x00\xff"),
+                          imagen.escribir_chunk_png(b"tRNS", b"\x80"),
+                          imagen.escribir_chunk_png(b"IDAT", zlib.compress(b"\x00\x00\x01")),
+                          imagen.escribir_chunk_png(b"IEND", b"")))
+        decodificada = imagen.decodificar_png(datos)
+        self.assertEqual(decodificada.canales, 4)
+        self.assertEqual(decodificada.pixeles, b"\xff\x00\x00\x80\x00\x00\xff\xff")
+
+    def test_redimensionar_cubre_y_recorta(self):
+        """Prueba que el escalado cubre el tamaño objetivo y recorta el centro."""
+        rojo_azul = lambda x, y: (255, 0, 0) if x < 50 else (0, 0, 255)
+        origen = imagen.decodificar_png(png_rgb(100, 10, rojo_azul)[0])
+        destino = imagen.redimensionar(origen, 20, 20)
+        self.assertEqual(len(destino.pixeles), 20 * 20 * 3)
+        fila = destino.pixeles[:60]
+        self.assertEqual(fila[:3], b"\xff\x00\x00")
+        self.assertEqual(fila[-3:], b"\x00\x00\xff")
+        self.assertEqual(imagen.decodificar_png(imagen.codificar_png(destino)), destino)
+
+
+class TestRedimension(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.cache = os.path.join(self.directorio, "rendiciones")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def escribir(self, nombre, datos):
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, "wb") as archivo:
+            archivo.write(datos)
+        return ruta
+
+    def test_tamanos_de(self):
+        """Prueba que los tamaños salen del subtipo o del alto y ancho del anuncio."""
+        self.assertEqual(redimension.tamanos_de(Display("Banner")), ((728, 90), (468, 60)))
+        self.assertEqual(redimension.tamanos_de(Social("Story")), ((1080, 1920),))
+        display = Display()
+        self.assertEqual(redimension.tamanos_de(display), ())
+        display.ancho, display.alto = 250, 250
+        self.assertEqual(redimension.tamanos_de(display), ((250, 250),))
+
+    def test_redimensionar_display_con_cache(self):
+        """Prueba las rendiciones de un banner y que la segunda vez salen del caché."""
+        ruta = self.escribir("banner.png", png_rgb(64, 32)[0])
+        display = Display("Banner", ruta)
+        resultado = display.redimensionar_anuncio(self.cache)
+        self.assertIsNone(resultado.error)
+        self.assertFalse(resultado.desde_cache)
+        self.assertEqual([(r[0], r[1]) for r in resultado.rendiciones], [(728, 90), (468, 60)])
+        for ancho, alto, destino in resultado.rendiciones:
+            with open(destino, "rb") as archivo:
+                decodificada = imagen.decodificar_png(archivo.read())
+            self.assertEqual((decodificada.ancho, decodificada.alto), (ancho, alto))
+        self.assertEqual((display.ancho, display.alto), (728, 90))
+
+        with mock.patch("imagen.decodificar_png", wraps=imagen.decodificar_png) as decodificar:
+            otra = Display("Banner", ruta).redimensionar_anuncio(self.cache)
+        self.assertTrue(otra.desde_cache)
+        self.assertEqual(otra.rendiciones, resultado.rendiciones)
+        decodificar.assert_not_called()
+
+    @unittest.skipIf(redimension.Image is not None, "Con Pillow la decodificación no pasa por imagen.")
+    def test_origen_compartido_se_decodifica_una_vez(self):
+        """Prueba que anuncios con el mismo archivo comparten una sola decodificación."""
+        ruta = self.escribir("creativo.png", png_rgb(40, 40)[0])
+        anuncios = [Display("Banner", ruta), Display("Sidebar", ruta), Social("Post", ruta)]
+        with mock.patch("imagen.decodificar_png", wraps=imagen.decodificar_png) as decodificar:
+            resultados = redimension.redimensionar_lote(anuncios, self.cache, max_procesos=1)
+        self.assertEqual(decodificar.call_count, 1)
+        self.assertEqual([len(r.rendiciones) for r in resultados], [2, 2, 1])
+        self.assertEqual(resultados[2].rendiciones[0][:2], (1080, 1080))
+
+    def test_redimensionar_campana(self):
+        """Prueba el redimensionamiento de una campaña completa en un pool de procesos."""
+        rutas = [self.escribir(f"img{i}.png", png_rgb(20 + i, 20)[0]) for i in range(3)]
+        video = self.escribir("spot.mp4", b"video")
+        anuncios = [Social("Story", ruta) for ruta in rutas]
+        anuncios += [Video("Tutorial", video), Display("Banner", "https://cdn.com/a.png")]
+        campana = Campana("Rendiciones", anuncios)
+
+        resultados = campana.redimensionar_anuncios(self.cache, max_procesos=2,
+                                                    escalador_video=escalador_copia)
+        self.assertEqual(len(resultados), 5)
+        for resultado in resultados[:4]:
+            self.assertIsNone(resultado.error)
+            self.assertTrue(all(os.path.exists(r[2]) for r in resultado.rendiciones))
+        self.assertEqual((anuncios[0].ancho, anuncios[0].alto), (1080, 1920))
+        self.assertEqual((anuncios[3].ancho, anuncios[3].alto), (1280, 720))
+        self.assertIsInstance(resultados[4].error, ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
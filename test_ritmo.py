@@ -0,0 +1,71 @@
+import unittest
+from datetime import date, datetime
+from campana import Campana
+from ritmo import Ritmo
+
+
+def momento(dia, hora=0, minuto=0):
+    """Segundos desde la época de un momento de enero de 2024, en hora local."""
+    return datetime(2024, 1, dia, hora, minuto).timestamp()
+
+
+class TestRitmo(unittest.TestCase):
+
+    def setUp(self):
+        self.ahora = momento(1)
+        self.ritmo = Ritmo(reloj=lambda: self.ahora)
+
+    def test_reparto_por_minuto(self):
+        """Prueba que la cuota por minuto reparta el presupuesto y arrastre lo no gastado."""
+        campana = Campana("Verano", fecha_inicio=date(2024, 1, 1), fecha_termino=date(2024, 1, 1))
+        self.ritmo.agregar(campana, 1440 * 3)
+        entregas = sum(self.ritmo.permitir(campana) for _ in range(10))
+        self.assertEqual(entregas, 3)
+        self.ahora += 60
+        self.assertEqual(sum(self.ritmo.permitir(campana) for _ in range(10)), 3)
+        # Un minuto sin pedidos se reparte entre los que faltan; lo no gastado pasa al siguiente.
+        self.ahora += 120
+        self.assertEqual(sum(self.ritmo.permitir(campana, costo=0.5) for _ in range(10)), 6)
+        self.assertAlmostEqual(self.ritmo.restante(campana), 1440 * 3 - 9)
+
+        lenta = Campana("Lenta", fecha_inicio=date(2024, 1, 1), fecha_termino=date(2024, 1, 1))
+        self.ritmo.agregar(lenta, 144)
+        entregas = 0
+        for _ in range(60):
+            entregas += self.ritmo.permitir(lenta)
+            self.ahora += 60
+        self.assertEqual(entregas, 6)
+
+    def test_periodo_y_activas(self):
+        """Prueba que las campañas entren y salgan de activas según sus fechas y su presupuesto."""
+        enero = Campana("Enero", fecha_inicio=date(2024, 1, 2), fecha_termino=date(2024, 1, 3))
+        corta = Campana("Corta", fecha_termino=date(2024, 1, 1))
+        self.ritmo.agregar(enero, 10_000)
+        self.ritmo.agregar(corta, 1)
+        self.assertEqual(self.ritmo.activas(), {corta})
+        self.assertFalse(self.ritmo.permitir(enero))
+
+        self.ahora = momento(1, 23, 59)
+        self.assertTrue(self.ritmo.permitir(corta))
+        self.assertEqual(self.ritmo.activas(), set())
+        self.assertEqual(self.ritmo.avanzar(momento(2)), [corta])
+        self.assertEqual(self.ritmo.activas(), {enero})
+
+        enero.fecha_inicio = date(2024, 1, 5)
+        enero.fecha_termino = date(2024, 1, 6)
+        self.assertEqual(self.ritmo.activas(), set())
+        self.assertEqual(self.ritmo.avanzar(momento(4)), [])
+        self.ahora = momento(5, 12)
+        self.assertTrue(self.ritmo.permitir(enero))
+        self.assertEqual(self.ritmo.activas(), {enero})
+        self.assertEqual(self.ritmo.avanzar(momento(7)), [enero])
+
+        with self.assertRaises(ValueError):
+            self.ritmo.agregar(Campana("Sin fin"), 10)
+        self.ritmo.cerrar()
+        enero.fecha_termino = None
+        self.assertEqual(len(self.ritmo), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from collections import Counter
+from almacen import AnuncioStore
+from anuncio import Display, Social, Video
+from campana import Campana
+from seleccion import Selector, tabla_alias
+
+
+def banner(ancho, alto, url=None):
+    anuncio = Display("Banner", url_clic=url)
+    anuncio.ancho, anuncio.alto = ancho, alto
+    return anuncio
+
+
+class TestSeleccion(unittest.TestCase):
+
+    def test_tabla_alias(self):
+        """Prueba que la tabla de alias reparta la probabilidad según los pesos."""
+        pesos = [1, 2, 3, 4]
+        probabilidades, alias = tabla_alias(pesos)
+        masa = [0.0] * len(pesos)
+        for i, (probabilidad, otro) in enumerate(zip(probabilidades, alias)):
+            masa[i] += probabilidad / len(pesos)
+            masa[otro] += (1 - probabilidad) / len(pesos)
+        for obtenida, peso in zip(masa, pesos):
+            self.assertAlmostEqual(obtenida, peso / sum(pesos))
+
+    def test_eleccion_proporcional_y_filtros(self):
+        """Prueba que las elecciones sigan los pesos y respeten tipo, subtipo y tamaño."""
+        liviano, pesado, grande = banner(728, 90, "1"), banner(728, 90, "3"), banner(300, 600)
+        video = Video("Publicidad")
+        campana = Campana("Verano", [liviano, pesado, grande, video, Social("Post")])
+        selector = campana.selector(peso=lambda anuncio: int(anuncio.url_clic or 1), semilla=1)
+
+        conteos = Counter(selector.elegir_varios(40_000, tipo="Display", ancho=728, alto=90))
+        self.assertEqual(set(conteos), {liviano, pesado})
+        self.assertAlmostEqual(conteos[pesado] / 40_000, 0.75, delta=0.02)
+        self.assertIs(selector.elegir(tipo="Video"), video)
+        self.assertIs(selector.elegir(ancho=300), grande)
+        self.assertIsNone(selector.elegir(tipo="Display", sub_tipo="Sidebar"))
+        self.assertEqual(selector.elegir_varios(3, tipo="Audio"), [])
+        self.assertEqual(len(Counter(selector.elegir_varios(2_000))), 5)
+
+    def test_cambios_incrementales(self):
+        """Prueba que agregar, quitar y modificar anuncios se refleje en las elecciones."""
+        primero, segundo = banner(728, 90), banner(728, 90)
+        selector = Selector([primero], semilla=2)
+        selector.agregar(segundo, peso=0)
+        self.assertEqual(set(selector.elegir_varios(200, ancho=728)), {primero})
+        selector.agregar(segundo, peso=5)
+        self.assertEqual(set(selector.elegir_varios(200, ancho=728)), {primero, segundo})
+        segundo.sub_tipo = "Sidebar"
+        self.assertEqual(set(selector.elegir_varios(200, sub_tipo="Banner")), {primero})
+        primero.ancho = 468
+        self.assertIsNone(selector.elegir(sub_tipo="Banner", ancho=728))
+        selector.quitar(primero)
+        self.assertEqual(set(selector.elegir_varios(50)), {segundo})
+        selector.cerrar()
+        primero.ancho = 728
+        self.assertEqual(len(selector), 0)
+
+    def test_filas_de_almacen(self):
+        """Prueba elegir entre las filas de un AnuncioStore, identificadas por su posición."""
+        almacen = AnuncioStore([banner(728, 90), banner(728, 90), Social("Post")])
+        selector = Selector(almacen, semilla=3)
+        self.assertEqual(len(selector), 3)
+        self.assertIn(almacen[1], selector)
+        self.assertEqual({fila._indice for fila in selector.elegir_varios(200, tipo="Display")}, {0, 1})
+        almacen[0].ancho = 468
+        selector.actualizar(almacen[0])
+        self.assertEqual(selector.elegir(ancho=468)._indice, 0)
+        selector.quitar(almacen[1])
+        self.assertIsNone(selector.elegir(ancho=728))
+        self.assertEqual(len(selector), 2)
+
+    def test_peso_que_falla(self):
+        """Prueba que un error de la función de peso deje el anuncio donde estaba."""
+        anuncio = banner(728, 90)
+        fallar = False
+
+        def peso(_):
+            if fallar:
+                raise RuntimeError("sin peso")
+            return 1
+
+        selector = Selector([anuncio], peso=peso)
+        fallar = True
+        with self.assertRaises(RuntimeError):
+            anuncio.ancho = 468
+        self.assertIn(anuncio, selector)
+        self.assertIs(selector.elegir(ancho=728), anuncio)
+        fallar = False
+        anuncio.alto = 60
+        self.assertIs(selector.elegir(ancho=468, alto=60), anuncio)
+
+
+if __name__ == "__main__":
+    unittest.main()
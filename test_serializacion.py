@@ -0,0 +1,133 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from almacen import AnuncioStore
+from anuncio import Display, Social, Video
+from campana import Campana
+from error import LargoExcedidoException, SubTipoInvalidoException
+import serializacion
+
+
+def crear_campana():
+    """Crea una campaña con un anuncio de cada tipo."""
+    video = Video("Publicidad", "http://cdn.com/v.mp4", "http://ejemplo.com", 30)
+    display = Display("Banner", "http://cdn.com/b.png")
+    display.alto, display.ancho = 90, 728
+    return Campana("Verano, ñandú", [video, display, Social("Story")],
+                   date(2024, 1, 1), date(2024, 2, 1))
+
+
+class TestSerializacion(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def comparar(self, original, importada):
+        self.assertEqual((importada.nombre, importada.fecha_inicio, importada.fecha_termino),
+                         (original.nombre, original.fecha_inicio, original.fecha_termino))
+        campos = lambda a: (a.tipo, a.sub_tipo, a.url_archivo, a.url_clic, a.alto, a.ancho,
+                            getattr(a, "duracion", None))
+        self.assertEqual([campos(a) for a in importada.anuncios],
+                         [campos(a) for a in original.anuncios])
+
+    def test_ida_y_vuelta(self):
+        """Prueba exportar e importar en ambos formatos, también con una campaña vacía."""
+        campanas = [crear_campana(), Campana("Vacía", fecha_inicio=date(2024, 3, 1))]
+        for formato in ("jsonl", "csv"):
+            ruta = os.path.join(self.directorio, f"campanas.{formato}")
+            self.assertEqual(serializacion.exportar(campanas, ruta, formato), 4)
+            importadas = serializacion.importar(ruta, formato)
+            self.assertEqual(list(importadas), [c.nombre for c in campanas])
+            for campana in campanas:
+                self.comparar(campana, importadas[campana.nombre])
+
+    def test_exportar_almacen(self):
+        """Prueba que un AnuncioStore se exporta igual que una lista de anuncios."""
+        original = crear_campana()
+        columnar = Campana(original.nombre, AnuncioStore(original.anuncios),
+                           original.fecha_inicio, original.fecha_termino)
+        texto, otro = io.StringIO(), io.StringIO()
+        serializacion.escribir_jsonl(original, texto)
+        serializacion.escribir_jsonl(columnar, otro)
+        self.assertEqual(texto.getvalue(), otro.getvalue())
+
+    def test_errores_por_linea(self):
+        """Prueba que los errores se informan con su línea y no detienen la importación."""
+        lineas = [
+            '{"campana": "A", "fecha_inicio": "2024-01-01"}',
+            '{"campana": "A", "tipo": "Video", "sub_tipo": "Publicidad"}',
+            '',
+            'esto no es json',
+            '{"campana": "%s", "tipo": "Video", "sub_tipo": "Publicidad"}' % ("x" * 251),
+            '{"campana": "A", "tipo": "Social", "sub_tipo": "Banner"}',
+            '{"campana": "B", "fecha_termino": "mañana"}',
+            '{"tipo": "Social", "sub_tipo": "Post"}',
+            '{"campana": "A", "tipo": "Display", "sub_tipo": "Sidebar"}',
+            '{"campana": ["A"], "tipo": "Video", "sub_tipo": "Publicidad"}',
+        ]
+        errores = []
+        campanas = serializacion.importar(io.StringIO("\n".join(lineas)), al_error=errores.append,
+                                          tamano_lote=2)
+        self.assertEqual([(e.fila, e.campo) for e in errores],
+                         [(4, None), (5, "campana"), (6, "sub_tipo"), (7, "fecha_termino"),
+                          (8, "campana"), (10, "campana")])
+        self.assertIsInstance(errores[-1].error, TypeError)
+        self.assertIsInstance(errores[1].error, LargoExcedidoException)
+        self.assertIsInstance(errores[2].error, SubTipoInvalidoException)
+        self.assertEqual(campanas["A"].fecha_inicio, date(2024, 1, 1))
+        self.assertEqual([a.tipo for a in campanas["A"].anuncios], ["Video", "Display"])
+
+    def test_errores_de_csv(self):
+        """Prueba que los registros CSV ilegibles o con campos de más se informen con su línea."""
+        limite = csv.field_size_limit(100)
+        try:
+            texto = io.StringIO("campana,tipo,sub_tipo\n"
+                                "A,Video,Publicidad\n"
+                                "A,Social,Post,sobra\n"
+                                "A,Display,%s\n"
+                                "A,Display,Banner\n" % ("x" * 200))
+            errores = []
+            campanas = serializacion.importar(texto, "csv", al_error=errores.append)
+        finally:
+            csv.field_size_limit(limite)
+        self.assertEqual([(e.fila, e.campo) for e in errores], [(3, None), (4, None)])
+        self.assertIsInstance(errores[1].error, csv.Error)
+        self.assertEqual([a.tipo for a in campanas["A"].anuncios], ["Video", "Display"])
+
+    def test_sin_callback_lanza(self):
+        """Prueba que sin callback el primer error se lanza con su número de línea."""
+        texto = io.StringIO("campana,tipo,sub_tipo\nA,Video,Banner\n")
+        with self.assertRaises(SubTipoInvalidoException) as contexto:
+            serializacion.importar(texto, "csv")
+        self.assertTrue(str(contexto.exception).startswith("Línea 2, campo sub_tipo: "))
+
+    def test_lectura_perezosa(self):
+        """Prueba que la importación no lee más allá del lote en curso."""
+        leidas = []
+
+        def lineas():
+            for i in range(10):
+                leidas.append(i)
+                yield '{"campana": "A", "tipo": "Social", "sub_tipo": "Post"}\n'
+
+        filas = serializacion.leer_jsonl(lineas())
+        self.assertEqual(next(filas)[0], 1)
+        self.assertEqual(leidas, [0])
+
+    def test_formato_desconocido(self):
+        """Prueba que un formato no soportado lanza ValueError."""
+        with self.assertRaises(ValueError):
+            serializacion.importar(io.StringIO(), "xml")
+        with self.assertRaises(ValueError):
+            serializacion.exportar([], io.StringIO(), "xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
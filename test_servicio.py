@@ -0,0 +1,176 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+import servicio
+from campana import Campana
+from persistencia import AlmacenSQLite
+from servicio import Cliente, Servicio
+
+
+class TestServicio(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.servicio = Servicio([Campana("Verano")])
+        self.servidor = await self.servicio.iniciar(puerto=0)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+        self.cliente = await Cliente.conectar(puerto=self.puerto)
+
+    async def asyncTearDown(self):
+        await self.cliente.cerrar()
+        self.servidor.close()
+        await self.servidor.wait_closed()
+
+    async def test_crear_y_modificar_campana(self):
+        """Prueba crear una campaña, cambiar sus fechas y rechazar una fecha inválida."""
+        estado, cuerpo = await self.cliente.pedir("POST", "/campanas",
+                                                  {"nombre": "Otoño", "fecha_inicio": "2024-03-01"})
+        self.assertEqual(estado, 201)
+        self.assertEqual((cuerpo["id"], cuerpo["fecha_inicio"]), (2, "2024-03-01"))
+
+        estado, cuerpo = await self.cliente.pedir("PATCH", "/campanas/2", {"fecha_termino": "2024-06-01"})
+        self.assertEqual((estado, cuerpo["fecha_termino"]), (200, "2024-06-01"))
+
+        estado, cuerpo = await self.cliente.pedir("PATCH", "/campanas/2", {"fecha_inicio": "ayer"})
+        self.assertEqual((estado, cuerpo["campo"]), (422, "fecha_inicio"))
+        estado, cuerpo = await self.cliente.pedir("PATCH", "/campanas/2", {"nombre": ["a"]})
+        self.assertEqual((estado, cuerpo["campo"]), (422, "nombre"))
+        self.assertEqual(self.servicio.campanas[2].nombre, "Otoño")
+
+        estado, cuerpo = await self.cliente.pedir("POST", "/campanas", {"nombre": "x" * 251})
+        self.assertEqual((estado, cuerpo["campo"]), (422, "nombre"))
+
+    async def test_nombres_repetidos(self):
+        """Prueba que crear o renombrar una campaña con un nombre en uso responda 409."""
+        self.assertEqual((await self.cliente.pedir("POST", "/campanas", {"nombre": "Verano"}))[0], 409)
+        self.assertEqual((await self.cliente.pedir("POST", "/campanas", {"nombre": "Otoño"}))[0], 201)
+        estado, cuerpo = await self.cliente.pedir("PATCH", "/campanas/2", {"nombre": "Verano"})
+        self.assertEqual((estado, cuerpo["campo"]), (409, "nombre"))
+        self.assertEqual((await self.cliente.pedir("PATCH", "/campanas/2", {"nombre": "Otoño"}))[0], 200)
+        self.assertEqual(len(self.servicio.campanas), 2)
+
+    async def test_guardar_cada_escritura(self):
+        """Prueba que con un almacén cada escritura quede guardada sin esperar a que el servicio termine."""
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "campanas.db")
+            with AlmacenSQLite(ruta) as almacen:
+                servicio_bd = Servicio(almacen=almacen)
+                await servicio_bd.despachar("POST", "/campanas", {"nombre": "Otoño"})
+                await servicio_bd.despachar("POST", "/campanas/1/anuncios", {"tipo": "Social", "sub_tipo": "Post"})
+                await servicio_bd.despachar("PATCH", "/campanas/1/anuncios/0", {"sub_tipo": "Story"})
+                with AlmacenSQLite(ruta) as otra:
+                    guardada = otra.abrir_por_nombre("Otoño")
+                    self.assertEqual([a.sub_tipo for a in guardada.anuncios], ["Story"])
+
+    async def test_anuncios(self):
+        """Prueba agregar anuncios en lote con errores por fila, leerlos y modificar uno."""
+        estado, cuerpo = await self.cliente.pedir("POST", "/campanas/1/anuncios", [
+            {"tipo": "Video", "sub_tipo": "Tutorial", "duracion": 30},
+            {"tipo": "Video", "sub_tipo": "Noticia"},
+            {"tipo": "Social", "sub_tipo": "Post"},
+        ])
+        self.assertEqual(estado, 201)
+        self.assertEqual(cuerpo["agregados"], 2)
+        self.assertEqual([(e["fila"], e["campo"]) for e in cuerpo["errores"]], [(1, "sub_tipo")])
+
+        estado, cuerpo = await self.cliente.pedir("PATCH", "/campanas/1/anuncios/0", {"duracion": 45})
+        self.assertEqual((estado, cuerpo["duracion"]), (200, 45))
+        estado, cuerpo = await self.cliente.pedir("PATCH", "/campanas/1/anuncios/1", {"duracion": 45})
+        self.assertEqual((estado, cuerpo["campo"]), (422, "duracion"))
+        estado, _ = await self.cliente.pedir("GET", "/campanas/1/anuncios/5")
+        self.assertEqual(estado, 404)
+
+        estado, cuerpo = await self.cliente.pedir("GET", "/campanas/1")
+        self.assertEqual({tipo: n for tipo, n in cuerpo["por_tipo"].items() if n}, {"Video": 1, "Social": 1})
+
+    async def test_lista_por_partes(self):
+        """Prueba que una lista grande de anuncios llega completa en JSON Lines."""
+        self.servicio.campanas[1].agregar_anuncios_bulk(
+            [{"tipo": "Display", "sub_tipo": "Banner"}] * 2500)
+        estado, filas = await self.cliente.pedir("GET", "/campanas/1/anuncios")
+        self.assertEqual(estado, 200)
+        self.assertEqual(len(filas), 2500)
+        self.assertEqual(filas[0]["sub_tipo"], "Banner")
+
+        # Una escritura mientras el cliente no ha leído la lista no espera al envío.
+        lector, escritor = await asyncio.open_connection("127.0.0.1", self.puerto)
+        escritor.write(b"GET /campanas/1/anuncios HTTP/1.1\r\n\r\n")
+        await escritor.drain()
+        await asyncio.sleep(0.05)
+        estado, _ = await asyncio.wait_for(
+            self.cliente.pedir("POST", "/campanas/1/anuncios", {"tipo": "Social", "sub_tipo": "Post"}), 5)
+        self.assertEqual(estado, 201)
+        escritor.close()
+
+    async def test_lista_que_falla(self):
+        """Prueba que un error antes del envío se responda con 500 y uno a la mitad cierre la conexión."""
+        self.servicio.campanas[1].agregar_anuncios_bulk([{"tipo": "Display", "sub_tipo": "Banner"}] * 1500)
+        with mock.patch.object(servicio, "datos_anuncio", side_effect=RuntimeError("falla")):
+            estado, cuerpo = await self.cliente.pedir("GET", "/campanas/1/anuncios")
+        self.assertEqual((estado, cuerpo["error"]), (500, "RuntimeError: falla"))
+
+        datos = servicio.datos_anuncio
+        llamadas = iter(range(2000))
+
+        def fallar_despues(anuncio):
+            if next(llamadas) >= servicio.TAMANO_PARTE:
+                raise RuntimeError("falla")
+            return datos(anuncio)
+
+        lector, escritor = await asyncio.open_connection("127.0.0.1", self.puerto)
+        with mock.patch.object(servicio, "datos_anuncio", side_effect=fallar_despues):
+            escritor.write(b"GET /campanas/1/anuncios HTTP/1.1\r\n\r\n")
+            respuesta = await asyncio.wait_for(lector.read(), 5)
+        escritor.close()
+        self.assertTrue(respuesta.startswith(b"HTTP/1.1 200 "))
+        self.assertFalse(respuesta.endswith(b"0\r\n\r\n"))
+
+    async def test_lote_y_errores(self):
+        """Prueba una petición por lotes y las respuestas a rutas y cuerpos inválidos."""
+        estado, cuerpo = await self.cliente.pedir("POST", "/lote", [
+            {"metodo": "POST", "ruta": "/campanas/1/anuncios", "cuerpo": {"tipo": "Social", "sub_tipo": "Story"}},
+            {"metodo": "GET", "ruta": "/campanas/1/anuncios"},
+            {"metodo": "GET", "ruta": "/campanas/9"},
+        ])
+        self.assertEqual(estado, 200)
+        self.assertEqual([r["estado"] for r in cuerpo], [201, 200, 404])
+        self.assertEqual(len(cuerpo[1]["cuerpo"]), 1)
+
+        self.assertEqual((await self.cliente.pedir("DELETE", "/campanas"))[0], 405)
+        self.assertEqual((await self.cliente.pedir("GET", "/nada"))[0], 404)
+
+    async def test_peticiones_mal_formadas(self):
+        """Prueba que una petición que no se puede leer o que falla reciba una respuesta en lugar de un corte."""
+        for peticion in (b"GET\r\n\r\n", b"POST /campanas HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+                         b"POST /campanas HTTP/1.1\r\nContent-Length: diez\r\n\r\n",
+                         b"GET /campanas/" + b"1" * 100_000 + b" HTTP/1.1\r\n\r\n",
+                         b"GET /campanas HTTP/1.1\r\nX-Relleno: " + b"a" * 100_000 + b"\r\n\r\n"):
+            lector, escritor = await asyncio.open_connection("127.0.0.1", self.puerto)
+            escritor.write(peticion)
+            self.assertTrue((await lector.readline()).startswith(b"HTTP/1.1 400 "))
+            escritor.close()
+
+        with mock.patch.object(servicio, "aplicar_edicion", side_effect=RuntimeError("falla")):
+            estado, cuerpo = await self.cliente.pedir("PATCH", "/campanas/1", {"nombre": "Otoño"})
+        self.assertEqual((estado, cuerpo["error"]), (500, "RuntimeError: falla"))
+        self.assertEqual((await self.cliente.pedir("GET", "/campanas/1"))[0], 200)
+
+    async def test_escrituras_concurrentes(self):
+        """Prueba que escrituras simultáneas a la misma campaña no pierden anuncios."""
+        clientes = [await Cliente.conectar(puerto=self.puerto) for _ in range(5)]
+
+        async def agregar(cliente):
+            for _ in range(20):
+                await cliente.pedir("POST", "/campanas/1/anuncios", {"tipo": "Social", "sub_tipo": "Post"})
+
+        try:
+            await asyncio.gather(*(agregar(cliente) for cliente in clientes))
+        finally:
+            for cliente in clientes:
+                await cliente.cerrar()
+        self.assertEqual(len(self.servicio.campanas[1].anuncios), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
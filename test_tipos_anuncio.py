@@ -0,0 +1,84 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import tipos_anuncio
+from anuncio import Anuncio
+from campana import Campana
+
+MODULO = '''
+from anuncio import Anuncio
+
+
+class Holograma(Anuncio):
+    SUB_TIPOS = {"Holograma": ("Vitrina", "Escenario")}
+    TAMANOS = {"Vitrina": ((640, 480),)}
+    CAMPOS_EDITABLES = Anuncio.CAMPOS_EDITABLES + ("alto", "ancho")
+
+    def comprimir_anuncio(self):
+        pass
+
+    def redimensionar_anuncio(self):
+        pass
+'''
+
+
+class TestTiposAnuncio(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directorio = tempfile.mkdtemp()
+        with open(os.path.join(cls.directorio, "formato_holograma.py"), "w", encoding="utf-8") as archivo:
+            archivo.write(MODULO)
+        sys.path.insert(0, cls.directorio)
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.modules.pop("formato_holograma", None)
+        sys.path.remove(cls.directorio)
+        shutil.rmtree(cls.directorio)
+
+    def setUp(self):
+        # Cada prueba declara e importa Holograma desde cero y deja los registros como estaban.
+        self.registro, self.sub_tipos = Anuncio.REGISTRO, dict(Anuncio.SUB_TIPOS)
+        self.declarados, self.formatos = dict(tipos_anuncio._declarados), dict(tipos_anuncio._formatos)
+        tipos_anuncio.declarar("Holograma", "formato_holograma:Holograma")
+
+    def tearDown(self):
+        sys.modules.pop("formato_holograma", None)
+        Anuncio.REGISTRO = self.registro
+        for tabla, copia in ((Anuncio.SUB_TIPOS, self.sub_tipos), (tipos_anuncio._declarados, self.declarados),
+                             (tipos_anuncio._formatos, self.formatos)):
+            tabla.clear()
+            tabla.update(copia)
+
+    def test_carga_perezosa(self):
+        """Prueba que un tipo declarado se liste sin importarse y se importe al usarse en una carga."""
+        self.assertIn("Holograma", tipos_anuncio.nombres())
+        self.assertNotIn("formato_holograma", sys.modules)
+
+        campana = Campana("Feria")
+        errores = campana.agregar_anuncios_bulk([("Holograma", "Vitrina"), ("Holograma", "Banner")])
+        self.assertIn("formato_holograma", sys.modules)
+        self.assertEqual([(e.fila, e.campo) for e in errores], [(1, "sub_tipo")])
+        self.assertEqual(campana.anuncios[0].tipo, "Holograma")
+
+    def test_metadatos(self):
+        """Prueba los subtipos, campos editables y tamaños por defecto de un tipo."""
+        formato = tipos_anuncio.formato("Holograma")
+        self.assertEqual(formato.sub_tipos, ("Vitrina", "Escenario"))
+        self.assertEqual(formato.campos[-2:], ("alto", "ancho"))
+        self.assertEqual(formato.tamanos, {"Vitrina": (640, 480), "Escenario": (1, 1)})
+        self.assertEqual(tipos_anuncio.formato("Video").campos[-1], "duracion")
+        self.assertIsNone(tipos_anuncio.formato("Radio"))
+
+    def test_declaracion_incorrecta(self):
+        """Prueba que una ruta que no define el tipo declarado lance ImportError."""
+        tipos_anuncio.declarar("Fantasma", "formato_holograma:Holograma")
+        with self.assertRaises(ImportError):
+            tipos_anuncio.clase("Fantasma")
+
+
+if __name__ == "__main__":
+    unittest.main()
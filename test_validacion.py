@@ -0,0 +1,46 @@
+import unittest
+from validacion import validar_fecha, validar_url, validar_urls
+from ingesta import cargar_anuncios
+
+
+class TestValidacion(unittest.TestCase):
+    """Pruebas unitarias para el módulo de validación."""
+
+    def test_validar_url(self):
+        """Prueba URLs válidas e inválidas."""
+        self.assertTrue(validar_url("http://www.ejemplo.com/destino"))
+        self.assertTrue(validar_url("https://localhost:8080/a?b=c"))
+        self.assertTrue(validar_url("ftp://192.168.0.1"))
+        self.assertFalse(validar_url("www.ejemplo.com"))
+        self.assertFalse(validar_url("http://ejemplo"))
+
+    def test_cache_de_urls_repetidas(self):
+        """Prueba que las URLs repetidas se resuelvan desde el caché."""
+        validar_url.cache_clear()
+        validar_urls(["http://ejemplo.com/landing"] * 10)
+        info = validar_url.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 9)
+
+    def test_validar_urls_en_lote(self):
+        """Prueba el resultado booleano y la lista de posiciones inválidas."""
+        urls = ["http://a.com", "nada", "https://b.org/x", "http//c.com"]
+        self.assertEqual(list(validar_urls(urls)), [1, 0, 1, 0])
+        self.assertEqual(validar_urls(urls, solo_invalidas=True), [1, 3])
+
+    def test_validar_fecha(self):
+        """Prueba el formato de fechas YYYY-MM-DD."""
+        self.assertTrue(validar_fecha("2024-02-09"))
+        self.assertFalse(validar_fecha("09/02/2024"))
+
+    def test_ingesta_valida_urls(self):
+        """Prueba que la carga masiva rechace URLs inválidas."""
+        _, errores = cargar_anuncios([
+            ("Display", "Banner", "http://cdn.com/b.jpg", "no-es-url"),
+            ("Display", "Banner", None, "http://ejemplo.com"),
+        ])
+        self.assertEqual([(e.fila, e.campo) for e in errores], [(0, "url_clic")])
+
+
+if __name__ == "__main__":
+    unittest.main()
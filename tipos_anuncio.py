@@ -0,0 +1,134 @@
+"""
+Registro perezoso de tipos de anuncio.
+
+Un tipo se declara con su nombre y la ruta "modulo:Clase" donde está
+definido, sin importarlo. El módulo se importa la primera vez que se pide la
+clase o sus metadatos; al importarse, Anuncio.__init_subclass__ registra la
+clase en Anuncio.REGISTRO y desde ahí el resto del sistema la conoce.
+
+Los paquetes instalados pueden declarar sus tipos como entry points del grupo
+GRUPO, por ejemplo en su pyproject.toml:
+
+    [project.entry-points."campanas.tipos_anuncio"]
+    Audio = "formatos_audio:Audio"
+
+Los entry points se leen (sin importar nada) la primera vez que se busca un
+tipo que no está cargado ni declarado, o al listar los nombres.
+"""
+import importlib
+from collections import namedtuple
+from anuncio import Anuncio
+
+GRUPO = "campanas.tipos_anuncio"
+
+Formato = namedtuple("Formato", ["nombre", "clase", "sub_tipos", "campos", "tamanos"])
+Formato.__doc__ = """Metadatos de un tipo de anuncio: nombre, clase, subtipos en orden de presentación,
+campos editables y tamaño (ancho, alto) por defecto de cada subtipo."""
+
+_declarados = {}
+_entry_points_leidos = False
+_formatos = {}
+
+
+def declarar(nombre, ruta):
+    """
+    Declara un tipo de anuncio sin importar su módulo.
+
+    Args:
+        nombre (str): Nombre de la clase, el mismo que usa la columna 'tipo'.
+        ruta (str): "modulo:Clase" a importar cuando el tipo se use por primera vez.
+    """
+    _declarados[nombre] = ruta
+
+
+def _leer_entry_points():
+    """Agrega las declaraciones de los entry points instalados, una sola vez."""
+    global _entry_points_leidos
+    if _entry_points_leidos:
+        return
+    _entry_points_leidos = True
+    from importlib.metadata import entry_points
+    for punto in entry_points(group=GRUPO):
+        _declarados.setdefault(punto.name, punto.value)
+
+
+def nombres():
+    """
+    Regresa los nombres de todos los tipos conocidos, sin importar los declarados.
+
+    Returns:
+        list: Tipos ya cargados en orden de registro, seguidos de los declarados
+            que aún no se importan.
+    """
+    _leer_entry_points()
+    cargados = [clase.__name__ for clase in Anuncio.REGISTRO.clases]
+    return cargados + [nombre for nombre in _declarados if nombre not in cargados]
+
+
+def clase(nombre):
+    """
+    Regresa la clase de un tipo de anuncio, importando su módulo si hace falta.
+
+    Args:
+        nombre (str): Nombre del tipo.
+
+    Returns:
+        type | None: La subclase de Anuncio, o None si el tipo no existe.
+
+    Raises:
+        ImportError: Si el módulo declarado no se puede importar.
+    """
+    encontrada = Anuncio.REGISTRO.clase_por_nombre(nombre)
+    if encontrada is not None:
+        return encontrada
+    ruta = _declarados.get(nombre)
+    if ruta is None and not _entry_points_leidos:
+        _leer_entry_points()
+        ruta = _declarados.get(nombre)
+    if ruta is None:
+        return None
+    modulo, _, atributo = ruta.partition(":")
+    encontrada = getattr(importlib.import_module(modulo), atributo or nombre)
+    if Anuncio.REGISTRO.clase_por_nombre(nombre) is not encontrada:
+        raise ImportError(f"'{ruta}' no define el tipo de anuncio {nombre}.")
+    return encontrada
+
+
+def cargar(nombres_tipos):
+    """
+    Importa los tipos indicados que estén declarados y aún no cargados.
+
+    Args:
+        nombres_tipos (iterable): Nombres a cargar; los desconocidos se ignoran.
+
+    Returns:
+        bool: True si se cargó alguno.
+    """
+    cargado = False
+    for nombre in nombres_tipos:
+        if isinstance(nombre, str) and Anuncio.REGISTRO.clase_por_nombre(nombre) is None:
+            cargado = clase(nombre) is not None or cargado
+    return cargado
+
+
+def formato(nombre):
+    """
+    Regresa los metadatos de un tipo, importándolo si hace falta.
+
+    Args:
+        nombre (str): Nombre del tipo.
+
+    Returns:
+        Formato | None: Metadatos del tipo, o None si no existe.
+    """
+    resultado = _formatos.get(nombre)
+    if resultado is None:
+        encontrada = clase(nombre)
+        if encontrada is None:
+            return None
+        sub_tipos = Anuncio.REGISTRO.sub_tipos_ordenados(encontrada)
+        # El primer tamaño de cada subtipo es el principal (ver redimension); sin tamaños, 1x1.
+        tamanos = {sub_tipo: (encontrada.TAMANOS.get(sub_tipo) or ((1, 1),))[0] for sub_tipo in sub_tipos}
+        resultado = _formatos[nombre] = Formato(nombre, encontrada, sub_tipos, encontrada.CAMPOS_EDITABLES,
+                                                tamanos)
+    return resultado
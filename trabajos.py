@@ -0,0 +1,69 @@
+import os
+import tempfile
+
+
+def escribir_atomico(ruta, datos):
+    """
+    Escribe un archivo de forma atómica: los lectores ven el contenido anterior o el nuevo, nunca uno a medias.
+
+    Args:
+        ruta (str): Ruta del archivo a escribir o reemplazar.
+        datos (bytes | iterable): Contenido nuevo, o un iterable de bloques de bytes que se
+            escriben uno tras otro sin juntarlos en memoria.
+    """
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            if isinstance(datos, (bytes, bytearray, memoryview)):
+                archivo.write(datos)
+            else:
+                archivo.writelines(datos)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+def _ejecutar(funcion, argumentos):
+    """Punto de entrada de los procesos del pool."""
+    return funcion(*argumentos)
+
+
+def ejecutar_en_pool(tareas, max_procesos=None, en_vuelo=None):
+    """
+    Ejecuta tareas en un pool de procesos con una cantidad acotada de tareas pendientes.
+
+    Como mucho hay en_vuelo tareas enviadas al pool al mismo tiempo, así que la
+    memoria no crece con el tamaño del lote. Las funciones y sus argumentos deben
+    poder enviarse a otro proceso (funciones definidas a nivel de módulo).
+
+    Args:
+        tareas (list): Tuplas (función, argumentos).
+        max_procesos (int, optional): Procesos del pool. Por defecto, uno por núcleo.
+            Con 1, o con una sola tarea, todo se ejecuta en el proceso actual.
+        en_vuelo (int, optional): Tareas pendientes como máximo. Por defecto, el doble
+            de max_procesos.
+
+    Returns:
+        list: El resultado de cada tarea, en el mismo orden.
+    """
+    max_procesos = max_procesos or os.cpu_count() or 1
+    if max_procesos == 1 or len(tareas) <= 1:
+        return [funcion(*argumentos) for funcion, argumentos in tareas]
+
+    # Se importa aquí para no cargar multiprocessing al importar el módulo.
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    resultados = [None] * len(tareas)
+    en_vuelo = en_vuelo or 2 * max_procesos
+    with ProcessPoolExecutor(max_workers=min(max_procesos, len(tareas))) as pool:
+        pendientes = {}
+        for posicion, (funcion, argumentos) in enumerate(tareas):
+            if len(pendientes) >= en_vuelo:
+                listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    resultados[pendientes.pop(futuro)] = futuro.result()
+            pendientes[pool.submit(_ejecutar, funcion, argumentos)] = posicion
+        for futuro, posicion in pendientes.items():
+            resultados[posicion] = futuro.result()
+    return resultados
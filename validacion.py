@@ -0,0 +1,63 @@
+import re
+from datetime import date
+from functools import lru_cache
+
+PATRON_URL = re.compile(
+    r'^(?:http|ftp)s?://'  # http:// o https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # Dominio
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...o dirección IP
+    r'(?::\d+)?'  # puerto opcional
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+TAMANO_CACHE_URLS = 65536
+
+
+def validar_fecha(fecha_str):
+    """Valida que la fecha tenga el formato YYYY-MM-DD."""
+    try:
+        date.fromisoformat(fecha_str)
+        return True
+    except ValueError:
+        return False
+
+
+def convertir_fecha(fecha_str):
+    """
+    Convierte un texto YYYY-MM-DD en fecha.
+
+    Raises:
+        ValueError: Si el valor no es un texto con el formato YYYY-MM-DD.
+    """
+    if not isinstance(fecha_str, str) or not validar_fecha(fecha_str):
+        raise ValueError(f"Fecha '{fecha_str}' no válida, se espera YYYY-MM-DD.")
+    return date.fromisoformat(fecha_str)
+
+
+@lru_cache(maxsize=TAMANO_CACHE_URLS)
+def validar_url(url):
+    """
+    Valida que la URL tenga un formato válido usando la expresión regular precompilada.
+
+    Los resultados se guardan en un caché LRU, porque las mismas URLs de destino se
+    repiten en muchos anuncios.
+    """
+    return PATRON_URL.match(url) is not None
+
+
+def validar_urls(urls, solo_invalidas=False):
+    """
+    Valida muchas URLs de una vez.
+
+    Args:
+        urls (iterable): URLs a validar.
+        solo_invalidas (bool, optional): Si es True, regresa solo las posiciones de las
+            URLs inválidas. Por defecto es False.
+
+    Returns:
+        bytearray | list: Un 1 o 0 por URL, o la lista de posiciones inválidas.
+    """
+    resultados = bytearray(map(validar_url, urls))
+    if solo_invalidas:
+        return [i for i, valida in enumerate(resultados) if not valida]
+    return resultados